@@ -1,13 +1,25 @@
 from django.contrib import admin
-from simple_history.admin import SimpleHistoryAdmin
-from .models import Announcement, Tag, AnnouncementFile
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from core.history import render_text_diff
+from .models import Announcement, Tag, AnnouncementFile, AnnouncementRevision, TeamsNotification, announcement_history
+
+def _display_value(instance, field):
+    if field.choices:
+        return getattr(instance, f'get_{field.name}_display')()
+    return getattr(instance, field.name)
 
 class AnnouncementFileInline(admin.TabularInline):
     model = AnnouncementFile
-    extra = 1
+    extra = 0
+    fields = ('file_name', 'size', 'content_type', 'preview_status', 'uploaded_at')
+    readonly_fields = ('size', 'content_type', 'preview_status', 'uploaded_at')
 
 @admin.register(Announcement)
-class AnnouncementAdmin(SimpleHistoryAdmin):
+class AnnouncementAdmin(admin.ModelAdmin):
     list_display = ('title', 'announcement_type', 'priority', 'product', 'status', 'pinned', 'start_date', 'end_date', 'author', 'created_at')
     list_filter = ('announcement_type', 'priority', 'status', 'pinned', 'start_date', 'end_date')
     search_fields = ('title', 'content', 'product')
@@ -15,6 +27,7 @@ class AnnouncementAdmin(SimpleHistoryAdmin):
     filter_horizontal = ('tags',)
     readonly_fields = ('created_at', 'updated_at')
     inlines = [AnnouncementFileInline]
+    object_history_template = 'admin/announcements/announcement/object_history.html'
     
     fieldsets = (
         ('Temel Bilgiler', {
@@ -35,8 +48,60 @@ class AnnouncementAdmin(SimpleHistoryAdmin):
     def save_model(self, request, obj, form, change):
         if not change:  # Yeni kayıt oluşturuluyorsa
             obj.author = request.user
+        obj._history_user = request.user
         super().save_model(request, obj, form, change)
 
+    def delete_model(self, request, obj):
+        obj._history_user = request.user
+        super().delete_model(request, obj)
+
+    def get_urls(self):
+        return [
+            path('<path:object_id>/history/<int:revision_id>/',
+                 self.admin_site.admin_view(self.revision_view),
+                 name='announcements_announcement_revision'),
+        ] + super().get_urls()
+
+    def history_view(self, request, object_id, extra_context=None):
+        """Değişiklik geçmişi: kayıtlar listelenir, sürümler istenince kurulur"""
+        revisions = (AnnouncementRevision.objects.filter(announcement_id=object_id)
+                     .select_related('user').defer('previous', 'text_delta'))
+        extra_context = {**(extra_context or {}), 'revisions': revisions}
+        return super().history_view(request, object_id, extra_context=extra_context)
+
+    def revision_view(self, request, object_id, revision_id):
+        """Bir kaydın sonrasındaki sürümü geçmişten kurar ve öncekiyle karşılaştırır"""
+        announcement = self.get_object(request, object_id)
+        if announcement is None or not self.has_view_or_change_permission(request, announcement):
+            raise Http404
+        revision = get_object_or_404(AnnouncementRevision, pk=revision_id, announcement_id=announcement.pk)
+        after, before = announcement_history.reconstruct(revision, with_previous=True)
+
+        version = announcement_history.as_instance(after)
+        previous = announcement_history.as_instance(before) if before is not None else None
+        rows = []
+        for attname, field in announcement_history.fields.items():
+            row = {
+                'label': field.verbose_name,
+                'value': _display_value(version, field),
+                'changed': field.name in revision.changed_fields,
+            }
+            if row['changed'] and previous is not None:
+                row['previous'] = _display_value(previous, field)
+                if attname in announcement_history.text_fields:
+                    row['diff'] = render_text_diff(before[attname], after[attname])
+            rows.append(row)
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'object': announcement,
+            'revision': revision,
+            'rows': rows,
+            'title': f'{announcement} - {revision.revision_date:%d.%m.%Y %H:%M}',
+        }
+        return TemplateResponse(request, 'admin/announcements/announcement/revision.html', context)
+
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
     list_display = ('name',)
@@ -44,7 +109,42 @@ class TagAdmin(admin.ModelAdmin):
 
 @admin.register(AnnouncementFile)
 class AnnouncementFileAdmin(admin.ModelAdmin):
-    list_display = ('file_name', 'announcement', 'uploaded_at')
-    list_filter = ('uploaded_at',)
-    search_fields = ('file_name', 'announcement__title')
-    date_hierarchy = 'uploaded_at'
\ No newline at end of file
+    list_display = ('file_name', 'announcement', 'size', 'preview_status', 'uploaded_at')
+    list_filter = ('preview_status', 'uploaded_at')
+    search_fields = ('file_name', 'announcement__title', 'sha256')
+    raw_id_fields = ('announcement',)
+    readonly_fields = ('blob_key', 'sha256', 'size', 'content_type', 'preview_key', 'preview_status')
+    date_hierarchy = 'uploaded_at'
+
+@admin.register(TeamsNotification)
+class TeamsNotificationAdmin(admin.ModelAdmin):
+    list_display = ('announcement', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status',)
+    search_fields = ('announcement__title', 'last_error')
+    raw_id_fields = ('announcement',)
+    readonly_fields = ('created_at', 'sent_at')
+    actions = ['retry_now']
+
+    @admin.action(description='Seçili bildirimleri hemen yeniden dene')
+    def retry_now(self, request, queryset):
+        from django.utils import timezone
+        from .notifications import schedule_dispatch
+
+        count = queryset.exclude(status='sent').update(status='pending', next_attempt_at=timezone.now())
+        schedule_dispatch(0)
+        self.message_user(request, f'{count} bildirim yeniden kuyruğa alındı.')
+
+@admin.register(AnnouncementRevision)
+class AnnouncementRevisionAdmin(admin.ModelAdmin):
+    list_display = ('announcement', 'revision_type', 'status', 'revision_date', 'user', 'change_reason')
+    list_filter = ('revision_type', 'status')
+    search_fields = ('announcement__title', 'change_reason')
+    date_hierarchy = 'revision_date'
+    raw_id_fields = ('announcement',)
+    exclude = ('previous', 'text_delta')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
\ No newline at end of file
@@ -8,4 +8,9 @@ class AnnouncementsConfig(AppConfig):
 
     def ready(self):
         # Sinyalleri yükle
-        import announcements.signals
\ No newline at end of file
+        import announcements.signals
+
+        # Migrasyonlardan sonra duyuru arama indeksini oluştur
+        from django.db.models.signals import post_migrate
+        from .search import ensure_announcement_search_index
+        post_migrate.connect(ensure_announcement_search_index, sender=self)
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+Duyuru ekleri: içerik adresli saklama ve önizlemeler
+
+Yüklenen dosya parça parça özetlenip paylaşımlı depoya yazılır; depoda aynı
+içerik varsa yeniden yazılmaz. Küçük resim önizlemeleri istek içinde değil,
+generate_attachment_previews görevinde üretilir ve aynı içerikli ekler
+arasında paylaşılır.
+"""
+import io
+import logging
+import mimetypes
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from core.models import UploadSession
+from core.storage import get_blob_storage, hash_file, local_blob_path, put_blob
+
+from .models import AnnouncementFile
+
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_MAX_SIZE = getattr(settings, 'ATTACHMENT_MAX_SIZE', 100 * 1024 * 1024)
+PREVIEW_SIZE = (480, 480)
+PREVIEW_QUALITY = 80
+PDF_RENDER_TIMEOUT = 30  # saniye
+
+
+def _content_type(file_name, declared=None):
+    return mimetypes.guess_type(file_name)[0] or declared or 'application/octet-stream'
+
+
+def _reuse_preview(attachment):
+    """Aynı içerikli başka bir ekin önizlemesi hazırsa onu kullanır"""
+    preview_key = (AnnouncementFile.objects
+                   .filter(sha256=attachment.sha256, preview_status='ready')
+                   .exclude(preview_key='')
+                   .values_list('preview_key', flat=True).first())
+    if preview_key:
+        attachment.preview_key = preview_key
+        attachment.preview_status = 'ready'
+
+
+def store_attachment(announcement, uploaded_file):
+    """
+    Yüklenen dosyayı depoya yazar ve duyuruya ekler
+
+    Raises:
+        ValueError: Dosya boyutu sınırı aşıyorsa
+    """
+    if uploaded_file.size > ATTACHMENT_MAX_SIZE:
+        raise ValueError(f"{uploaded_file.name}: dosya boyutu izin verilen sınırı aşıyor.")
+    sha256 = hash_file(uploaded_file)
+    key, _created = put_blob(uploaded_file, sha256=sha256)
+    attachment = AnnouncementFile(
+        announcement=announcement,
+        file_name=os.path.basename(uploaded_file.name)[:255],
+        blob_key=key,
+        sha256=sha256,
+        size=uploaded_file.size,
+        content_type=_content_type(uploaded_file.name, getattr(uploaded_file, 'content_type', None)),
+    )
+    _reuse_preview(attachment)
+    attachment.save()
+    return attachment
+
+
+def attach_upload_session(announcement, user, upload_key):
+    """
+    Parçalı yüklemeyle (core.UploadSession) depoya yazılmış dosyayı duyuruya ekler
+
+    Yalnızca kullanıcının kendi tamamladığı oturumun anahtarı kabul edilir.
+
+    Raises:
+        ValueError: Oturum bulunamazsa
+    """
+    session = UploadSession.objects.filter(user=user, blob_key=upload_key, status='complete').first()
+    if session is None:
+        raise ValueError('Yüklenen dosya bulunamadı.')
+    attachment = AnnouncementFile(
+        announcement=announcement,
+        file_name=session.file_name,
+        blob_key=session.blob_key,
+        sha256=session.blob_key.rsplit('/', 1)[-1],
+        size=session.size,
+        content_type=_content_type(session.file_name),
+    )
+    _reuse_preview(attachment)
+    attachment.save()
+    return attachment
+
+
+def save_attachments(request, announcement):
+    """
+    İstekteki dosyaları ve parçalı yükleme anahtarlarını duyuruya ekler
+
+    Önizlemesi olmayan ekler için işlem tamamlanınca arka plan görevi başlatılır.
+
+    Returns:
+        tuple: (eklenen dosyalar, hata mesajları)
+    """
+    attachments, errors = [], []
+    uploaded = request.FILES.getlist('files') + request.FILES.getlist('file')
+    for uploaded_file in uploaded:
+        try:
+            attachments.append(store_attachment(announcement, uploaded_file))
+        except ValueError as e:
+            errors.append(str(e))
+    for upload_key in request.POST.getlist('upload_key'):
+        try:
+            attachments.append(attach_upload_session(announcement, request.user, upload_key))
+        except ValueError as e:
+            errors.append(str(e))
+
+    pending = [attachment.pk for attachment in attachments if attachment.preview_status == 'pending']
+    if pending:
+        from .tasks import generate_attachment_previews
+        transaction.on_commit(lambda: generate_attachment_previews.delay(pending))
+    return attachments, errors
+
+
+# Önizlemeler
+
+def _thumbnail(image):
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(PREVIEW_SIZE)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+    output = io.BytesIO()
+    image.save(output, 'JPEG', quality=PREVIEW_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+def _image_preview(path):
+    with Image.open(path) as image:
+        # JPEG'ler küçültülerek çözülür; büyük fotoğraflarda belleği ve süreyi azaltır
+        image.draft('RGB', PREVIEW_SIZE)
+        return _thumbnail(image)
+
+
+def _pdf_preview(path):
+    """İlk sayfanın önizlemesi; pdftoppm (poppler-utils) kurulu değilse None"""
+    pdftoppm = shutil.which('pdftoppm')
+    if not pdftoppm:
+        return None
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'page')
+        subprocess.run(
+            [pdftoppm, '-f', '1', '-l', '1', '-singlefile', '-png',
+             '-scale-to', str(max(PREVIEW_SIZE)), path, output],
+            check=True, timeout=PDF_RENDER_TIMEOUT, capture_output=True,
+        )
+        with Image.open(output + '.png') as image:
+            return _thumbnail(image)
+
+
+def render_preview(key, content_type):
+    """
+    Depodaki dosyanın JPEG küçük resmi
+
+    Returns:
+        bytes ya da None: Tür desteklenmiyorsa None
+    """
+    if content_type.startswith('image/'):
+        renderer = _image_preview
+    elif content_type == 'application/pdf':
+        renderer = _pdf_preview
+    else:
+        return None
+    with local_blob_path(key, suffix=mimetypes.guess_extension(content_type) or '') as path:
+        return renderer(path)
+
+
+def generate_preview(sha256):
+    """
+    Aynı içerikli tüm ekler için önizlemeyi bir kez üretir
+
+    Returns:
+        str: Önizleme durumu
+    """
+    attachment = (AnnouncementFile.objects.filter(sha256=sha256).exclude(blob_key='')
+                  .order_by('pk').first())
+    if attachment is None:
+        return 'failed'
+    siblings = AnnouncementFile.objects.filter(sha256=sha256)
+
+    ready = siblings.filter(preview_status='ready').exclude(preview_key='').values_list('preview_key', flat=True).first()
+    if ready:
+        siblings.exclude(preview_status='ready').update(preview_key=ready, preview_status='ready')
+        return 'ready'
+
+    if not get_blob_storage().exists(attachment.blob_key):
+        logger.error("Ek dosyası depoda bulunamadı: %s", attachment.blob_key)
+        siblings.update(preview_status='failed')
+        return 'failed'
+
+    try:
+        data = render_preview(attachment.blob_key, attachment.content_type)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError,
+            subprocess.SubprocessError) as e:
+        logger.warning("Önizleme üretilemedi (%s): %s", attachment.file_name, e)
+        siblings.update(preview_status='failed')
+        return 'failed'
+
+    if data is None:
+        siblings.update(preview_status='unsupported')
+        return 'unsupported'
+
+    preview_key, _created = put_blob(io.BytesIO(data))
+    siblings.update(preview_key=preview_key, preview_status='ready')
+    return 'ready'
@@ -0,0 +1,142 @@
+"""
+Etiket süzmesi ve etiket sayıları (facet)
+
+Her duyurunun etiket id'leri Announcement.tag_key alanında ",3,7,12,"
+biçiminde tutulur; etiket süzmesi çoktan çoğa tabloya JOIN ve DISTINCT
+gerektirmeden bu alan üzerinden yapılır (AnnouncementQuerySet.with_tags).
+Etiket başına duruma ve türe göre duyuru sayıları TagFacet tablosundadır.
+
+İkisi de etiketler, duyuru durumu/türü değiştikçe signals.py tarafından
+güncellenir. Mevcut veriler için: python manage.py rebuild_tag_facets
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from core.cache import cache_for_models
+
+from .models import Announcement, Tag, TagFacet
+
+
+TagLink = Announcement.tags.through
+
+
+def make_tag_key(tag_ids):
+    return ',' + ''.join(f'{tag_id},' for tag_id in sorted(set(tag_ids)))
+
+
+def parse_tag_key(tag_key):
+    return [int(tag_id) for tag_id in (tag_key or '').split(',') if tag_id]
+
+
+def refresh_tag_keys(announcement_ids):
+    """
+    Duyuruların tag_key alanını çoktan çoğa tablodan yeniden yazar
+
+    Returns:
+        dict: {duyuru id: tag_key}
+    """
+    tag_ids = {pk: [] for pk in announcement_ids}
+    if not tag_ids:
+        return {}
+    links = TagLink.objects.filter(announcement_id__in=tag_ids).values_list('announcement_id', 'tag_id')
+    for announcement_id, tag_id in links:
+        tag_ids[announcement_id].append(tag_id)
+    keys = {pk: make_tag_key(ids) for pk, ids in tag_ids.items()}
+    Announcement.objects.bulk_update(
+        [Announcement(pk=pk, tag_key=key) for pk, key in keys.items()], ['tag_key'], batch_size=500,
+    )
+    return keys
+
+
+def refresh_tag_facets(tag_ids):
+    """Etiketlerin duruma ve türe göre sayılarını yeniden hesaplar"""
+    tag_ids = sorted(set(tag_ids))
+    if not tag_ids:
+        return
+    with transaction.atomic():
+        # Aynı etiketler için eşzamanlı yeniden hesaplamalar sıraya girer
+        list(Tag.objects.select_for_update().filter(pk__in=tag_ids).order_by('pk').values_list('pk', flat=True))
+        rows = (TagLink.objects.filter(tag_id__in=tag_ids)
+                .values('tag_id', 'announcement__status', 'announcement__announcement_type')
+                .annotate(count=Count('pk'))
+                .order_by())
+        TagFacet.objects.filter(tag_id__in=tag_ids).delete()
+        TagFacet.objects.bulk_create([
+            TagFacet(
+                tag_id=row['tag_id'],
+                status=row['announcement__status'],
+                announcement_type=row['announcement__announcement_type'],
+                count=row['count'],
+            )
+            for row in rows
+        ])
+
+
+def tags_changed(announcement_ids, tag_ids):
+    """
+    Etiket ilişkileri değişen duyuruların anahtarlarını ve etiket sayılarını günceller
+
+    Returns:
+        dict: {duyuru id: tag_key}
+    """
+    keys = refresh_tag_keys(announcement_ids)
+    refresh_tag_facets(tag_ids)
+    return keys
+
+
+def announcements_changed(announcement_ids):
+    """Durumu ya da türü değişen duyuruların etiketlerinin sayılarını günceller"""
+    tag_ids = set()
+    for tag_key in Announcement.objects.filter(pk__in=announcement_ids).values_list('tag_key', flat=True):
+        tag_ids.update(parse_tag_key(tag_key))
+    refresh_tag_facets(tag_ids)
+
+
+def rebuild_tag_facets():
+    """
+    Tüm duyuruların tag_key alanını ve tüm etiket sayılarını yeniden oluşturur
+
+    Returns:
+        tuple: (duyuru sayısı, etiket sayısı)
+    """
+    tag_ids = defaultdict(list)
+    for announcement_id, tag_id in TagLink.objects.values_list('announcement_id', 'tag_id').iterator():
+        tag_ids[announcement_id].append(tag_id)
+
+    announcements = []
+    for pk, tag_key in Announcement.objects.values_list('pk', 'tag_key').iterator():
+        key = make_tag_key(tag_ids.get(pk, ()))
+        if key != tag_key:
+            announcements.append(Announcement(pk=pk, tag_key=key))
+    Announcement.objects.bulk_update(announcements, ['tag_key'], batch_size=500)
+
+    all_tags = list(Tag.objects.values_list('pk', flat=True))
+    refresh_tag_facets(all_tags)
+    return len(announcements), len(all_tags)
+
+
+@cache_for_models(TagFacet, Tag)
+def tag_facets(status=None, announcement_type=None):
+    """
+    Etiketler ve duyuru sayıları; sayısı sıfır olan etiketler dönmez
+
+    Args:
+        status (str, optional): Yalnızca bu durumdaki duyurular
+        announcement_type (str, optional): Yalnızca bu türdeki duyurular
+
+    Returns:
+        list: [{'id', 'name', 'count'}], ada göre sıralı
+    """
+    queryset = TagFacet.objects.filter(count__gt=0)
+    if status:
+        queryset = queryset.filter(status=status)
+    if announcement_type:
+        queryset = queryset.filter(announcement_type=announcement_type)
+    return [
+        {'id': row['tag_id'], 'name': row['tag__name'], 'count': row['total']}
+        for row in (queryset.values('tag_id', 'tag__name')
+                    .annotate(total=Sum('count'))
+                    .order_by('tag__name'))
+    ]
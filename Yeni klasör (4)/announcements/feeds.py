@@ -0,0 +1,222 @@
+"""
+Yayındaki duyuruların RSS, Atom ve JSON akışları
+
+Akışlar önceden oluşturulup önbellekte saklanır. Önbellek anahtarı ve ETag,
+Announcement ve Tag model sürümlerinden (core.cache) türetilir; bir duyuru
+değişince sürüm artar ve eski kayıtlar kendiliğinden geçersiz olur.
+If-None-Match ile gelen yoklamalar veritabanına hiç gidilmeden 304 alır.
+
+Betikler oturum yerine settings.ANNOUNCEMENT_FEEDS['TOKEN'] ile erişmelidir;
+oturum doğrulaması her istekte oturum ve kullanıcı sorgusu gerektirir.
+"""
+import hmac
+import json
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.urls import reverse
+from django.utils import feedgenerator, timezone
+from django.utils.http import http_date, quote_etag
+
+from core.cache import versioned_key
+from core.text import html_to_text
+
+from .models import Announcement, Tag
+
+
+DEFAULTS = {
+    'SIZE': 50,
+    'TIMEOUT': 24 * 60 * 60,
+    'TOKEN': None,
+}
+
+FEED_MODELS = (Announcement, Tag)
+FEED_FILTERS = ('type', 'product', 'tag')
+FEED_TITLE = 'Duyurular'
+
+JSON_FEED_CONTENT_TYPE = 'application/feed+json; charset=utf-8'
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'ANNOUNCEMENT_FEEDS', {}))
+    return config
+
+
+def token_allowed(request, token):
+    """Authorization: Bearer <token> başlığı ya da ?token= parametresi"""
+    if not token:
+        return False
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header.startswith('Bearer '):
+        supplied = header[len('Bearer '):]
+    else:
+        supplied = request.GET.get('token', '')
+    return hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def absolute_url(path):
+    return f"{settings.SITE_URL.rstrip('/')}{path}"
+
+
+def feed_filters(params):
+    """
+    İstekteki filtreleri doğrular
+
+    Returns:
+        dict: Boş olmayan filtreler
+
+    Raises:
+        ValueError: Geçersiz duyuru türü
+    """
+    filters = {name: params.get(name, '').strip() for name in FEED_FILTERS}
+    filters = {name: value for name, value in filters.items() if value}
+    if 'type' in filters and filters['type'] not in dict(Announcement.TYPE_CHOICES):
+        raise ValueError(f"Geçersiz duyuru türü: {filters['type']}")
+    return filters
+
+
+def feed_key(feed_format, filters):
+    """Akışın önbellek anahtarı; sürümler anahtarın içinde olduğundan ETag olarak da kullanılır"""
+    return versioned_key('announcement_feed', FEED_MODELS, feed_format,
+                         *(f"{name}={filters[name]}" for name in sorted(filters)))
+
+
+def feed_etag(key):
+    return quote_etag(key.rsplit(':', 1)[-1])
+
+
+def feed_announcements(filters):
+    queryset = (Announcement.objects.filter(status='published')
+                .select_related('author').prefetch_related('tags')
+                .order_by('-start_date', '-pk'))
+    if 'type' in filters:
+        queryset = queryset.filter(announcement_type=filters['type'])
+    if 'product' in filters:
+        queryset = queryset.filter(product__iexact=filters['product'])
+    if 'tag' in filters:
+        queryset = queryset.filter(tags__name__iexact=filters['tag'])
+    return list(queryset[:get_config()['SIZE']])
+
+
+def _feed_title(filters):
+    parts = [FEED_TITLE]
+    if 'type' in filters:
+        parts.append(dict(Announcement.TYPE_CHOICES)[filters['type']])
+    if 'product' in filters:
+        parts.append(filters['product'])
+    if 'tag' in filters:
+        parts.append(f"#{filters['tag']}")
+    return ' - '.join(parts)
+
+
+def _categories(announcement):
+    return [announcement.get_announcement_type_display(), announcement.product,
+            *(tag.name for tag in announcement.tags.all())]
+
+
+def _author_name(announcement):
+    return announcement.author.get_full_name() or announcement.author.username
+
+
+def _render_syndication(feed_class, announcements, filters, feed_url):
+    feed = feed_class(
+        title=_feed_title(filters),
+        link=absolute_url(reverse('announcement_list')),
+        description='Yayındaki duyurular, planlı çalışmalar ve bilgilendirmeler',
+        language='tr',
+        feed_url=feed_url,
+    )
+    for announcement in announcements:
+        url = absolute_url(announcement.get_absolute_url())
+        feed.add_item(
+            title=announcement.title,
+            link=url,
+            description=announcement.content,
+            unique_id=url,
+            pubdate=announcement.start_date,
+            updateddate=announcement.updated_at,
+            author_name=_author_name(announcement),
+            categories=_categories(announcement),
+        )
+    return feed.writeString('utf-8').encode('utf-8'), feed.content_type
+
+
+def _render_json(announcements, filters, feed_url):
+    items = []
+    for announcement in announcements:
+        url = absolute_url(announcement.get_absolute_url())
+        items.append({
+            'id': url,
+            'url': url,
+            'title': announcement.title,
+            'content_html': announcement.content,
+            'summary': html_to_text(announcement.content)[:300],
+            'date_published': announcement.start_date.isoformat(),
+            'date_modified': announcement.updated_at.isoformat(),
+            'authors': [{'name': _author_name(announcement)}],
+            'tags': _categories(announcement),
+            '_announcement': {
+                'type': announcement.announcement_type,
+                'priority': announcement.priority,
+                'product': announcement.product,
+                'pinned': announcement.pinned,
+                'end_date': announcement.end_date.isoformat(),
+            },
+        })
+    feed = {
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': _feed_title(filters),
+        'home_page_url': absolute_url(reverse('announcement_list')),
+        'feed_url': feed_url,
+        'language': 'tr',
+        'items': items,
+    }
+    return json.dumps(feed, ensure_ascii=False).encode('utf-8'), JSON_FEED_CONTENT_TYPE
+
+
+FEED_FORMATS = {
+    'rss': partial(_render_syndication, feedgenerator.Rss201rev2Feed),
+    'atom': partial(_render_syndication, feedgenerator.Atom1Feed),
+    'json': _render_json,
+}
+
+
+def build_feed(feed_format, filters, feed_url):
+    """
+    Akışı veritabanından oluşturur
+
+    Returns:
+        dict: body, content_type ve last_modified (zaman damgası)
+    """
+    announcements = feed_announcements(filters)
+    body, content_type = FEED_FORMATS[feed_format](announcements, filters, feed_url)
+    # Akıştan çıkarılan duyurular da içeriği değiştirdiğinden öğelerin en son
+    # güncellenme zamanı değil, oluşturulma anı kullanılır
+    return {
+        'body': body,
+        'content_type': content_type,
+        'last_modified': int(timezone.now().timestamp()),
+    }
+
+
+def get_feed(feed_format, filters, feed_url, key=None):
+    """Akışı önbellekten döndürür; yoksa oluşturup saklar"""
+    cache = caches['default']
+    key = key or feed_key(feed_format, filters)
+    entry = cache.get(key)
+    if entry is None:
+        entry = build_feed(feed_format, filters, feed_url)
+        cache.set(key, entry, get_config()['TIMEOUT'])
+    return entry
+
+
+def feed_headers(etag, last_modified):
+    return {
+        'ETag': etag,
+        'Last-Modified': http_date(last_modified),
+        # İstemci her yoklamada doğrular; yanıt çoğunlukla gövdesiz 304 olur
+        'Cache-Control': 'private, no-cache',
+        'Vary': 'Cookie, Authorization',
+    }
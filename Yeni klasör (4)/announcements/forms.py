@@ -64,11 +64,17 @@ class AnnouncementFilterForm(forms.Form):
     FILTER_STATUS_CHOICES = (
         ('', 'Tüm Durumlar'),
     ) + Announcement.STATUS_CHOICES
+
+    TAG_MATCH_CHOICES = (
+        ('any', 'Etiketlerden herhangi biri'),
+        ('all', 'Etiketlerin tümü'),
+    )
     
-    title = forms.CharField(
+    q = forms.CharField(
         required=False,
-        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Başlık ara...'}),
-        label='Başlık'
+        widget=forms.TextInput(attrs={'class': 'form-control',
+                                      'placeholder': 'Başlık, içerik, ürün veya etiket ara...'}),
+        label='Arama'
     )
     announcement_type = forms.ChoiceField(
         choices=FILTER_TYPE_CHOICES,
@@ -99,6 +105,12 @@ class AnnouncementFilterForm(forms.Form):
         widget=forms.SelectMultiple(attrs={'class': 'form-select'}),
         label='Etiketler'
     )
+    tag_match = forms.ChoiceField(
+        choices=TAG_MATCH_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select form-select-sm mt-2'}),
+        label='Etiket Eşleşmesi'
+    )
     date_from = forms.DateField(
         required=False,
         widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
@@ -110,6 +122,27 @@ class AnnouncementFilterForm(forms.Form):
         label='Bitiş Tarihi'
     )
 
+    def filter_tags(self, queryset):
+        """Seçili etiketlere göre süzer (AnnouncementQuerySet.with_tags)"""
+        tags = self.cleaned_data.get('tags')
+        if not tags:
+            return queryset
+        return queryset.with_tags([tag.pk for tag in tags],
+                                  match_all=self.cleaned_data.get('tag_match') == 'all')
+
+    def set_tag_facets(self, facets):
+        """
+        Etiket seçeneklerini "etiket (N)" biçiminde duyuru sayılarıyla gösterir
+
+        Tüm etiketler yerine yalnızca duyurusu olan etiketler (facets.tag_facets)
+        ve seçili etiketler listelenir.
+        """
+        choices = [(facet['id'], f"{facet['name']} ({facet['count']})") for facet in facets]
+        shown = {facet['id'] for facet in facets}
+        selected = self.cleaned_data.get('tags') if self.is_valid() else None
+        choices += [(tag.pk, f"{tag.name} (0)") for tag in selected or () if tag.pk not in shown]
+        self.fields['tags'].widget.choices = choices
+
 
 class TagForm(forms.ModelForm):
     """Etiket oluşturma ve düzenleme formu"""
@@ -121,9 +154,27 @@ class TagForm(forms.ModelForm):
         }
 
 
+class MultipleFileInput(forms.ClearableFileInput):
+    """Birden fazla dosya seçilebilen dosya girişi"""
+    allow_multiple_selected = True
+
+
+class MultipleFileField(forms.FileField):
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('widget', MultipleFileInput())
+        super().__init__(*args, **kwargs)
+
+    def clean(self, data, initial=None):
+        single_file_clean = super().clean
+        if isinstance(data, (list, tuple)):
+            return [single_file_clean(d, initial) for d in data]
+        return single_file_clean(data, initial)
+
+
 class AnnouncementFileForm(forms.Form):
     """Duyuruya dosya ekleme formu"""
-    file = forms.FileField(
-        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'multiple': True}),
-        label='Dosya'
-    )
\ No newline at end of file
+    files = MultipleFileField(
+        widget=MultipleFileInput(attrs={'class': 'form-control'}),
+        label='Dosya',
+        required=False
+    )
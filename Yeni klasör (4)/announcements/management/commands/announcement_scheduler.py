@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from announcements.scheduler import AnnouncementScheduler, apply_due_transitions
+
+
+class Command(BaseCommand):
+    help = 'Duyuruları yayın ve bitiş anlarında yayınlayan/arşivleyen zamanlayıcıyı çalıştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Yeni kaydedilen duyuruların denetlenme aralığı (saniye)')
+        parser.add_argument('--once', action='store_true',
+                            help='Zamanı gelmiş geçişleri uygulayıp çıkar')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            published, archived = apply_due_transitions()
+            self.stdout.write(self.style.SUCCESS(f'{published} duyuru yayınlandı, {archived} duyuru arşivlendi.'))
+            return
+
+        self.stdout.write('Duyuru zamanlayıcısı başlatıldı.')
+        AnnouncementScheduler(poll_interval=options['poll_interval']).run_forever()
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from announcements.tasks import compact_announcement_history
+
+
+class Command(BaseCommand):
+    help = 'Eski duyuru geçmişi kayıtlarını siler ve gün başına bire indirir'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--compact-after-days', type=int, default=None,
+                            help='Bu günden eski değişiklik kayıtları gün başına bire indirilir')
+        parser.add_argument('--retention-days', type=int, default=None,
+                            help='Bu günden eski kayıtlar silinir (0: silme)')
+
+    def handle(self, *args, **options):
+        pruned, compacted = compact_announcement_history(
+            compact_after_days=options['compact_after_days'],
+            retention_days=options['retention_days'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{pruned} eski kayıt silindi, {compacted} kayıt birleştirildi.'
+        ))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from announcements.search import ensure_announcement_search_index, rebuild_announcement_search_index
+
+
+class Command(BaseCommand):
+    help = 'Duyuru arama indeksini (FTS5 / tsvector) oluşturur ve arşiv dahil tüm duyurularla doldurur'
+
+    def handle(self, *args, **options):
+        ensure_announcement_search_index()
+        count = rebuild_announcement_search_index()
+        self.stdout.write(self.style.SUCCESS(f'{count} duyuru arama indeksine eklendi.'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from announcements.facets import rebuild_tag_facets
+
+
+class Command(BaseCommand):
+    help = 'Duyuruların etiket anahtarlarını (tag_key) ve etiket sayılarını yeniden oluşturur'
+
+    def handle(self, *args, **options):
+        announcements, tags = rebuild_tag_facets()
+        self.stdout.write(self.style.SUCCESS(
+            f'{announcements} duyurunun etiket anahtarı güncellendi, {tags} etiketin sayıları hesaplandı.'
+        ))
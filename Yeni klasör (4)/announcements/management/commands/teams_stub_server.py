@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from announcements.teams_stub import TeamsStubServer
+
+
+class Command(BaseCommand):
+    help = 'Teams webhook yerine kartları kaydeden yerel bir sunucu çalıştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--rate-limit', type=int, default=None,
+                            help='rate-period içinde kabul edilecek en fazla istek; aşılınca 429 döner')
+        parser.add_argument('--rate-period', type=float, default=60)
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='Rastgele 500 döndürme oranı (0-1)')
+        parser.add_argument('--delay', type=float, default=0.0,
+                            help='Yanıt gecikmesi (saniye)')
+
+    def handle(self, *args, **options):
+        server = TeamsStubServer(
+            host=options['host'], port=options['port'],
+            rate_limit=options['rate_limit'], rate_period=options['rate_period'],
+            error_rate=options['error_rate'], delay=options['delay'], verbose=True,
+        )
+        self.stdout.write(f'Teams stub sunucusu dinleniyor: {server.url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stdout.write(f'{len(server.received)} kart alındı; yanıtlar: {server.responses}')
@@ -1,11 +1,138 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, RowNumber
 from django.contrib.auth import get_user_model
+from django.dispatch import Signal
 from django.urls import reverse
+from django.utils import timezone
 from ckeditor.fields import RichTextField
-from simple_history.models import HistoricalRecords
+
+from core.cache import VersionedQuerySet
+from core.history import DEFAULT_EXCLUDE, CompactHistory
+from core.models import AbstractRevision
 
 User = get_user_model()
 
+# Toplu durum geçişinden sonra bir kez gönderilir (post_save yerine).
+# Argümanlar: status (yeni durum), previous (pk -> eski durum), user
+announcements_transitioned = Signal()
+
+
+class AnnouncementQuerySet(VersionedQuerySet):
+    HISTORY_BATCH_SIZE = 500
+
+    def for_display(self):
+        """
+        Liste kartları için: yazar, etiketler ve ek sayısı sorgu sayısı sayfadaki
+        duyuru sayısıyla artmadan yüklenir (duyurular, etiketler: iki sorgu)
+        """
+        attachments = (self.model._meta.get_field('files').related_model.objects
+                       .filter(announcement=models.OuterRef('pk'))
+                       .order_by().values('announcement')
+                       .annotate(count=models.Count('pk')).values('count'))
+        return (self.select_related('author')
+                .prefetch_related('tags')
+                .annotate(file_count=Coalesce(models.Subquery(attachments), 0)))
+
+    def dashboard_lists(self, limit=5):
+        """
+        Yayındaki sabitlenmiş ve son duyurular tek sorguda
+
+        Her grubun en yeni limit kaydı pencere fonksiyonuyla seçilir.
+
+        Returns:
+            tuple: (sabitlenmiş, son duyurular)
+        """
+        rows = list(
+            self.filter(status='published')
+            .select_related('author')
+            .annotate(position=models.Window(
+                RowNumber(), partition_by=[models.F('pinned')], order_by=models.F('created_at').desc(),
+            ))
+            .filter(position__lte=limit)
+            .order_by('-created_at')
+        )
+        return [row for row in rows if row.pinned], [row for row in rows if not row.pinned]
+
+    def with_tags(self, tag_ids, match_all=False):
+        """
+        Etiketlere göre süzer; çoktan çoğa tabloya JOIN ve DISTINCT gerekmez
+
+        Args:
+            tag_ids (iterable): Etiket id'leri
+            match_all (bool): True ise tüm etiketleri (VE), değilse herhangi
+                birini (VEYA) taşıyan duyurular
+        """
+        conditions = [models.Q(tag_key__contains=f",{tag_id},") for tag_id in sorted(set(tag_ids))]
+        if not conditions:
+            return self
+        if match_all:
+            return self.filter(*conditions)
+        query = conditions.pop()
+        for condition in conditions:
+            query |= condition
+        return self.filter(query)
+
+    def due_for_publish(self, now=None):
+        """Başlangıç anı gelmiş, henüz yayınlanmamış zamanlanmış duyurular"""
+        now = now or timezone.now()
+        return self.filter(status='scheduled', start_date__lte=now, end_date__gt=now)
+
+    def expired(self, now=None):
+        """Bitiş anı gelmiş, hâlâ yayında ya da zamanlanmış duyurular"""
+        return self.filter(status__in=Announcement.LIVE_STATUSES, end_date__lte=now or timezone.now())
+
+    def archive(self, user=None, reason=None):
+        """Eşleşen duyuruları tek UPDATE ile arşivler; arşivlenen sayıyı döndürür"""
+        return self.transition('archived', user=user, reason=reason)
+
+    def publish(self, user=None, reason=None):
+        """Eşleşen duyuruları tek UPDATE ile yayınlar; yayınlanan sayıyı döndürür"""
+        return self.transition('published', user=user, reason=reason)
+
+    def transition(self, status, user=None, reason=None):
+        """
+        Eşleşen duyuruların durumunu toplu olarak değiştirir
+
+        save() çağrılmaz: durum tek UPDATE ile değişir, geçmiş kayıtları tek
+        bulk_create ile yazılır ve post_save yerine announcements_transitioned
+        sinyali bir kez gönderilir. Zaten bu durumdaki duyurular atlanır.
+
+        Returns:
+            int: Durumu değişen duyuru sayısı
+        """
+        now = timezone.now()
+
+        with transaction.atomic(using=self.db):
+            rows = list(
+                self.exclude(status=status)
+                .select_for_update()
+                .order_by()
+                .values('id', 'status')
+            )
+            if not rows:
+                return 0
+
+            pks = [row['id'] for row in rows]
+            changes = {'status': status, 'updated_at': now}
+            if status == 'published':
+                changes['published_at'] = Coalesce('published_at', models.Value(now))
+            self.model._default_manager.using(self.db).filter(pk__in=pks).update(**changes)
+            # Geçmişe yalnızca durum değişikliği yazılır
+            announcement_history.bulk_record(
+                rows, {'status': status}, user=user, reason=reason, date=now,
+                batch_size=self.HISTORY_BATCH_SIZE,
+            )
+
+            previous = {row['id']: row['status'] for row in rows}
+            transaction.on_commit(
+                lambda: announcements_transitioned.send(
+                    sender=self.model, status=status, previous=previous, user=user,
+                ),
+                using=self.db,
+            )
+        return len(rows)
+
+
 class Announcement(models.Model):
     """Duyurular, Planlı Çalışmalar ve Bilgilendirmeler için model"""
     
@@ -27,9 +154,12 @@ class Announcement(models.Model):
     # Durum seçenekleri
     STATUS_CHOICES = (
         ('draft', 'Taslak'),
+        ('scheduled', 'Zamanlanmış'),
         ('published', 'Yayında'),
         ('archived', 'Arşiv'),
     )
+    # Yayın tarihleri durumu belirleyen, zamanlayıcının izlediği durumlar
+    LIVE_STATUSES = ('scheduled', 'published')
     
     title = models.CharField(max_length=255, verbose_name='Başlık')
     content = RichTextField(verbose_name='İçerik')
@@ -49,6 +179,8 @@ class Announcement(models.Model):
     start_date = models.DateTimeField(verbose_name='Yayın Başlangıç Tarihi')
     end_date = models.DateTimeField(verbose_name='Yayın Bitiş Tarihi')
     pinned = models.BooleanField(default=False, verbose_name='Sabitlenmiş')
+    # İlk yayın anı; okundu takibinde (reads.py) okunmamışları ayırır
+    published_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name='Yayınlanma Tarihi')
     status = models.CharField(
         max_length=10, 
         choices=STATUS_CHOICES, 
@@ -66,17 +198,61 @@ class Announcement(models.Model):
     
     # Etiketler için ManyToMany ilişkisi
     tags = models.ManyToManyField('Tag', blank=True, related_name='announcements', verbose_name='Etiketler')
+    # Etiket id'lerinin sıralı kopyası (",3,7,12,"); etiket süzmesi JOIN'siz
+    # yapılır. m2m_changed ile güncellenir (announcements/facets.py)
+    tag_key = models.TextField(blank=True, default=',', editable=False, verbose_name='Etiket Anahtarı')
     
-    # Tarihçe kaydı
-    history = HistoricalRecords()
+    objects = AnnouncementQuerySet.as_manager()
     
     class Meta:
         verbose_name = 'Duyuru'
         verbose_name_plural = 'Duyurular'
         ordering = ['-pinned', '-created_at']
+        indexes = [
+            # Okuma yolları yalnızca duruma göre süzer ve bu sırayla listeler
+            models.Index(fields=['status', '-pinned', '-created_at'], name='announcement_status_idx'),
+            # Zamanlayıcının yayın ve bitiş anlarını okuduğu sorgular
+            models.Index(fields=['status', 'start_date'], name='announcement_status_start_idx'),
+            models.Index(fields=['status', 'end_date'], name='announcement_status_end_idx'),
+            models.Index(fields=['updated_at'], name='announcement_updated_idx'),
+        ]
     
     def __str__(self):
         return self.title
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kayıttan sonra durumun neyden değiştiğini bilmek için (bildirimler)
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_type = instance.__dict__.get('announcement_type')
+        # Geçmişe yalnızca değişen alanları yazmak için
+        announcement_history.remember(instance, dict(zip(field_names, values)))
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.status = self.scheduled_status()
+        if self.status == 'published' and self.published_at is None:
+            self.published_at = timezone.now()
+        created = self._state.adding
+        super().save(*args, **kwargs)
+        announcement_history.record(self, created=created)
+        self._loaded_status = self.status
+        self._loaded_type = self.announcement_type
+
+    def scheduled_status(self, now=None):
+        """
+        Yayın tarihlerine göre olması gereken durum
+
+        Yayınlanmak istenen duyuru başlangıç anına kadar 'scheduled', bitiş
+        anından sonra 'archived' olur. Taslak ve arşiv durumları değişmez.
+        """
+        if self.status not in self.LIVE_STATUSES or not (self.start_date and self.end_date):
+            return self.status
+        now = now or timezone.now()
+        if self.end_date <= now:
+            return 'archived'
+        return 'scheduled' if self.start_date > now else 'published'
     
     def get_absolute_url(self):
         return reverse('announcement_detail', kwargs={'pk': self.pk})
@@ -97,7 +273,7 @@ class Announcement(models.Model):
         self.save()
     
     def publish(self):
-        """Duyuruyu yayınlar"""
+        """Duyuruyu yayınlar; başlangıç tarihi gelecekteyse zamanlanır"""
         self.status = 'published'
         self.save()
 
@@ -115,16 +291,69 @@ class Tag(models.Model):
         return self.name
 
 
+class TagFacet(models.Model):
+    """
+    Etiket başına duruma ve türe göre duyuru sayıları
+
+    Filtre formundaki "etiket (N)" sayıları buradan okunur; etiketler ve
+    durumlar değiştikçe announcements/facets.py tarafından yeniden hesaplanır.
+    """
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='facets', verbose_name='Etiket')
+    status = models.CharField(max_length=10, choices=Announcement.STATUS_CHOICES, verbose_name='Durum')
+    announcement_type = models.CharField(max_length=20, choices=Announcement.TYPE_CHOICES, verbose_name='Duyuru Türü')
+    count = models.PositiveIntegerField(default=0, verbose_name='Duyuru Sayısı')
+
+    objects = VersionedQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Etiket Sayısı'
+        verbose_name_plural = 'Etiket Sayıları'
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'status', 'announcement_type'], name='tag_facet_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'announcement_type'], name='tag_facet_status_type_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tag_id} {self.status}/{self.announcement_type}: {self.count}"
+
+
 class AnnouncementFile(models.Model):
-    """Duyurulara eklenebilecek dosyalar"""
+    """
+    Duyurulara eklenebilecek dosyalar
+
+    İçerik paylaşımlı depoda SHA-256 özetiyle adreslenir (core/storage.py);
+    aynı dosya birden çok duyuruya eklense de bir kez saklanır. Önizlemeler
+    arka planda üretilir (generate_attachment_previews).
+    """
+    PREVIEW_STATUS_CHOICES = (
+        ('pending', 'Bekliyor'),
+        ('ready', 'Hazır'),
+        ('unsupported', 'Desteklenmiyor'),
+        ('failed', 'Başarısız'),
+    )
+
     announcement = models.ForeignKey(
         Announcement, 
         on_delete=models.CASCADE, 
         related_name='files',
         verbose_name='Duyuru'
     )
-    file = models.FileField(upload_to='announcements/', verbose_name='Dosya')
+    # Paylaşımlı depoya geçilmeden önce yüklenen dosyalar
+    file = models.FileField(upload_to='announcements/', blank=True, verbose_name='Dosya')
     file_name = models.CharField(max_length=255, verbose_name='Dosya Adı')
+    blob_key = models.CharField(max_length=255, blank=True, verbose_name='Depolama Anahtarı')
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True, verbose_name='SHA-256')
+    size = models.BigIntegerField(default=0, verbose_name='Boyut')
+    content_type = models.CharField(max_length=100, blank=True, verbose_name='İçerik Türü')
+    preview_key = models.CharField(max_length=255, blank=True, verbose_name='Önizleme Anahtarı')
+    preview_status = models.CharField(
+        max_length=12,
+        choices=PREVIEW_STATUS_CHOICES,
+        default='pending',
+        verbose_name='Önizleme Durumu'
+    )
     uploaded_at = models.DateTimeField(auto_now_add=True, verbose_name='Yüklenme Tarihi')
     
     class Meta:
@@ -133,4 +362,134 @@ class AnnouncementFile(models.Model):
         ordering = ['-uploaded_at']
     
     def __str__(self):
-        return self.file_name
\ No newline at end of file
+        return self.file_name
+
+    def get_absolute_url(self):
+        return reverse('file_download', kwargs={'pk': self.pk})
+
+    @property
+    def has_preview(self):
+        return self.preview_status == 'ready' and bool(self.preview_key)
+
+
+class TeamsNotification(models.Model):
+    """
+    Teams webhook'una gönderilecek duyuru bildirimleri (kalıcı kuyruk)
+
+    Bildirimler önce bu tabloya yazılır, dispatch_teams_notifications görevi
+    gönderir. Başarısız gönderimler artan bekleme süreleriyle yeniden denenir.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Bekliyor'),
+        ('sent', 'Gönderildi'),
+        ('failed', 'Başarısız'),
+    )
+
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.CASCADE,
+        related_name='teams_notifications',
+        verbose_name='Duyuru'
+    )
+    webhook_url = models.URLField(max_length=500, verbose_name='Webhook URL')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name='Durum')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Deneme Sayısı')
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name='Sonraki Deneme')
+    last_error = models.TextField(blank=True, verbose_name='Son Hata')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name='Gönderilme Tarihi')
+
+    class Meta:
+        verbose_name = 'Teams Bildirimi'
+        verbose_name_plural = 'Teams Bildirimleri'
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='teams_notification_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.announcement_id} ({self.get_status_display()})"
+
+
+class AnnouncementReadState(models.Model):
+    """
+    Kullanıcının okuduğu duyurular (announcements/reads.py)
+
+    Kullanıcı ve duyuru başına satır yerine kullanıcı başına tek satır tutulur:
+    high_water anına kadar yayınlanan duyuruların tümü okunmuştur; sonra
+    yayınlanıp okunanların id'leri bit haritasında (core/bitmaps.py) saklanır.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='announcement_read_state',
+        verbose_name='Kullanıcı'
+    )
+    high_water = models.DateTimeField(null=True, blank=True, verbose_name='Okunma Sınırı')
+    bitmap_base = models.PositiveIntegerField(default=0, verbose_name='Bit Haritası Başlangıcı')
+    bitmap = models.BinaryField(default=b'', verbose_name='Okunan Duyurular')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')
+
+    class Meta:
+        verbose_name = 'Duyuru Okunma Durumu'
+        verbose_name_plural = 'Duyuru Okunma Durumları'
+
+    def __str__(self):
+        return str(self.user)
+
+
+class AnnouncementReadCount(models.Model):
+    """
+    Duyuruyu okuyan kullanıcı sayısı
+
+    Okumalar tek tek kaydedilmez; sayaç F() ile artırılır. Duyuru tablosu
+    güncellenmediğinden okumalar duyuru önbelleklerini geçersiz kılmaz.
+    """
+    announcement = models.OneToOneField(
+        Announcement,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='read_count',
+        verbose_name='Duyuru'
+    )
+    count = models.PositiveIntegerField(default=0, verbose_name='Okuyan Sayısı')
+
+    class Meta:
+        verbose_name = 'Duyuru Okunma Sayısı'
+        verbose_name_plural = 'Duyuru Okunma Sayıları'
+
+    def __str__(self):
+        return f"{self.announcement_id}: {self.count}"
+
+
+class AnnouncementRevision(AbstractRevision):
+    """
+    Duyuru değişiklik geçmişi (core/history.py)
+
+    Yalnızca değişen alanların önceki değerleri tutulur; içerik sıkıştırılmış
+    fark olarak saklanır. Duyuru silinse de kayıtlar kalır.
+    """
+    announcement = models.ForeignKey(
+        Announcement,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='revisions',
+        verbose_name='Duyuru'
+    )
+    status = models.CharField(max_length=10, choices=Announcement.STATUS_CHOICES, verbose_name='Durum')
+
+    class Meta(AbstractRevision.Meta):
+        verbose_name = 'Duyuru Geçmişi'
+        verbose_name_plural = 'Duyuru Geçmişi'
+        indexes = [
+            models.Index(fields=['announcement', '-id'], name='announcement_revision_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.announcement_id} - {self.get_revision_type_display()} ({self.revision_date:%d.%m.%Y %H:%M})"
+
+
+announcement_history = CompactHistory(
+    AnnouncementRevision, 'announcement', text_fields=('content',), extra_fields=('status',),
+    exclude=DEFAULT_EXCLUDE + ('tag_key', 'published_at'),
+)
\ No newline at end of file
@@ -0,0 +1,435 @@
+"""
+Teams webhook bildirimleri
+
+Bildirimler TeamsNotification tablosuna yazılır (enqueue_notifications) ve
+dispatch_teams_notifications görevi tarafından gönderilir:
+
+- HTTP istekleri süreç başına tek bir bağlantı havuzlu oturumla, kısa bağlantı
+  ve okuma zaman aşımlarıyla yapılır.
+- Her webhook için RATE_LIMIT / RATE_PERIOD sınırı paylaşımlı önbellekte
+  sayılır; sınır dolunca görev beklemeden sonraya ertelenir.
+- Aynı webhook için bekleyen DIGEST_THRESHOLD ya da daha fazla bildirim tek bir
+  özet kartında gönderilir; toplu yayınlar Teams'i kısıtlamaya zorlamaz.
+- Başarısız gönderimler üstel bekleme süreleriyle MAX_ATTEMPTS kez denenir.
+
+Ayarlar TEAMS_NOTIFICATIONS sözlüğündedir.
+"""
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import TeamsNotification
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'WEBHOOK_URL': None,        # tanımlanmazsa TEAMS_WEBHOOK_URL kullanılır
+    'CONNECT_TIMEOUT': 3,       # saniye
+    'READ_TIMEOUT': 10,         # saniye
+    'POOL_SIZE': 10,            # webhook başına açık tutulacak bağlantı
+    'RATE_LIMIT': 4,            # RATE_PERIOD içinde webhook başına en fazla istek
+    'RATE_PERIOD': 60,          # saniye
+    'COALESCE_SECONDS': 10,     # gönderimden önce birikmesi beklenen süre
+    'DIGEST_THRESHOLD': 3,      # bu kadar bildirim birikirse tek özet kartı gönderilir
+    'DIGEST_MAX_ITEMS': 20,     # özet kartında listelenecek en fazla duyuru
+    'MAX_ATTEMPTS': 8,
+    'BACKOFF_BASE': 30,         # ilk yeniden deneme beklemesi (saniye), her denemede iki katı
+    'BACKOFF_MAX': 60 * 60,
+    'CACHE_ALIAS': 'default',
+    'CLAIM_TIMEOUT': 5 * 60,    # sahiplenilen bildirim bu süre içinde gönderilmezse yeniden denenir
+}
+
+PRIORITY_COLORS = {
+    'low': '808080',       # Gri
+    'medium': '0078D7',    # Mavi
+    'high': 'FFA500',      # Turuncu
+    'critical': 'FF0000',  # Kırmızı
+}
+
+TYPE_TITLES = {
+    'announcement': 'Duyuru',
+    'planned_work': 'Planlı Çalışma',
+    'information': 'Bilgilendirme',
+}
+
+DISPATCH_ETA_KEY = 'teams_notifications:dispatch_eta'
+
+_session_local = threading.local()
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'TEAMS_NOTIFICATIONS', {}))
+    config['WEBHOOK_URL'] = config['WEBHOOK_URL'] or getattr(settings, 'TEAMS_WEBHOOK_URL', None)
+    return config
+
+
+def get_session():
+    """Süreç ve iş parçacığı başına bağlantı havuzlu HTTP oturumu"""
+    session = getattr(_session_local, 'session', None)
+    if session is None or _session_local.pid != os.getpid():
+        config = get_config()
+        session = requests.Session()
+        # Yeniden denemeler kalıcı kuyrukta yapılır; burada denenmez
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config['POOL_SIZE'], max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Content-Type'] = 'application/json'
+        _session_local.session = session
+        _session_local.pid = os.getpid()
+    return session
+
+
+# Kuyruğa ekleme
+
+def enqueue_notifications(announcement_ids, webhook_url=None):
+    """
+    Duyurular için bekleyen bildirim kayıtları oluşturur ve gönderimi zamanlar
+
+    Aynı duyuru için zaten bekleyen bir bildirim varsa yenisi eklenmez.
+    İşlem (transaction) tamamlandıktan sonra gönderim görevi kuyruğa alınır.
+
+    Returns:
+        int: Eklenen bildirim sayısı
+    """
+    config = get_config()
+    webhook_url = webhook_url or config['WEBHOOK_URL']
+    if not webhook_url:
+        logger.warning("Teams webhook URL'si tanımlanmamış. Bildirim gönderilemiyor.")
+        return 0
+
+    ids = set(announcement_ids)
+    pending = set(TeamsNotification.objects.filter(
+        announcement_id__in=ids, webhook_url=webhook_url, status='pending',
+    ).values_list('announcement_id', flat=True))
+    now = timezone.now()
+    created = TeamsNotification.objects.bulk_create([
+        TeamsNotification(announcement_id=pk, webhook_url=webhook_url, next_attempt_at=now)
+        for pk in sorted(ids - pending)
+    ])
+    if created:
+        transaction.on_commit(lambda: schedule_dispatch(config['COALESCE_SECONDS']))
+    return len(created)
+
+
+def schedule_dispatch(countdown):
+    """
+    Gönderim görevini countdown saniye sonrasına kuyruğa alır
+
+    Daha erken ya da aynı zamana kurulmuş bir görev varsa yenisi eklenmez;
+    böylece art arda gelen kayıtlar tek gönderimde birleşir. Yarış durumunda
+    iki görev kurulması zararsızdır (satırlar SKIP LOCKED ile alınır).
+    """
+    from .tasks import dispatch_teams_notifications
+
+    cache = caches[get_config()['CACHE_ALIAS']]
+    countdown = max(int(countdown), 0)
+    eta = time.time() + countdown
+    scheduled = cache.get(DISPATCH_ETA_KEY)
+    if scheduled is not None and scheduled <= eta + 1:
+        return
+    cache.set(DISPATCH_ETA_KEY, eta, countdown + 60)
+    dispatch_teams_notifications.apply_async(countdown=countdown)
+
+
+def clear_scheduled_dispatch():
+    """Gönderim görevi başladığında çağrılır"""
+    caches[get_config()['CACHE_ALIAS']].delete(DISPATCH_ETA_KEY)
+
+
+# Hız sınırı
+
+def _rate_key(webhook_url, window):
+    digest = hashlib.md5(webhook_url.encode('utf-8')).hexdigest()[:16]
+    return f"teams_notifications:rate:{digest}:{window}"
+
+
+def acquire_rate_slot(webhook_url, config=None):
+    """
+    Webhook için bir istek hakkı alır
+
+    Returns:
+        float: 0 ise istek gönderilebilir; değilse bir sonraki pencereye kalan saniye
+    """
+    config = config or get_config()
+    cache = caches[config['CACHE_ALIAS']]
+    period = config['RATE_PERIOD']
+    now = time.time()
+    window = int(now // period)
+    key = _rate_key(webhook_url, window)
+    cache.add(key, 0, period * 2)
+    try:
+        used = cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, period * 2)
+        used = 1
+    if used <= config['RATE_LIMIT']:
+        return 0
+    return (window + 1) * period - now
+
+
+# Kartlar
+
+def _absolute_url(path):
+    return f"{settings.SITE_URL.rstrip('/')}{path}"
+
+
+def build_card(announcement):
+    """Tek duyuru için MessageCard"""
+    type_title = TYPE_TITLES.get(announcement.announcement_type, 'Duyuru')
+    content = announcement.content or ''
+    return {
+        "@type": "MessageCard",
+        "@context": "http://schema.org/extensions",
+        "themeColor": PRIORITY_COLORS.get(announcement.priority, '0078D7'),
+        "summary": f"Yeni {type_title}: {announcement.title}",
+        "sections": [
+            {
+                "activityTitle": f"Yeni {type_title}",
+                "activitySubtitle": announcement.title,
+                "facts": [
+                    {"name": "Öncelik:", "value": announcement.get_priority_display()},
+                    {"name": "Ürün:", "value": announcement.product},
+                    {"name": "Yayın Tarihi:",
+                     "value": timezone.localtime(announcement.start_date).strftime('%d.%m.%Y %H:%M')},
+                    {"name": "Yazar:",
+                     "value": announcement.author.get_full_name() or announcement.author.username},
+                ],
+                "text": content[:500] + ("..." if len(content) > 500 else ""),
+            }
+        ],
+        "potentialAction": [
+            {
+                "@type": "OpenUri",
+                "name": "Detayları Görüntüle",
+                "targets": [{"os": "default", "uri": _absolute_url(announcement.get_absolute_url())}],
+            }
+        ],
+    }
+
+
+def build_digest_card(announcements, max_items):
+    """Birden fazla duyuru için tek özet kartı"""
+    highest = max(
+        (announcement.priority for announcement in announcements),
+        key=lambda priority: list(PRIORITY_COLORS).index(priority) if priority in PRIORITY_COLORS else 0,
+    )
+    lines = [
+        f"- [{announcement.title}]({_absolute_url(announcement.get_absolute_url())}) "
+        f"({TYPE_TITLES.get(announcement.announcement_type, 'Duyuru')}, {announcement.get_priority_display()})"
+        for announcement in announcements[:max_items]
+    ]
+    if len(announcements) > max_items:
+        lines.append(f"- ... ve {len(announcements) - max_items} duyuru daha")
+    return {
+        "@type": "MessageCard",
+        "@context": "http://schema.org/extensions",
+        "themeColor": PRIORITY_COLORS.get(highest, '0078D7'),
+        "summary": f"{len(announcements)} yeni duyuru",
+        "sections": [
+            {
+                "activityTitle": f"{len(announcements)} yeni duyuru yayınlandı",
+                "text": '\n'.join(lines),
+            }
+        ],
+        "potentialAction": [
+            {
+                "@type": "OpenUri",
+                "name": "Tüm Duyurular",
+                "targets": [{"os": "default", "uri": _absolute_url('/announcements/')}],
+            }
+        ],
+    }
+
+
+# Gönderim
+
+class DeliveryError(Exception):
+    def __init__(self, message, retry_after=None, permanent=False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.permanent = permanent
+
+
+def _retry_after(response):
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max((parsedate_to_datetime(value) - timezone.now()).total_seconds(), 0)
+        except (TypeError, ValueError):
+            return None
+
+
+def post_card(webhook_url, card, config=None):
+    """Kartı webhook'a gönderir; başarısızlıkta DeliveryError yükseltir"""
+    config = config or get_config()
+    try:
+        response = get_session().post(
+            webhook_url, json=card,
+            timeout=(config['CONNECT_TIMEOUT'], config['READ_TIMEOUT']),
+        )
+    except requests.RequestException as e:
+        raise DeliveryError(f"Bağlantı hatası: {e}")
+
+    if response.status_code == 429:
+        raise DeliveryError("Teams istek sınırı aşıldı (429)", retry_after=_retry_after(response))
+    if response.status_code >= 500:
+        raise DeliveryError(f"Sunucu hatası: {response.status_code}", retry_after=_retry_after(response))
+    if response.status_code >= 400:
+        raise DeliveryError(f"İstek reddedildi: {response.status_code} - {response.text[:500]}", permanent=True)
+    # Eski Office 365 bağlayıcıları kısıtlamayı 200 yanıtının gövdesinde bildirir
+    if '429' in response.text[:200]:
+        raise DeliveryError("Teams istek sınırı aşıldı (yanıt gövdesi)")
+
+
+def backoff_seconds(attempts, config):
+    delay = min(config['BACKOFF_BASE'] * (2 ** max(attempts - 1, 0)), config['BACKOFF_MAX'])
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _mark_failed(notifications, error, config):
+    now = timezone.now()
+    for notification in notifications:
+        notification.attempts += 1
+        notification.last_error = str(error)[:2000]
+        if error.permanent or notification.attempts >= config['MAX_ATTEMPTS']:
+            notification.status = 'failed'
+        else:
+            delay = backoff_seconds(notification.attempts, config)
+            if error.retry_after is not None:
+                delay = max(delay, error.retry_after)
+            notification.next_attempt_at = now + timezone.timedelta(seconds=delay)
+    TeamsNotification.objects.bulk_update(notifications, ['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def _deliver(webhook_url, notifications, config):
+    """
+    Bildirimleri tek istekle gönderir: tek duyuru için duyuru kartı, birden
+    fazlası için özet kartı
+
+    Returns:
+        int: Gönderilen bildirim sayısı
+    """
+    announcements = [notification.announcement for notification in notifications]
+    if len(announcements) == 1:
+        card = build_card(announcements[0])
+    else:
+        card = build_digest_card(announcements, config['DIGEST_MAX_ITEMS'])
+
+    try:
+        post_card(webhook_url, card, config)
+    except DeliveryError as e:
+        logger.warning("Teams bildirimi gönderilemedi (%d duyuru): %s", len(notifications), e)
+        _mark_failed(notifications, e, config)
+        return 0
+
+    with transaction.atomic():
+        TeamsNotification.objects.filter(pk__in=[n.pk for n in notifications]).update(
+            status='sent', sent_at=timezone.now(), attempts=F('attempts') + 1, last_error='',
+        )
+    logger.info("Teams bildirimi gönderildi: %d duyuru", len(notifications))
+    return len(notifications)
+
+
+def _batches(notifications, config):
+    """DIGEST_THRESHOLD altında tek tek, üstünde tek özet olarak gruplar"""
+    if len(notifications) >= config['DIGEST_THRESHOLD']:
+        return [notifications]
+    return [[notification] for notification in notifications]
+
+
+def _claim_due(now, config):
+    """
+    Zamanı gelmiş bildirimleri kısa bir işlemde sahiplenir
+
+    Satırlar SELECT ... FOR UPDATE SKIP LOCKED ile alınır ve next_attempt_at
+    CLAIM_TIMEOUT kadar ileri alınır; kilit gönderim boyunca tutulmaz, başka
+    görevler bu satırları almaz. Görev yarıda kalırsa süre dolunca yeniden denenir.
+
+    Returns:
+        list: Gönderilecek bildirimler
+    """
+    with transaction.atomic():
+        due = list(
+            TeamsNotification.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .filter(status='pending', next_attempt_at__lte=now)
+            .select_related('announcement__author')
+            .order_by('next_attempt_at', 'pk')
+        )
+        claimed, withdrawn = [], []
+        for notification in due:
+            # Bu arada yayından kaldırılan duyurular için bildirim gönderilmez
+            if notification.announcement.status != 'published':
+                withdrawn.append(notification.pk)
+            else:
+                claimed.append(notification)
+        if withdrawn:
+            TeamsNotification.objects.filter(pk__in=withdrawn).update(
+                status='failed', last_error='Duyuru artık yayında değil',
+            )
+        if claimed:
+            TeamsNotification.objects.filter(pk__in=[n.pk for n in claimed]).update(
+                next_attempt_at=now + timezone.timedelta(seconds=config['CLAIM_TIMEOUT']),
+            )
+    return claimed
+
+
+def dispatch_pending(config=None):
+    """
+    Zamanı gelmiş bildirimleri webhook başına gönderir
+
+    Bildirimler önce sahiplenilir (_claim_due); istekler veritabanı kilidi ya
+    da açık işlem tutulmadan yapılır ve her gönderimin sonucu ayrı kaydedilir.
+    Sonradan oluşan bir hata önceden gönderilmiş kartları geri almaz. Hız
+    sınırına takılan bildirimler bekletilmeden sonraki çalışmaya bırakılır.
+
+    Returns:
+        tuple: (gönderilen bildirim sayısı, sonraki çalışmaya kalan saniye ya da None)
+    """
+    config = config or get_config()
+    now = timezone.now()
+    sent = 0
+    next_run = None
+
+    by_webhook = {}
+    for notification in _claim_due(now, config):
+        by_webhook.setdefault(notification.webhook_url, []).append(notification)
+
+    for webhook_url, notifications in by_webhook.items():
+        batches = _batches(notifications, config)
+        for index, batch in enumerate(batches):
+            wait = acquire_rate_slot(webhook_url, config)
+            if wait:
+                # Kalan bildirimler sınır açıldığında gönderilmek üzere bırakılır
+                remaining = [n.pk for later in batches[index:] for n in later]
+                TeamsNotification.objects.filter(pk__in=remaining).update(
+                    next_attempt_at=timezone.now() + timezone.timedelta(seconds=wait),
+                )
+                next_run = wait if next_run is None else min(next_run, wait)
+                break
+            sent += _deliver(webhook_url, batch, config)
+
+    upcoming = (TeamsNotification.objects.filter(status='pending', next_attempt_at__gt=now)
+                .order_by('next_attempt_at').values_list('next_attempt_at', flat=True).first())
+    if upcoming is not None:
+        seconds = max((upcoming - timezone.now()).total_seconds(), 0)
+        next_run = seconds if next_run is None else min(next_run, seconds)
+    return sent, next_run
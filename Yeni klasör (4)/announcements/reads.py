@@ -0,0 +1,184 @@
+"""
+Duyuru okundu takibi
+
+Kullanıcı başına tek satır (AnnouncementReadState) tutulur:
+
+- high_water: Bu ana kadar yayınlanan duyuruların tümü okunmuş sayılır.
+- bitmap: high_water'dan sonra yayınlanıp okunan duyuruların id'leri.
+
+"X okundu mu?" yalnızca bu satırla yanıtlanır. Okunmamış sayısı, önbellekteki
+yayındaki duyuru listesi (genellikle birkaç düzine) üzerinden hesaplanır;
+kullanıcı ya da toplam duyuru sayısıyla büyümez. Yayındaki duyuruların tümü
+okununca high_water ileri alınır ve bit haritası boşaltılır.
+
+Okuyan sayıları duyuru başına bir sayaçta (AnnouncementReadCount) toplanır;
+yazarlar okunma oranını ham kayıt taramadan görür.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.bitmaps import IdBitmap
+from core.cache import cache_for_models
+
+from .models import Announcement, AnnouncementReadCount, AnnouncementReadState
+
+
+User = get_user_model()
+
+
+def published_at(announcement):
+    """Yayın anı; alan eklenmeden önce yayınlananlar için başlangıç tarihi"""
+    return announcement.published_at or announcement.start_date
+
+
+@cache_for_models(Announcement)
+def live_announcements():
+    """
+    Yayındaki duyurular
+
+    Returns:
+        list: [(id, yayın anı)]
+    """
+    return [
+        (pk, first_published or start_date)
+        for pk, first_published, start_date in Announcement.objects.filter(status='published')
+        .order_by().values_list('pk', 'published_at', 'start_date')
+    ]
+
+
+@cache_for_models(User)
+def audience_size():
+    """Okunma oranının paydası: etkin kullanıcı sayısı"""
+    return User.objects.filter(is_active=True).count()
+
+
+class ReadState:
+    """Kullanıcının okuma durumu; kayıt yoksa hiçbir duyuru okunmamıştır"""
+
+    def __init__(self, record):
+        self.record = record
+        self.bitmap = IdBitmap(record.bitmap_base, record.bitmap)
+
+    @classmethod
+    def for_user(cls, user, lock=False):
+        if lock:
+            # Aynı kullanıcının eşzamanlı işaretlemeleri sıraya girer; sayaçlar iki kez artmaz
+            AnnouncementReadState.objects.get_or_create(user=user)
+            return cls(AnnouncementReadState.objects.select_for_update().get(user=user))
+        record = AnnouncementReadState.objects.filter(user=user).first()
+        return cls(record or AnnouncementReadState(user=user))
+
+    def is_read(self, announcement_id, published):
+        high_water = self.record.high_water
+        if high_water is not None and published is not None and published <= high_water:
+            return True
+        return announcement_id in self.bitmap
+
+    def has_read(self, announcement):
+        return self.is_read(announcement.pk, published_at(announcement))
+
+    def unread_ids(self, live=None):
+        live = live_announcements() if live is None else live
+        return [pk for pk, published in live if not self.is_read(pk, published)]
+
+    def unread_count(self):
+        return len(self.unread_ids())
+
+    def _advance(self, live):
+        """
+        Bit haritasını yayındaki ve high_water'dan sonraki duyurularla sınırlar;
+        bunların tümü okunmuşsa high_water'ı ileri alıp haritayı boşaltır
+        """
+        high_water = self.record.high_water
+        newer = [(pk, published) for pk, published in live
+                 if high_water is None or published is None or published > high_water]
+        self.bitmap = self.bitmap.intersection(pk for pk, _published in newer)
+        if newer and len(self.bitmap) == len(newer):
+            self.record.high_water = max(
+                (published for _pk, published in newer if published is not None), default=high_water,
+            )
+            self.bitmap = IdBitmap()
+
+    def save(self):
+        self.record.bitmap_base, self.record.bitmap = self.bitmap.base, self.bitmap.to_bytes()
+        self.record.save()
+
+
+def _count_reads(announcement_ids):
+    if not announcement_ids:
+        return
+    AnnouncementReadCount.objects.bulk_create(
+        [AnnouncementReadCount(announcement_id=pk) for pk in announcement_ids], ignore_conflicts=True,
+    )
+    AnnouncementReadCount.objects.filter(announcement_id__in=announcement_ids).update(count=F('count') + 1)
+
+
+def get_read_state(user):
+    return ReadState.for_user(user)
+
+
+def mark_read(user, announcement):
+    """
+    Duyuruyu kullanıcı için okundu işaretler
+
+    Returns:
+        bool: Duyuru daha önce okunmamışsa True
+    """
+    if announcement.status != 'published':
+        return False
+    with transaction.atomic():
+        state = ReadState.for_user(user, lock=True)
+        if state.has_read(announcement):
+            return False
+        state.bitmap.add(announcement.pk)
+        state._advance(live_announcements())
+        state.save()
+        _count_reads([announcement.pk])
+    return True
+
+
+def mark_all_read(user):
+    """
+    Yayındaki tüm duyuruları okundu işaretler
+
+    Returns:
+        int: Yeni okunan duyuru sayısı
+    """
+    with transaction.atomic():
+        state = ReadState.for_user(user, lock=True)
+        unread = state.unread_ids()
+        state.record.high_water = timezone.now()
+        state.bitmap = IdBitmap()
+        state.save()
+        _count_reads(unread)
+    return len(unread)
+
+
+def read_counts(announcement_ids):
+    """
+    Duyuruların okuyan sayıları
+
+    Returns:
+        dict: {duyuru id: okuyan sayısı}
+    """
+    counts = dict(AnnouncementReadCount.objects.filter(announcement_id__in=announcement_ids)
+                  .values_list('announcement_id', 'count'))
+    return {pk: counts.get(pk, 0) for pk in announcement_ids}
+
+
+def read_ratio(announcement):
+    """
+    Okunma istatistiği
+
+    Returns:
+        dict: count (okuyan), audience (etkin kullanıcı), ratio (0-1)
+    """
+    count = read_counts([announcement.pk])[announcement.pk]
+    audience = audience_size()
+    return {
+        'count': count,
+        'audience': audience,
+        'ratio': min(count / audience, 1) if audience else 0,
+    }
@@ -0,0 +1,178 @@
+"""
+Duyuruların yayın ve bitiş anlarını tam zamanında uygulayan zamanlayıcı
+
+Yaklaşan yayın (start_date) ve bitiş (end_date) anları bir min-heap'te tutulur.
+Yığın başlangıçta indeksli bir sorguyla kurulur. Duyuru tablosunun model
+sürümü (core.cache) değiştiğinde, son eşitlemeden sonra kaydedilen duyurular
+yığına eklenir. Süreç sıradaki ana kadar uyur ve geçişi toplu durum
+değişikliğiyle (AnnouncementQuerySet.transition) uygular; Teams bildirimi ve
+önbellek geçersizleştirme bu geçişle birlikte çalışır.
+
+Tek bir süreçte çalıştırılmalıdır:
+    python manage.py announcement_scheduler
+"""
+import datetime
+import heapq
+import logging
+import time
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from core.cache import get_model_version
+
+from .models import Announcement
+
+
+logger = logging.getLogger(__name__)
+
+PUBLISH = 'publish'
+EXPIRE = 'expire'
+
+# Eşitleme sorgusu saat farklarını ve uzun işlemleri kapsayacak kadar geriye bakar
+SYNC_MARGIN = datetime.timedelta(minutes=5)
+
+
+def apply_due_transitions(now=None, publish_pks=None, expire_pks=None):
+    """
+    Zamanı gelmiş yayın ve bitiş geçişlerini toplu olarak uygular
+
+    Koşullar veritabanında yeniden denetlenir; bayat ya da yinelenen istekler
+    zararsızdır. pk listeleri verilmezse zamanı gelen tüm duyurular işlenir.
+
+    Returns:
+        tuple: (yayınlanan, arşivlenen) duyuru sayıları
+    """
+    now = now or timezone.now()
+    published = archived = 0
+
+    if publish_pks is None or publish_pks:
+        to_publish = Announcement.objects.due_for_publish(now)
+        if publish_pks is not None:
+            to_publish = to_publish.filter(pk__in=publish_pks)
+        published = to_publish.publish(reason='Yayın zamanı geldi')
+
+    if expire_pks is None or expire_pks:
+        to_expire = Announcement.objects.expired(now)
+        if expire_pks is not None:
+            to_expire = to_expire.filter(pk__in=expire_pks)
+        archived = to_expire.archive(reason='Yayın süresi doldu')
+
+    return published, archived
+
+
+class AnnouncementScheduler:
+    """
+    Yayın ve bitiş anlarının min-heap'i
+
+    Yığındaki kayıtlar (an, pk, eylem) üçlüleridir. Bir duyurunun tarihleri
+    değişince eski kayıt silinmez; expected sözlüğüyle eşleşmeyen kayıtlar
+    sıraları geldiğinde atlanır.
+    """
+
+    def __init__(self, poll_interval=1.0):
+        self.poll_interval = poll_interval
+        self.heap = []
+        self.expected = {}  # pk -> {eylem: an}
+        self.version = None
+        self.synced_at = None
+
+    def _instants(self, status, start_date, end_date):
+        instants = {}
+        if status == 'scheduled':
+            instants[PUBLISH] = start_date
+        if status in Announcement.LIVE_STATUSES:
+            instants[EXPIRE] = end_date
+        return instants
+
+    def _track(self, pk, status, start_date, end_date):
+        instants = self._instants(status, start_date, end_date)
+        previous = self.expected.pop(pk, {})
+        if instants:
+            self.expected[pk] = instants
+        for action, when in instants.items():
+            if previous.get(action) != when:
+                heapq.heappush(self.heap, (when, pk, action))
+
+    def _rows(self, queryset):
+        return queryset.values_list('pk', 'status', 'start_date', 'end_date').order_by()
+
+    def rebuild(self):
+        """Yığını veritabanından yeniden kurar"""
+        self.version = get_model_version(Announcement)
+        self.synced_at = timezone.now()
+        self.expected = {}
+        for pk, status, start_date, end_date in self._rows(
+            Announcement.objects.filter(status__in=Announcement.LIVE_STATUSES)
+        ):
+            instants = self._instants(status, start_date, end_date)
+            self.expected[pk] = instants
+        self.heap = [
+            (when, pk, action)
+            for pk, instants in self.expected.items()
+            for action, when in instants.items()
+        ]
+        heapq.heapify(self.heap)
+        logger.info("Duyuru zamanlayıcısı %d anla kuruldu.", len(self.heap))
+
+    def sync(self):
+        """Duyuru tablosu değiştiyse son eşitlemeden sonra kaydedilen duyuruları yığına ekler"""
+        version = get_model_version(Announcement)
+        if version == self.version:
+            return
+        since = self.synced_at - SYNC_MARGIN
+        self.version = version
+        self.synced_at = timezone.now()
+        for row in self._rows(Announcement.objects.filter(updated_at__gte=since)):
+            self._track(*row)
+
+    def pop_due(self, now):
+        """Zamanı gelmiş geçerli kayıtları eylemlerine göre gruplayarak çıkarır"""
+        due = {PUBLISH: [], EXPIRE: []}
+        while self.heap and self.heap[0][0] <= now:
+            when, pk, action = heapq.heappop(self.heap)
+            instants = self.expected.get(pk)
+            if instants is None or instants.get(action) != when:
+                continue  # tarih değişmiş ya da geçiş zaten yapılmış
+            due[action].append(pk)
+            if action == EXPIRE:
+                del self.expected[pk]
+            else:
+                del instants[PUBLISH]
+        return due
+
+    def run_pending(self, now=None):
+        now = now or timezone.now()
+        due = self.pop_due(now)
+        if not (due[PUBLISH] or due[EXPIRE]):
+            return 0, 0
+        published, archived = apply_due_transitions(now, due[PUBLISH], due[EXPIRE])
+        if published or archived:
+            logger.info("Duyuru zamanlayıcısı: %d yayınlandı, %d arşivlendi.", published, archived)
+        return published, archived
+
+    def seconds_until_next(self, now=None):
+        """Sıradaki ana ya da bir sonraki eşitlemeye kalan süre"""
+        if not self.heap:
+            return self.poll_interval
+        now = now or timezone.now()
+        remaining = (self.heap[0][0] - now).total_seconds()
+        return max(0.0, min(remaining, self.poll_interval))
+
+    def run_forever(self):
+        self.rebuild()
+        while True:
+            close_old_connections()
+            try:
+                self.sync()
+                self.run_pending()
+            except Exception:
+                # Veritabanı ya da önbellek geçici olarak erişilemezse yığın baştan kurulur
+                logger.exception("Duyuru zamanlayıcısında hata")
+                time.sleep(self.poll_interval)
+                try:
+                    self.rebuild()
+                except Exception:
+                    logger.exception("Duyuru zamanlayıcısı yeniden kurulamadı")
+                continue
+            time.sleep(self.seconds_until_next())
@@ -0,0 +1,216 @@
+from django.db import connection
+from django.db.models import Q
+
+from core.text import html_to_text, highlight_snippet, normalize_turkish, stem_text, stem_turkish
+
+
+ANNOUNCEMENT_FTS_TABLE = 'announcements_announcement_fts'
+ANNOUNCEMENT_SEARCH_TABLE = 'announcements_announcement_search'
+ANNOUNCEMENT_SEARCH_GIN_INDEX = 'announcements_announcement_search_gin'
+
+# Sütun ağırlıkları: başlık > etiketler > ürün > içerik
+FTS_COLUMN_WEIGHTS = (10.0, 5.0, 3.0, 1.0)
+TSVECTOR_WEIGHTS = ('A', 'B', 'C', 'D')
+
+SNIPPET_LENGTH = 200
+REBUILD_BATCH_SIZE = 500
+
+
+def _backend():
+    return connection.vendor if connection.vendor in ('sqlite', 'postgresql') else None
+
+
+def build_announcement_search_fields(announcement, tag_names=None):
+    """
+    Duyurunun indekslenecek alanları: başlık, etiketler, ürün ve HTML'den arındırılmış içerik
+
+    Metinler normalize edilir ve kelimeler köklerine indirgenir.
+
+    Returns:
+        tuple: (başlık, etiketler, ürün, içerik)
+    """
+    if tag_names is None:
+        tag_names = [tag.name for tag in announcement.tags.all()]
+    return (
+        stem_text(announcement.title),
+        stem_text(' '.join(tag_names)),
+        stem_text(announcement.product),
+        stem_text(html_to_text(announcement.content)),
+    )
+
+
+def ensure_announcement_search_index(**kwargs):
+    """
+    Duyuru arama indeksini oluşturur (post_migrate sinyali ile çağrılır)
+
+    SQLite'ta FTS5 sanal tablosu, PostgreSQL'de GIN indeksli tsvector tablosu
+    kullanılır. Kökler uygulamada bulunduğundan iki veritabanında da sonuçlar
+    aynıdır.
+    """
+    from .models import Announcement
+
+    backend = _backend()
+    with connection.cursor() as cursor:
+        if backend == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {ANNOUNCEMENT_FTS_TABLE} USING fts5("
+                f"title, tags, product, content, "
+                f"tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+            )
+        elif backend == 'postgresql':
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {ANNOUNCEMENT_SEARCH_TABLE} ("
+                f"announcement_id bigint PRIMARY KEY "
+                f"REFERENCES {Announcement._meta.db_table} (id) ON DELETE CASCADE, "
+                f"document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {ANNOUNCEMENT_SEARCH_GIN_INDEX} "
+                f"ON {ANNOUNCEMENT_SEARCH_TABLE} USING gin (document)"
+            )
+
+
+def _tsvector_sql():
+    return ' || '.join(f"setweight(to_tsvector('simple', %s), '{weight}')" for weight in TSVECTOR_WEIGHTS)
+
+
+def _write_index(cursor, rows, replace=True):
+    """rows: (pk, başlık, etiketler, ürün, içerik) kayıtları"""
+    backend = _backend()
+    if backend == 'sqlite':
+        if replace:
+            cursor.executemany(f"DELETE FROM {ANNOUNCEMENT_FTS_TABLE} WHERE rowid = %s",
+                               [(row[0],) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {ANNOUNCEMENT_FTS_TABLE} (rowid, title, tags, product, content) "
+            f"VALUES (%s, %s, %s, %s, %s)",
+            rows
+        )
+    elif backend == 'postgresql':
+        cursor.executemany(
+            f"INSERT INTO {ANNOUNCEMENT_SEARCH_TABLE} (announcement_id, document) "
+            f"VALUES (%s, {_tsvector_sql()}) "
+            f"ON CONFLICT (announcement_id) DO UPDATE SET document = EXCLUDED.document",
+            rows
+        )
+
+
+def index_announcement(announcement):
+    """Tek bir duyurunun arama kaydını günceller"""
+    if not _backend():
+        return
+    with connection.cursor() as cursor:
+        _write_index(cursor, [(announcement.pk, *build_announcement_search_fields(announcement))])
+
+
+def unindex_announcement(announcement_id):
+    """Silinen duyurunun arama kaydını kaldırır"""
+    backend = _backend()
+    if backend == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {ANNOUNCEMENT_FTS_TABLE} WHERE rowid = %s", [announcement_id])
+    # PostgreSQL'de kayıt ON DELETE CASCADE ile silinir
+
+
+def rebuild_announcement_search_index():
+    """
+    Tüm duyuruların (arşiv dahil) arama kaydını yeniden oluşturur
+
+    Returns:
+        int: İndekslenen duyuru sayısı
+    """
+    from .models import Announcement
+
+    if not _backend():
+        return 0
+
+    queryset = Announcement.objects.only('id', 'title', 'product', 'content').prefetch_related('tags')
+    count = 0
+    with connection.cursor() as cursor:
+        # Tablo boşaltıldığından kayıtlar tek tek silinmeden eklenir
+        cursor.execute(
+            f"DELETE FROM {ANNOUNCEMENT_FTS_TABLE}" if _backend() == 'sqlite'
+            else f"DELETE FROM {ANNOUNCEMENT_SEARCH_TABLE}"
+        )
+        batch = []
+        for announcement in queryset.iterator(chunk_size=REBUILD_BATCH_SIZE):
+            batch.append((announcement.pk, *build_announcement_search_fields(announcement)))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                _write_index(cursor, batch, replace=False)
+                count += len(batch)
+                batch = []
+        if batch:
+            _write_index(cursor, batch, replace=False)
+            count += len(batch)
+    return count
+
+
+def _query_stems(query):
+    return [stem_turkish(token) for token in normalize_turkish(query).split()]
+
+
+def search_announcements(query, queryset=None):
+    """
+    Duyuruları başlık, etiket, ürün ve içerikte arar ve alaka sırasına göre sıralar
+
+    Her kelime köküne indirgenir ve önek olarak aranır; "sunucularda" araması
+    "sunucu", "sunucuların" geçen duyuruları da bulur. Sonuçlar search_rank
+    değerine göre (küçük olan daha alakalı) sıralanır.
+
+    Args:
+        query (str): Arama metni
+        queryset (QuerySet, optional): Süzülecek duyuru sorgusu
+
+    Returns:
+        QuerySet: Eşleşen duyurular
+    """
+    from .models import Announcement
+
+    if queryset is None:
+        queryset = Announcement.objects.all()
+
+    stems = _query_stems(query)
+    if not stems:
+        return queryset
+
+    table = Announcement._meta.db_table
+    backend = _backend()
+    if backend == 'sqlite':
+        match = ' '.join('"{}"*'.format(stem.replace('"', '')) for stem in stems)
+        weights = ', '.join(str(weight) for weight in FTS_COLUMN_WEIGHTS)
+        # "+rowid" FTS tablosunun rowid ile aranmasını engeller; SQLite birleştirmeye
+        # MATCH sonuçlarından başlar. Aksi halde özellikle COUNT sorgularında her
+        # duyuru satırı için MATCH yeniden çalıştırılır.
+        return queryset.extra(
+            select={'search_rank': f"bm25({ANNOUNCEMENT_FTS_TABLE}, {weights})"},
+            tables=[ANNOUNCEMENT_FTS_TABLE],
+            where=[f"+{ANNOUNCEMENT_FTS_TABLE}.rowid = {table}.id", f"{ANNOUNCEMENT_FTS_TABLE} MATCH %s"],
+            params=[match],
+        ).order_by('search_rank', '-created_at')
+
+    if backend == 'postgresql':
+        tsquery = ' & '.join(f"{stem}:*" for stem in stems)
+        return queryset.extra(
+            select={'search_rank': f"-ts_rank_cd({ANNOUNCEMENT_SEARCH_TABLE}.document, "
+                                   f"to_tsquery('simple', %s))"},
+            select_params=[tsquery],
+            tables=[ANNOUNCEMENT_SEARCH_TABLE],
+            where=[f"{ANNOUNCEMENT_SEARCH_TABLE}.announcement_id = {table}.id",
+                   f"{ANNOUNCEMENT_SEARCH_TABLE}.document @@ to_tsquery('simple', %s)"],
+            params=[tsquery],
+        ).order_by('search_rank', '-created_at')
+
+    # Diğer veritabanları: indeks yok, her kelime alanlardan birinde geçmeli
+    for token in normalize_turkish(query).split():
+        queryset = queryset.filter(
+            Q(title__icontains=token) | Q(product__icontains=token) | Q(content__icontains=token)
+            | Q(tags__name__icontains=token)
+        )
+    return queryset.distinct()
+
+
+def attach_snippets(announcements, query, length=SNIPPET_LENGTH):
+    """Sayfadaki duyurulara eşleşmeleri vurgulanmış search_snippet ekler"""
+    for announcement in announcements:
+        announcement.search_snippet = highlight_snippet(html_to_text(announcement.content), query, length)
+    return announcements
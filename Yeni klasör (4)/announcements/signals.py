@@ -1,17 +1,124 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
-from .models import Announcement
-from .tasks import send_teams_notification
+from .models import Announcement, Tag, announcement_history, announcements_transitioned
+from . import facets
+from .search import index_announcement, unindex_announcement
+from .notifications import enqueue_notifications
 
 @receiver(post_save, sender=Announcement)
 def announcement_post_save(sender, instance, created, **kwargs):
     """Duyuru kaydedildiğinde çalışacak sinyal işleyicisi"""
-    # Yeni bir duyuru oluşturulduğunda ve yayında ise Teams bildirimi gönder
-    if created and instance.status == 'published':
-        send_teams_notification.delay(instance.id)
-    
-    # Var olan bir duyuru güncellendiğinde ve yayında ise Teams bildirimi gönder
-    elif not created and instance.status == 'published' and instance.tracker.has_changed('status'):
-        # Eğer durum taslaktan yayına değiştiyse bildirim gönder
-        if instance.tracker.previous('status') == 'draft':
-            send_teams_notification.delay(instance.id)
\ No newline at end of file
+    # Yeni bir duyuru yayında oluşturulduğunda ya da taslak/zamanlanmış
+    # durumdan yayına alındığında Teams bildirimi kuyruğa eklenir
+    if instance.status != 'published':
+        return
+    previous = getattr(instance, '_loaded_status', None)
+    if created or previous in ('draft', 'scheduled'):
+        enqueue_notifications([instance.pk])
+
+
+@receiver(announcements_transitioned, sender=Announcement)
+def announcements_transitioned_handler(sender, status, previous, **kwargs):
+    """Toplu durum geçişinde post_save'in yan etkilerini bir kez çalıştırır"""
+    # Taslaktan ya da zamanlanmış durumdan yayına alınan duyurular tek seferde kuyruğa eklenir;
+    # gönderim sırasında tek bir özet kartında birleştirilir
+    if status == 'published':
+        enqueue_notifications([
+            pk for pk, previous_status in previous.items()
+            if previous_status in ('draft', 'scheduled')
+        ])
+
+
+@receiver(post_save, sender=Announcement)
+def update_announcement_search_index(sender, instance, **kwargs):
+    """Duyuru kaydedildiğinde arama indeksini günceller"""
+    index_announcement(instance)
+
+
+@receiver(m2m_changed, sender=Announcement.tags.through)
+def update_announcement_tags_search_index(sender, instance, action, reverse, pk_set, **kwargs):
+    """Etiketler değiştiğinde ilgili duyuruların arama kaydını günceller"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        index_announcement(instance)
+    elif pk_set:
+        for announcement in Announcement.objects.filter(pk__in=pk_set).prefetch_related('tags'):
+            index_announcement(announcement)
+
+
+@receiver(post_save, sender=Tag)
+def update_tag_search_index(sender, instance, created, **kwargs):
+    """Etiket adı değiştiğinde etiketi taşıyan duyuruların arama kaydını günceller"""
+    if created:
+        return
+    for announcement in instance.announcements.prefetch_related('tags'):
+        index_announcement(announcement)
+
+
+@receiver(post_delete, sender=Announcement)
+def remove_announcement_from_search_index(sender, instance, **kwargs):
+    """Duyuru silindiğinde arama indeksinden kaldırır"""
+    unindex_announcement(instance.pk)
+
+
+@receiver(post_delete, sender=Announcement)
+def record_announcement_delete(sender, instance, **kwargs):
+    """Silinen duyurunun son halini geçmişe yazar; eski sürümler buradan kurulur"""
+    announcement_history.record_delete(instance)
+
+
+# Etiket süzmesi ve etiket sayıları (facets.py)
+
+@receiver(m2m_changed, sender=Announcement.tags.through)
+def update_announcement_tag_facets(sender, instance, action, reverse, pk_set, **kwargs):
+    """Etiketler değiştiğinde tag_key alanlarını ve etiket sayılarını günceller"""
+    if action == 'pre_clear':
+        # Temizlenecek ilişkiler silinmeden önce alınır
+        if reverse:
+            instance._cleared_tag_links = list(instance.announcements.values_list('pk', flat=True))
+        else:
+            instance._cleared_tag_links = list(instance.tags.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    related = pk_set if action != 'post_clear' else getattr(instance, '_cleared_tag_links', ())
+    if reverse:
+        facets.tags_changed(related, [instance.pk])
+    else:
+        keys = facets.tags_changed([instance.pk], related)
+        instance.tag_key = keys[instance.pk]
+
+
+@receiver(post_save, sender=Announcement)
+def update_tag_facets_on_save(sender, instance, created, raw=False, **kwargs):
+    """Etiketli bir duyurunun durumu ya da türü değiştiğinde sayıları günceller"""
+    if created or raw:
+        return
+    changed = (getattr(instance, '_loaded_status', None) != instance.status
+               or getattr(instance, '_loaded_type', None) != instance.announcement_type)
+    if changed:
+        facets.refresh_tag_facets(facets.parse_tag_key(instance.tag_key))
+
+
+@receiver(announcements_transitioned, sender=Announcement)
+def update_tag_facets_on_transition(sender, previous, **kwargs):
+    """Toplu durum geçişinden sonra etkilenen etiketlerin sayılarını günceller"""
+    facets.announcements_changed(list(previous))
+
+
+@receiver(post_delete, sender=Announcement)
+def update_tag_facets_on_delete(sender, instance, **kwargs):
+    """Silinen duyurunun etiketlerinin sayılarını günceller"""
+    facets.refresh_tag_facets(facets.parse_tag_key(instance.tag_key))
+
+
+@receiver(pre_delete, sender=Tag)
+def remember_tagged_announcements(sender, instance, **kwargs):
+    instance._tagged_announcements = list(instance.announcements.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def update_tag_keys_on_tag_delete(sender, instance, **kwargs):
+    """Silinen etiketi duyuruların tag_key alanından çıkarır"""
+    facets.refresh_tag_keys(getattr(instance, '_tagged_announcements', ()))
@@ -1,124 +1,82 @@
 from celery import shared_task
+from django.conf import settings
 from django.utils import timezone
-from .models import Announcement
 import logging
-import requests
-from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
 @shared_task
 def archive_expired_announcements():
-    """Süresi dolmuş duyuruları arşivler"""
-    now = timezone.now()
-    expired_announcements = Announcement.objects.filter(
-        status='published',
-        end_date__lt=now
+    """
+    Zamanı gelmiş yayın ve arşiv geçişlerini uygular
+
+    Geçişleri tam zamanında announcement_scheduler komutu yapar; bu görev
+    zamanlayıcı çalışmadığı süreler için yedektir.
+    """
+    from .scheduler import apply_due_transitions
+
+    published, archived = apply_due_transitions()
+    logger.info(f"{archived} adet duyuru otomatik olarak arşivlendi, {published} adet duyuru yayınlandı.")
+    return archived
+
+@shared_task
+def generate_attachment_previews(file_ids):
+    """Eklerin küçük resim önizlemelerini üretir; aynı içerik için bir kez çalışır"""
+    from .attachments import generate_preview
+    from .models import AnnouncementFile
+
+    hashes = set(
+        AnnouncementFile.objects.filter(pk__in=file_ids, preview_status='pending')
+        .exclude(sha256='').values_list('sha256', flat=True)
     )
-    
-    count = 0
-    for announcement in expired_announcements:
-        try:
-            announcement.archive()
-            count += 1
-        except Exception as e:
-            logger.error(f"Duyuru arşivlenirken hata oluştu (ID: {announcement.id}): {str(e)}")
-    
-    logger.info(f"{count} adet duyuru otomatik olarak arşivlendi.")
-    return count
+    results = {sha256: generate_preview(sha256) for sha256 in hashes}
+    logger.info(f"{len(results)} ek önizlemesi işlendi.")
+    return results
+
+@shared_task
+def compact_announcement_history(compact_after_days=None, retention_days=None):
+    """
+    Duyuru geçmişini budar ve sıkıştırır (ANNOUNCEMENT_HISTORY ayarları)
+
+    Returns:
+        tuple: (silinen, birleştirilen) kayıt sayıları
+    """
+    from django.conf import settings
+    from .models import announcement_history
+
+    config = getattr(settings, 'ANNOUNCEMENT_HISTORY', {})
+    if compact_after_days is None:
+        compact_after_days = config.get('COMPACT_AFTER_DAYS', 30)
+    if retention_days is None:
+        retention_days = config.get('RETENTION_DAYS', 365)
+
+    now = timezone.now()
+    pruned = announcement_history.prune(now - timezone.timedelta(days=retention_days)) if retention_days else 0
+    compacted = announcement_history.compact(now - timezone.timedelta(days=compact_after_days))
+    logger.info(f"Duyuru geçmişi: {pruned} eski kayıt silindi, {compacted} kayıt birleştirildi.")
+    return pruned, compacted
 
 @shared_task
 def send_teams_notification(announcement_id):
-    """Yeni duyuru için Teams webhook bildirimi gönderir"""
-    try:
-        # Duyuru bilgilerini al
-        announcement = Announcement.objects.get(id=announcement_id)
-        
-        # Teams webhook URL'si ayarlardan alınır
-        webhook_url = getattr(settings, 'TEAMS_WEBHOOK_URL', None)
-        
-        if not webhook_url:
-            logger.warning("Teams webhook URL'si tanımlanmamış. Bildirim gönderilemiyor.")
-            return False
-        
-        # Duyuru türüne göre renk belirleme
-        color_map = {
-            'low': '808080',  # Gri
-            'medium': '0078D7',  # Mavi
-            'high': 'FFA500',  # Turuncu
-            'critical': 'FF0000'  # Kırmızı
-        }
-        
-        # Duyuru türüne göre başlık belirleme
-        type_titles = {
-            'announcement': 'Duyuru',
-            'planned_work': 'Planlı Çalışma',
-            'information': 'Bilgilendirme'
-        }
-        
-        # Teams kart mesajı oluştur
-        card_data = {
-            "@type": "MessageCard",
-            "@context": "http://schema.org/extensions",
-            "themeColor": color_map.get(announcement.priority, '0078D7'),
-            "summary": f"Yeni {type_titles.get(announcement.announcement_type, 'Duyuru')}: {announcement.title}",
-            "sections": [
-                {
-                    "activityTitle": f"Yeni {type_titles.get(announcement.announcement_type, 'Duyuru')}",
-                    "activitySubtitle": announcement.title,
-                    "activityImage": "https://adaptivecards.io/content/adaptive-card-50.png",
-                    "facts": [
-                        {
-                            "name": "Öncelik:",
-                            "value": announcement.get_priority_display()
-                        },
-                        {
-                            "name": "Ürün:",
-                            "value": announcement.product
-                        },
-                        {
-                            "name": "Yayın Tarihi:",
-                            "value": announcement.start_date.strftime('%d.%m.%Y %H:%M')
-                        },
-                        {
-                            "name": "Yazar:",
-                            "value": announcement.author.get_full_name() or announcement.author.username
-                        }
-                    ],
-                    "text": announcement.content[:500] + ("..." if len(announcement.content) > 500 else "")
-                }
-            ],
-            "potentialAction": [
-                {
-                    "@type": "OpenUri",
-                    "name": "Detayları Görüntüle",
-                    "targets": [
-                        {
-                            "os": "default",
-                            "uri": f"{settings.SITE_URL}{announcement.get_absolute_url()}"
-                        }
-                    ]
-                }
-            ]
-        }
-        
-        # Webhook'a POST isteği gönder
-        response = requests.post(
-            webhook_url,
-            json=card_data,
-            headers={"Content-Type": "application/json"}
-        )
-        
-        if response.status_code >= 400:
-            logger.error(f"Teams bildirimi gönderilirken hata oluştu: {response.status_code} - {response.text}")
-            return False
-        
-        logger.info(f"Teams bildirimi başarıyla gönderildi: {announcement.title}")
-        return True
-        
-    except Announcement.DoesNotExist:
-        logger.error(f"Bildirim gönderilecek duyuru bulunamadı (ID: {announcement_id})")
-        return False
-    except Exception as e:
-        logger.error(f"Teams bildirimi gönderilirken beklenmeyen hata: {str(e)}")
-        return False
\ No newline at end of file
+    """Yeni duyuru için Teams bildirimini gönderim kuyruğuna ekler"""
+    from .notifications import enqueue_notifications
+
+    return enqueue_notifications([announcement_id]) > 0
+
+@shared_task
+def dispatch_teams_notifications():
+    """
+    Bekleyen Teams bildirimlerini gönderir
+
+    Hız sınırına takılan ya da yeniden denenecek bildirimler varsa görev,
+    işçiyi bekletmek yerine kendini o zamana erteler. Görevler eşzamanlı
+    (CELERY_TASK_ALWAYS_EAGER) çalışıyorsa countdown yok sayıldığından görev
+    kendini yeniden kuyruğa almaz; yeniden denemeler beat ile yapılır.
+    """
+    from .notifications import clear_scheduled_dispatch, dispatch_pending, schedule_dispatch
+
+    clear_scheduled_dispatch()
+    sent, next_run = dispatch_pending()
+    if next_run is not None and not getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False):
+        schedule_dispatch(next_run)
+    return sent
@@ -0,0 +1,121 @@
+"""
+Teams gelen webhook'unu taklit eden yerel sunucu
+
+Bildirim gönderimini gerçek Teams kanalı olmadan denemek için kullanılır.
+Gelen kartlar kaydedilir; sunucu belirli oranda 429 ya da 500 döndürecek ve
+yanıtı geciktirecek şekilde ayarlanabilir.
+
+    server = TeamsStubServer(rate_limit=2, rate_period=1).start()
+    ... TEAMS_WEBHOOK_URL = server.url ...
+    server.received  # alınan kartlar
+    server.stop()
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'TeamsStub/1.0'
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        status, headers = stub.decide()
+        if stub.delay:
+            time.sleep(stub.delay)
+        if status == 200:
+            try:
+                card = json.loads(body or b'null')
+            except ValueError:
+                status = 400
+            else:
+                stub.record(self.path, card)
+
+        payload = b'1' if status == 200 else f'Hata {status}'.encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if self.server.stub.verbose:
+            super().log_message(format, *args)
+
+
+class TeamsStubServer:
+    """
+    Args:
+        host, port: Dinlenecek adres; port 0 ise boş bir port seçilir
+        rate_limit, rate_period: Bu sınır aşılınca Retry-After ile 429 döner
+        error_rate: 0-1 arası, rastgele 500 döndürme oranı
+        delay: Her yanıttan önce beklenecek süre (saniye), zaman aşımı denemek için
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, rate_limit=None, rate_period=60,
+                 error_rate=0.0, delay=0.0, verbose=False):
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        self.error_rate = error_rate
+        self.delay = delay
+        self.verbose = verbose
+        self.received = []
+        self.responses = {}  # durum kodu -> sayı
+        self._requests = []  # hız sınırı için istek zamanları
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/webhook'
+
+    def decide(self):
+        """Sıradaki isteğin yanıt kodunu ve ek başlıklarını belirler"""
+        with self._lock:
+            now = time.monotonic()
+            status, headers = 200, {}
+            if self.rate_limit is not None:
+                self._requests = [t for t in self._requests if now - t < self.rate_period]
+                if len(self._requests) >= self.rate_limit:
+                    retry_after = self.rate_period - (now - self._requests[0])
+                    status, headers = 429, {'Retry-After': str(max(int(retry_after + 0.999), 1))}
+                else:
+                    self._requests.append(now)
+            if status == 200 and self.error_rate and random.random() < self.error_rate:
+                status = 500
+            self.responses[status] = self.responses.get(status, 0) + 1
+            return status, headers
+
+    def record(self, path, card):
+        with self._lock:
+            self.received.append({'path': path, 'card': card, 'received_at': time.time()})
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
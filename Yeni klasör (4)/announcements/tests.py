@@ -0,0 +1,276 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import notifications
+from .models import Announcement, AnnouncementFile, Tag, TeamsNotification
+from .tasks import dispatch_teams_notifications
+from .teams_stub import TeamsStubServer
+
+
+User = get_user_model()
+
+TEAMS_TEST_CONFIG = {
+    'RATE_LIMIT': 10,
+    'RATE_PERIOD': 3600,        # testler süresince pencere değişmez
+    'DIGEST_THRESHOLD': 3,
+    'MAX_ATTEMPTS': 3,
+    'BACKOFF_BASE': 10,
+    'BACKOFF_MAX': 60 * 60,
+    'CONNECT_TIMEOUT': 1,
+    'READ_TIMEOUT': 1,
+}
+
+
+class TeamsNotificationDispatchTests(TestCase):
+    """Bildirim gönderimi, yerel Teams taklit sunucusuna karşı"""
+
+    def setUp(self):
+        caches['default'].clear()
+        self.server = TeamsStubServer().start()
+        self.addCleanup(self.server.stop)
+        settings_override = override_settings(
+            TEAMS_WEBHOOK_URL=self.server.url, TEAMS_NOTIFICATIONS=TEAMS_TEST_CONFIG,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.author = User.objects.create_user(username='yazar', password='x')
+
+    def create_announcements(self, count, status='published'):
+        now = timezone.now()
+        return [
+            Announcement.objects.create(
+                title=f'Duyuru {i}', content='İçerik', product='Ürün', status=status,
+                start_date=now, end_date=now + timezone.timedelta(days=1), author=self.author,
+            )
+            for i in range(count)
+        ]
+
+    def notification(self, announcement):
+        return TeamsNotification.objects.get(announcement=announcement)
+
+    def make_due(self):
+        TeamsNotification.objects.filter(status='pending').update(next_attempt_at=timezone.now())
+
+    def test_single_announcement_is_sent_as_its_own_card(self):
+        announcement, = self.create_announcements(1)
+
+        sent, next_run = notifications.dispatch_pending()
+
+        self.assertEqual((sent, next_run), (1, None))
+        self.assertEqual(len(self.server.received), 1)
+        self.assertEqual(self.server.received[0]['card']['summary'], 'Yeni Duyuru: Duyuru 0')
+        self.assertEqual(self.notification(announcement).status, 'sent')
+
+    def test_announcements_below_threshold_are_sent_one_by_one(self):
+        self.create_announcements(2)
+
+        sent, _next_run = notifications.dispatch_pending()
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(len(self.server.received), 2)
+
+    def test_announcements_at_threshold_are_coalesced_into_one_digest(self):
+        self.create_announcements(5)
+
+        sent, next_run = notifications.dispatch_pending()
+
+        self.assertEqual((sent, next_run), (5, None))
+        self.assertEqual(len(self.server.received), 1)
+        card = self.server.received[0]['card']
+        self.assertEqual(card['summary'], '5 yeni duyuru')
+        self.assertEqual(len(card['sections'][0]['text'].splitlines()), 5)
+        self.assertFalse(TeamsNotification.objects.exclude(status='sent').exists())
+
+    def test_rate_limit_is_applied_per_webhook(self):
+        other = TeamsStubServer().start()
+        self.addCleanup(other.stop)
+        with override_settings(TEAMS_NOTIFICATIONS={**TEAMS_TEST_CONFIG, 'RATE_LIMIT': 2, 'DIGEST_THRESHOLD': 100}):
+            announcements = self.create_announcements(3)
+            notifications.enqueue_notifications([announcements[0].pk], webhook_url=other.url)
+
+            sent, next_run = notifications.dispatch_pending()
+
+        # Birinci webhook'un sınırı iki istek; ikinci webhook bundan etkilenmez
+        self.assertEqual(sent, 3)
+        self.assertEqual(len(self.server.received), 2)
+        self.assertEqual(len(other.received), 1)
+        self.assertGreater(next_run, 0)
+
+        waiting = TeamsNotification.objects.get(webhook_url=self.server.url, status='pending')
+        self.assertEqual(waiting.attempts, 0)
+        self.assertGreater(waiting.next_attempt_at, timezone.now())
+
+        # Bekleyen bildirim sınır açılana kadar yeniden alınmaz
+        self.assertEqual(notifications.dispatch_pending()[0], 0)
+        self.assertEqual(self.server.responses, {200: 2})
+
+    def test_server_error_is_retried_with_backoff(self):
+        announcement, = self.create_announcements(1)
+        self.server.error_rate = 1.0
+
+        before = timezone.now()
+        sent, next_run = notifications.dispatch_pending()
+
+        self.assertEqual(sent, 0)
+        notification = self.notification(announcement)
+        self.assertEqual((notification.status, notification.attempts), ('pending', 1))
+        self.assertEqual(notification.last_error, 'Sunucu hatası: 500')
+        # BACKOFF_BASE * (0.8 - 1.2)
+        delay = (notification.next_attempt_at - before).total_seconds()
+        self.assertTrue(8 <= delay <= 13, delay)
+        self.assertTrue(0 < next_run <= 13, next_run)
+
+        self.make_due()
+        notifications.dispatch_pending()
+        notification = self.notification(announcement)
+        self.assertEqual(notification.attempts, 2)
+        # İkinci denemede bekleme iki katına çıkar
+        delay = (notification.next_attempt_at - timezone.now()).total_seconds()
+        self.assertTrue(15 <= delay <= 25, delay)
+
+        self.server.error_rate = 0.0
+        self.make_due()
+        self.assertEqual(notifications.dispatch_pending(), (1, None))
+        notification = self.notification(announcement)
+        self.assertEqual((notification.status, notification.attempts), ('sent', 3))
+        self.assertEqual(notification.last_error, '')
+
+    def test_server_errors_stop_after_max_attempts(self):
+        announcement, = self.create_announcements(1)
+        self.server.error_rate = 1.0
+
+        for _attempt in range(TEAMS_TEST_CONFIG['MAX_ATTEMPTS']):
+            self.make_due()
+            notifications.dispatch_pending()
+
+        notification = self.notification(announcement)
+        self.assertEqual((notification.status, notification.attempts), ('failed', 3))
+        self.make_due()
+        self.assertEqual(notifications.dispatch_pending(), (0, None))
+        self.assertEqual(self.server.responses, {500: 3})
+
+    def test_too_many_requests_waits_for_retry_after(self):
+        self.server.rate_limit, self.server.rate_period = 1, 120
+        _first, second = self.create_announcements(2)
+
+        before = timezone.now()
+        sent, _next_run = notifications.dispatch_pending()
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(self.server.responses, {200: 1, 429: 1})
+        limited = self.notification(second)
+        self.assertEqual((limited.status, limited.attempts), ('pending', 1))
+        self.assertIn('429', limited.last_error)
+        # Retry-After geri çekilme süresinden uzun olduğundan ona uyulur
+        self.assertGreaterEqual((limited.next_attempt_at - before).total_seconds(), 119)
+
+    def test_withdrawn_announcement_is_not_sent(self):
+        announcement, = self.create_announcements(1)
+        Announcement.objects.filter(pk=announcement.pk).update(status='archived')
+
+        self.assertEqual(notifications.dispatch_pending(), (0, None))
+        self.assertEqual(self.server.received, [])
+        self.assertEqual(self.notification(announcement).status, 'failed')
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_eager_task_does_not_reschedule_itself(self):
+        self.create_announcements(1)
+        self.server.error_rate = 1.0
+
+        with mock.patch.object(notifications, 'schedule_dispatch') as schedule_dispatch:
+            self.assertEqual(dispatch_teams_notifications(), 0)
+
+        schedule_dispatch.assert_not_called()
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=False)
+    def test_task_reschedules_itself_for_retries(self):
+        self.create_announcements(1)
+        self.server.error_rate = 1.0
+
+        with mock.patch.object(notifications, 'schedule_dispatch') as schedule_dispatch:
+            dispatch_teams_notifications()
+
+        schedule_dispatch.assert_called_once()
+
+
+async def run_serially(*funcs):
+    """
+    run_concurrently yerine; sorgular test işleminin bağlantısında çalışır ve sayılır
+    """
+    return [await sync_to_async(func)() for func in funcs]
+
+
+@override_settings(STORAGES={
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+})
+@mock.patch('announcements.views.run_concurrently', run_serially)
+class AnnouncementPageQueryTests(TestCase):
+    """Liste sayfalarının sorgu sayısı duyuru sayısıyla artmamalı"""
+
+    PAGES = [
+        ('announcement_dashboard', {}, {}),
+        ('announcement_list', {}, {}),
+        ('announcement_list', {}, {'status': 'published', 'tag_match': 'all'}),
+        ('announcement_by_type', {'announcement_type': 'planned_work'}, {}),
+        ('archived_announcements', {}, {}),
+    ]
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='yonetici', email='y@example.com', password='x')
+        self.client.force_login(self.user)
+        self.tags = [Tag.objects.create(name=f'etiket{i}') for i in range(4)]
+        self.created = 0
+
+    def create_announcements(self, count):
+        """Farklı yazar, etiket, dosya, tür ve durumlarda duyurular"""
+        now = timezone.now()
+        for _i in range(count):
+            n = self.created
+            self.created += 1
+            author = User.objects.create_user(username=f'yazar{n}', password='x')
+            for status in ('published', 'archived'):
+                announcement = Announcement.objects.create(
+                    title=f'Duyuru {n}', content='İçerik', product='Ürün', status=status,
+                    announcement_type=Announcement.TYPE_CHOICES[n % 3][0], pinned=n % 4 == 0,
+                    start_date=now - timezone.timedelta(hours=1), end_date=now + timezone.timedelta(days=1),
+                    author=author,
+                )
+                announcement.tags.set(self.tags[:n % 4 + 1])
+                AnnouncementFile.objects.create(announcement=announcement, file_name=f'dosya{n}.pdf', blob_key='k')
+
+    def page_url(self, name, kwargs, params):
+        url = reverse(name, kwargs=kwargs)
+        if 'tag_match' in params:
+            params = {**params, 'tags': [tag.pk for tag in self.tags[:2]]}
+        return url, params
+
+    def count_queries(self, name, kwargs, params):
+        # Önbelleğe alınmış parçalar sorguları gizlemesin
+        caches['default'].clear()
+        url, params = self.page_url(name, kwargs, params)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries)
+
+    def test_query_count_does_not_grow_with_announcements(self):
+        self.create_announcements(4)
+        expected = [self.count_queries(*page) for page in self.PAGES]
+
+        self.create_announcements(8)
+        for page, count in zip(self.PAGES, expected):
+            with self.subTest(page=page[0], params=page[2]):
+                caches['default'].clear()
+                url, params = self.page_url(*page)
+                with self.assertNumQueries(count):
+                    response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200)
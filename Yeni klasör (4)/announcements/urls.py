@@ -6,10 +6,12 @@ urlpatterns = [
     path('', views.announcement_dashboard, name='announcement_dashboard'),
     path('list/', views.announcement_list, name='announcement_list'),
     path('<int:pk>/', views.announcement_detail, name='announcement_detail'),
+    path('read-all/', views.announcement_mark_all_read, name='announcement_mark_all_read'),
     
     # Duyuru türlerine göre görünümler
     path('type/<str:announcement_type>/', views.announcement_by_type, name='announcement_by_type'),
     path('archived/', views.archived_announcements, name='archived_announcements'),
+    path('feed/<str:feed_format>/', views.announcement_feed, name='announcement_feed'),
     
     # Duyuru yönetimi
     path('create/', views.announcement_create, name='announcement_create'),
@@ -22,5 +24,8 @@ urlpatterns = [
     path('tag/create/', views.tag_create, name='tag_create'),
     
     # Dosya yönetimi
+    path('<int:pk>/files/upload/', views.file_upload, name='file_upload'),
+    path('file/<int:pk>/', views.file_download, name='file_download'),
+    path('file/<int:pk>/preview/', views.file_preview, name='file_preview'),
     path('file/<int:pk>/delete/', views.file_delete, name='file_delete'),
 ]
\ No newline at end of file
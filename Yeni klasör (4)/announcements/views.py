@@ -1,70 +1,96 @@
+import os
+
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib import messages
-from django.utils import timezone
-from django.db.models import Q
-from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.db.models import Q, Count
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseBadRequest, HttpResponseNotModified, JsonResponse,
+)
+from django.utils.http import parse_etags, parse_http_date_safe, url_has_allowed_host_and_scheme, urlencode
+from django.views.decorators.http import require_POST, require_http_methods
 from django.core.paginator import Paginator
 
-from .models import Announcement, Tag, AnnouncementFile
+from core.async_views import alogin_required, arender, run_concurrently
+from core.cache import cache_for_models
+from core.serving import serve_blob
+
+from .models import Announcement, AnnouncementFile
+from .attachments import save_attachments
+from .facets import tag_facets
+from .reads import get_read_state, mark_all_read, mark_read, read_ratio
+from . import feeds
+from .search import attach_snippets, search_announcements
 from .forms import AnnouncementForm, AnnouncementFilterForm, TagForm, AnnouncementFileForm
 
-@login_required
-def announcement_dashboard(request):
-    """Duyurular ve Planlı Çalışmalar için dashboard görünümü"""
-    # Sabitlenmiş ve aktif duyurular
-    pinned_announcements = Announcement.objects.filter(
-        status='published',
-        pinned=True,
-        start_date__lte=timezone.now(),
-        end_date__gte=timezone.now()
-    ).order_by('-created_at')[:5]
-    
-    # Son duyurular (sabitlenmemiş)
-    recent_announcements = Announcement.objects.filter(
-        status='published',
-        pinned=False,
-        start_date__lte=timezone.now(),
-        end_date__gte=timezone.now()
-    ).order_by('-created_at')[:5]
-    
-    # Duyuru türlerine göre sayılar
-    announcement_count = Announcement.objects.filter(announcement_type='announcement', status='published').count()
-    planned_work_count = Announcement.objects.filter(announcement_type='planned_work', status='published').count()
-    information_count = Announcement.objects.filter(announcement_type='information', status='published').count()
-    archived_count = Announcement.objects.filter(status='archived').count()
+@cache_for_models(Announcement)
+def announcement_counts():
+    """Duyuru türlerine göre sayıları tek sorguda hesaplar"""
+    published = Q(status='published')
+    return Announcement.objects.aggregate(
+        announcement=Count('id', filter=published & Q(announcement_type='announcement')),
+        planned_work=Count('id', filter=published & Q(announcement_type='planned_work')),
+        information=Count('id', filter=published & Q(announcement_type='information')),
+        archived=Count('id', filter=Q(status='archived')),
+    )
+
+
+@cache_for_models(Announcement, settings.AUTH_USER_MODEL)
+def active_announcements(limit=5):
+    """
+    Yayında olan sabitlenmiş ve son duyurular; tek sorgu
+
+    Yayın ve bitiş anlarında durum zamanlayıcı tarafından değiştirildiğinden
+    yalnızca duruma göre süzülür; tarih koşulu gerekmez.
+
+    Returns:
+        tuple: (sabitlenmiş, son duyurular)
+    """
+    return Announcement.objects.dashboard_lists(limit)
+
+
+@alogin_required
+async def announcement_dashboard(request):
+    """Duyurular ve Planlı Çalışmalar için dashboard görünümü; sorgular eşzamanlı çalışır"""
+    # Sabitlenmiş ve aktif duyurular, son duyurular ve türlere göre sayılar
+    (pinned_announcements, recent_announcements), counts, unread_ids = await run_concurrently(
+        active_announcements,
+        announcement_counts,
+        lambda: get_read_state(request.user).unread_ids(),
+    )
     
     context = {
         'pinned_announcements': pinned_announcements,
         'recent_announcements': recent_announcements,
-        'announcement_count': announcement_count,
-        'planned_work_count': planned_work_count,
-        'information_count': information_count,
-        'archived_count': archived_count,
+        'announcement_count': counts['announcement'],
+        'planned_work_count': counts['planned_work'],
+        'information_count': counts['information'],
+        'archived_count': counts['archived'],
+        'unread_ids': set(unread_ids),
+        'unread_count': len(unread_ids),
     }
     
-    return render(request, 'announcements/dashboard.html', context)
+    return await arender(request, 'announcements/dashboard.html', context)
 
 @login_required
 def announcement_list(request):
     """Tüm duyuruları listeler ve filtreleme sağlar"""
     filter_form = AnnouncementFilterForm(request.GET)
-    announcements = Announcement.objects.all()
+    announcements = Announcement.objects.for_display()
     
     # Filtreleme işlemleri
     if filter_form.is_valid():
-        title = filter_form.cleaned_data.get('title')
+        query = filter_form.cleaned_data.get('q')
         announcement_type = filter_form.cleaned_data.get('announcement_type')
         priority = filter_form.cleaned_data.get('priority')
         product = filter_form.cleaned_data.get('product')
         status = filter_form.cleaned_data.get('status')
-        tags = filter_form.cleaned_data.get('tags')
         date_from = filter_form.cleaned_data.get('date_from')
         date_to = filter_form.cleaned_data.get('date_to')
         
-        if title:
-            announcements = announcements.filter(title__icontains=title)
+        if query:
+            announcements = search_announcements(query, announcements)
         
         if announcement_type:
             announcements = announcements.filter(announcement_type=announcement_type)
@@ -78,8 +104,7 @@ def announcement_list(request):
         if status:
             announcements = announcements.filter(status=status)
         
-        if tags:
-            announcements = announcements.filter(tags__in=tags).distinct()
+        announcements = filter_form.filter_tags(announcements)
         
         if date_from:
             announcements = announcements.filter(start_date__gte=date_from)
@@ -91,17 +116,31 @@ def announcement_list(request):
     if not request.GET:
         announcements = announcements.filter(status='published')
     
-    # Sıralama: Önce sabitlenmiş, sonra oluşturma tarihine göre
-    announcements = announcements.order_by('-pinned', '-created_at')
+    search_query = filter_form.cleaned_data.get('q') if filter_form.is_valid() else ''
+    filter_data = filter_form.cleaned_data if filter_form.is_valid() else {}
+    filter_form.set_tag_facets(tag_facets(
+        status=filter_data.get('status') or ('published' if not request.GET else None),
+        announcement_type=filter_data.get('announcement_type'),
+    ))
+    
+    # Sıralama: aramada alaka, değilse önce sabitlenmiş, sonra oluşturma tarihine göre
+    if not search_query:
+        announcements = announcements.order_by('-pinned', '-created_at')
     
     # Sayfalama
     paginator = Paginator(announcements, 10)  # Her sayfada 10 duyuru
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    if search_query:
+        attach_snippets(page_obj, search_query)
+    unread_ids = get_read_state(request.user).unread_ids()
     
     context = {
         'filter_form': filter_form,
         'page_obj': page_obj,
+        'search_query': search_query,
+        'unread_ids': set(unread_ids),
+        'unread_count': len(unread_ids),
     }
     
     return render(request, 'announcements/announcement_list.html', context)
@@ -115,12 +154,41 @@ def announcement_detail(request, pk):
     if announcement.status == 'archived':
         messages.warning(request, 'Bu duyuru arşivlenmiştir.')
     
+    # Geçmiş listesi için sıkıştırılmış farklar yüklenmez
+    revisions = []
+    if request.user.has_perm('announcements.view_announcementrevision'):
+        revisions = list(announcement.revisions.select_related('user').defer('previous', 'text_delta'))
+
+    mark_read(request.user, announcement)
+    # Okunma oranını yazar ve düzenleme yetkisi olanlar görür
+    read_stats = None
+    if announcement.author_id == request.user.pk or request.user.has_perm('announcements.change_announcement'):
+        read_stats = read_ratio(announcement)
+
     context = {
         'announcement': announcement,
+        'revisions': revisions,
+        'read_stats': read_stats,
     }
     
     return render(request, 'announcements/announcement_detail.html', context)
 
+@login_required
+@require_POST
+def announcement_mark_all_read(request):
+    """Yayındaki tüm duyuruları okundu işaretler"""
+    count = mark_all_read(request.user)
+    message = f'{count} duyuru okundu olarak işaretlendi.'
+
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return JsonResponse({'status': 'success', 'message': message, 'count': count})
+
+    messages.success(request, message)
+    next_url = request.POST.get('next')
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        next_url = 'announcement_list'
+    return redirect(next_url)
+
 @login_required
 @permission_required('announcements.add_announcement', raise_exception=True)
 def announcement_create(request):
@@ -130,17 +198,14 @@ def announcement_create(request):
         if form.is_valid():
             announcement = form.save(commit=False)
             announcement.author = request.user
+            announcement._history_user = request.user
             announcement.save()
             form.save_m2m()  # ManyToMany ilişkilerini kaydet (etiketler)
             
-            # Dosya yükleme işlemi
-            files = request.FILES.getlist('file')
-            for f in files:
-                AnnouncementFile.objects.create(
-                    announcement=announcement,
-                    file=f,
-                    file_name=f.name
-                )
+            # Dosyalar içerik adresli depoya yazılır, önizlemeler arka planda üretilir
+            _attachments, errors = save_attachments(request, announcement)
+            for error in errors:
+                messages.warning(request, error)
             
             messages.success(request, 'Duyuru başarıyla oluşturuldu.')
             
@@ -186,16 +251,13 @@ def announcement_update(request, pk):
     if request.method == 'POST':
         form = AnnouncementForm(request.POST, instance=announcement)
         if form.is_valid():
+            announcement._history_user = request.user
             form.save()
             
-            # Dosya yükleme işlemi
-            files = request.FILES.getlist('file')
-            for f in files:
-                AnnouncementFile.objects.create(
-                    announcement=announcement,
-                    file=f,
-                    file_name=f.name
-                )
+            # Dosyalar içerik adresli depoya yazılır, önizlemeler arka planda üretilir
+            _attachments, errors = save_attachments(request, announcement)
+            for error in errors:
+                messages.warning(request, error)
             
             messages.success(request, 'Duyuru başarıyla güncellendi.')
             
@@ -239,6 +301,7 @@ def announcement_update(request, pk):
 def announcement_delete(request, pk):
     """Duyuru silme"""
     announcement = get_object_or_404(Announcement, pk=pk)
+    announcement._history_user = request.user
     announcement.delete()
     
     messages.success(request, 'Duyuru başarıyla silindi.')
@@ -259,6 +322,7 @@ def announcement_delete(request, pk):
 def announcement_archive(request, pk):
     """Duyuruyu arşivleme"""
     announcement = get_object_or_404(Announcement, pk=pk)
+    announcement._history_user = request.user
     announcement.archive()
     
     messages.success(request, 'Duyuru başarıyla arşivlendi.')
@@ -279,6 +343,7 @@ def announcement_archive(request, pk):
 def announcement_publish(request, pk):
     """Duyuruyu yayınlama"""
     announcement = get_object_or_404(Announcement, pk=pk)
+    announcement._history_user = request.user
     announcement.publish()
     
     messages.success(request, 'Duyuru başarıyla yayınlandı.')
@@ -305,22 +370,21 @@ def announcement_by_type(request, announcement_type):
         return redirect('announcement_list')
     
     # Duyuruları filtrele
-    announcements = Announcement.objects.filter(
+    announcements = Announcement.objects.for_display().filter(
         announcement_type=announcement_type,
         status='published'
     )
     
     # Ek filtreleme işlemleri
     if filter_form.is_valid():
-        title = filter_form.cleaned_data.get('title')
+        query = filter_form.cleaned_data.get('q')
         priority = filter_form.cleaned_data.get('priority')
         product = filter_form.cleaned_data.get('product')
-        tags = filter_form.cleaned_data.get('tags')
         date_from = filter_form.cleaned_data.get('date_from')
         date_to = filter_form.cleaned_data.get('date_to')
         
-        if title:
-            announcements = announcements.filter(title__icontains=title)
+        if query:
+            announcements = search_announcements(query, announcements)
         
         if priority:
             announcements = announcements.filter(priority=priority)
@@ -328,8 +392,7 @@ def announcement_by_type(request, announcement_type):
         if product:
             announcements = announcements.filter(product__icontains=product)
         
-        if tags:
-            announcements = announcements.filter(tags__in=tags).distinct()
+        announcements = filter_form.filter_tags(announcements)
         
         if date_from:
             announcements = announcements.filter(start_date__gte=date_from)
@@ -337,13 +400,19 @@ def announcement_by_type(request, announcement_type):
         if date_to:
             announcements = announcements.filter(end_date__lte=date_to)
     
-    # Sıralama: Önce sabitlenmiş, sonra oluşturma tarihine göre
-    announcements = announcements.order_by('-pinned', '-created_at')
+    search_query = filter_form.cleaned_data.get('q') if filter_form.is_valid() else ''
+    filter_form.set_tag_facets(tag_facets(status='published', announcement_type=announcement_type))
+    
+    # Sıralama: aramada alaka, değilse önce sabitlenmiş, sonra oluşturma tarihine göre
+    if not search_query:
+        announcements = announcements.order_by('-pinned', '-created_at')
     
     # Sayfalama
     paginator = Paginator(announcements, 10)  # Her sayfada 10 duyuru
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    if search_query:
+        attach_snippets(page_obj, search_query)
     
     # Türe göre başlık belirleme
     type_titles = {
@@ -355,30 +424,31 @@ def announcement_by_type(request, announcement_type):
     context = {
         'filter_form': filter_form,
         'page_obj': page_obj,
+        'announcements': page_obj,
+        'search_query': search_query,
         'announcement_type': announcement_type,
         'type_title': type_titles.get(announcement_type, 'Duyurular')
     }
     
-    return render(request, 'announcements/announcement_by_type.html', context)
+    return render(request, 'announcements/announcement_type_list.html', context)
 
 @login_required
 def archived_announcements(request):
     """Arşivlenmiş duyuruları listeler"""
     filter_form = AnnouncementFilterForm(request.GET)
-    announcements = Announcement.objects.filter(status='archived')
+    announcements = Announcement.objects.for_display().filter(status='archived')
     
     # Filtreleme işlemleri
     if filter_form.is_valid():
-        title = filter_form.cleaned_data.get('title')
+        query = filter_form.cleaned_data.get('q')
         announcement_type = filter_form.cleaned_data.get('announcement_type')
         priority = filter_form.cleaned_data.get('priority')
         product = filter_form.cleaned_data.get('product')
-        tags = filter_form.cleaned_data.get('tags')
         date_from = filter_form.cleaned_data.get('date_from')
         date_to = filter_form.cleaned_data.get('date_to')
         
-        if title:
-            announcements = announcements.filter(title__icontains=title)
+        if query:
+            announcements = search_announcements(query, announcements)
         
         if announcement_type:
             announcements = announcements.filter(announcement_type=announcement_type)
@@ -389,8 +459,7 @@ def archived_announcements(request):
         if product:
             announcements = announcements.filter(product__icontains=product)
         
-        if tags:
-            announcements = announcements.filter(tags__in=tags).distinct()
+        announcements = filter_form.filter_tags(announcements)
         
         if date_from:
             announcements = announcements.filter(start_date__gte=date_from)
@@ -398,17 +467,26 @@ def archived_announcements(request):
         if date_to:
             announcements = announcements.filter(end_date__lte=date_to)
     
-    # Sıralama: Oluşturma tarihine göre
-    announcements = announcements.order_by('-created_at')
+    search_query = filter_form.cleaned_data.get('q') if filter_form.is_valid() else ''
+    filter_data = filter_form.cleaned_data if filter_form.is_valid() else {}
+    filter_form.set_tag_facets(tag_facets(status='archived', announcement_type=filter_data.get('announcement_type')))
+    
+    # Sıralama: aramada alaka, değilse oluşturma tarihine göre
+    if not search_query:
+        announcements = announcements.order_by('-created_at')
     
     # Sayfalama
     paginator = Paginator(announcements, 10)  # Her sayfada 10 duyuru
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    if search_query:
+        attach_snippets(page_obj, search_query)
     
     context = {
         'filter_form': filter_form,
         'page_obj': page_obj,
+        'announcements': page_obj,
+        'search_query': search_query,
     }
     
     return render(request, 'announcements/archived_announcements.html', context)
@@ -466,4 +544,97 @@ def file_delete(request, pk):
         })
     
     messages.success(request, 'Dosya başarıyla silindi.')
-    return redirect('announcement_update', pk=announcement_pk)
\ No newline at end of file
+    return redirect('announcement_update', pk=announcement_pk)
+
+@login_required
+@permission_required('announcements.change_announcement', raise_exception=True)
+@require_POST
+def file_upload(request, pk):
+    """Var olan duyuruya dosya ekleme (AJAX)"""
+    announcement = get_object_or_404(Announcement, pk=pk)
+    attachments, errors = save_attachments(request, announcement)
+    if not attachments and not errors:
+        return JsonResponse({'status': 'error', 'errors': ['Dosya seçilmedi.']}, status=400)
+
+    return JsonResponse({
+        'status': 'success' if not errors else 'partial',
+        'files': [
+            {'id': attachment.pk, 'name': attachment.file_name, 'url': attachment.get_absolute_url()}
+            for attachment in attachments
+        ],
+        'errors': errors,
+    }, status=201 if attachments else 400)
+
+def _visible_file(request, pk):
+    """Kullanıcının görebileceği duyuruya ait dosya; taslakları yalnızca düzenleyebilenler görür"""
+    file = get_object_or_404(AnnouncementFile.objects.select_related('announcement'), pk=pk)
+    if file.announcement.status == 'draft' and not request.user.has_perm('announcements.change_announcement'):
+        raise Http404
+    return file
+
+@login_required
+@require_http_methods(['GET', 'HEAD'])
+def file_download(request, pk):
+    """
+    Duyuru dosyasını indirir
+
+    Aktarım önde nginx/Apache varsa onlara devredilir (core/serving.py); bayt
+    aralığı istekleri desteklenir.
+    """
+    file = _visible_file(request, pk)
+    if file.blob_key:
+        return serve_blob(request, file.blob_key, file.file_name, content_type=file.content_type or None)
+    if file.file:
+        # Paylaşımlı depoya geçilmeden önce yüklenmiş dosya
+        return FileResponse(file.file.open('rb'), as_attachment=True, filename=file.file_name)
+    raise Http404
+
+@login_required
+@require_http_methods(['GET', 'HEAD'])
+def file_preview(request, pk):
+    """Dosyanın arka planda üretilmiş küçük resim önizlemesi"""
+    file = _visible_file(request, pk)
+    if not file.has_preview:
+        raise Http404
+    preview_name = f"{os.path.splitext(file.file_name)[0]}.jpg"
+    return serve_blob(request, file.preview_key, preview_name, content_type='image/jpeg', as_attachment=False)
+@require_http_methods(['GET', 'HEAD'])
+def announcement_feed(request, feed_format):
+    """
+    Yayındaki duyuruların RSS, Atom ya da JSON akışı
+
+    type, product ve tag parametreleriyle süzülebilir. Oturum ya da
+    ANNOUNCEMENT_FEEDS['TOKEN'] ile erişilir; ETag eşleşirse veritabanına
+    gidilmeden 304 döner.
+    """
+    if feed_format not in feeds.FEED_FORMATS:
+        raise Http404
+    config = feeds.get_config()
+    if not feeds.token_allowed(request, config['TOKEN']) and not request.user.is_authenticated:
+        response = HttpResponse('Kimlik doğrulaması gerekli.', status=401, content_type='text/plain; charset=utf-8')
+        response['WWW-Authenticate'] = 'Bearer realm="announcements"'
+        return response
+    try:
+        filters = feeds.feed_filters(request.GET)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    key = feeds.feed_key(feed_format, filters)
+    etag = feeds.feed_etag(key)
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and etag in parse_etags(if_none_match):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    feed_url = feeds.absolute_url(request.path) + (f"?{urlencode(filters)}" if filters else '')
+    entry = feeds.get_feed(feed_format, filters, feed_url, key=key)
+    headers = feeds.feed_headers(etag, entry['last_modified'])
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    if not if_none_match and if_modified_since and entry['last_modified'] <= if_modified_since:
+        return HttpResponseNotModified(headers=headers)
+
+    body = b'' if request.method == 'HEAD' else entry['body']
+    response = HttpResponse(body, content_type=entry['content_type'], headers=headers)
+    response['Content-Length'] = str(len(entry['body']))
+    return response
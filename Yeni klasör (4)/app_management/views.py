@@ -1,30 +1,64 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db.models import Q, Count
+from core.async_views import alogin_required, arender, run_concurrently
+from core.cache import cache_for_models
+
 from .models import Server, Application, ApplicationLog, MaintenanceRecord, ApplicationDocument
 from .forms import ServerForm, ApplicationForm, MaintenanceRecordForm, ApplicationDocumentForm
 
-@login_required
-def dashboard_view(request):
-    """Ana dashboard görünümü"""
-    servers = Server.objects.all()
-    applications = Application.objects.all()
-    
-    # Son 5 uygulama logu
-    recent_logs = ApplicationLog.objects.all().order_by('-timestamp')[:5]
-    
-    # Yaklaşan bakımlar
-    upcoming_maintenance = MaintenanceRecord.objects.filter(
+def _status_aggregates(model):
+    """Toplam ve her durum için koşullu sayım ifadeleri"""
+    aggregates = {'total': Count('id')}
+    for status, _ in model.STATUS_CHOICES:
+        aggregates[status] = Count('id', filter=Q(status=status))
+    return aggregates
+
+
+@cache_for_models(Server)
+def server_status_counts():
+    return Server.objects.aggregate(**_status_aggregates(Server))
+
+
+@cache_for_models(Application)
+def application_status_counts():
+    return Application.objects.aggregate(**_status_aggregates(Application))
+
+
+@cache_for_models(ApplicationLog, Application)
+def recent_application_logs(limit=5):
+    return list(ApplicationLog.objects.select_related(
+        'application', 'user'
+    ).order_by('-timestamp')[:limit])
+
+
+@cache_for_models(MaintenanceRecord, Application)
+def upcoming_application_maintenance(limit=5):
+    return list(MaintenanceRecord.objects.filter(
         status__in=['scheduled', 'in_progress']
-    ).order_by('scheduled_start')[:5]
+    ).select_related('application').order_by('scheduled_start')[:limit])
+
+
+@alogin_required
+async def dashboard_view(request):
+    """Ana dashboard görünümü; her model için tek sorgu, sorgular eşzamanlı çalışır"""
+    server_counts, application_counts, recent_logs, upcoming_maintenance = await run_concurrently(
+        server_status_counts,
+        application_status_counts,
+        recent_application_logs,
+        upcoming_application_maintenance,
+    )
     
-    return render(request, 'app_management/dashboard.html', {
-        'servers': servers,
-        'applications': applications,
+    return await arender(request, 'app_management/dashboard.html', {
+        'servers': Server.objects.all(),
+        'applications': Application.objects.all(),
         'recent_logs': recent_logs,
         'upcoming_maintenance': upcoming_maintenance,
-        'server_count': servers.count(),
-        'application_count': applications.count(),
+        'server_count': server_counts['total'],
+        'application_count': application_counts['total'],
+        'server_status_counts': server_counts,
+        'application_status_counts': application_counts,
     })
 
 @login_required
@@ -112,7 +112,7 @@ class CertificateNotification(models.Model):
     certificate = models.ForeignKey(Certificate, on_delete=models.CASCADE, related_name="notifications", verbose_name="Sertifika")
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPE_CHOICES, verbose_name="Bildirim Türü")
     sent_date = models.DateTimeField(default=timezone.now, verbose_name="Gönderilme Tarihi")
-    sent_to = models.ManyToManyField(User, related_name="certificate_notifications", verbose_name="Alıcılar")
+    sent_to = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name="certificate_notifications", verbose_name="Alıcılar")
     message = models.TextField(verbose_name="Mesaj")
     acknowledged = models.BooleanField(default=False, verbose_name="Onaylandı")
     acknowledged_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="acknowledged_notifications", verbose_name="Onaylayan")
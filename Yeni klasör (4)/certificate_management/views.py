@@ -1,47 +1,70 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import Q, Count
 from django.utils import timezone
+from core.async_views import alogin_required, arender, run_concurrently
+from core.cache import cache_for_models
+
 from .models import CertificateType, Certificate, CertificateRenewal, CertificateNotification
 from .forms import (
     CertificateTypeForm, CertificateForm, CertificateRenewalForm, 
     CertificateNotificationForm, CertificateFilterForm, CertificateRenewalFilterForm
 )
 
-@login_required
-def certificate_dashboard(request):
-    """Sertifika yönetimi dashboard görünümü"""
-    # Sertifika istatistikleri
-    total_certificates = Certificate.objects.count()
-    active_certificates = Certificate.objects.filter(status='active').count()
-    expired_certificates = Certificate.objects.filter(status='expired').count()
-    revoked_certificates = Certificate.objects.filter(status='revoked').count()
-    pending_certificates = Certificate.objects.filter(status='pending').count()
-    
-    # Yakında süresi dolacak sertifikalar
-    today = timezone.now().date()
-    thirty_days_later = today + timezone.timedelta(days=30)
-    expiring_soon = Certificate.objects.filter(
+@cache_for_models(Certificate)
+def certificate_status_counts():
+    """Sertifika sayılarını duruma göre tek sorguda hesaplar"""
+    return Certificate.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status='active')),
+        expired=Count('id', filter=Q(status='expired')),
+        revoked=Count('id', filter=Q(status='revoked')),
+        pending=Count('id', filter=Q(status='pending')),
+    )
+
+
+@cache_for_models(Certificate, CertificateType)
+def expiring_certificates(today, days=30):
+    """Yakında süresi dolacak sertifikalar; tarih anahtara girdiğinden gün değişince yenilenir"""
+    return list(Certificate.objects.filter(
         status='active',
         expiry_date__gt=today,
-        expiry_date__lte=thirty_days_later
-    ).order_by('expiry_date')
-    
-    # Son yenileme işlemleri
-    recent_renewals = CertificateRenewal.objects.all().order_by('-renewal_date')[:5]
-    
-    # Son bildirimler
-    recent_notifications = CertificateNotification.objects.filter(
+        expiry_date__lte=today + timezone.timedelta(days=days)
+    ).select_related('certificate_type').order_by('expiry_date'))
+
+
+@cache_for_models(CertificateRenewal, Certificate)
+def recent_certificate_renewals(limit=5):
+    return list(CertificateRenewal.objects.select_related(
+        'certificate'
+    ).order_by('-renewal_date')[:limit])
+
+
+@cache_for_models(CertificateNotification, Certificate)
+def unacknowledged_notifications(limit=5):
+    return list(CertificateNotification.objects.filter(
         acknowledged=False
-    ).order_by('-sent_date')[:5]
+    ).select_related('certificate').order_by('-sent_date')[:limit])
+
+
+@alogin_required
+async def certificate_dashboard(request):
+    """Sertifika yönetimi dashboard görünümü; bağımsız sorgular eşzamanlı çalışır"""
+    today = timezone.now().date()
+    counts, expiring_soon, recent_renewals, recent_notifications = await run_concurrently(
+        certificate_status_counts,
+        lambda: expiring_certificates(today),
+        recent_certificate_renewals,
+        unacknowledged_notifications,
+    )
     
-    return render(request, 'certificate_management/dashboard.html', {
-        'total_certificates': total_certificates,
-        'active_certificates': active_certificates,
-        'expired_certificates': expired_certificates,
-        'revoked_certificates': revoked_certificates,
-        'pending_certificates': pending_certificates,
+    return await arender(request, 'certificate_management/dashboard.html', {
+        'total_certificates': counts['total'],
+        'active_certificates': counts['active'],
+        'expired_certificates': counts['expired'],
+        'revoked_certificates': counts['revoked'],
+        'pending_certificates': counts['pending'],
         'expiring_soon': expiring_soon,
         'recent_renewals': recent_renewals,
         'recent_notifications': recent_notifications,
@@ -1 +1,4 @@
-# Django yapılandırma paketi
\ No newline at end of file
+# Django yapılandırma paketi
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
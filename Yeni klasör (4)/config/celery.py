@@ -0,0 +1,37 @@
+"""
+Celery uygulaması
+
+Ayarlar Django ayarlarındaki CELERY_ önekli değerlerden okunur; aracı profili
+için core/queues.py, yönlendirme ve zamanlama için config/settings.py'ye bakın.
+
+Worker:  python manage.py celery_worker ingest
+Beat:    celery -A config beat -l info
+"""
+import os
+
+from celery import Celery
+from kombu import Queue
+
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Kuyruklar açıkça tanımlanır; yanlış yazılmış bir yönlendirme sessizce yeni kuyruk açmaz
+app.conf.task_queues = [
+    Queue('default'),
+    Queue('ingest'),
+    Queue('notifications'),
+    Queue('maintenance'),
+]
+app.conf.task_create_missing_queues = False
+
+app.autodiscover_tasks()
+
+
+@app.on_after_configure.connect
+def setup_metrics(sender, **kwargs):
+    # Görev süreleri ve hatalar /metrics uç noktasında yayımlanır (core/metrics.py)
+    from core.metrics import connect_celery_signals
+    connect_celery_signals()
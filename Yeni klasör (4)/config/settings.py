@@ -1,6 +1,11 @@
 import os
+import sys
+from datetime import timedelta
 from pathlib import Path
 
+from core.db import database_from_env
+from core.queues import broker_profile
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -10,6 +15,9 @@ SECRET_KEY = 'django-insecure-your-secret-key-here'
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+# manage.py test ile çalışırken True
+TESTING = sys.argv[1:2] == ['test']
+
 ALLOWED_HOSTS = []
 
 # Application definition
@@ -25,33 +33,47 @@ INSTALLED_APPS = [
     # Üçüncü parti uygulamalar
     'crispy_forms',
     'crispy_bootstrap5',
+    'ckeditor',
     
     # Proje uygulamaları
+    'core',
     'app_management',
     'inventory_management',
     'certificate_management',
     'server_management',
     'user_management',
+    'nobet_listesi',
+    'announcements',
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.profiling.SQLProfilerMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Şablonlar DEBUG kapalıyken bir kez derlenip süreç boyunca bellekte tutulur
+            'loaders': TEMPLATE_LOADERS if DEBUG else [
+                ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -66,12 +88,71 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+# DATABASE_URL verilmişse PostgreSQL (kalıcı bağlantı, isteğe bağlı PgBouncer),
+# verilmemişse WAL kipinde SQLite kullanılır. Ayrıntılar için core/db.py.
 
 DATABASES = {
+    'default': database_from_env(BASE_DIR),
+}
+
+# Önbellek
+# 'default' süreç içi LRU + paylaşımlı önbellekten oluşan iki katmanlı arka uçtur.
+# Paylaşımlı katman REDIS_URL verilmişse Redis, yoksa dosya tabanlı önbellektir.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'BACKEND': 'core.cache.TwoTierCache',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'SHARED_ALIAS': 'shared',
+            'LOCAL_MAX_ENTRIES': 1000,
+            'LOCAL_TIMEOUT': 60,
+        },
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+        'KEY_PREFIX': 'portal',
+    } if os.environ.get('REDIS_URL') else {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+}
+
+# Model sürümlerine bağlı önbellek kayıtlarının varsayılan saklama süresi (saniye)
+CACHE_MODEL_TIMEOUT = 60 * 60
+
+# {% cachefragment %} ile önbelleğe alınan şablon parçalarının saklama süresi (saniye)
+FRAGMENT_CACHE_TIMEOUT = CACHE_MODEL_TIMEOUT
+
+# İstek başına SQL profili
+# Kapalıyken yalnızca personel kullanıcıların X-SQL-Profile başlığıyla gönderdiği
+# istekler profillenir. Üretimde düşük SAMPLE_RATE ile açık tutulabilir.
+SQL_PROFILER = {
+    'ENABLED': os.environ.get('SQL_PROFILER_ENABLED', 'False') == 'True',
+    'SAMPLE_RATE': float(os.environ.get('SQL_PROFILER_SAMPLE_RATE', '0.01')),
+    'QUERY_BUDGET': 30,
+    'TIME_BUDGET_MS': 250,
+    'DUPLICATE_THRESHOLD': 5,
+    'TOP_N': 50,
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.profiling': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
 }
 
 # Password validation
@@ -109,11 +190,66 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+    'core.staticfiles.BundleFinder',
+]
+
+# Bölüm başına tek CSS ve tek JS paketi (core/staticfiles.py). Kaynaklar sırayla
+# birleştirilir; .min. içermeyenler küçültülür. Bootstrap, Font Awesome, jQuery
+# gibi kütüphaneler static/vendor depoya eklenene kadar şablonlarda CDN'den
+# yüklenir (bkz. vendor_assets); eklendiğinde buradaki paketlere taşınabilir.
+STATIC_BUNDLES = {
+    'bundles/main.css': [
+        'css/style.css',
+    ],
+    'bundles/main.js': [
+        'js/script.js',
+    ],
+    'bundles/nobet.css': [
+        'css/custom.css',
+    ],
+    'bundles/nobet.js': [
+        'js/custom.js',
+    ],
+}
+STATIC_BUNDLE_ROOT = os.path.join(BASE_DIR, 'static_bundles')
+
+# Önde nginx gibi bir sunucu yoksa statik dosyaları DEBUG kapalıyken Django sunar
+SERVE_STATIC = os.environ.get('SERVE_STATIC', '').lower() in ('1', 'true', 'yes')
 
 # Media files
 MEDIA_URL = 'media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Paylaşımlı depolama: web ve worker sunucularının birlikte eriştiği dosya deposu.
+# Birden fazla sunucuda ortak bir dizin (NFS vb.) bağlanmalı ya da 'blobs' deposu
+# S3 uyumlu bir arka uçla (ör. storages.backends.s3boto3.S3Boto3Storage) değiştirilmelidir.
+SHARED_STORAGE_ROOT = os.environ.get('SHARED_STORAGE_ROOT', os.path.join(BASE_DIR, 'shared_storage'))
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # collectstatic: özetli dosya adları, manifest ve .gz/.br kopyaları. Geliştirmede
+    # ve testlerde manifest olmadığından özetsiz adlar kullanılır.
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG or TESTING
+        else 'core.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+    'blobs': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        'OPTIONS': {
+            'location': SHARED_STORAGE_ROOT,
+        },
+    },
+}
+
+# Parçalı yükleme ayarları
+UPLOAD_CHUNK_SIZE = 2 * 1024 * 1024  # DATA_UPLOAD_MAX_MEMORY_SIZE (2.5 MB) altında kalmalı
+UPLOAD_MAX_SIZE = 200 * 1024 * 1024
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -138,4 +274,131 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # Geliştirme
 # EMAIL_USE_TLS = True
 # EMAIL_HOST_USER = 'your-email@example.com'
 # EMAIL_HOST_PASSWORD = 'your-password'
-# DEFAULT_FROM_EMAIL = 'your-email@example.com'
\ No newline at end of file
+# DEFAULT_FROM_EMAIL = 'your-email@example.com'
+# Duyuru eklerinin indirilmesi (core/serving.py): izin denetiminden sonra aktarım
+# nginx (X-Accel-Redirect), Apache (X-Sendfile) ya da Django tarafından yapılır
+BLOB_SERVE = {
+    'BACKEND': os.environ.get('BLOB_SERVE_BACKEND', 'django'),  # django | nginx | sendfile
+    'ACCEL_PREFIX': '/protected-blobs/',
+}
+ATTACHMENT_MAX_SIZE = 100 * 1024 * 1024
+
+# Bildirimlerdeki bağlantılar için sitenin dışarıdan erişilen adresi
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost:8000')
+
+# Teams bildirimleri (announcements/notifications.py)
+# Yerel deneme için: python manage.py teams_stub_server ve
+# TEAMS_WEBHOOK_URL=http://127.0.0.1:8765/webhook
+TEAMS_WEBHOOK_URL = os.environ.get('TEAMS_WEBHOOK_URL') or None
+TEAMS_NOTIFICATIONS = {
+    'CONNECT_TIMEOUT': 3,
+    'READ_TIMEOUT': 10,
+    'RATE_LIMIT': 4,           # webhook başına RATE_PERIOD saniyede en fazla istek
+    'RATE_PERIOD': 60,
+    'COALESCE_SECONDS': 10,
+    'DIGEST_THRESHOLD': 3,
+    'MAX_ATTEMPTS': 8,
+}
+
+# Duyuru geçmişi (core/history.py): eski değişiklikler gün başına bire indirilir,
+# saklama süresini aşanlar silinir (compact_announcement_history)
+ANNOUNCEMENT_HISTORY = {
+    'COMPACT_AFTER_DAYS': 30,
+    'RETENTION_DAYS': 365,
+}
+
+# Duyuru akışları (/announcements/feed/<rss|atom|json>/, announcements/feeds.py)
+# Betikler Authorization: Bearer <token> ya da ?token= ile erişir
+ANNOUNCEMENT_FEEDS = {
+    'SIZE': 50,
+    'TIMEOUT': 24 * 60 * 60,
+    'TOKEN': os.environ.get('ANNOUNCEMENT_FEED_TOKEN') or None,
+}
+
+# Prometheus metrikleri (/metrics, core/metrics.py)
+# Birden çok worker süreci varsa hepsi aynı METRICS_DIR'i kullanmalı; dizin her
+# dağıtımda, süreçler başlamadan önce boşaltılmalıdır.
+METRICS = {
+    'ENABLED': os.environ.get('METRICS_ENABLED', '1') == '1',
+    'DIRECTORY': os.environ.get('METRICS_DIR') or None,
+    'FLUSH_INTERVAL': 5,
+    'TOKEN': os.environ.get('METRICS_TOKEN') or None,
+    'ALLOWED_IPS': ('127.0.0.1', '::1'),
+    'ROW_COUNT_MODELS': (
+        'nobet_listesi.FetchLog',
+        'nobet_listesi.AuditLog',
+        'app_management.ApplicationLog',
+        'server_management.ServerMonitoringLog',
+    ),
+}
+
+# Celery
+# Aracı profili ortamdan seçilir (core/queues.py): CELERY_PROFILE=broker|local|eager.
+# Testler ve geliştirme için varsayılan 'eager': görevler dış servis olmadan çalışır.
+_celery_profile = broker_profile(BASE_DIR)
+CELERY_PROFILE = _celery_profile['PROFILE']
+CELERY_BROKER_URL = _celery_profile['BROKER_URL']
+CELERY_BROKER_TRANSPORT_OPTIONS = _celery_profile.get('BROKER_TRANSPORT_OPTIONS', {})
+CELERY_RESULT_BACKEND = _celery_profile['RESULT_BACKEND']
+CELERY_RESULT_EXPIRES = 24 * 60 * 60
+CELERY_TASK_ALWAYS_EAGER = _celery_profile['TASK_ALWAYS_EAGER']
+CELERY_TASK_EAGER_PROPAGATES = _celery_profile.get('TASK_EAGER_PROPAGATES', False)
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_RESULT_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+
+# Kuyruklar: ağır içe aktarma, gecikmeye duyarlı bildirimler ve bakım işleri
+# birbirini beklemez. Yönlendirilmeyen görevler 'default' kuyruğuna gider.
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'nobet_listesi.tasks.fetch_data_from_source': {'queue': 'ingest'},
+    'nobet_listesi.tasks.process_uploaded_file': {'queue': 'ingest'},
+    'announcements.tasks.send_teams_notification': {'queue': 'notifications'},
+    'announcements.tasks.dispatch_teams_notifications': {'queue': 'notifications'},
+    'announcements.tasks.archive_expired_announcements': {'queue': 'maintenance'},
+    'announcements.tasks.compact_announcement_history': {'queue': 'maintenance'},
+    'nobet_listesi.tasks.fetch_due_sources': {'queue': 'maintenance'},
+    'core.tasks.purge_stale_upload_sessions': {'queue': 'maintenance'},
+}
+# İçe aktarma görevleri bitince onaylanır; worker çökerse görev kaybolmaz, yeniden çalışır
+CELERY_TASK_ANNOTATIONS = {
+    'nobet_listesi.tasks.fetch_data_from_source': {'acks_late': True, 'reject_on_worker_lost': True},
+    'nobet_listesi.tasks.process_uploaded_file': {'acks_late': True, 'reject_on_worker_lost': True},
+}
+
+# Kuyruk başına worker ayarları: python manage.py celery_worker <kuyruk>
+#   concurrency         eşzamanlı görev sayısı
+#   prefetch_multiplier worker'ın önceden aldığı görev sayısı (concurrency ile çarpılır);
+#                       uzun görevlerde 1 olmalı, yoksa kısa görevler uzunların arkasında bekler
+#   max_tasks_per_child bellek sızıntılarına karşı süreç bu kadar görevden sonra yenilenir
+CELERY_WORKER_PROFILES = {
+    'ingest': {'concurrency': 2, 'prefetch_multiplier': 1, 'max_tasks_per_child': 50},
+    'notifications': {'concurrency': 8, 'prefetch_multiplier': 4},
+    'maintenance': {'concurrency': 1, 'prefetch_multiplier': 1},
+    'default': {'concurrency': 2, 'prefetch_multiplier': 2},
+}
+
+CELERY_BEAT_SCHEDULE = {
+    'archive-expired-announcements': {
+        'task': 'announcements.tasks.archive_expired_announcements',
+        'schedule': timedelta(minutes=5),
+    },
+    # Yeniden denemeler görevin kendini ertelemesiyle yapılır; bu giriş yedektir
+    'dispatch-teams-notifications': {
+        'task': 'announcements.tasks.dispatch_teams_notifications',
+        'schedule': timedelta(minutes=1),
+    },
+    'compact-announcement-history': {
+        'task': 'announcements.tasks.compact_announcement_history',
+        'schedule': timedelta(days=1),
+    },
+    'fetch-due-sources': {
+        'task': 'nobet_listesi.tasks.fetch_due_sources',
+        'schedule': timedelta(minutes=15),
+    },
+    'purge-stale-upload-sessions': {
+        'task': 'core.tasks.purge_stale_upload_sessions',
+        'schedule': timedelta(hours=6),
+    },
+}
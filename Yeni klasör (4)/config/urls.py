@@ -1,20 +1,31 @@
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import RedirectView
 
+from core.views import metrics, static_file
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics, name='metrics'),
     path('', RedirectView.as_view(url='user/', permanent=False)),
+    path('core/', include('core.urls')),
     path('app/', include('app_management.urls')),
     path('inventory/', include('inventory_management.urls')),
     path('certificates/', include('certificate_management.urls')),
     path('servers/', include('server_management.urls')),
     path('user/', include('user_management.urls')),
+    path('nobet/', include('nobet_listesi.urls')),
+    path('announcements/', include('announcements.urls')),
 ]
 
 # Medya dosyaları için URL yapılandırması (sadece geliştirme ortamında)
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
+    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+elif settings.SERVE_STATIC:
+    # Önde statik dosyaları sunan bir sunucu yoksa: sıkıştırılmış kopyalar ve süresiz önbellek
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), static_file),
+    ]
\ No newline at end of file
@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+    verbose_name = _('Ortak Altyapı')
+
+    def ready(self):
+        # Model sürüm sayaçlarını güncelleyen sinyalleri yükle
+        import core.signals
+
+        # SQLite bağlantılarına WAL ve diğer PRAGMA'ları uygula
+        from django.db.backends.signals import connection_created
+        from .db import configure_connection
+        connection_created.connect(configure_connection, dispatch_uid='core.db.configure_connection')
+
+        # İstek başına sorgu sayımı (core.metrics.MetricsMiddleware)
+        from .metrics import install_query_counter
+        connection_created.connect(install_query_counter, dispatch_uid='core.metrics.install_query_counter')
@@ -0,0 +1,103 @@
+"""
+Asenkron görünümler için yardımcılar
+
+Django 4.2'de async ORM çağrıları (acount, aaggregate, ...) tek bir ortak iş
+parçacığında sırayla çalışır; asyncio.gather ile birlikte çağrılsalar da
+birbirini bekler. Bağımsız sorguları gerçekten eşzamanlı çalıştırmak için
+run_concurrently her birini ayrı bir iş parçacığında ve dolayısıyla ayrı bir
+veritabanı bağlantısında çalıştırır.
+"""
+import asyncio
+import functools
+from urllib.parse import urlparse
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.db import close_old_connections, connection
+from django.shortcuts import render, resolve_url
+
+from .profiling import current_recorder
+
+
+def _isolated(func):
+    """
+    Fonksiyonu iş parçacığının kendi bağlantısıyla çalıştırır
+
+    İş havuzundaki bağlantılar istek sonunda kapatılmadığından, CONN_MAX_AGE
+    süresi dolanlar çalıştırmadan önce ve sonra kapatılır. Etkin bir SQL
+    profili varsa sorgular ona da kaydedilir.
+    """
+    @functools.wraps(func)
+    def wrapper():
+        close_old_connections()
+        try:
+            recorder = current_recorder()
+            if recorder is None:
+                return func()
+            with connection.execute_wrapper(recorder):
+                return func()
+        finally:
+            close_old_connections()
+    return wrapper
+
+
+async def run_concurrently(*funcs):
+    """
+    Senkron fonksiyonları ayrı iş parçacıklarında eşzamanlı çalıştırır
+
+    Toplam süre en yavaş fonksiyonun süresine yaklaşır. Fonksiyonlar sonuçlarını
+    tamamen değerlendirilmiş olarak (list(), aggregate() vb.) döndürmelidir.
+
+    Örnek:
+        counts, lists = await run_concurrently(server_counts, lambda: server_lists(today))
+
+    Returns:
+        list: Fonksiyonlarla aynı sırada sonuçlar
+    """
+    return await asyncio.gather(*(
+        sync_to_async(_isolated(func), thread_sensitive=False)() for func in funcs
+    ))
+
+
+async def arender(request, template_name, context=None, **kwargs):
+    """
+    Şablonu iş parçacığında işler
+
+    Bağlam işlemcileri ve şablonlar oturum, mesajlar gibi tembel nesnelere
+    erişebildiğinden işleme senkron bağlamda yapılır.
+    """
+    return await sync_to_async(render)(request, template_name, context, **kwargs)
+
+
+async def aget_user(request):
+    """request.user'ı veritabanına erişerek çözer; sonraki erişimler önbellekten gelir"""
+    def resolve():
+        user = request.user
+        user.is_authenticated  # tembel nesneyi çöz
+        return user
+    return await sync_to_async(resolve)()
+
+
+def alogin_required(view_func):
+    """
+    Asenkron görünümler için login_required
+
+    Django 4.2'deki login_required asenkron görünümleri desteklemez.
+    """
+    @functools.wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        user = await aget_user(request)
+        if user.is_authenticated:
+            return await view_func(request, *args, **kwargs)
+
+        path = request.build_absolute_uri()
+        login_url = resolve_url(settings.LOGIN_URL)
+        # Aynı sunucudaysa yalnızca yolu kullan (login_required ile aynı davranış)
+        login_scheme, login_netloc = urlparse(login_url)[:2]
+        current_scheme, current_netloc = urlparse(path)[:2]
+        if (not login_scheme or login_scheme == current_scheme) and \
+                (not login_netloc or login_netloc == current_netloc):
+            path = request.get_full_path()
+        return redirect_to_login(path, login_url)
+    return wrapper
@@ -0,0 +1,479 @@
+"""
+Önemli görünüm, görev ve dışa aktarmaların süre ölçümleri
+
+Sonuçlar JSON olarak yazılır; aynı veri (seed_scale) üzerinde farklı
+sürümlerin sonuçları karşılaştırılabilir.
+"""
+import importlib
+import platform
+import statistics
+import time
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+
+
+class Benchmark:
+    """
+    Tek bir ölçüm tanımı
+
+    prepare() ölçülecek fonksiyonu döndürür; gerekli veri ya da uygulama yoksa
+    None döner ve ölçüm atlanır.
+    """
+
+    def __init__(self, name, app_label, prepare):
+        self.name = name
+        self.app_label = app_label
+        self.prepare = prepare
+
+
+def view(url_name, method='get', data=None, kwargs=None, expect=200):
+    """Görünüm ölçümü; kwargs ve data çağrılabilir olursa ölçümden önce çözülür"""
+    def prepare():
+        url_kwargs = kwargs() if callable(kwargs) else kwargs
+        if url_kwargs is False:
+            return None
+        payload = data() if callable(data) else data
+        if payload is False:
+            return None
+        try:
+            url = reverse(url_name, kwargs=url_kwargs)
+        except NoReverseMatch:
+            return None
+
+        def run(client):
+            response = getattr(client, method)(url, payload or {})
+            if response.status_code != expect:
+                raise AssertionError(f'{url} beklenmeyen yanıt: {response.status_code}')
+            # Akış yanıtlarının içeriği de ölçüme dahil olmalı
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            return response
+        return run
+    return prepare
+
+
+def task(path, args=None, rollback=False):
+    """
+    Görev ya da yardımcı fonksiyon ölçümü (Celery olmadan doğrudan çağrılır)
+
+    rollback=True ise veri değiştiren görev her çalıştırmada geri alınan bir
+    işlem içinde çalışır; tekrarlanan ölçümler aynı veri üzerinde yapılır.
+    """
+    def prepare():
+        module_name, func_name = path.rsplit('.', 1)
+        try:
+            func = getattr(importlib.import_module(module_name), func_name)
+        except (ImportError, AttributeError):
+            return None
+        call_args = args() if callable(args) else (args or ())
+        if call_args is False:
+            return None
+        func = getattr(func, 'run', func)  # Celery görevleri için asıl fonksiyon
+
+        def run(client):
+            if not rollback:
+                return func(*call_args)
+            with transaction.atomic():
+                try:
+                    return func(*call_args)
+                finally:
+                    transaction.set_rollback(True)
+        return run
+    return prepare
+
+
+def _first_pk(model_path, **filters):
+    def resolve():
+        model = apps.get_model(model_path)
+        pk = model.objects.filter(**filters).order_by('pk').values_list('pk', flat=True).first()
+        return {'pk': pk} if pk is not None else False
+    return resolve
+
+
+def _largest_shift_list_export(export_format):
+    def resolve():
+        from django.db.models import Count
+        ShiftList = apps.get_model('nobet_listesi.ShiftList')
+        shift_list = ShiftList.objects.filter(is_published=True).annotate(
+            shift_total=Count('shifts')
+        ).order_by('-shift_total').first()
+        if shift_list is None:
+            return False
+        return {'format': export_format, 'shift_list': shift_list.pk,
+                'include_contact_info': 'on'}
+    return resolve
+
+
+def rendered(template_name, context):
+    """
+    Şablon işleme ölçümü
+
+    context() her çalıştırmada tembel QuerySet'lerle yeni bağlam üretir; böylece
+    önbellekteki şablon parçalarının atladığı sorgular da ölçüme yansır. --cold
+    ile parçalar her çalıştırmada yeniden işlenir.
+    """
+    def prepare():
+        try:
+            template = get_template(template_name)
+        except TemplateDoesNotExist:
+            return None
+        if context() is False:
+            return None
+        user = {}
+
+        def run(client):
+            from django.contrib.auth import get_user
+            request = RequestFactory().get('/')
+            request.session = client.session
+            if 'user' not in user:
+                user['user'] = get_user(request)
+            request.user = user['user']
+            return template.render(context(), request)
+        return run
+    return prepare
+
+
+def _shift_list_detail_context():
+    from django.db.models import Count
+    ShiftList = apps.get_model('nobet_listesi.ShiftList')
+    shift_list = ShiftList.objects.annotate(shift_total=Count('shifts')).order_by('-shift_total').first()
+    if shift_list is None:
+        return False
+    shifts = shift_list.shifts.select_related('doctor').order_by('date', 'start_time')
+    return {'shift_list': shift_list, 'shifts': shifts, 'doctors': shifts, 'show_contact_info': False}
+
+
+def _shift_form_context():
+    from nobet_listesi.forms import ShiftListForm
+    context = _shift_list_detail_context()
+    if context is False:
+        return False
+    return {'form': ShiftListForm(instance=context['shift_list']), 'shift_list': context['shift_list'],
+            'shifts': context['shifts']}
+
+
+def _announcement_type_list_context():
+    from django.core.paginator import Paginator
+    from announcements.forms import AnnouncementFilterForm
+    Announcement = apps.get_model('announcements.Announcement')
+    announcements = Announcement.objects.select_related('author').order_by('-created_at')
+    return {
+        'announcements': Paginator(announcements, 20).get_page(1),
+        'filter_form': AnnouncementFilterForm(),
+        'announcement_type': 'announcement',
+        'type_display': 'Duyuru',
+    }
+
+
+def _certificate_dashboard_context():
+    from django.db.models import Count, F
+    from django.utils.functional import SimpleLazyObject
+    Certificate = apps.get_model('certificate_management.Certificate')
+    certificates = Certificate.objects.all()
+    type_counts = certificates.values('certificate_type__name').annotate(count=Count('id'))
+    return {
+        'status_counts': certificates.values('status').annotate(count=Count('id')).order_by('status'),
+        'type_counts': SimpleLazyObject(lambda: [
+            {'certificate_type': row['certificate_type__name'], 'count': row['count']} for row in type_counts
+        ]),
+        'server_counts': certificates.values(server_name=F('domain_name')).annotate(
+            count=Count('id')).order_by('-count')[:10],
+        'recent_certificates': certificates.order_by('-updated_at')[:5],
+        'expiry_counts': {},
+    }
+
+
+BENCHMARKS = [
+    # Dashboardlar
+    Benchmark('certificate_dashboard', 'certificate_management', view('certificate_dashboard')),
+    Benchmark('server_dashboard', 'server_management', view('server_dashboard')),
+    Benchmark('inventory_dashboard', 'inventory_management', view('inventory_dashboard')),
+    Benchmark('app_dashboard', 'app_management', view('dashboard')),
+    Benchmark('user_dashboard', 'user_management', view('user_dashboard')),
+    Benchmark('nobet_dashboard', 'nobet_listesi', view('nobet_dashboard')),
+
+    # Listeler
+    Benchmark('certificate_list', 'certificate_management', view('certificate_list')),
+    Benchmark('server_list', 'server_management', view('server_list')),
+    Benchmark('server_monitoring_log_list', 'server_management', view('server_monitoring_log_list')),
+    Benchmark('inventory_item_list', 'inventory_management', view('inventory_item_list')),
+    Benchmark('shift_list_view', 'nobet_listesi', view('shift_list_view')),
+    Benchmark('shift_list_detail', 'nobet_listesi',
+              view('shift_list_detail', kwargs=_first_pk('nobet_listesi.ShiftList'))),
+    Benchmark('audit_log_list', 'nobet_listesi', view('audit_log_list')),
+    Benchmark('doctor_autocomplete', 'nobet_listesi', view('doctor_autocomplete', data={'q': 'yıl'})),
+
+    # Asenkron JSON uç noktaları
+    Benchmark('notification_counts', 'user_management', view('notification_counts')),
+    Benchmark('shift_calendar', 'nobet_listesi',
+              view('shift_calendar', data={'start': '2024-01-01', 'end': '2024-01-31'})),
+    Benchmark('on_call', 'nobet_listesi', view('on_call', data={'date': '2024-01-15', 'time': '03:00'})),
+
+    # Dışa aktarmalar
+    Benchmark('export_shift_list_csv', 'nobet_listesi',
+              view('export_shift_list', method='post', data=_largest_shift_list_export('csv'))),
+    Benchmark('export_shift_list_excel', 'nobet_listesi',
+              view('export_shift_list', method='post', data=_largest_shift_list_export('excel'))),
+
+    # Şablon işleme (önbellekteki parçalarla; --cold ile parçalar her seferinde işlenir)
+    Benchmark('render_shift_list_detail', 'nobet_listesi',
+              rendered('nobet_listesi/shift_list_detail.html', _shift_list_detail_context)),
+    Benchmark('render_shift_form', 'nobet_listesi',
+              rendered('nobet_listesi/shift_form.html', _shift_form_context)),
+    Benchmark('render_announcement_type_list', 'announcements',
+              rendered('announcements/announcement_type_list.html', _announcement_type_list_context)),
+    Benchmark('render_certificate_dashboard', 'certificate_management',
+              rendered('certificate_management/certificate_dashboard.html', _certificate_dashboard_context)),
+
+    # Görevler
+    Benchmark('rebuild_doctor_search_index', 'nobet_listesi',
+              task('nobet_listesi.search.rebuild_doctor_search_index')),
+    Benchmark('archive_expired_announcements', 'announcements',
+              task('announcements.tasks.archive_expired_announcements', rollback=True)),
+]
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = min(int(round(percent / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def measure(run, client, repeat=5, warmup=1, cold=False):
+    """
+    Fonksiyonu ölçer
+
+    Args:
+        cold (bool): Her çalıştırmadan önce önbelleği boşalt
+
+    Returns:
+        dict: Süre istatistikleri (ms) ve sorgu sayısı
+    """
+    for _ in range(warmup):
+        if cold:
+            caches['default'].clear()
+        run(client)
+
+    timings = []
+    queries = []
+    for _ in range(repeat):
+        if cold:
+            caches['default'].clear()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            run(client)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured.captured_queries))
+
+    return {
+        'runs': repeat,
+        'min_ms': round(min(timings), 2),
+        'median_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+        'max_ms': round(max(timings), 2),
+        'queries': max(queries),
+    }
+
+
+def row_counts():
+    """Ölçümlerin hangi veri hacminde yapıldığını kaydetmek için tablo boyutları"""
+    counts = {}
+    for model_path in [
+        'nobet_listesi.Doctor', 'nobet_listesi.Shift', 'nobet_listesi.AuditLog',
+        'certificate_management.Certificate', 'server_management.Server',
+        'server_management.ServerMonitoringLog', 'inventory_management.InventoryItem',
+    ]:
+        app_label = model_path.split('.')[0]
+        if apps.is_installed(app_label):
+            counts[model_path] = apps.get_model(model_path).objects.count()
+    return counts
+
+
+def run_benchmarks(user, only=None, repeat=5, warmup=1, cold=False, progress=None):
+    """
+    Tanımlı ölçümleri çalıştırır
+
+    Returns:
+        dict: Ortam bilgileri ve ölçüm sonuçları
+    """
+    client = Client()
+    client.force_login(user)
+
+    results = {}
+    allowed_hosts = list(settings.ALLOWED_HOSTS) + ['testserver']
+    with override_settings(ALLOWED_HOSTS=allowed_hosts):
+        for benchmark in BENCHMARKS:
+            if only and benchmark.name not in only:
+                continue
+            if not apps.is_installed(benchmark.app_label):
+                results[benchmark.name] = {'skipped': f'{benchmark.app_label} yüklü değil'}
+                continue
+            run = benchmark.prepare()
+            if run is None:
+                results[benchmark.name] = {'skipped': 'ölçüm için veri yok'}
+                continue
+            try:
+                results[benchmark.name] = measure(run, client, repeat, warmup, cold)
+            except Exception as e:
+                results[benchmark.name] = {'error': f'{type(e).__name__}: {e}'}
+            if progress:
+                progress(benchmark.name, results[benchmark.name])
+
+    return {
+        'timestamp': timezone.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'cache': settings.CACHES['default']['BACKEND'],
+            'debug': settings.DEBUG,
+        },
+        'options': {'repeat': repeat, 'warmup': warmup, 'cold': cold},
+        'row_counts': row_counts(),
+        'results': results,
+    }
+
+
+# Veritabanı ölçümleri
+
+SQLITE_PROFILES = {
+    # Django'nun varsayılan SQLite davranışı: geri alma günlüğü, her işlemde fsync
+    'default': {'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+    # core.db ile uygulanan ayarlar
+    'tuned': None,
+}
+
+
+def _sqlite_connect(path, profile):
+    import sqlite3
+    from .db import apply_sqlite_pragmas, sqlite_pragmas
+
+    pragmas = SQLITE_PROFILES[profile] or sqlite_pragmas()
+    timeout = pragmas.get('busy_timeout', 5000) / 1000
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    apply_sqlite_pragmas(conn, pragmas)
+    return conn
+
+
+def sqlite_concurrency(path, profile, readers=4, writers=2, duration=5.0, rows=10_000):
+    """
+    Eşzamanlı okuma ve yazma hızını ölçer
+
+    Okuyucular aralık sorguları, yazarlar 10 satırlık işlemler çalıştırır
+    (Celery içe aktarmasını andırır). 'database is locked' hataları sayılır.
+    """
+    import random
+    import sqlite3
+    import threading
+
+    conn = _sqlite_connect(path, profile)
+    conn.execute('DROP TABLE IF EXISTS bench_items')
+    conn.execute('CREATE TABLE bench_items (id INTEGER PRIMARY KEY, name TEXT, value REAL)')
+    conn.execute('BEGIN')
+    conn.executemany('INSERT INTO bench_items (name, value) VALUES (?, ?)',
+                     ((f'kayit {i}', i * 0.5) for i in range(rows)))
+    conn.execute('COMMIT')
+    conn.close()
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    totals = {'reads': 0, 'writes': 0, 'read_errors': 0, 'write_errors': 0}
+    write_latencies = []
+
+    def reader(index):
+        rng = random.Random(index)
+        local = _sqlite_connect(path, profile)
+        reads = errors = 0
+        while not stop.is_set():
+            start = rng.randrange(rows)
+            try:
+                local.execute('SELECT COUNT(*), AVG(value) FROM bench_items WHERE id BETWEEN ? AND ?',
+                              (start, start + 100)).fetchone()
+                reads += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        local.close()
+        with lock:
+            totals['reads'] += reads
+            totals['read_errors'] += errors
+
+    def writer(index):
+        rng = random.Random(1000 + index)
+        local = _sqlite_connect(path, profile)
+        writes = errors = 0
+        latencies = []
+        while not stop.is_set():
+            began = time.perf_counter()
+            try:
+                local.execute('BEGIN IMMEDIATE')
+                local.executemany('INSERT INTO bench_items (name, value) VALUES (?, ?)',
+                                  [(f'yeni {index}', rng.random()) for _ in range(10)])
+                local.execute('COMMIT')
+                writes += 1
+                latencies.append((time.perf_counter() - began) * 1000)
+            except sqlite3.OperationalError:
+                errors += 1
+                if local.in_transaction:
+                    local.execute('ROLLBACK')
+        local.close()
+        with lock:
+            totals['writes'] += writes
+            totals['write_errors'] += errors
+            write_latencies.extend(latencies)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'profile': profile,
+        'readers': readers,
+        'writers': writers,
+        'duration_s': duration,
+        'reads_per_s': round(totals['reads'] / duration, 1),
+        'writes_per_s': round(totals['writes'] / duration, 1),
+        'read_errors': totals['read_errors'],
+        'write_errors': totals['write_errors'],
+        'write_p95_ms': round(_percentile(write_latencies, 95), 2) if write_latencies else None,
+    }
+
+
+def connection_reuse(iterations=200):
+    """
+    Yapılandırılmış veritabanında her istekte yeni bağlantı açmak ile
+    bağlantıyı yeniden kullanmayı karşılaştırır
+    """
+    def run(reuse):
+        connection.close()
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if not reuse:
+                connection.close()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+        return (time.perf_counter() - start) * 1000 / iterations
+
+    return {
+        'database': connection.vendor,
+        'iterations': iterations,
+        'new_connection_ms': round(run(False), 3),
+        'persistent_connection_ms': round(run(True), 3),
+        'conn_max_age': connection.settings_dict.get('CONN_MAX_AGE'),
+    }
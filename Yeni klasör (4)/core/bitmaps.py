@@ -0,0 +1,73 @@
+"""
+Tam sayı id kümeleri için sıkıştırılmış bit haritası
+
+Küme, en küçük id'den (base) başlayan bir bit dizisi olarak tutulur; birbirine
+yakın id'ler (ör. son yayınlanan duyurular) birkaç bayt yer kaplar. Veritabanında
+base bir tam sayı alanında, bitler BinaryField'da saklanır.
+
+Örnek:
+    bitmap = IdBitmap(state.bitmap_base, state.bitmap)
+    bitmap.add(1042)
+    state.bitmap_base, state.bitmap = bitmap.base, bitmap.to_bytes()
+"""
+
+
+class IdBitmap:
+
+    def __init__(self, base=0, data=b''):
+        self.base = base or 0
+        self.bits = int.from_bytes(bytes(data or b''), 'little')
+
+    @classmethod
+    def from_ids(cls, ids):
+        bitmap = cls()
+        for value in ids:
+            bitmap.add(value)
+        return bitmap
+
+    def __contains__(self, value):
+        offset = value - self.base
+        return offset >= 0 and bool((self.bits >> offset) & 1)
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def __bool__(self):
+        return bool(self.bits)
+
+    def __iter__(self):
+        bits, value = self.bits, self.base
+        while bits:
+            low = bits & -bits
+            offset = low.bit_length() - 1
+            yield value + offset
+            bits ^= low
+
+    def add(self, value):
+        if not self.bits:
+            self.base = value
+        elif value < self.base:
+            self.bits <<= self.base - value
+            self.base = value
+        self.bits |= 1 << (value - self.base)
+
+    def discard(self, value):
+        if value in self:
+            self.bits &= ~(1 << (value - self.base))
+
+    def intersection(self, values):
+        """Yalnızca verilen id'leri içeren yeni bit haritası"""
+        return IdBitmap.from_ids(value for value in values if value in self)
+
+    def compact(self):
+        """Baştaki boş bitleri atar; base en küçük id olur"""
+        if not self.bits:
+            self.base = 0
+            return
+        shift = (self.bits & -self.bits).bit_length() - 1
+        self.bits >>= shift
+        self.base += shift
+
+    def to_bytes(self):
+        self.compact()
+        return self.bits.to_bytes((self.bits.bit_length() + 7) // 8, 'little')
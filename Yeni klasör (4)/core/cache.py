@@ -0,0 +1,374 @@
+import functools
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+from django.db import connection, models, transaction
+
+from core.metrics import CACHE_REQUESTS
+
+
+class TwoTierCache(BaseCache):
+    """
+    Süreç içi LRU önbelleği ile paylaşımlı önbelleği birleştiren arka uç
+
+    Okumalar önce süreç içi katmana bakar, bulunamazsa paylaşımlı katmana
+    (Redis, dosya tabanlı vb.) gider ve sonucu yerelde de tutar. Yazmalar her
+    iki katmana yapılır. Diğer süreçlerdeki yerel kopyalar en fazla
+    LOCAL_TIMEOUT saniye bayat kalabilir; model sürümü içeren anahtarlar ise
+    sürüm değişince zaten farklılaştığından bu durumdan etkilenmez.
+
+    Ayarlar:
+        'OPTIONS': {
+            'SHARED_ALIAS': 'shared',     # paylaşımlı önbellek takma adı
+            'LOCAL_MAX_ENTRIES': 1000,    # süreç içi en fazla kayıt
+            'LOCAL_TIMEOUT': 60,          # süreç içi en uzun saklama (saniye)
+        }
+    """
+
+    def __init__(self, location, params):
+        options = params.get('OPTIONS', {})
+        self._shared_alias = options.get('SHARED_ALIAS', 'shared')
+        self._local_max_entries = int(options.get('LOCAL_MAX_ENTRIES', 1000))
+        self._local_timeout = float(options.get('LOCAL_TIMEOUT', 60))
+        super().__init__({k: v for k, v in params.items() if k != 'OPTIONS'})
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    # Süreç içi katman
+
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+        return entry
+
+    def _local_set(self, key, value, timeout):
+        if timeout is not None and timeout <= 0:
+            self._local_delete(key)
+            return
+        local_timeout = self._local_timeout if timeout is None else min(timeout, self._local_timeout)
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (time.monotonic() + local_timeout, data)
+            self._local.move_to_end(key)
+            while len(self._local) > self._local_max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, key):
+        with self._lock:
+            self._local.pop(key, None)
+
+    def _count(self, tier, result, amount=1):
+        CACHE_REQUESTS.inc(amount, cache=self._shared_alias, tier=tier, result=result)
+
+    def _timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    # Cache API
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version)
+        if added:
+            self._local_set(self.make_and_validate_key(key, version), value, self._timeout(timeout))
+        return added
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        entry = self._local_get(local_key)
+        if entry is not None:
+            self._count('local', 'hit')
+            return pickle.loads(entry[1])
+
+        sentinel = object()
+        value = self.shared.get(key, sentinel, version)
+        if value is sentinel:
+            self._count('shared', 'miss')
+            return default
+        self._count('shared', 'hit')
+        self._local_set(local_key, value, None)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version)
+        self._local_set(self.make_and_validate_key(key, version), value, self._timeout(timeout))
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version)
+
+    def delete(self, key, version=None):
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.delete(key, version)
+
+    def get_many(self, keys, version=None):
+        result = {}
+        missing = []
+        for key in keys:
+            entry = self._local_get(self.make_and_validate_key(key, version))
+            if entry is not None:
+                result[key] = pickle.loads(entry[1])
+            else:
+                missing.append(key)
+
+        if result:
+            self._count('local', 'hit', len(result))
+        if missing:
+            found = self.shared.get_many(missing, version)
+            for key, value in found.items():
+                self._local_set(self.make_and_validate_key(key, version), value, None)
+            result.update(found)
+            if found:
+                self._count('shared', 'hit', len(found))
+            if len(found) < len(missing):
+                self._count('shared', 'miss', len(missing) - len(found))
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version)
+        for key, value in data.items():
+            if key not in failed:
+                self._local_set(self.make_and_validate_key(key, version), value, self._timeout(timeout))
+        return failed
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self._local_delete(self.make_and_validate_key(key, version))
+        self.shared.delete_many(keys, version)
+
+    def incr(self, key, delta=1, version=None):
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.incr(key, delta, version)
+
+    def has_key(self, key, version=None):
+        return self._local_get(self.make_and_validate_key(key, version)) is not None \
+            or self.shared.has_key(key, version)
+
+    def clear(self):
+        self.clear_local()
+        self.shared.clear()
+
+    def clear_local(self):
+        """Yalnızca bu süreçteki kopyaları temizler"""
+        with self._lock:
+            self._local.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+# Model sürüm sayaçları
+#
+# Her model için paylaşımlı önbellekte bir sayaç tutulur ve tablo her
+# değiştiğinde artırılır. Türetilmiş veriler anahtarlarına ilgili modellerin
+# sürümlerini katarak önbelleğe alınır; sürüm değişince eski kayıtlar bir daha
+# okunmaz ve zaman aşımıyla kendiliğinden silinir.
+
+MODEL_VERSION_CACHE = getattr(settings, 'MODEL_VERSION_CACHE', 'default')
+MODEL_VERSION_TIMEOUT = None  # sayaçlar hiç zaman aşımına uğramaz
+
+
+def _version_cache():
+    cache = caches[MODEL_VERSION_CACHE]
+    # Sayaçlar her zaman paylaşımlı katmandan okunur; süreç içi kopyaları bayat kalabilir
+    return getattr(cache, 'shared', cache)
+
+
+def _model_label(model):
+    if isinstance(model, str):
+        return model.lower()
+    return model._meta.label_lower
+
+
+def _version_key(model):
+    return f"model_version:{_model_label(model)}"
+
+
+def get_model_versions(*model_list):
+    """
+    Modellerin güncel sürümlerini tek önbellek isteğiyle döndürür
+
+    Returns:
+        tuple: Modellerle aynı sırada sürüm numaraları
+    """
+    cache = _version_cache()
+    keys = [_version_key(model) for model in model_list]
+    found = cache.get_many(keys)
+
+    missing = {key: _initial_version() for key in keys if key not in found}
+    for key, value in missing.items():
+        # Başka bir süreç aynı anda oluşturduysa onunkini kullan
+        if not cache.add(key, value, MODEL_VERSION_TIMEOUT):
+            value = cache.get(key, value)
+        found[key] = value
+    return tuple(found[key] for key in keys)
+
+
+def get_model_version(model):
+    return get_model_versions(model)[0]
+
+
+def _initial_version():
+    # Önbellek boşaltılırsa sayaçlar eski değerlere dönüp eski kayıtlarla çakışmasın
+    return int(time.time() * 1000)
+
+
+def bump_model_version(model):
+    """Modelin sürümünü artırır; bu modele bağlı tüm önbellek kayıtları geçersiz olur"""
+    cache = _version_cache()
+    key = _version_key(model)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        value = _initial_version()
+        if not cache.add(key, value, MODEL_VERSION_TIMEOUT):
+            return cache.incr(key)
+        return value
+
+
+def bump_model_version_on_commit(model):
+    """
+    Sürümü hemen ve işlem (transaction) tamamlandığında tekrar artırır
+
+    İşlem sürerken başka bir istek eski veriyi yeni sürümle önbelleğe alabilir;
+    commit sonrası ikinci artırma bu kaydı da geçersiz kılar.
+    """
+    bump_model_version(model)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: bump_model_version(model))
+
+
+def versioned_key(prefix, model_list, *parts):
+    """
+    Model sürümlerini içeren önbellek anahtarı üretir
+
+    Örnek:
+        versioned_key('certificate_dashboard', [Certificate], user.pk)
+    """
+    versions = get_model_versions(*model_list)
+    raw = ':'.join(str(part) for part in (*parts, *versions))
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f"{prefix}:{digest}"
+
+
+def cached_for_models(prefix, model_list, compute, *parts, timeout=None):
+    """
+    Modellere bağlı türetilmiş veriyi önbellekten döndürür, yoksa hesaplar
+
+    Args:
+        prefix (str): Anahtar öneki
+        model_list (list): Verinin bağlı olduğu modeller
+        compute (callable): Önbellekte yoksa çağrılacak fonksiyon
+        *parts: Anahtara eklenecek ek değerler (kullanıcı, filtre vb.)
+        timeout (int, optional): Saklama süresi; varsayılan CACHE_MODEL_TIMEOUT
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'CACHE_MODEL_TIMEOUT', 60 * 60)
+    cache = caches['default']
+    key = versioned_key(prefix, model_list, *parts)
+    return cache.get_or_set(key, compute, timeout)
+
+
+def cache_for_models(*model_list, timeout=None):
+    """
+    Fonksiyon sonucunu, argümanları ve model sürümleriyle anahtarlayarak önbelleğe alır
+
+    Örnek:
+        @cache_for_models(Server)
+        def server_status_counts():
+            return Server.objects.aggregate(...)
+    """
+    def decorator(func):
+        prefix = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parts = list(args) + [f"{key}={value}" for key, value in sorted(kwargs.items())]
+            return cached_for_models(prefix, model_list, lambda: func(*args, **kwargs), *parts,
+                                     timeout=timeout)
+        return wrapper
+    return decorator
+
+
+def permission_signature(user):
+    """
+    Kullanıcının yetki kümesini temsil eden kısa değer
+
+    Aynı yetkilere sahip kullanıcılar aynı değeri alır; yetkiye göre değişen
+    önbellek kayıtları (şablon parçaları vb.) kullanıcılar arasında paylaşılır.
+    Sonuç kullanıcı nesnesinde ve önbellekte tutulur; yetki, grup ya da
+    kullanıcı tabloları değişince yeniden hesaplanır.
+    """
+    if user is None or not user.is_authenticated:
+        return 'anonymous'
+    if not user.is_active:
+        return 'inactive'
+    if user.is_superuser:
+        return 'superuser'
+
+    signature = getattr(user, '_permission_signature', None)
+    if signature is None:
+        def compute():
+            perms = ','.join(sorted(user.get_all_permissions()))
+            return hashlib.md5(perms.encode('utf-8')).hexdigest()[:16]
+
+        signature = cached_for_models(
+            'permission_signature',
+            ['auth.permission', 'auth.group', settings.AUTH_USER_MODEL],
+            compute, user.pk,
+        )
+        signature = f"{'staff' if user.is_staff else 'user'}:{signature}"
+        user._permission_signature = signature
+    return signature
+
+
+class VersionedQuerySet(models.QuerySet):
+    """
+    Sinyal göndermeyen toplu işlemlerde de model sürümünü artıran QuerySet
+
+    update(), bulk_create() ve bulk_update() post_save sinyali göndermez.
+
+    Kullanım:
+        objects = VersionedManager()
+    """
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if rows:
+            bump_model_version_on_commit(self.model)
+        return rows
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            bump_model_version_on_commit(self.model)
+        return created
+
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if rows:
+            bump_model_version_on_commit(self.model)
+        return rows
+
+    bulk_update.alters_data = True
+
+
+VersionedManager = models.Manager.from_queryset(VersionedQuerySet)
@@ -0,0 +1,406 @@
+"""
+Sıkıştırılmış değişiklik geçmişi
+
+Her kayıtta satırın tam kopyası yerine yalnızca değişen alanların önceki
+değerleri saklanır (ters fark). Uzun metin alanları (ör. zengin metin içerik)
+kelime düzeyinde farkla, sıkıştırılmış olarak tutulur. Değişiklik olmayan
+kayıtlar (save) geçmişe yazılmaz.
+
+Herhangi bir sürüm, güncel satırdan (satır silinmişse silme kaydındaki tam
+kopyadan) başlayıp daha yeni kayıtların farkları geri alınarak kurulur.
+Ters farklar sayesinde en eski kayıtlar diğerlerini bozmadan silinebilir;
+compact() eski kayıtları gün başına bire indirir.
+
+Kullanım:
+    history = CompactHistory(AnnouncementRevision, 'announcement', text_fields=('content',))
+    history.record(instance, created=True)
+    history.reconstruct(revision)
+"""
+import datetime
+import decimal
+import difflib
+import json
+import re
+import uuid
+import zlib
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+
+# Etiketler, kelimeler, boşluklar ve tek tek diğer karakterler; birleşimleri metnin kendisidir
+_TOKEN_RE = re.compile(r'<[^>]*>|\w+|\s+|[^\w\s]')
+
+DEFAULT_EXCLUDE = ('id', 'created_at', 'updated_at')
+
+
+def _tokens(text):
+    return _TOKEN_RE.findall(text or '')
+
+
+def make_patch(source, target):
+    """
+    source metnini target metnine çeviren işlemler
+
+    Returns:
+        list: [başlangıç, bitiş, yeni metin] işlemleri; konumlar source içinde karakter sırasıdır
+    """
+    source_tokens, target_tokens = _tokens(source), _tokens(target)
+    offsets = [0]
+    for token in source_tokens:
+        offsets.append(offsets[-1] + len(token))
+
+    ops = []
+    matcher = difflib.SequenceMatcher(None, source_tokens, target_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            ops.append([offsets[i1], offsets[i2], ''.join(target_tokens[j1:j2])])
+    return ops
+
+
+def apply_patch(source, ops):
+    parts = []
+    position = 0
+    for start, end, text in ops:
+        parts.append(source[position:start])
+        parts.append(text)
+        position = end
+    parts.append(source[position:])
+    return ''.join(parts)
+
+
+def encode_text_delta(deltas):
+    """{alan: {'p': işlemler} ya da {'f': tam metin}} sözlüğünü sıkıştırır"""
+    if not deltas:
+        return None
+    return zlib.compress(json.dumps(deltas, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 6)
+
+
+def decode_text_delta(data):
+    if not data:
+        return {}
+    return json.loads(zlib.decompress(bytes(data)).decode('utf-8'))
+
+
+def text_delta(new, old):
+    """new metninden old metnine dönüşü; fark tam metinden büyükse tam metin saklanır"""
+    old = old or ''
+    ops = make_patch(new or '', old)
+    if len(json.dumps(ops, ensure_ascii=False)) >= len(old):
+        return {'f': old}
+    return {'p': ops}
+
+
+def render_text_diff(old, new):
+    """İki metin arasındaki farkı <del>/<ins> ile işaretlenmiş güvenli HTML olarak döndürür"""
+    old_tokens, new_tokens = _tokens(old), _tokens(new)
+    parts = []
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            parts.append(escape(''.join(old_tokens[i1:i2])))
+            continue
+        if i2 > i1:
+            parts.append(f"<del>{escape(''.join(old_tokens[i1:i2]))}</del>")
+        if j2 > j1:
+            parts.append(f"<ins>{escape(''.join(new_tokens[j1:j2]))}</ins>")
+    return mark_safe(''.join(parts))
+
+
+def _json_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+class CompactHistory:
+    """
+    Bir model için sıkıştırılmış değişiklik geçmişi
+
+    Args:
+        revision_model: core.models.AbstractRevision'dan türeyen model
+        object_field (str): Kayıt modelinde izlenen satıra işaret eden ForeignKey adı
+        text_fields (tuple): Fark olarak saklanacak uzun metin alanları
+        extra_fields (tuple): Listeleme için kayıt modeline değişiklik sonrası değeri
+            kopyalanan alanlar (ör. 'status')
+        exclude (tuple): İzlenmeyen alanlar
+    """
+
+    def __init__(self, revision_model, object_field, text_fields=(), extra_fields=(), exclude=DEFAULT_EXCLUDE):
+        self.revision_model = revision_model
+        self.object_field = object_field
+        self.object_attname = f"{object_field}_id"
+        self.text_fields = tuple(text_fields)
+        self.extra_fields = tuple(extra_fields)
+        self.exclude = tuple(exclude)
+
+    @property
+    def model(self):
+        return self.revision_model._meta.get_field(self.object_field).related_model
+
+    @property
+    def fields(self):
+        """İzlenen alanlar: {attname: alan}"""
+        return {
+            field.attname: field
+            for field in self.model._meta.concrete_fields
+            if field.name not in self.exclude and field.attname not in self.exclude
+        }
+
+    # Durum
+
+    def state(self, instance):
+        return {attname: getattr(instance, attname) for attname in self.fields}
+
+    def remember(self, instance, values=None):
+        """Satırın veritabanındaki değerlerini saklar (from_db ve kayıttan sonra çağrılır)"""
+        if values is None:
+            values = self.state(instance)
+        instance._history_loaded = {attname: values[attname] for attname in self.fields if attname in values}
+
+    def _previous_state(self, instance):
+        loaded = dict(getattr(instance, '_history_loaded', None) or {})
+        missing = [attname for attname in self.fields if attname not in loaded]
+        if missing:
+            # Ertelenmiş alanlar ya da from_db ile yüklenmemiş örnek
+            row = self.model._default_manager.filter(pk=instance.pk).values(*missing).first()
+            if row is None:
+                return None
+            loaded.update(row)
+        return loaded
+
+    def _changes(self, old, new):
+        return [attname for attname, field in self.fields.items() if old.get(attname) != new.get(attname)]
+
+    def _build(self, object_id, revision_type, new, old, changed, user, reason, date):
+        previous = {attname: _json_value(old[attname]) for attname in changed if attname not in self.text_fields}
+        deltas = {attname: text_delta(new[attname], old[attname]) for attname in changed if attname in self.text_fields}
+        values = {
+            self.object_attname: object_id,
+            'revision_type': revision_type,
+            'revision_date': date or timezone.now(),
+            'user': user,
+            'change_reason': reason or '',
+            'changed_fields': [self.fields[attname].name for attname in changed],
+            'previous': previous,
+            'text_delta': encode_text_delta(deltas),
+        }
+        for name in self.extra_fields:
+            values[name] = new.get(name, old.get(name))
+        return self.revision_model(**values)
+
+    # Kayıt
+
+    def record(self, instance, created=False, user=None, reason=None):
+        """
+        save() sonrası değişiklik kaydı oluşturur; değişiklik yoksa kayıt yazılmaz
+
+        Kullanıcı ve neden verilmezse örneğin _history_user ve _change_reason
+        özniteliklerinden alınır.
+
+        Returns:
+            Kayıt nesnesi ya da None
+        """
+        user = user or getattr(instance, '_history_user', None)
+        reason = reason or getattr(instance, '_change_reason', None)
+        new = self.state(instance)
+        revision = None
+        if created:
+            revision = self._build(instance.pk, '+', new, new, [], user, reason, None)
+        else:
+            old = self._previous_state(instance)
+            changed = self._changes(old, new) if old is not None else []
+            if changed:
+                revision = self._build(instance.pk, '~', new, old, changed, user, reason, None)
+        if revision is not None:
+            revision.save()
+        self.remember(instance, new)
+        return revision
+
+    def record_delete(self, instance, user=None, reason=None):
+        """Silinen satırın tam kopyasını saklar; eski sürümler bu kopyadan kurulur"""
+        user = user or getattr(instance, '_history_user', None)
+        reason = reason or getattr(instance, '_change_reason', None)
+        state = self.state(instance)
+        revision = self._build(instance.pk, '-', state, state, [], user, reason, None)
+        revision.previous = {
+            attname: _json_value(value) for attname, value in state.items() if attname not in self.text_fields
+        }
+        revision.text_delta = encode_text_delta({
+            attname: {'f': state[attname] or ''} for attname in self.text_fields
+        })
+        revision.save()
+        return revision
+
+    def bulk_record(self, rows, new_values, user=None, reason=None, date=None, batch_size=500):
+        """
+        Toplu UPDATE için değişiklik kayıtlarını tek bulk_create ile yazar
+
+        Args:
+            rows (list): 'id' ve new_values anahtarlarının eski değerlerini içeren sözlükler
+            new_values (dict): UPDATE ile yazılan değerler
+
+        Returns:
+            int: Yazılan kayıt sayısı
+        """
+        tracked = {attname: value for attname, value in new_values.items() if attname in self.fields}
+        revisions = []
+        for row in rows:
+            old = {attname: row[attname] for attname in tracked}
+            changed = [attname for attname, value in tracked.items() if old[attname] != value]
+            if changed:
+                revisions.append(self._build(row['id'], '~', {**row, **tracked}, old, changed, user, reason, date))
+        self.revision_model._default_manager.bulk_create(revisions, batch_size=batch_size)
+        return len(revisions)
+
+    # Sürümleri kurma
+
+    def _apply(self, state, revision):
+        """Kaydın farkını geri alır: değişiklikten sonraki durumdan öncekini kurar"""
+        fields = self.fields
+        state = dict(state)
+        for attname, value in revision.previous.items():
+            if attname in fields:
+                state[attname] = fields[attname].to_python(value)
+        for attname, delta in decode_text_delta(revision.text_delta).items():
+            state[attname] = delta['f'] if 'f' in delta else apply_patch(state.get(attname) or '', delta['p'])
+        return state
+
+    def _live_state(self, object_id):
+        instance = self.model._default_manager.filter(pk=object_id).first()
+        return self.state(instance) if instance is not None else None
+
+    def states(self, object_id, revisions=None):
+        """
+        Kayıtları yeniden eskiye, her birinden sonraki durumla birlikte döndürür
+
+        Silme kaydı için durum, silinmeden hemen önceki satırdır. Oluşturma
+        kaydından önceki durum None'dır.
+
+        Yields:
+            tuple: (kayıt, değişiklikten sonraki durum, değişiklikten önceki durum)
+        """
+        if revisions is None:
+            revisions = self.revision_model._default_manager.filter(
+                **{self.object_attname: object_id}
+            ).order_by('-id')
+        state = None
+        live_loaded = False
+        for revision in revisions:
+            if revision.revision_type == '-':
+                state = self._apply({}, revision)
+                yield revision, state, state
+                continue
+            if state is None and not live_loaded:
+                state = self._live_state(object_id)
+                live_loaded = True
+            if state is None:
+                raise ValueError(f"{object_id} numaralı kaydın güncel durumu bulunamadı; geçmiş kurulamıyor")
+            before = None if revision.revision_type == '+' else self._apply(state, revision)
+            yield revision, state, before
+            state = before
+
+    def reconstruct(self, revision, with_previous=False):
+        """
+        Kayıttan hemen sonraki sürümün alan değerleri
+
+        Returns:
+            dict ya da (sonraki, önceki) çifti
+        """
+        newer = self.revision_model._default_manager.filter(
+            **{self.object_attname: getattr(revision, self.object_attname), 'id__gte': revision.id}
+        ).order_by('-id')
+        for current, after, before in self.states(getattr(revision, self.object_attname), newer):
+            if current.id == revision.id:
+                return (after, before) if with_previous else after
+        raise ValueError("Kayıt bulunamadı")
+
+    def as_instance(self, state):
+        """Durumdan kaydedilmemiş bir model örneği oluşturur"""
+        return self.model(**state)
+
+    # Bakım
+
+    def prune(self, before):
+        """before tarihinden eski kayıtları siler; daha yeni sürümler kurulabilir kalır"""
+        deleted, _ = self.revision_model._default_manager.filter(revision_date__lt=before).delete()
+        return deleted
+
+    def compact(self, before):
+        """
+        before tarihinden eski değişiklik kayıtlarını nesne ve gün başına bire indirir
+
+        Her günün son kaydı kalır ve aynı gün içindeki önceki kayıtların
+        farklarını da kapsar. Oluşturma ve silme kayıtlarına dokunulmaz.
+
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        groups = (
+            self.revision_model._default_manager
+            .filter(revision_date__lt=before, revision_type='~')
+            .annotate(day=TruncDate('revision_date'))
+            .values(self.object_attname, 'day')
+            .annotate(count=Count('id'))
+            .filter(count__gt=1)
+            .order_by()
+        )
+        candidates = sorted({group[self.object_attname] for group in groups})
+        removed = 0
+        for object_id in candidates:
+            with transaction.atomic():
+                removed += self._compact_object(object_id, before)
+        return removed
+
+    def _compact_object(self, object_id, before):
+        entries = list(self.states(object_id))
+        entries.reverse()  # eskiden yeniye
+
+        def day(revision):
+            return timezone.localtime(revision.revision_date).date()
+
+        # Eski değişiklik kayıtlarından her günün sonuncusu dışındakiler birleştirilir
+        drop = set()
+        for index, (revision, _, _) in enumerate(entries):
+            if revision.revision_type != '~' or revision.revision_date >= before:
+                continue
+            following = entries[index + 1][0] if index + 1 < len(entries) else None
+            if (following is not None and following.revision_type == '~'
+                    and following.revision_date < before and day(following) == day(revision)):
+                drop.add(revision.id)
+
+        removed, updated, group = [], [], []
+        for revision, after, previous in entries:
+            if revision.id in drop:
+                group.append((revision, after, previous))
+                continue
+            if not group:
+                continue
+            # Grup, bir sonraki değişiklik kaydına katılır
+            merged_before = group[0][2]
+            removed.extend(item[0].id for item in group)
+            group = []
+
+            changed = self._changes(merged_before, after)
+            if not changed:
+                removed.append(revision.id)  # değişiklikler birbirini götürmüş
+                continue
+            merged = self._build(object_id, '~', after, merged_before, changed, None, None, None)
+            revision.previous = merged.previous
+            revision.text_delta = merged.text_delta
+            revision.changed_fields = merged.changed_fields
+            updated.append(revision)
+
+        if updated:
+            self.revision_model._default_manager.bulk_update(
+                updated, ['previous', 'text_delta', 'changed_fields']
+            )
+        if removed:
+            self.revision_model._default_manager.filter(id__in=removed).delete()
+        return len(removed)
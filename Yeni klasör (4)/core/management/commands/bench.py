@@ -0,0 +1,48 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import BENCHMARKS, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Önemli görünüm, görev ve dışa aktarmaların sürelerini ölçer ve JSON olarak yazar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='İsteklerin yapılacağı kullanıcı adı (varsayılan: ilk süper kullanıcı)')
+        parser.add_argument('--only', nargs='+', choices=[b.name for b in BENCHMARKS], metavar='OLCUM',
+                            help='Yalnızca seçilen ölçümler')
+        parser.add_argument('--repeat', type=int, default=5, help='Her ölçümün tekrar sayısı')
+        parser.add_argument('--warmup', type=int, default=1, help='Ölçülmeyen ısınma çalıştırmaları')
+        parser.add_argument('--cold', action='store_true', help='Her çalıştırmadan önce önbelleği boşalt')
+        parser.add_argument('--output', help='Sonucun yazılacağı dosya (varsayılan: standart çıktı)')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat en az 1 olmalıdır')
+
+        User = get_user_model()
+        if options['user']:
+            user = User.objects.filter(username=options['user']).first()
+        else:
+            user = User.objects.filter(is_superuser=True).order_by('pk').first()
+        if user is None:
+            raise CommandError('Ölçüm için kullanıcı bulunamadı; --user verin ya da süper kullanıcı oluşturun')
+
+        def progress(name, result):
+            if 'median_ms' in result:
+                self.stderr.write(f"{name}: {result['median_ms']} ms, {result['queries']} sorgu")
+            else:
+                self.stderr.write(f"{name}: {result.get('skipped') or result.get('error')}")
+
+        report = run_benchmarks(user, options['only'], options['repeat'], options['warmup'],
+                                options['cold'], progress)
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+            self.stderr.write(self.style.SUCCESS(f"Sonuçlar {options['output']} dosyasına yazıldı."))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,50 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from core.benchmark import SQLITE_PROFILES, connection_reuse, sqlite_concurrency
+
+
+class Command(BaseCommand):
+    help = ('SQLite varsayılan ve WAL ayarlarıyla eşzamanlı okuma/yazma hızını, '
+            'yapılandırılmış veritabanında bağlantı yeniden kullanımının etkisini ölçer')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help='Okuyucu iş parçacığı sayısı')
+        parser.add_argument('--writers', type=int, default=2, help='Yazar iş parçacığı sayısı')
+        parser.add_argument('--duration', type=float, default=5.0, help='Her profilin ölçüm süresi (saniye)')
+        parser.add_argument('--iterations', type=int, default=200,
+                            help='Bağlantı ölçümündeki istek sayısı')
+        parser.add_argument('--output', help='Sonucun yazılacağı dosya (varsayılan: standart çıktı)')
+
+    def handle(self, *args, **options):
+        report = {'sqlite_concurrency': {}}
+
+        # Ölçüm geçici bir dosyada yapılır; gerçek veritabanına dokunulmaz
+        with tempfile.TemporaryDirectory() as tmp:
+            for profile in SQLITE_PROFILES:
+                path = os.path.join(tmp, f'{profile}.sqlite3')
+                result = sqlite_concurrency(path, profile, options['readers'], options['writers'],
+                                            options['duration'])
+                report['sqlite_concurrency'][profile] = result
+                self.stderr.write(
+                    f"SQLite {profile}: {result['reads_per_s']} okuma/sn, {result['writes_per_s']} yazma/sn, "
+                    f"{result['read_errors'] + result['write_errors']} kilit hatası"
+                )
+
+        report['connection_reuse'] = connection_reuse(options['iterations'])
+        self.stderr.write(
+            f"Bağlantı ({report['connection_reuse']['database']}): "
+            f"yeni {report['connection_reuse']['new_connection_ms']} ms, "
+            f"kalıcı {report['connection_reuse']['persistent_connection_ms']} ms"
+        )
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output)
+            self.stderr.write(self.style.SUCCESS(f"Sonuçlar {options['output']} dosyasına yazıldı."))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Kuyruğa özel eşzamanlılık ve önceden alma ayarlarıyla Celery worker başlatır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('queues', nargs='+',
+                            help='Dinlenecek kuyruklar (CELERY_WORKER_PROFILES anahtarları)')
+        parser.add_argument('--loglevel', default='info')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Worker başlatmadan komut satırını yazdırır')
+
+    def handle(self, *args, **options):
+        profiles = getattr(settings, 'CELERY_WORKER_PROFILES', {})
+        unknown = [queue for queue in options['queues'] if queue not in profiles]
+        if unknown:
+            raise CommandError(
+                f"Tanımsız kuyruk: {', '.join(unknown)} (seçenekler: {', '.join(profiles)})"
+            )
+
+        # Birden çok kuyruk verilirse ilkinin ayarları kullanılır
+        profile = profiles[options['queues'][0]]
+        argv = [
+            'worker',
+            f"--queues={','.join(options['queues'])}",
+            f"--hostname={'-'.join(options['queues'])}@%h",
+            f"--loglevel={options['loglevel']}",
+            f"--concurrency={profile['concurrency']}",
+            f"--prefetch-multiplier={profile['prefetch_multiplier']}",
+        ]
+        if profile.get('max_tasks_per_child'):
+            argv.append(f"--max-tasks-per-child={profile['max_tasks_per_child']}")
+
+        if options['dry_run']:
+            self.stdout.write('celery -A config ' + ' '.join(argv))
+            return
+
+        from config.celery import app
+        app.worker_main(argv)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.tasks import purge_stale_upload_sessions
+
+
+class Command(BaseCommand):
+    help = 'Yarım kalmış eski yükleme oturumlarını ve parçalarını siler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24,
+                            help='Bu süreden eski tamamlanmamış oturumlar silinir (saat)')
+
+    def handle(self, *args, **options):
+        count = purge_stale_upload_sessions(hours=options['hours'])
+        self.stdout.write(self.style.SUCCESS(f'{count} yükleme oturumu silindi.'))
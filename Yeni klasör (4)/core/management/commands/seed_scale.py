@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.seeding import DATASETS, VOLUMES, seed_all
+
+
+class Command(BaseCommand):
+    help = 'Üretim ölçeğinde sentetik veriyi tohum değerinden tekrarlanabilir şekilde üretir'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Rastgele sayı üreteci tohumu; aynı tohum aynı veriyi üretir')
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Varsayılan hacimlerin çarpanı (ör. 0.01 ile hızlı deneme)')
+        parser.add_argument('--only', nargs='+', choices=list(DATASETS), metavar='VERI_KUMESI',
+                            help=f"Yalnızca seçilen veri kümeleri: {', '.join(DATASETS)}")
+        parser.add_argument('--json', action='store_true',
+                            help='Sonucu JSON olarak yazdır')
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0:
+            raise CommandError('--scale sıfırdan büyük olmalıdır')
+
+        only = options['only']
+        for name in only or DATASETS:
+            planned = max(int(VOLUMES[name] * options['scale']), 1)
+            self.stderr.write(f'{name}: {planned} kayıt üretilecek')
+
+        def progress(name, total):
+            if total % 100_000 == 0:
+                self.stderr.write(f'  {name}: {total}')
+
+        try:
+            results = seed_all(options['seed'], options['scale'], only, progress)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2, ensure_ascii=False))
+            return
+
+        for name, result in results.items():
+            if 'skipped' in result:
+                self.stdout.write(self.style.WARNING(f"{name}: atlandı ({result['skipped']})"))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{name}: {result['rows']} kayıt, {result['seconds']} sn"
+                ))
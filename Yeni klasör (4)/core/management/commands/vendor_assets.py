@@ -0,0 +1,37 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.staticfiles import download_vendor_assets, verify_vendor_assets
+
+
+class Command(BaseCommand):
+    help = ('Dış CSS/JS kütüphanelerini ve yazı tiplerini static/vendor altına indirir; '
+            'sunucular çalışırken CDN kullanılmaz')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Var olan dosyaları da yeniden indir')
+        parser.add_argument('--check', action='store_true',
+                            help='İndirmeden, dosyaları kilit dosyasındaki özetlerle karşılaştır')
+
+    def handle(self, *args, **options):
+        root = settings.STATICFILES_DIRS[0]
+
+        if options['check']:
+            problems = verify_vendor_assets(root)
+            if problems:
+                raise CommandError('\n'.join(problems))
+            self.stdout.write(self.style.SUCCESS('Tüm vendor dosyaları kilit dosyasıyla uyumlu.'))
+            return
+
+        def progress(path, size):
+            self.stderr.write(f'  {path} ({size // 1024} KB)')
+
+        try:
+            lock = download_vendor_assets(root, options['force'], progress)
+        except OSError as e:
+            raise CommandError(f'İndirme başarısız: {e}')
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(lock)} dosya hazır; kilit dosyası: {os.path.join(root, 'vendor', 'vendor-lock.json')}"
+        ))
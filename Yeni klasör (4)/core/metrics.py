@@ -0,0 +1,473 @@
+"""
+Prometheus metin biçiminde uygulama metrikleri
+
+Sayaçlar ve histogramlar her süreçte bellekte tutulur. Her iş parçacığı kendi
+sözlüğüne yazar; kayıt sırasında kilit alınmaz. Süreçler değerlerini
+METRICS['DIRECTORY'] altındaki kendi dosyalarına aralıklarla yazar ve /metrics
+isteği tüm dosyaları toplayarak yanıt verir; gunicorn/uvicorn worker'ları ve
+Celery worker'ları aynı dizini kullanarak tek bir uç noktadan izlenir.
+
+Kullanım:
+    TASKS = Counter('portal_example', 'Açıklama', ['task'])   # portal_example_total
+    TASKS.inc(task='archive')
+
+    DURATION = Histogram('portal_example_seconds', 'Açıklama', ['view'])
+    DURATION.observe(0.12, view='dashboard')
+"""
+import atexit
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, router
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'DIRECTORY': None,         # süreçlerin ortak dizini; None ise yalnızca bu sürecin değerleri
+    'FLUSH_INTERVAL': 5,       # süreç değerlerinin dosyaya yazılma aralığı (saniye)
+    'TOKEN': None,             # verilirse /metrics 'Authorization: Bearer <TOKEN>' ister
+    'ALLOWED_IPS': ('127.0.0.1', '::1'),  # TOKEN yoksa erişebilecek adresler
+    'ROW_COUNT_MODELS': (),    # satır sayısı izlenecek modeller ('uygulama.Model')
+    'SCRAPE_CACHE_TIMEOUT': 30,  # satır sayıları ve kuyruk uzunlukları bu süre önbellekte tutulur
+}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+TASK_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600)
+
+_registry = {}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'METRICS', {}))
+    return config
+
+
+# Süreç içi depolama
+#
+# Anahtar (örnek adı, etiketler) -> değer. Her iş parçacığı yalnızca kendi
+# sözlüğüne yazar; toplama sırasında sözlüklerin kopyası alınır (dict.copy()
+# CPython'da GIL altında tek adımda çalışır).
+
+class _ProcessStore:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        # Süreç numarası yeniden kullanılsa da önceki sürecin dosyası ezilmesin
+        self.token = f"{self.pid}-{uuid.uuid4().hex[:8]}"
+        self.shards = []
+        self.local = threading.local()
+        self.last_flush = time.monotonic()
+        self.flush_lock = threading.Lock()
+
+    def shard(self):
+        values = getattr(self.local, 'values', None)
+        if values is None:
+            values = self.local.values = {}
+            self.shards.append(values)
+        return values
+
+    def add(self, key, amount):
+        values = self.shard()
+        values[key] = values.get(key, 0) + amount
+
+    def snapshot(self):
+        merged = {}
+        for shard in list(self.shards):
+            for key, value in shard.copy().items():
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+
+_store = _ProcessStore()
+
+if hasattr(os, 'register_at_fork'):
+    # Çatallanan süreç (Celery prefork, gunicorn --preload) ebeveynin değerlerini taşımaz
+    os.register_at_fork(after_in_child=_store.reset)
+
+
+def _directory():
+    return get_config()['DIRECTORY']
+
+
+def _process_file(directory):
+    return os.path.join(directory, f"{_store.token}.json")
+
+
+def flush():
+    """Bu sürecin değerlerini ortak dizindeki dosyasına yazar"""
+    directory = _directory()
+    if not directory:
+        return
+    if not _store.flush_lock.acquire(blocking=False):
+        return  # başka bir iş parçacığı zaten yazıyor
+    try:
+        _store.last_flush = time.monotonic()
+        data = [[name, list(labels), value] for (name, labels), value in _store.snapshot().items()]
+        os.makedirs(directory, exist_ok=True)
+        path = _process_file(directory)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+    except OSError:
+        logger.warning("Metrik dosyası yazılamadı: %s", directory, exc_info=True)
+    finally:
+        _store.flush_lock.release()
+
+
+def _maybe_flush():
+    interval = getattr(settings, 'METRICS', {}).get('FLUSH_INTERVAL', DEFAULTS['FLUSH_INTERVAL'])
+    if time.monotonic() - _store.last_flush >= interval:
+        flush()
+
+
+atexit.register(flush)
+
+
+def _record(name, labels, amount):
+    _store.add((name, labels), amount)
+    _maybe_flush()
+
+
+# Metrik türleri
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry[name] = self
+
+    def _labels(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} etiketleri {self.labelnames} olmalıdır, verilen: {tuple(labels)}")
+        return tuple((label, str(labels[label])) for label in self.labelnames)
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        _record(self.name + '_total', self._labels(labels), amount)
+
+    def samples(self, values):
+        for (name, labels), value in sorted(values.items()):
+            if name == self.name + '_total':
+                yield name, labels, value
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        labels = self._labels(labels)
+        # Kovalar birikimsiz tutulur; birikimli toplam yayımlarken hesaplanır
+        index = bisect_left(self.buckets, value)
+        bucket = _format_value(self.buckets[index]) if index < len(self.buckets) else '+Inf'
+        _record(self.name + '_bucket', labels + (('le', bucket),), 1)
+        _record(self.name + '_sum', labels, value)
+        _record(self.name + '_count', labels, 1)
+
+    def samples(self, values):
+        series = sorted({labels for (name, labels) in values if name == self.name + '_count'})
+        bounds = [_format_value(bound) for bound in self.buckets] + ['+Inf']
+        for labels in series:
+            total = 0
+            for bound in bounds:
+                total += values.get((self.name + '_bucket', labels + (('le', bound),)), 0)
+                yield self.name + '_bucket', labels + (('le', bound),), total
+            yield self.name + '_sum', labels, values.get((self.name + '_sum', labels), 0)
+            yield self.name + '_count', labels, values.get((self.name + '_count', labels), 0)
+
+
+class Gauge(_Metric):
+    """
+    Yayımlama anında hesaplanan değer; süreçler arasında toplanmaz
+
+    collect() (etiketler sözlüğü, değer) çiftleri döndürmelidir.
+    """
+    type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), collect=None):
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+
+    def samples(self, values):
+        for labels, value in (self.collect() if self.collect else ()):
+            yield self.name, self._labels(labels), value
+
+
+# Yayımlama
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def collect_values():
+    """Tüm süreçlerin değerlerini toplar"""
+    values = _store.snapshot()
+    directory = _directory()
+    if not directory or not os.path.isdir(directory):
+        return values
+
+    own_file = os.path.basename(_process_file(directory))
+    for file_name in os.listdir(directory):
+        if not file_name.endswith('.json') or file_name == own_file:
+            continue
+        try:
+            with open(os.path.join(directory, file_name), encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue  # yazılmakta ya da silinmiş
+        for name, labels, value in data:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            values[key] = values.get(key, 0) + value
+    return values
+
+
+def render_metrics():
+    """Prometheus metin biçimi (0.0.4)"""
+    values = collect_values()
+    lines = []
+    for metric in _registry.values():
+        try:
+            samples = list(metric.samples(values))
+        except Exception:
+            logger.warning("Metrik hesaplanamadı: %s", metric.name, exc_info=True)
+            continue
+        lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, labels, value in samples:
+            label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels)
+            lines.append(f"{name}{{{label_text}}} {_format_value(value)}" if label_text
+                         else f"{name} {_format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+# Uygulama metrikleri
+
+REQUEST_LATENCY = Histogram(
+    'portal_http_request_duration_seconds', 'İstek süresi', ['view', 'method', 'status'],
+)
+REQUEST_QUERIES = Counter(
+    'portal_http_db_queries', 'İsteklerde çalıştırılan veritabanı sorgusu sayısı', ['view'],
+)
+TASK_DURATION = Histogram(
+    'portal_celery_task_duration_seconds', 'Celery görev süresi', ['task', 'state'],
+    buckets=TASK_BUCKETS,
+)
+TASK_RETRIES = Counter('portal_celery_task_retries', 'Yeniden denenen Celery görevleri', ['task'])
+TASK_FAILURES = Counter('portal_celery_task_failures', 'Başarısız Celery görevleri', ['task'])
+INGEST_BYTES = Counter('portal_ingest_bytes', 'Veri kaynaklarından indirilen bayt', ['source'])
+INGEST_ROWS = Counter('portal_ingest_rows', 'Veri kaynaklarından okunan satır', ['source'])
+CACHE_REQUESTS = Counter(
+    'portal_cache_requests', 'Önbellek okumaları (tier: local/shared, result: hit/miss)',
+    ['cache', 'tier', 'result'],
+)
+
+
+def _scrape_cached(key, compute):
+    """Pahalı ölçümleri kısa süre önbellekte tutar; sık kazıma veritabanını yormasın"""
+    return caches['default'].get_or_set(f"core:metrics:{key}", compute,
+                                        get_config()['SCRAPE_CACHE_TIMEOUT'])
+
+
+def _estimated_row_count(model):
+    """Büyük tablolarda COUNT(*) yerine PostgreSQL istatistiklerinden tahmin kullanılır"""
+    db_connection = connections[router.db_for_read(model) or 'default']
+    if db_connection.vendor == 'postgresql':
+        with db_connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                           [model._meta.db_table])
+            row = cursor.fetchone()
+            if row and row[0] >= 0:
+                return row[0]
+    return model._default_manager.count()
+
+
+def _table_rows():
+    def compute():
+        counts = []
+        for label in get_config()['ROW_COUNT_MODELS']:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError):
+                continue  # uygulama yüklü değil
+            counts.append(({'table': model._meta.db_table}, _estimated_row_count(model)))
+        return counts
+    return _scrape_cached('table_rows', compute)
+
+
+def _queue_lengths():
+    if getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', True):
+        return []
+
+    def compute():
+        from config.celery import app
+
+        lengths = []
+        with app.connection_for_read() as conn:
+            channel = conn.default_channel
+            for queue in app.conf.task_queues or ():
+                try:
+                    result = channel.queue_declare(queue=queue.name, passive=True)
+                except Exception:
+                    continue  # kuyruk henüz oluşturulmamış
+                lengths.append(({'queue': queue.name}, result.message_count))
+        return lengths
+    return _scrape_cached('queue_lengths', compute)
+
+
+TABLE_ROWS = Gauge('portal_table_rows', 'Tablo satır sayısı (PostgreSQL\'de tahmini)', ['table'],
+                   collect=_table_rows)
+QUEUE_LENGTH = Gauge('portal_celery_queue_length', 'Kuyrukta bekleyen görev sayısı', ['queue'],
+                     collect=_queue_lengths)
+
+
+def record_ingest(source, data):
+    """IngestMetrics.as_dict() sonucundaki bayt ve satır sayılarını kaynak etiketiyle ekler"""
+    if data.get('bytes'):
+        INGEST_BYTES.inc(data['bytes'], source=source)
+    if data.get('rows'):
+        INGEST_ROWS.inc(data['rows'], source=source)
+
+
+# Sorgu sayımı
+#
+# Her bağlantıya açılırken kalıcı bir execute wrapper eklenir. Ölçülen istek
+# yoksa wrapper yalnızca ContextVar okur. Sayaç itertools.count'tur; next()
+# tek adımda çalıştığından eşzamanlı iş parçacıkları kilit olmadan sayar.
+
+_query_counter = ContextVar('metrics_query_counter', default=None)
+
+
+def _count_query(execute, sql, params, many, context):
+    counter = _query_counter.get()
+    if counter is not None:
+        next(counter)
+    return execute(sql, params, many, context)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """connection_created sinyali alıcısı"""
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+class MetricsMiddleware:
+    """
+    İstek süresini ve sorgu sayısını görünüm bazında kaydeder
+
+    Senkron ve asenkron çalışabilir; asenkron görünümlerde run_concurrently ile
+    iş parçacıklarında çalışan sorgular da sayılır.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = get_config()['ENABLED']
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        counter = itertools.count()
+        token = _query_counter.set(counter)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_counter.reset(token)
+        self._record(request, response, start, counter)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        counter = itertools.count()
+        token = _query_counter.set(counter)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_counter.reset(token)
+        self._record(request, response, start, counter)
+        return response
+
+    def _record(self, request, response, start, counter):
+        elapsed = time.perf_counter() - start
+        match = getattr(request, 'resolver_match', None)
+        # Eşleşmeyen yollar tek etikette toplanır; etiket sayısı sınırsız büyümesin
+        view = (match.view_name or match._func_path) if match else 'unresolved'
+        REQUEST_LATENCY.observe(elapsed, view=view, method=request.method,
+                                status=f"{response.status_code // 100}xx")
+        queries = next(counter)
+        if queries:
+            REQUEST_QUERIES.inc(queries, view=view)
+
+
+# Celery
+
+def connect_celery_signals():
+    """Görev süresi, yeniden deneme ve hata sayaçlarını Celery sinyallerine bağlar"""
+    from celery import signals
+
+    started = {}
+
+    @signals.task_prerun.connect(weak=False)
+    def task_prerun(task_id=None, **kwargs):
+        started[task_id] = time.perf_counter()
+
+    @signals.task_postrun.connect(weak=False)
+    def task_postrun(task_id=None, task=None, state=None, **kwargs):
+        start = started.pop(task_id, None)
+        if start is not None and task is not None:
+            TASK_DURATION.observe(time.perf_counter() - start, task=task.name, state=state or 'UNKNOWN')
+
+    @signals.task_retry.connect(weak=False)
+    def task_retry(sender=None, **kwargs):
+        TASK_RETRIES.inc(task=getattr(sender, 'name', 'unknown'))
+
+    @signals.task_failure.connect(weak=False)
+    def task_failure(sender=None, **kwargs):
+        TASK_FAILURES.inc(task=getattr(sender, 'name', 'unknown'))
+
+    # Worker kapanırken son değerler dosyaya yazılsın
+    @signals.worker_process_shutdown.connect(weak=False)
+    def worker_process_shutdown(**kwargs):
+        flush()
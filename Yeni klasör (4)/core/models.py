@@ -0,0 +1,215 @@
+import hashlib
+import tempfile
+import uuid
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .storage import get_blob_storage, blob_key, is_sha256, put_blob, HASH_CHUNK_SIZE
+
+
+class UploadSession(models.Model):
+    """
+    Parçalı ve kaldığı yerden devam ettirilebilen dosya yüklemesi
+
+    Parçalar paylaşımlı depoda `uploads/<oturum>/<sıra>` altında tutulur; tüm
+    parçalar gelince birleştirilip içerik adresli olarak kaydedilir.
+    """
+    STATUS_CHOICES = [
+        ('pending', _('Yükleniyor')),
+        ('complete', _('Tamamlandı')),
+        ('failed', _('Başarısız')),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                           related_name='upload_sessions',
+                           verbose_name=_('Kullanıcı'))
+    file_name = models.CharField(_('Dosya Adı'), max_length=255)
+    size = models.BigIntegerField(_('Boyut'))
+    chunk_size = models.PositiveIntegerField(_('Parça Boyutu'))
+    expected_sha256 = models.CharField(_('Beklenen SHA-256'), max_length=64, blank=True)
+    blob_key = models.CharField(_('Depolama Anahtarı'), max_length=255, blank=True)
+    deduplicated = models.BooleanField(_('Tekrar Yükleme'), default=False,
+                                     help_text=_('Aynı içerik depoda zaten vardı'))
+    status = models.CharField(_('Durum'), max_length=10, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(_('Oluşturulma Zamanı'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('Güncellenme Zamanı'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('Yükleme Oturumu')
+        verbose_name_plural = _('Yükleme Oturumları')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
+
+    @property
+    def total_chunks(self):
+        return max((self.size + self.chunk_size - 1) // self.chunk_size, 1)
+
+    @property
+    def staging_prefix(self):
+        return f"uploads/{self.id}"
+
+    def part_key(self, index):
+        return f"{self.staging_prefix}/{index:06d}"
+
+    def expected_chunk_size(self, index):
+        """Son parça dışındaki tüm parçalar chunk_size boyutundadır"""
+        if index == self.total_chunks - 1:
+            return self.size - index * self.chunk_size
+        return self.chunk_size
+
+    def received_chunks(self):
+        """Depoda bulunan parçaların sıra numaraları"""
+        storage = get_blob_storage()
+        try:
+            _, files = storage.listdir(self.staging_prefix)
+        except FileNotFoundError:
+            return []
+        return sorted(int(name) for name in files if name.isdigit())
+
+    def missing_chunks(self):
+        received = set(self.received_chunks())
+        return [index for index in range(self.total_chunks) if index not in received]
+
+    def write_chunk(self, index, data):
+        """
+        Bir parçayı depoya yazar; aynı parçanın tekrar gönderilmesi zararsızdır
+
+        Raises:
+            ValueError: Sıra numarası ya da parça boyutu hatalıysa
+        """
+        if not 0 <= index < self.total_chunks:
+            raise ValueError(f"Geçersiz parça numarası: {index}")
+        if len(data) != self.expected_chunk_size(index):
+            raise ValueError(
+                f"Parça boyutu hatalı: {len(data)} (beklenen {self.expected_chunk_size(index)})"
+            )
+
+        storage = get_blob_storage()
+        key = self.part_key(index)
+        if storage.exists(key):
+            storage.delete(key)
+        storage.save(key, ContentFile(data))
+
+    def skip_if_known(self):
+        """
+        Kullanıcı aynı içeriği daha önce yüklediyse yüklemeyi atlar
+
+        İstemcinin bildirdiği özet tek başına içeriğe sahip olunduğunu
+        kanıtlamaz; yalnızca kullanıcının baytlarını göndererek tamamladığı bir
+        oturum aynı anahtarı gösteriyorsa yükleme atlanır. Aksi halde parçalar
+        yüklenir ve tekrar yükleme sunucunun hesapladığı özetle saptanır.
+
+        Returns:
+            bool: Yükleme atlandıysa True
+        """
+        if not is_sha256(self.expected_sha256):
+            return False
+        key = blob_key(self.expected_sha256)
+        uploaded_before = (UploadSession.objects
+                           .filter(user_id=self.user_id, blob_key=key, status='complete')
+                           .exclude(pk=self.pk).exists())
+        if not uploaded_before or not get_blob_storage().exists(key):
+            return False
+        self.blob_key = key
+        self.deduplicated = True
+        self.status = 'complete'
+        self.save(update_fields=['blob_key', 'deduplicated', 'status', 'updated_at'])
+        return True
+
+    def assemble(self):
+        """
+        Parçaları sırayla birleştirir, özeti doğrular ve içerik adresli kaydeder
+
+        Returns:
+            str: Depolama anahtarı
+
+        Raises:
+            ValueError: Eksik parça varsa ya da özet uyuşmazsa
+        """
+        missing = self.missing_chunks()
+        if missing:
+            raise ValueError(f"Eksik parçalar: {missing[:10]}")
+
+        storage = get_blob_storage()
+        digest = hashlib.sha256()
+        with tempfile.TemporaryFile() as assembled:
+            for index in range(self.total_chunks):
+                with storage.open(self.part_key(index), 'rb') as part:
+                    for chunk in iter(lambda: part.read(HASH_CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                        assembled.write(chunk)
+
+            sha256 = digest.hexdigest()
+            if self.expected_sha256 and sha256 != self.expected_sha256:
+                self.status = 'failed'
+                self.save(update_fields=['status', 'updated_at'])
+                self.discard_parts()
+                raise ValueError("Dosya özeti uyuşmuyor, yükleme bozulmuş olabilir")
+
+            key, created = put_blob(assembled, sha256=sha256)
+
+        self.discard_parts()
+        self.blob_key = key
+        self.deduplicated = not created
+        self.status = 'complete'
+        self.save(update_fields=['blob_key', 'deduplicated', 'status', 'updated_at'])
+        return key
+
+    def discard_parts(self):
+        """Geçici parçaları depodan siler"""
+        storage = get_blob_storage()
+        for index in self.received_chunks():
+            storage.delete(self.part_key(index))
+
+    def as_dict(self):
+        data = {
+            'id': str(self.id),
+            'file_name': self.file_name,
+            'size': self.size,
+            'chunk_size': self.chunk_size,
+            'total_chunks': self.total_chunks,
+            'status': self.status,
+            'key': self.blob_key or None,
+            'deduplicated': self.deduplicated,
+        }
+        if self.status == 'pending':
+            data['missing_chunks'] = self.missing_chunks()
+        return data
+
+
+class AbstractRevision(models.Model):
+    """
+    Sıkıştırılmış değişiklik kaydı (core/history.py)
+
+    Her kayıt satırın tamamını değil, yalnızca değişen alanların önceki
+    değerlerini tutar. Uzun metin alanları sıkıştırılmış fark olarak saklanır.
+    Somut model, izlenen modele `object_field` adında bir ForeignKey ekler.
+    """
+    TYPE_CHOICES = [
+        ('+', _('Oluşturuldu')),
+        ('~', _('Değiştirildi')),
+        ('-', _('Silindi')),
+    ]
+
+    revision_type = models.CharField(_('Değişiklik Türü'), max_length=1, choices=TYPE_CHOICES)
+    revision_date = models.DateTimeField(_('Değişiklik Zamanı'), db_index=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+                           null=True, blank=True, related_name='+',
+                           verbose_name=_('Kullanıcı'))
+    change_reason = models.CharField(_('Değişiklik Nedeni'), max_length=255, blank=True)
+    changed_fields = models.JSONField(_('Değişen Alanlar'), default=list)
+    # Değişiklikten önceki değerler; silme kaydında satırın tamamı
+    previous = models.JSONField(_('Önceki Değerler'), default=dict, encoder=DjangoJSONEncoder)
+    # Metin alanlarının yeni değerden eskisine sıkıştırılmış farkı
+    text_delta = models.BinaryField(_('Metin Farkı'), null=True, blank=True)
+
+    class Meta:
+        abstract = True
+        ordering = ['-id']
@@ -0,0 +1,300 @@
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+
+logger = logging.getLogger('core.profiling')
+
+DEFAULTS = {
+    'ENABLED': False,             # örnekleme ile her istekte çalışsın mı
+    'SAMPLE_RATE': 0.01,          # ENABLED iken profillenecek istek oranı (0-1)
+    'HEADER': 'X-SQL-Profile',    # personel kullanıcılar bu başlıkla tek isteği profilleyebilir
+    'QUERY_BUDGET': 30,           # istek başına sorgu sayısı sınırı
+    'TIME_BUDGET_MS': 250,        # istek başına toplam veritabanı süresi sınırı
+    'DUPLICATE_THRESHOLD': 5,     # aynı biçimdeki sorgu bu kadar tekrarlanırsa N+1 şüphesi
+    'TOP_N': 50,                  # raporda tutulacak en kötü istek sayısı
+    'CACHE_ALIAS': 'default',
+}
+
+REPORT_CACHE_KEY = 'core:sql_profile_report'
+REPORT_TIMEOUT = 7 * 24 * 60 * 60
+
+# Profillenen isteğin kaydedicisi; asenkron görünümlerin iş parçacıklarına da taşınır
+_active_recorder = ContextVar('sql_profile_recorder', default=None)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+_SPACE_RE = re.compile(r'\s+')
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'SQL_PROFILER', {}))
+    return config
+
+
+def normalize_sql(sql):
+    """
+    Sorguyu biçimine indirger; değerleri farklı olan aynı sorgular eşleşir
+
+    Örnek:
+        SELECT ... WHERE id = 5 AND name = 'x'  ->  SELECT ... WHERE id = ? AND name = ?
+        WHERE id IN (%s, %s, %s)               ->  WHERE id IN (...)
+    """
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper ile çalıştırılan sorguları sayar ve süre ölçer
+
+    Sorgu metinleri saklanmaz, yalnızca biçimlerin sayıları tutulur; DEBUG
+    kapalıyken de çalışır.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            shape = normalize_sql(sql)
+            with self._lock:
+                self.count += 1
+                self.duration += elapsed
+                self.shapes[shape] += 1
+
+    def duplicates(self, threshold):
+        """Eşik sayısı kadar ya da daha çok tekrarlanan sorgu biçimleri"""
+        return [
+            {'sql': shape, 'count': count}
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+
+def current_recorder():
+    """Profillenen bir istek içindeyse etkin QueryRecorder, değilse None"""
+    return _active_recorder.get()
+
+
+def install_recorder(stack, recorder):
+    """Kaydediciyi bu iş parçacığının bağlantılarına ekler; stack kapanınca çıkarılır"""
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(recorder))
+
+
+@contextmanager
+def recording(recorder):
+    """Bu iş parçacığındaki tüm bağlantıların sorgularını kaydeder"""
+    token = _active_recorder.set(recorder)
+    try:
+        with ExitStack() as stack:
+            install_recorder(stack, recorder)
+            yield recorder
+    finally:
+        _active_recorder.reset(token)
+
+
+def profile_summary(recorder, request, view_name, status_code, elapsed, config):
+    duplicates = recorder.duplicates(config['DUPLICATE_THRESHOLD'])
+    return {
+        'view': view_name,
+        'method': request.method,
+        'path': request.path,
+        'status': status_code,
+        'queries': recorder.count,
+        'db_ms': round(recorder.duration * 1000, 1),
+        'total_ms': round(elapsed * 1000, 1),
+        'duplicates': duplicates[:10],
+        'duplicate_queries': sum(item['count'] - 1 for item in duplicates),
+        'timestamp': time.time(),
+    }
+
+
+def over_budget(summary, config):
+    return (summary['queries'] > config['QUERY_BUDGET']
+            or summary['db_ms'] > config['TIME_BUDGET_MS']
+            or bool(summary['duplicates']))
+
+
+def _report_cache(config):
+    return caches[config['CACHE_ALIAS']]
+
+
+def record_profile(summary, config):
+    """
+    Profili en kötü N istek raporuna ekler
+
+    Rapor paylaşımlı önbellekte tutulur; her görünüm için yalnızca en kötü
+    istek saklanır. Eşzamanlı güncellemelerde bir kaydın kaybolması rapor
+    için önemsizdir.
+    """
+    cache = _report_cache(config)
+    report = _merge_profile(cache.get(REPORT_CACHE_KEY) or {}, summary, config)
+    cache.set(REPORT_CACHE_KEY, report, REPORT_TIMEOUT)
+
+
+async def arecord_profile(summary, config):
+    """record_profile'ın olay döngüsünü engellemeyen karşılığı"""
+    cache = _report_cache(config)
+    report = _merge_profile(await cache.aget(REPORT_CACHE_KEY) or {}, summary, config)
+    await cache.aset(REPORT_CACHE_KEY, report, REPORT_TIMEOUT)
+
+
+def _merge_profile(report, summary, config):
+    key = summary['view'] or summary['path']
+    current = report.get(key)
+    if current is None or _severity(summary) >= _severity(current):
+        summary = dict(summary, hits=(current or {}).get('hits', 0) + 1)
+    else:
+        current['hits'] = current.get('hits', 0) + 1
+        summary = current
+    report[key] = summary
+
+    if len(report) > config['TOP_N']:
+        worst = sorted(report.items(), key=lambda item: _severity(item[1]), reverse=True)
+        report = dict(worst[:config['TOP_N']])
+    return report
+
+
+def _severity(summary):
+    return (summary['duplicate_queries'], summary['queries'], summary['db_ms'])
+
+
+def get_report(config=None):
+    """En kötü istekleri önem sırasına göre döndürür"""
+    config = config or get_config()
+    report = _report_cache(config).get(REPORT_CACHE_KEY) or {}
+    return sorted(report.values(), key=_severity, reverse=True)
+
+
+def clear_report(config=None):
+    config = config or get_config()
+    _report_cache(config).delete(REPORT_CACHE_KEY)
+
+
+class SQLProfilerMiddleware:
+    """
+    İstek başına sorgu sayısı, veritabanı süresi ve tekrarlanan sorguları ölçer
+
+    SQL_PROFILER ayarında ENABLED açıksa istekler SAMPLE_RATE oranında
+    örneklenir. Personel kullanıcılar HEADER başlığını göndererek tek bir isteği
+    her zaman profilleyebilir; bu durumda sonuç yanıt başlıklarına da eklenir.
+    Sınırları aşan istekler loglanır ve en kötü istekler raporuna eklenir.
+
+    Senkron ve asenkron çalışabilir. Asenkron görünümlerde run_concurrently ile
+    iş parçacıklarında çalışan sorgular da kaydedilir.
+
+    AuthenticationMiddleware'den sonra eklenmelidir.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_config()
+        self.header = 'HTTP_' + self.config['HEADER'].upper().replace('-', '_')
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _requested_by_header(self, request):
+        if self.header not in request.META:
+            return False
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_authenticated and user.is_staff)
+
+    def _sampled(self):
+        rate = self.config['SAMPLE_RATE']
+        return self.config['ENABLED'] and rate > 0 and random.random() < rate
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        forced = self._requested_by_header(request)
+        if not forced and not self._sampled():
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with recording(QueryRecorder()) as recorder:
+            response = self.get_response(request)
+        summary = self._finish(request, response, recorder, start, forced)
+        if summary is not None:
+            record_profile(summary, self.config)
+        return response
+
+    async def __acall__(self, request):
+        # Başlık yalnızca personel için geçerli; kullanıcıyı çözmek veritabanı ister
+        forced = False
+        if self.header in request.META:
+            forced = await sync_to_async(self._requested_by_header)(request)
+        if not forced and not self._sampled():
+            return await self.get_response(request)
+
+        # Senkron ORM çağrıları isteğe ait ayrı bir iş parçacığında çalışır;
+        # kaydedici o iş parçacığının bağlantılarına eklenir
+        recorder = QueryRecorder()
+        token = _active_recorder.set(recorder)
+        stack = ExitStack()
+        start = time.perf_counter()
+        try:
+            await sync_to_async(install_recorder)(stack, recorder)
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _active_recorder.reset(token)
+        summary = self._finish(request, response, recorder, start, forced)
+        if summary is not None:
+            await arecord_profile(summary, self.config)
+        return response
+
+    def _finish(self, request, response, recorder, start, forced):
+        """
+        Özeti çıkarır, bütçe aşımını loglar ve gerekirse yanıt başlıklarını ekler
+
+        Returns:
+            dict: Rapora eklenecek özet; bütçe aşılmadıysa None
+        """
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = (match.view_name or match._func_path) if match else None
+        summary = profile_summary(recorder, request, view_name, response.status_code, elapsed, self.config)
+
+        exceeded = over_budget(summary, self.config)
+        if exceeded:
+            logger.warning(
+                "SQL bütçesi aşıldı: %s %s (%s) %d sorgu, %.1f ms, %d tekrarlanan sorgu",
+                summary['method'], summary['path'], summary['view'],
+                summary['queries'], summary['db_ms'], summary['duplicate_queries'],
+                extra={'sql_profile': summary},
+            )
+
+        if forced:
+            response['X-SQL-Queries'] = str(summary['queries'])
+            response['X-SQL-Time-Ms'] = str(summary['db_ms'])
+            response['X-SQL-Duplicates'] = str(summary['duplicate_queries'])
+        return summary if exceeded else None
@@ -0,0 +1,68 @@
+"""
+Ortama göre seçilen Celery aracı (broker) profili
+
+Profiller (CELERY_PROFILE):
+    broker  CELERY_BROKER_URL (ör. redis://sunucu:6379/1) ile gerçek aracı.
+            CELERY_RESULT_BACKEND verilmezse sonuçlar aynı Redis'te tutulur.
+    local   Dış servis olmadan dosya sistemi üzerinden aracı; worker ve beat
+            aynı makinede ayrı süreçler olarak çalışabilir.
+    eager   Görevler çağrıldığı yerde, aynı süreçte çalışır (testler ve
+            geliştirme). Hatalar çağırana iletilir.
+
+CELERY_PROFILE verilmezse CELERY_BROKER_URL varsa 'broker', yoksa 'eager'
+kullanılır.
+"""
+import os
+
+
+PROFILES = ('broker', 'local', 'eager')
+
+
+def broker_profile(base_dir, profile=None):
+    """
+    Profile göre CELERY_* ayarlarını döndürür
+
+    Returns:
+        dict: CELERY_ öneki olmadan ayar adı -> değer
+    """
+    broker_url = os.environ.get('CELERY_BROKER_URL')
+    profile = profile or os.environ.get('CELERY_PROFILE') or ('broker' if broker_url else 'eager')
+    if profile not in PROFILES:
+        raise ValueError(f"Geçersiz CELERY_PROFILE: {profile} (seçenekler: {', '.join(PROFILES)})")
+
+    if profile == 'broker':
+        if not broker_url:
+            raise ValueError("CELERY_PROFILE=broker için CELERY_BROKER_URL gereklidir")
+        return {
+            'PROFILE': profile,
+            'BROKER_URL': broker_url,
+            'RESULT_BACKEND': os.environ.get('CELERY_RESULT_BACKEND', broker_url),
+            'TASK_ALWAYS_EAGER': False,
+            # Redis görünürlük süresi en uzun görevden uzun olmalı; yoksa görev iki kez çalışır
+            'BROKER_TRANSPORT_OPTIONS': {'visibility_timeout': 2 * 60 * 60},
+        }
+
+    if profile == 'local':
+        folder = os.environ.get('CELERY_LOCAL_DIR') or os.path.join(base_dir, 'celery_local')
+        queue_folder = os.path.join(folder, 'queue')
+        for path in (queue_folder, os.path.join(folder, 'processed'), os.path.join(folder, 'results')):
+            os.makedirs(path, exist_ok=True)
+        return {
+            'PROFILE': profile,
+            'BROKER_URL': 'filesystem://',
+            'BROKER_TRANSPORT_OPTIONS': {
+                'data_folder_in': queue_folder,
+                'data_folder_out': queue_folder,
+                'processed_folder': os.path.join(folder, 'processed'),
+            },
+            'RESULT_BACKEND': 'file://' + os.path.join(folder, 'results'),
+            'TASK_ALWAYS_EAGER': False,
+        }
+
+    return {
+        'PROFILE': profile,
+        'BROKER_URL': 'memory://',
+        'RESULT_BACKEND': 'cache+memory://',
+        'TASK_ALWAYS_EAGER': True,
+        'TASK_EAGER_PROPAGATES': True,
+    }
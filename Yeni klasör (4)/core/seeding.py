@@ -0,0 +1,395 @@
+"""
+Üretim ölçeğinde sentetik veri üretimi
+
+Her veri kümesi kendi adı ve tohum değerinden türetilen ayrı bir rastgele sayı
+üreteci kullanır; aynı tohumla yalnızca bir kısmı üretilse bile sonuç aynı olur.
+Kayıtlar bulk_create ile parti parti eklenir, hiçbiri bellekte toplu tutulmaz.
+"""
+import datetime
+import ipaddress
+import itertools
+import random
+import time
+from decimal import Decimal
+
+from django.apps import apps
+from django.db import transaction
+
+from .cache import bump_model_version
+
+
+# Varsayılan hacimler; --scale ile çarpılır
+VOLUMES = {
+    'doctors': 10_000,
+    'shifts': 1_000_000,
+    'audit_logs': 200_000,
+    'certificates': 100_000,
+    'servers': 50_000,
+    'monitoring_logs': 10_000_000,
+    'inventory_items': 100_000,
+}
+
+BATCH_SIZE = 5000
+
+# Sabit tarihler; üretilen veri çalıştırma gününden bağımsızdır.
+# Nöbetler BASE_DATE'ten başlar, durumlar ve loglar REFERENCE_DATE'e göre üretilir.
+BASE_DATE = datetime.date(2024, 1, 1)
+REFERENCE_DATE = datetime.date(2026, 1, 1)
+
+FIRST_NAMES = [
+    'Ahmet', 'Mehmet', 'Mustafa', 'Ali', 'Hüseyin', 'Hasan', 'İbrahim', 'Osman', 'Yusuf', 'Murat',
+    'Ayşe', 'Fatma', 'Emine', 'Hatice', 'Zeynep', 'Elif', 'Şule', 'Özlem', 'Gülşen', 'Çiğdem',
+]
+SURNAMES = [
+    'Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Yıldırım', 'Öztürk', 'Aydın', 'Özdemir',
+    'Arslan', 'Doğan', 'Kılıç', 'Aslan', 'Çetin', 'Kara', 'Koç', 'Kurt', 'Özkan', 'Şimşek',
+]
+TITLES = ['Dr.', 'Uzm. Dr.', 'Doç. Dr.', 'Prof. Dr.', 'Op. Dr.']
+DEPARTMENTS = [
+    'Acil Servis', 'Dahiliye', 'Kardiyoloji', 'Nöroloji', 'Genel Cerrahi', 'Ortopedi', 'Pediatri',
+    'Kadın Doğum', 'Göz Hastalıkları', 'KBB', 'Üroloji', 'Radyoloji', 'Anesteziyoloji', 'Psikiyatri',
+    'Dermatoloji', 'Göğüs Hastalıkları', 'Enfeksiyon', 'Nefroloji', 'Onkoloji', 'Yoğun Bakım',
+]
+CERTIFICATE_TYPES = ['SSL', 'TLS', 'Kod İmzalama', 'E-posta (S/MIME)', 'İstemci', 'Wildcard SSL']
+ISSUERS = ["Let's Encrypt", 'DigiCert', 'Sectigo', 'GlobalSign', 'TÜRKTRUST', 'Kurum İçi CA']
+SERVER_TYPES = ['Fiziksel', 'Sanal', 'Bulut', 'Konteyner']
+INVENTORY_CATEGORIES = ['Dizüstü', 'Masaüstü', 'Monitör', 'Yazıcı', 'Ağ Cihazı', 'Telefon', 'Tablet', 'Sunucu Parçası']
+SUPPLIERS = ['Bilişim A.Ş.', 'Teknoloji Ltd.', 'Donanım Dünyası', 'Ağ Sistemleri', 'Ofis Çözümleri']
+METRICS = [('cpu_usage', 80.0), ('memory_usage', 85.0), ('disk_usage', 90.0), ('load_average', 4.0), ('response_time_ms', 500.0)]
+
+
+def scaled(name, scale):
+    return max(int(VOLUMES[name] * scale), 1)
+
+
+def rng_for(seed, name):
+    return random.Random(f'{seed}:{name}')
+
+
+def bulk_insert(model, objects, batch_size=BATCH_SIZE, progress=None, **kwargs):
+    """
+    Nesneleri partiler halinde ekler; her parti ayrı bir işlemdir
+
+    Returns:
+        int: Eklenen kayıt sayısı
+    """
+    objects = iter(objects)
+    total = 0
+    while True:
+        batch = list(itertools.islice(objects, batch_size))
+        if not batch:
+            break
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=batch_size, **kwargs)
+        total += len(batch)
+        if progress:
+            progress(total)
+    # bulk_create sinyal göndermez; önbellekteki türetilmiş veriler geçersiz kılınmalı
+    bump_model_version(model)
+    return total
+
+
+def ensure_named(model, names, **defaults):
+    """Ad listesindeki kayıtları yoksa oluşturur ve kimliklerini döndürür"""
+    existing = dict(model.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = [model(name=name, **defaults) for name in names if name not in existing]
+    if missing:
+        model.objects.bulk_create(missing)
+        bump_model_version(model)
+        existing = dict(model.objects.filter(name__in=names).values_list('name', 'id'))
+    return [existing[name] for name in names]
+
+
+def _random_date(rng, start, days):
+    return start + datetime.timedelta(days=rng.randrange(days))
+
+
+# Nöbet listesi
+
+def seed_doctors(seed, scale, progress=None):
+    from nobet_listesi.models import Department, Doctor
+    from nobet_listesi.search import build_doctor_search_text, rebuild_doctor_search_index
+
+    rng = rng_for(seed, 'doctors')
+    department_ids = ensure_named(Department, DEPARTMENTS)
+
+    def generate():
+        for i in range(scaled('doctors', scale)):
+            doctor = Doctor(
+                title=rng.choice(TITLES),
+                name=rng.choice(FIRST_NAMES),
+                surname=rng.choice(SURNAMES),
+                department_id=rng.choice(department_ids),
+                phone=f'+90 5{rng.randrange(30, 60)} {rng.randrange(100, 1000)} {rng.randrange(1000, 10000)}',
+                email=f'doktor{seed}.{i}@hastane.example',
+                external_id=f'seed-{seed}-{i}',
+            )
+            # bulk_create save() çağırmaz
+            doctor.search_text = build_doctor_search_text(doctor)
+            yield doctor
+
+    total = bulk_insert(Doctor, generate(), progress=progress)
+    # bulk_create FTS tablosunu doldurmaz; arama ölçümleri tüm doktorları görmeli
+    rebuild_doctor_search_index()
+    return total
+
+
+def seed_shifts(seed, scale, progress=None):
+    """
+    Nöbetleri iki yıla yayar
+
+    Her gün için farklı doktorlar seçildiğinden (doktor, tarih, nöbet tipi)
+    tekilliği korunur. Listeler bölüm ve ay başına bir tanedir.
+    """
+    from nobet_listesi.models import Department, Doctor, ShiftList, Shift
+
+    rng = rng_for(seed, 'shifts')
+    # Sıralama sabit olmalı; aksi halde aynı tohum farklı sonuç verir
+    doctors = list(Doctor.objects.order_by('id').values_list('id', 'department_id'))
+    if not doctors:
+        raise ValueError('Önce doktorlar üretilmelidir')
+
+    days = 730
+    months = sorted({(day.year, day.month) for day in (BASE_DATE + datetime.timedelta(days=d) for d in range(days))})
+    department_ids = list(Department.objects.order_by('id').values_list('id', flat=True))
+
+    lists = {}
+    for department_id in department_ids:
+        for year, month in months:
+            start = datetime.date(year, month, 1)
+            end = (start + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+            lists[(department_id, year, month)] = ShiftList(
+                title=f'Nöbet Listesi {month:02d}.{year}',
+                department_id=department_id,
+                start_date=start,
+                end_date=end,
+            )
+    ShiftList.objects.bulk_create(lists.values(), batch_size=BATCH_SIZE)
+    bump_model_version(ShiftList)
+    list_ids = {
+        (department_id, start.year, start.month): pk
+        for pk, department_id, start in ShiftList.objects.filter(
+            title__startswith='Nöbet Listesi ', start_date__gte=BASE_DATE
+        ).values_list('id', 'department_id', 'start_date')
+    }
+
+    count = scaled('shifts', scale)
+    per_day = min(-(-count // days), len(doctors))
+    shift_types = [choice for choice, _ in Shift.SHIFT_TYPE_CHOICES]
+    hours = {
+        'day': (datetime.time(8, 0), datetime.time(16, 0)),
+        'night': (datetime.time(16, 0), datetime.time(8, 0)),
+        'weekend': (datetime.time(8, 0), datetime.time(8, 0)),
+        'holiday': (datetime.time(8, 0), datetime.time(8, 0)),
+    }
+    fallback_department = department_ids[0]
+
+    def generate():
+        produced = 0
+        for offset in range(days):
+            date = BASE_DATE + datetime.timedelta(days=offset)
+            for doctor_id, department_id in rng.sample(doctors, per_day):
+                if produced >= count:
+                    return
+                shift_type = 'weekend' if date.weekday() >= 5 else rng.choice(shift_types[:2])
+                if rng.random() < 0.02:
+                    shift_type = 'holiday'
+                start_time, end_time = hours[shift_type]
+                yield Shift(
+                    shift_list_id=list_ids[(department_id or fallback_department, date.year, date.month)],
+                    doctor_id=doctor_id,
+                    date=date,
+                    shift_type=shift_type,
+                    start_time=start_time,
+                    end_time=end_time,
+                )
+                produced += 1
+
+    return bulk_insert(Shift, generate(), progress=progress, ignore_conflicts=True)
+
+
+def seed_audit_logs(seed, scale, progress=None):
+    from nobet_listesi.models import AuditLog
+
+    rng = rng_for(seed, 'audit_logs')
+    actions = [choice for choice, _ in AuditLog.ACTION_CHOICES]
+    model_names = ['ShiftList', 'Shift', 'Doctor', 'DataSource', 'Department']
+
+    def generate():
+        for i in range(scaled('audit_logs', scale)):
+            model_name = rng.choice(model_names)
+            object_id = rng.randrange(1, 100_000)
+            yield AuditLog(
+                action=rng.choice(actions),
+                model_name=model_name,
+                object_id=str(object_id),
+                object_repr=f'{model_name} #{object_id}',
+                changes={'field': rng.choice(['title', 'date', 'doctor', 'notes']), 'seed': seed},
+                ip_address=f'10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}',
+                user_agent='seed_scale',
+            )
+
+    return bulk_insert(AuditLog, generate(), progress=progress)
+
+
+# Sertifikalar
+
+def seed_certificates(seed, scale, progress=None):
+    from certificate_management.models import CertificateType, Certificate
+
+    rng = rng_for(seed, 'certificates')
+    type_ids = ensure_named(CertificateType, CERTIFICATE_TYPES)
+
+    def generate():
+        for i in range(scaled('certificates', scale)):
+            issue_date = _random_date(rng, REFERENCE_DATE - datetime.timedelta(days=1100), 1100)
+            expiry_date = issue_date + datetime.timedelta(days=rng.choice([90, 365, 730]))
+            if rng.random() < 0.02:
+                status = 'revoked'
+            elif rng.random() < 0.03:
+                status = 'pending'
+            else:
+                status = 'expired' if expiry_date < REFERENCE_DATE else 'active'
+            domain = f'app{i}.birim{rng.randrange(500)}.example.com.tr'
+            yield Certificate(
+                name=f'{domain} sertifikası',
+                certificate_type_id=rng.choice(type_ids),
+                domain_name=domain,
+                issuer=rng.choice(ISSUERS),
+                serial_number=f'{seed:04x}{i:012x}',
+                issue_date=issue_date,
+                expiry_date=expiry_date,
+                status=status,
+                key_algorithm=rng.choice(['RSA', 'ECDSA']),
+                key_size=rng.choice([2048, 3072, 4096, 256]),
+                signature_algorithm='sha256WithRSAEncryption',
+            )
+
+    return bulk_insert(Certificate, generate(), progress=progress)
+
+
+# Sunucular
+
+def seed_servers(seed, scale, progress=None):
+    from server_management.models import ServerType, Server
+
+    rng = rng_for(seed, 'servers')
+    type_ids = ensure_named(ServerType, SERVER_TYPES)
+    statuses = ['active'] * 85 + ['maintenance'] * 5 + ['inactive'] * 7 + ['retired'] * 3
+    systems = [choice for choice, _ in Server.OS_CHOICES]
+    network = ipaddress.ip_network('10.0.0.0/8')
+
+    def generate():
+        for i in range(scaled('servers', scale)):
+            purchase_date = _random_date(rng, REFERENCE_DATE - datetime.timedelta(days=1825), 1825)
+            yield Server(
+                name=f'srv-{seed}-{i:06d}',
+                hostname=f'srv-{seed}-{i:06d}.dc{rng.randrange(1, 4)}.local',
+                ip_address=str(network[(seed * 1_000_003 + i) % (network.num_addresses - 2) + 1]),
+                server_type_id=rng.choice(type_ids),
+                operating_system=rng.choice(systems),
+                os_version=f'{rng.randrange(6, 24)}.{rng.randrange(10)}',
+                cpu=f'{rng.choice([4, 8, 16, 32, 64])} çekirdek',
+                ram=f'{rng.choice([8, 16, 32, 64, 128, 256])} GB',
+                storage=f'{rng.choice([256, 512, 1024, 2048, 4096])} GB',
+                location=f'Kabin {rng.randrange(1, 200)}',
+                status=rng.choice(statuses),
+                purchase_date=purchase_date,
+                warranty_expiry=purchase_date + datetime.timedelta(days=rng.choice([1095, 1825])),
+            )
+
+    return bulk_insert(Server, generate(), progress=progress)
+
+
+def seed_monitoring_logs(seed, scale, progress=None):
+    """İzleme loglarını REFERENCE_DATE öncesindeki 90 güne yayar; çoğu bilgi seviyesindedir"""
+    from django.utils import timezone
+    from server_management.models import Server, ServerMonitoringLog
+
+    rng = rng_for(seed, 'monitoring_logs')
+    server_ids = list(Server.objects.order_by('id').values_list('id', flat=True))
+    if not server_ids:
+        raise ValueError('Önce sunucular üretilmelidir')
+
+    levels = ['info'] * 90 + ['warning'] * 7 + ['error'] * 2 + ['critical'] * 1
+    end = timezone.make_aware(datetime.datetime.combine(REFERENCE_DATE, datetime.time()))
+    window = 90 * 24 * 60 * 60
+
+    def generate():
+        for _ in range(scaled('monitoring_logs', scale)):
+            metric_name, threshold = rng.choice(METRICS)
+            level = rng.choice(levels)
+            value = round(rng.uniform(0, threshold) if level == 'info' else rng.uniform(threshold, threshold * 1.5), 2)
+            yield ServerMonitoringLog(
+                server_id=rng.choice(server_ids),
+                timestamp=end - datetime.timedelta(seconds=rng.randrange(window)),
+                log_level=level,
+                metric_name=metric_name,
+                metric_value=value,
+                threshold=threshold,
+                message=f'{metric_name} = {value}',
+                resolved=level == 'info' or rng.random() < 0.7,
+            )
+
+    return bulk_insert(ServerMonitoringLog, generate(), batch_size=BATCH_SIZE * 2, progress=progress)
+
+
+# Envanter
+
+def seed_inventory_items(seed, scale, progress=None):
+    from inventory_management.models import Category, Supplier, InventoryItem
+
+    rng = rng_for(seed, 'inventory_items')
+    category_ids = ensure_named(Category, INVENTORY_CATEGORIES)
+    supplier_ids = ensure_named(Supplier, SUPPLIERS)
+    statuses = ['available'] * 30 + ['in_use'] * 55 + ['maintenance'] * 5 + ['reserved'] * 5 + ['retired'] * 5
+
+    def generate():
+        for i in range(scaled('inventory_items', scale)):
+            purchase_date = _random_date(rng, REFERENCE_DATE - datetime.timedelta(days=1825), 1825)
+            yield InventoryItem(
+                name=f'{rng.choice(INVENTORY_CATEGORIES)} {i}',
+                serial_number=f'SN-{seed}-{i:08d}',
+                category_id=rng.choice(category_ids),
+                supplier_id=rng.choice(supplier_ids),
+                purchase_date=purchase_date,
+                purchase_price=Decimal(rng.randrange(50_000, 5_000_000)) / 100,
+                warranty_expiry=purchase_date + datetime.timedelta(days=730),
+                status=rng.choice(statuses),
+                location=f'Kat {rng.randrange(1, 10)} / Oda {rng.randrange(1, 50)}',
+            )
+
+    # Aynı tohumla tekrar çalıştırıldığında seri numarası çakışmaları atlanır
+    return bulk_insert(InventoryItem, generate(), progress=progress, ignore_conflicts=True)
+
+
+# Veri kümesi adı -> (gerekli uygulama, üretici); sıra bağımlılıkları gözetir
+DATASETS = {
+    'doctors': ('nobet_listesi', seed_doctors),
+    'shifts': ('nobet_listesi', seed_shifts),
+    'audit_logs': ('nobet_listesi', seed_audit_logs),
+    'certificates': ('certificate_management', seed_certificates),
+    'servers': ('server_management', seed_servers),
+    'monitoring_logs': ('server_management', seed_monitoring_logs),
+    'inventory_items': ('inventory_management', seed_inventory_items),
+}
+
+
+def seed_all(seed=42, scale=1.0, only=None, progress=None):
+    """
+    Seçilen veri kümelerini sırayla üretir
+
+    Returns:
+        dict: Veri kümesi adı -> {'rows': ..., 'seconds': ...} ya da {'skipped': sebep}
+    """
+    results = {}
+    for name, (app_label, generator) in DATASETS.items():
+        if only and name not in only:
+            continue
+        if not apps.is_installed(app_label):
+            results[name] = {'skipped': f'{app_label} yüklü değil'}
+            continue
+        start = time.perf_counter()
+        rows = generator(seed, scale, progress=(lambda total, name=name: progress(name, total)) if progress else None)
+        results[name] = {'rows': rows, 'seconds': round(time.perf_counter() - start, 2)}
+    return results
@@ -0,0 +1,155 @@
+"""
+Paylaşımlı depodaki dosyaların (core/storage.py) yetki denetimli sunumu
+
+İzin denetimini görünüm yapar; aktarım settings.BLOB_SERVE['BACKEND'] ile
+seçilir:
+
+- 'nginx': X-Accel-Redirect ile nginx'e devredilir. nginx'te depo dizinini
+  gösteren internal bir location tanımlanmalıdır:
+      location /protected-blobs/ { internal; alias /srv/portal/shared_storage/; }
+- 'sendfile': X-Sendfile ile Apache mod_xsendfile'a (ya da lighttpd) devredilir.
+- 'django': Dosya Django tarafından parça parça akıtılır.
+
+Bayt aralığı (Range) istekleri önde bir sunucu varsa onun tarafından, yoksa
+burada karşılanır. İçerik adresli anahtarlar değişmediğinden ETag özetin
+kendisidir.
+"""
+import mimetypes
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import content_disposition_header, parse_etags, quote_etag
+
+from .storage import HASH_CHUNK_SIZE, get_blob_storage
+
+
+DEFAULTS = {
+    'BACKEND': 'django',
+    'ACCEL_PREFIX': '/protected-blobs/',
+    'MAX_AGE': 24 * 60 * 60,
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'BLOB_SERVE', {}))
+    return config
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    Tek bir bayt aralığını çözümler
+
+    Returns:
+        tuple ya da None: (başlangıç, bitiş) dahil; başlık yoksa, geçersizse ya da
+        birden çok aralık isteniyorsa None (dosyanın tamamı gönderilir)
+
+    Raises:
+        RangeNotSatisfiable: Aralık dosyanın dışındaysa
+    """
+    if not header or not header.startswith('bytes='):
+        return None
+    spec = header[len('bytes='):].strip()
+    if ',' in spec:
+        return None
+    first, sep, last = spec.partition('-')
+    if not sep:
+        return None
+    try:
+        if not first:
+            # Son N bayt
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _iter_file(file, start, length, chunk_size=HASH_CHUNK_SIZE):
+    try:
+        file.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def serve_blob(request, key, file_name, content_type=None, as_attachment=True, etag=None):
+    """
+    Depodaki dosyayı yanıt olarak döndürür
+
+    Args:
+        key (str): Depolama anahtarı
+        file_name (str): İndirilen dosyanın adı
+        as_attachment (bool): False ise tarayıcıda açılır (önizleme)
+        etag (str, optional): Varsayılan, anahtarın son parçası (içerik özeti)
+    """
+    config = get_config()
+    storage = get_blob_storage()
+    content_type = content_type or mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+    etag = quote_etag(etag or key.rsplit('/', 1)[-1])
+
+    if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    headers = {
+        'Content-Type': content_type,
+        'ETag': etag,
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': f"private, max-age={config['MAX_AGE']}",
+        'Content-Disposition': content_disposition_header(as_attachment, file_name),
+        'X-Content-Type-Options': 'nosniff',
+    }
+
+    backend = config['BACKEND']
+    if backend == 'nginx':
+        response = HttpResponse(headers=headers)
+        response['X-Accel-Redirect'] = config['ACCEL_PREFIX'].rstrip('/') + '/' + quote(key)
+        return response
+    if backend == 'sendfile':
+        response = HttpResponse(headers=headers)
+        response['X-Sendfile'] = storage.path(key)
+        return response
+
+    size = storage.size(key)
+    byte_range = None
+    # If-Range farklı bir sürümü gösteriyorsa dosyanın tamamı gönderilir
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range or if_range == etag:
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416, headers={'Content-Range': f'bytes */{size}'})
+            return response
+
+    start, end = byte_range or (0, size - 1)
+    length = max(end - start + 1, 0)
+    if request.method == 'HEAD':
+        response = HttpResponse(headers=headers)
+    else:
+        response = StreamingHttpResponse(_iter_file(storage.open(key, 'rb'), start, length), headers=headers)
+    if byte_range:
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(length)
+    return response
@@ -0,0 +1,39 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .cache import bump_model_version_on_commit
+
+
+# Değişiklikleri önbelleği etkilemeyen modeller
+IGNORED_MODELS = {
+    'sessions.session',
+    'admin.logentry',
+    'contenttypes.contenttype',
+    'core.uploadsession',
+    # Okundu takibi her okumada yazılır; duyuru önbelleklerini etkilemez
+    'announcements.announcementreadstate',
+    'announcements.announcementreadcount',
+}
+
+
+def _should_track(model):
+    return model._meta.label_lower not in IGNORED_MODELS
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_version_on_change(sender, **kwargs):
+    """Kaydedilen ya da silinen modelin önbellek sürümünü artırır"""
+    if kwargs.get('raw') or not _should_track(sender):
+        return
+    bump_model_version_on_commit(sender)
+
+
+@receiver(m2m_changed)
+def bump_version_on_m2m_change(sender, instance, action, model, **kwargs):
+    """Çoktan çoğa ilişki değişince her iki ucun sürümünü artırır"""
+    if not action.startswith('post_'):
+        return
+    bump_model_version_on_commit(sender)
+    bump_model_version_on_commit(type(instance))
+    bump_model_version_on_commit(model)
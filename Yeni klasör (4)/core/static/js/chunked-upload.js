@@ -0,0 +1,142 @@
+/**
+ * Parçalı ve kaldığı yerden devam ettirilebilen dosya yükleme
+ *
+ * Kullanım:
+ *   chunkedUpload(file, {
+ *       url: '/core/uploads/',
+ *       csrfToken: '...',
+ *       onProgress: function(percent) { ... }
+ *   }).then(function(session) { session.key ... });
+ *
+ * Oturum kimliği localStorage'da tutulur; sayfa yenilense bile aynı dosya
+ * seçildiğinde yalnızca eksik parçalar gönderilir.
+ */
+(function(window) {
+    'use strict';
+
+    function storageKey(file) {
+        return 'chunkedUpload:' + [file.name, file.size, file.lastModified].join(':');
+    }
+
+    function toHex(buffer) {
+        return Array.prototype.map.call(new Uint8Array(buffer), function(b) {
+            return ('0' + b.toString(16)).slice(-2);
+        }).join('');
+    }
+
+    // Tarayıcı destekliyorsa dosya özeti gönderilir; depoda varsa yükleme atlanır
+    function sha256(file) {
+        if (!window.crypto || !window.crypto.subtle) {
+            return Promise.resolve(null);
+        }
+        return file.arrayBuffer()
+            .then(function(buffer) { return window.crypto.subtle.digest('SHA-256', buffer); })
+            .then(toHex)
+            .catch(function() { return null; });
+    }
+
+    function request(method, url, csrfToken, body, contentType) {
+        var headers = {'X-CSRFToken': csrfToken};
+        if (contentType) {
+            headers['Content-Type'] = contentType;
+        }
+        return fetch(url, {
+            method: method,
+            headers: headers,
+            body: body,
+            credentials: 'same-origin'
+        }).then(function(response) {
+            return response.json().then(function(data) {
+                if (!response.ok) {
+                    var error = new Error(data.error || response.statusText);
+                    error.status = response.status;
+                    throw error;
+                }
+                return data;
+            });
+        });
+    }
+
+    function resumeOrCreate(file, options) {
+        var saved = window.localStorage.getItem(storageKey(file));
+        var create = function() {
+            return sha256(file).then(function(hash) {
+                return request('POST', options.url, options.csrfToken, JSON.stringify({
+                    file_name: file.name,
+                    size: file.size,
+                    sha256: hash
+                }), 'application/json');
+            });
+        };
+
+        if (!saved) {
+            return create();
+        }
+        return request('GET', options.url + saved + '/', options.csrfToken)
+            .then(function(session) {
+                return session.status === 'failed' ? create() : session;
+            })
+            .catch(create);
+    }
+
+    function uploadChunks(file, session, options) {
+        var missing = (session.missing_chunks || []).slice();
+        var total = session.total_chunks;
+        var done = total - missing.length;
+        var retries = options.retries === undefined ? 3 : options.retries;
+
+        function report() {
+            if (options.onProgress) {
+                options.onProgress(Math.round(done / total * 100));
+            }
+        }
+
+        function sendChunk(index, attempt) {
+            var start = index * session.chunk_size;
+            var blob = file.slice(start, Math.min(start + session.chunk_size, file.size));
+            var url = options.url + session.id + '/chunks/' + index + '/';
+            return request('POST', url, options.csrfToken, blob, 'application/octet-stream')
+                .catch(function(error) {
+                    if (attempt >= retries || (error.status && error.status < 500)) {
+                        throw error;
+                    }
+                    return sendChunk(index, attempt + 1);
+                });
+        }
+
+        function next() {
+            if (!missing.length) {
+                return Promise.resolve();
+            }
+            var index = missing.shift();
+            return sendChunk(index, 0).then(function() {
+                done += 1;
+                report();
+                return next();
+            });
+        }
+
+        report();
+        return next();
+    }
+
+    window.chunkedUpload = function(file, options) {
+        return resumeOrCreate(file, options).then(function(session) {
+            if (session.status === 'complete') {
+                window.localStorage.removeItem(storageKey(file));
+                if (options.onProgress) {
+                    options.onProgress(100);
+                }
+                return session;
+            }
+
+            window.localStorage.setItem(storageKey(file), session.id);
+            return uploadChunks(file, session, options).then(function() {
+                return request('POST', options.url + session.id + '/complete/', options.csrfToken);
+            }).then(function(completed) {
+                window.localStorage.removeItem(storageKey(file));
+                return completed;
+            });
+        });
+    };
+})(window);
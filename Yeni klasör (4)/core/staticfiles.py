@@ -0,0 +1,420 @@
+"""
+Statik dosya hattı
+
+- Dış kütüphaneler VENDOR_ASSETS listesinden static/ altına indirilir
+  (vendor_assets komutu). Dosyalar depoya eklenene kadar şablonlar aynı
+  sürümleri CDN'den yükler.
+- STATIC_BUNDLES ayarındaki her paket, kaynak dosyaların küçültülüp
+  birleştirilmesiyle BundleFinder tarafından üretilir. Geliştirme sunucusu ve
+  collectstatic paketleri diğer statik dosyalar gibi bulur.
+- CompressedManifestStaticFilesStorage collectstatic sırasında dosya adlarına
+  içerik özeti ekler ve .gz / .br kopyalarını üretir. Özetli adlar hiç
+  değişmediğinden süresiz önbelleğe alınabilir (bkz. core.views.static_file).
+"""
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import posixpath
+import re
+import urllib.parse
+import urllib.request
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.finders import BaseFinder
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+
+try:
+    import brotli
+except ImportError:  # brotli kurulu değilse yalnızca gzip üretilir
+    brotli = None
+
+
+logger = logging.getLogger('core.staticfiles')
+
+# static/ altındaki yol: kaynak adres. CSS dosyalarındaki göreli url() başvuruları
+# (yazı tipleri, görseller) aynı göreli konuma ayrıca indirilir.
+VENDOR_ASSETS = {
+    # Ana arayüz (templates/base.html)
+    'vendor/bootstrap5/css/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap5/js/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/fontawesome6/css/all.min.css': 'https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.4.0/css/all.min.css',
+    'vendor/chart.js3/chart.min.js': 'https://cdn.jsdelivr.net/npm/chart.js@3.7.1/dist/chart.min.js',
+
+    # Nöbet listesi arayüzü (SB Admin 2, Bootstrap 4)
+    'vendor/fontawesome-free/css/all.min.css': 'https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@5.15.4/css/all.min.css',
+    'vendor/nunito/400.css': 'https://cdn.jsdelivr.net/npm/@fontsource/nunito@5.0.16/400.css',
+    'vendor/nunito/700.css': 'https://cdn.jsdelivr.net/npm/@fontsource/nunito@5.0.16/700.css',
+    'vendor/nunito/800.css': 'https://cdn.jsdelivr.net/npm/@fontsource/nunito@5.0.16/800.css',
+    'css/sb-admin-2.min.css': 'https://cdn.jsdelivr.net/npm/startbootstrap-sb-admin-2@4.1.4/css/sb-admin-2.min.css',
+    'js/sb-admin-2.min.js': 'https://cdn.jsdelivr.net/npm/startbootstrap-sb-admin-2@4.1.4/js/sb-admin-2.min.js',
+    'vendor/jquery/jquery.min.js': 'https://cdn.jsdelivr.net/npm/jquery@3.7.1/dist/jquery.min.js',
+    'vendor/bootstrap/js/bootstrap.bundle.min.js': 'https://cdn.jsdelivr.net/npm/bootstrap@4.6.2/dist/js/bootstrap.bundle.min.js',
+    'vendor/jquery-easing/jquery.easing.min.js': 'https://cdn.jsdelivr.net/npm/jquery.easing@1.4.1/jquery.easing.min.js',
+    'vendor/select2/select2.min.css': 'https://cdn.jsdelivr.net/npm/select2@4.0.13/dist/css/select2.min.css',
+    'vendor/select2/select2.min.js': 'https://cdn.jsdelivr.net/npm/select2@4.0.13/dist/js/select2.min.js',
+    'vendor/select2/i18n/tr.js': 'https://cdn.jsdelivr.net/npm/select2@4.0.13/dist/js/i18n/tr.js',
+    'vendor/select2/select2-bootstrap4.min.css': 'https://cdn.jsdelivr.net/npm/@ttskch/select2-bootstrap4-theme@1.5.2/dist/select2-bootstrap4.min.css',
+
+    # Sayfalara özel eklentiler
+    'vendor/datatables/jquery.dataTables.min.js': 'https://cdn.jsdelivr.net/npm/datatables.net@1.13.8/js/jquery.dataTables.min.js',
+    'vendor/datatables/dataTables.bootstrap4.min.js': 'https://cdn.jsdelivr.net/npm/datatables.net-bs4@1.13.8/js/dataTables.bootstrap4.min.js',
+    'vendor/datatables/dataTables.bootstrap4.min.css': 'https://cdn.jsdelivr.net/npm/datatables.net-bs4@1.13.8/css/dataTables.bootstrap4.min.css',
+    'vendor/datatables/Turkish.json': 'https://cdn.datatables.net/plug-ins/1.13.8/i18n/tr.json',
+    'vendor/sweetalert2/sweetalert2.all.min.js': 'https://cdn.jsdelivr.net/npm/sweetalert2@11.10.1/dist/sweetalert2.all.min.js',
+    'vendor/sweetalert2/sweetalert2.min.css': 'https://cdn.jsdelivr.net/npm/sweetalert2@11.10.1/dist/sweetalert2.min.css',
+    'vendor/daterangepicker/daterangepicker.css': 'https://cdn.jsdelivr.net/npm/daterangepicker@3.1.0/daterangepicker.css',
+    'vendor/daterangepicker/daterangepicker.js': 'https://cdn.jsdelivr.net/npm/daterangepicker@3.1.0/daterangepicker.js',
+    'vendor/daterangepicker/daterangepicker.min.js': 'https://cdn.jsdelivr.net/npm/daterangepicker@3.1.0/daterangepicker.js',
+    'vendor/daterangepicker/moment.min.js': 'https://cdn.jsdelivr.net/npm/moment@2.29.4/min/moment.min.js',
+    'vendor/moment/moment.min.js': 'https://cdn.jsdelivr.net/npm/moment@2.29.4/min/moment.min.js',
+    'vendor/chart.js/Chart.min.js': 'https://cdn.jsdelivr.net/npm/chart.js@2.9.4/dist/Chart.min.js',
+    'vendor/jsoneditor/jsoneditor.min.js': 'https://cdn.jsdelivr.net/npm/jsoneditor@9.10.4/dist/jsoneditor.min.js',
+    'vendor/jsoneditor/jsoneditor.min.css': 'https://cdn.jsdelivr.net/npm/jsoneditor@9.10.4/dist/jsoneditor.min.css',
+}
+
+# Sıkıştırılacak dosya türleri; yazı tipleri (woff2) ve görseller zaten sıkıştırılmıştır
+COMPRESS_EXTENSIONS = ('.css', '.js', '.json', '.svg', '.map', '.txt', '.xml', '.html', '.ttf', '.eot', '.ico')
+COMPRESS_MIN_SIZE = 512
+
+_CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_CSS_STRING_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+_CSS_STRING_OR_COMMENT_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*(?!!).*?\*/''', re.DOTALL)
+_CSS_CHARSET_RE = re.compile(r'@charset\s+("[^"]*"|\'[^\']*\')\s*;', re.IGNORECASE)
+
+
+def css_urls(content):
+    """CSS içindeki göreli url() başvuruları (data:, http: vb. hariç)"""
+    for match in _CSS_URL_RE.finditer(content):
+        url = match.group(2).strip()
+        if is_relative_url(url):
+            yield url
+
+
+def is_relative_url(url):
+    return not (url.startswith(('data:', '#', '/', 'http:', 'https:', 'about:')) or '//' in url[:8])
+
+
+def _split_url(url):
+    for separator in ('?', '#'):
+        if separator in url:
+            index = url.index(separator)
+            return url[:index], url[index:]
+    return url, ''
+
+
+def rebase_css_urls(content, source_path, target_path):
+    """
+    Göreli url() başvurularını kaynak dosyanın konumundan hedefin konumuna taşır
+
+    Örnek: vendor/fa/css/all.css içindeki ../webfonts/x.woff2, bundles/main.css
+    içinde ../vendor/fa/webfonts/x.woff2 olur.
+    """
+    source_dir = posixpath.dirname(source_path)
+    target_dir = posixpath.dirname(target_path) or '.'
+
+    def replace(match):
+        quote, url = match.group(1), match.group(2).strip()
+        if not is_relative_url(url):
+            return match.group(0)
+        path, suffix = _split_url(url)
+        resolved = posixpath.normpath(posixpath.join(source_dir, path))
+        return f'url({quote}{posixpath.relpath(resolved, target_dir)}{suffix}{quote})'
+
+    return _CSS_URL_RE.sub(replace, content)
+
+
+def minify_css(content):
+    """
+    Yorumları ve gereksiz boşlukları kaldırır
+
+    Dizgelere dokunulmaz; /*! ile başlayan lisans yorumları korunur.
+    """
+    # Dizgeler ve yorumlar birlikte taranır; yorum içindeki tırnaklar dizge sanılmaz
+    content = _CSS_STRING_OR_COMMENT_RE.sub(lambda match: match.group(1) or '', content)
+    parts = _CSS_STRING_RE.split(content)
+    for index in range(0, len(parts), 2):  # çift indisler dizge dışı
+        part = re.sub(r'\s+', ' ', parts[index])
+        part = re.sub(r'\s*([{};,])\s*', r'\1', part)
+        parts[index] = part.replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def minify_js(content):
+    """
+    Güvenli küçültme: girintileri, boş satırları ve tam satır // yorumlarını kaldırır
+
+    Satır sonları korunur (otomatik noktalı virgül kuralları değişmez); şablon
+    dizgelerinin (`...`) içindeki satırlara dokunulmaz.
+    """
+    lines = []
+    in_template = False
+    for line in content.splitlines():
+        if in_template:
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('//'):
+                lines.append(stripped)
+        # Kaçışsız ters tırnak sayısı tekse satır bir şablon dizgesinin içinde biter
+        if len(re.findall(r'(?<!\\)`', line)) % 2:
+            in_template = not in_template
+    return '\n'.join(lines)
+
+
+VENDOR_LOCK_FILE = 'vendor-lock.json'
+
+
+def _sha384(data):
+    return 'sha384-' + base64.b64encode(hashlib.sha384(data).digest()).decode('ascii')
+
+
+def _fetch(url, timeout=30):
+    request = urllib.request.Request(url, headers={'User-Agent': 'vendor-assets'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read()
+
+
+def download_vendor_assets(root, force=False, progress=None):
+    """
+    VENDOR_ASSETS'i root (static/) altına indirir ve kilit dosyası yazar
+
+    CSS dosyalarındaki göreli url() başvuruları da indirilir. Kilit dosyasında
+    her dosyanın adresi ve SRI özeti tutulur; dosyalar depoya eklenir, böylece
+    sunucular çalışırken dış ağa erişmez.
+
+    Returns:
+        dict: static/ altındaki yol -> {'url', 'integrity'}
+    """
+    lock = {}
+    queue = list(VENDOR_ASSETS.items())
+    while queue:
+        path, url = queue.pop(0)
+        if path in lock:
+            continue
+        target = os.path.join(root, *path.split('/'))
+        if os.path.exists(target) and not force:
+            with open(target, 'rb') as f:
+                data = f.read()
+        else:
+            data = _fetch(url)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as f:
+                f.write(data)
+            if progress:
+                progress(path, len(data))
+        lock[path] = {'url': url, 'integrity': _sha384(data)}
+
+        if path.endswith('.css'):
+            for ref in css_urls(data.decode('utf-8', errors='replace')):
+                ref_path, _ = _split_url(ref)
+                queue.append((
+                    posixpath.normpath(posixpath.join(posixpath.dirname(path), ref_path)),
+                    urllib.parse.urljoin(url, ref_path),
+                ))
+
+    os.makedirs(os.path.join(root, 'vendor'), exist_ok=True)
+    with open(os.path.join(root, 'vendor', VENDOR_LOCK_FILE), 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(lock.items())), f, indent=2)
+    return lock
+
+
+def verify_vendor_assets(root):
+    """
+    Kilit dosyasındaki dosyaların varlığını ve özetlerini denetler (ağ gerekmez)
+
+    Returns:
+        list: Sorunlu dosyalar için açıklamalar
+    """
+    lock_path = os.path.join(root, 'vendor', VENDOR_LOCK_FILE)
+    if not os.path.exists(lock_path):
+        return [f'{lock_path} yok; vendor_assets komutunu çalıştırın']
+    with open(lock_path, encoding='utf-8') as f:
+        lock = json.load(f)
+
+    problems = [f'{path}: kilit dosyasında yok' for path in VENDOR_ASSETS if path not in lock]
+    for path, entry in lock.items():
+        target = os.path.join(root, *path.split('/'))
+        if not os.path.exists(target):
+            problems.append(f'{path}: dosya yok')
+            continue
+        with open(target, 'rb') as f:
+            if _sha384(f.read()) != entry['integrity']:
+                problems.append(f'{path}: özet uyuşmuyor')
+    return problems
+
+def _is_minified(path):
+    return '.min.' in posixpath.basename(path)
+
+
+def get_bundles():
+    return getattr(settings, 'STATIC_BUNDLES', {})
+
+
+def bundle_root():
+    return getattr(settings, 'STATIC_BUNDLE_ROOT', os.path.join(settings.BASE_DIR, 'static_bundles'))
+
+
+def _find_source(path):
+    # BundleFinder kendi paketlerini kaynak olarak aramaz
+    for finder in finders.get_finders():
+        if isinstance(finder, BundleFinder):
+            continue
+        found = finder.find(path)
+        if found:
+            return found
+    return None
+
+
+def build_bundle(name):
+    """
+    Paketi gerekirse yeniden üretir
+
+    Kaynaklardan biri bulunamazsa paket atlanır ve uyarı loglanır (ör. uygulama
+    yüklü değil ya da vendor_assets çalıştırılmamış).
+
+    Returns:
+        str | None: Üretilen dosyanın tam yolu
+    """
+    sources = get_bundles().get(name)
+    if not sources:
+        return None
+
+    found = []
+    for source in sources:
+        path = _find_source(source)
+        if path is None:
+            logger.warning("Statik paket %s üretilemedi: %s bulunamadı", name, source)
+            return None
+        found.append((source, path))
+
+    # Kaynak listesi değişince de yeniden üretilsin diye ilk satırda imza tutulur
+    signature = '/* bundle:%s */' % hashlib.md5('\n'.join(sources).encode('utf-8')).hexdigest()
+    target = os.path.join(bundle_root(), *name.split('/'))
+    if os.path.exists(target):
+        built_at = os.path.getmtime(target)
+        with open(target, encoding='utf-8') as f:
+            current = f.readline().rstrip('\n')
+        if current == signature and all(os.path.getmtime(path) <= built_at for _, path in found):
+            return target
+
+    chunks = [signature]
+    for source, path in found:
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        if name.endswith('.css'):
+            content = _CSS_CHARSET_RE.sub('', content)
+            content = rebase_css_urls(content, source, name)
+            if not _is_minified(source):
+                content = minify_css(content)
+        elif name.endswith('.js') and not _is_minified(source):
+            content = minify_js(content)
+        chunks.append(f'/* {source} */\n{content.strip()}')
+
+    # JS dosyaları arasında noktalı virgül: biri ; ile bitmiyorsa sonraki bozulmasın
+    separator = '\n;\n' if name.endswith('.js') else '\n'
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp = f'{target}.tmp'
+    with open(temp, 'w', encoding='utf-8') as f:
+        f.write(separator.join(chunks) + '\n')
+    os.replace(temp, target)
+    return target
+
+
+class BundleFinder(BaseFinder):
+    """STATIC_BUNDLES ayarındaki paketleri üreten ve bulan statik dosya bulucu"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=bundle_root())
+
+    def check(self, **kwargs):
+        return []
+
+    def find(self, path, all=False):
+        if path not in get_bundles():
+            return []
+        target = build_bundle(path)
+        if target is None:
+            return []
+        return [target] if all else target
+
+    def list(self, ignore_patterns):
+        for name in get_bundles():
+            if build_bundle(name) is not None:
+                yield name, self.storage
+
+
+def compress_file(storage, name):
+    """Dosyanın .gz ve (brotli kuruluysa) .br kopyalarını yazar; küçülmüyorsa yazmaz"""
+    if not name.endswith(COMPRESS_EXTENSIONS):
+        return []
+    path = storage.path(name)
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return []
+
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+
+    written = []
+    for suffix, compressed in variants:
+        # %5'ten az kazanç için ayrı dosya ve Content-Encoding değmez
+        if len(compressed) >= len(data) * 0.95:
+            continue
+        with open(path + suffix, 'wb') as f:
+            f.write(compressed)
+        written.append(name + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Özetli dosya adları ve önceden sıkıştırılmış kopyalar üreten depolama
+
+    Manifest'te ya da diskte bulunmayan dosyalar (ör. henüz eklenmemiş
+    görseller, collectstatic çalıştırılmamış bir kurulum) için şablonlar hata
+    vermez, özetsiz adı kullanır ve uyarı loglanır.
+    """
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            missing = self.__dict__.setdefault('_missing_names', set())
+            if name not in missing:
+                missing.add(name)
+                logger.warning("Statik dosya bulunamadı, özetsiz ad kullanılıyor: %s", name)
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed.add(hashed_name)
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+        compressed = 0
+        for hashed_name in sorted(hashed):
+            compressed += len(compress_file(self, hashed_name))
+        logger.info("%d statik dosyanın %d sıkıştırılmış kopyası üretildi%s", len(hashed), compressed,
+                    '' if brotli is not None else ' (brotli kurulu değil, yalnızca gzip)')
+
+    def is_hashed(self, name):
+        """Ad manifest'teki özetli adlardan biriyse True"""
+        return name in self._hashed_names()
+
+    def _hashed_names(self):
+        names = getattr(self, '_hashed_name_set', None)
+        if names is None:
+            names = self._hashed_name_set = set(self.hashed_files.values())
+        return names
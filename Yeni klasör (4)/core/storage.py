@@ -0,0 +1,115 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from django.core.files import File
+from django.core.files.storage import storages
+
+
+# settings.STORAGES içindeki paylaşımlı depolama takma adı.
+# Web ve worker sunucuları aynı dizini (NFS vb.) ya da S3 uyumlu bir depoyu görür.
+BLOB_STORAGE_ALIAS = 'blobs'
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def is_sha256(value):
+    """Değer küçük harfli 64 karakterlik onaltılık bir SHA-256 özeti mi"""
+    return isinstance(value, str) and bool(SHA256_RE.match(value))
+
+
+def get_blob_storage():
+    """Paylaşımlı depolama nesnesini döndürür"""
+    return storages[BLOB_STORAGE_ALIAS]
+
+
+def blob_key(sha256):
+    """
+    İçerik özetinden depolama anahtarı üretir
+
+    Aynı içerik her zaman aynı anahtara düşer; böylece tekrar yüklemeler saptanır.
+
+    Raises:
+        ValueError: Özet geçerli bir SHA-256 değilse (anahtar depo dışına taşamaz)
+    """
+    if not is_sha256(sha256):
+        raise ValueError("Geçersiz SHA-256 özeti")
+    return f"sha256/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+def hash_file(file_obj):
+    """Dosyanın SHA-256 özetini hesaplar ve dosyayı başa sarar"""
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    for chunk in iter(lambda: file_obj.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def blob_exists(key):
+    return get_blob_storage().exists(key)
+
+
+def put_blob(file_obj, sha256=None):
+    """
+    Dosyayı içerik adresli olarak paylaşımlı depoya yazar
+
+    Args:
+        file_obj: Okunabilir ve başa sarılabilir dosya nesnesi
+        sha256 (str, optional): Önceden hesaplanmış özet
+
+    Returns:
+        tuple: (anahtar, yeni yazıldıysa True)
+    """
+    storage = get_blob_storage()
+    key = blob_key(sha256 or hash_file(file_obj))
+    if storage.exists(key):
+        return key, False
+
+    file_obj.seek(0)
+    saved = storage.save(key, File(file_obj))
+    if saved != key:
+        # Eşzamanlı aynı yükleme: depo farklı bir ad verdiyse fazlalığı sil
+        storage.delete(saved)
+    return key, True
+
+
+def open_blob(key, mode='rb'):
+    return get_blob_storage().open(key, mode)
+
+
+def delete_blob(key):
+    get_blob_storage().delete(key)
+
+
+@contextmanager
+def local_blob_path(key, suffix=''):
+    """
+    Depodaki dosyaya yerel bir yol sağlar
+
+    Dosya sistemi deposunda doğrudan dosyanın yolu kullanılır; uzak depolarda
+    dosya geçici bir dosyaya indirilir ve işlem bitince silinir.
+    """
+    storage = get_blob_storage()
+    try:
+        path = storage.path(key)
+    except NotImplementedError:
+        path = None
+
+    if path is not None:
+        yield path
+        return
+
+    fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, 'wb') as destination, storage.open(key, 'rb') as source:
+            shutil.copyfileobj(source, destination, HASH_CHUNK_SIZE)
+        yield temp_path
+    finally:
+        os.remove(temp_path)
@@ -0,0 +1,28 @@
+import datetime
+
+from celery import shared_task
+from django.utils import timezone
+
+from core.models import UploadSession
+
+
+@shared_task
+def purge_stale_upload_sessions(hours=24):
+    """
+    Yarım kalmış eski yükleme oturumlarını ve parçalarını siler
+
+    Args:
+        hours (int): Bu süreden eski tamamlanmamış oturumlar silinir (saat)
+
+    Returns:
+        int: Silinen oturum sayısı
+    """
+    cutoff = timezone.now() - datetime.timedelta(hours=hours)
+    sessions = UploadSession.objects.filter(updated_at__lt=cutoff).exclude(status='complete')
+
+    count = 0
+    for session in sessions:
+        session.discard_parts()
+        session.delete()
+        count += 1
+    return count
@@ -0,0 +1,125 @@
+"""
+Şablon parçalarını model sürümleri ve kullanıcı yetkileriyle önbelleğe alma
+
+Kullanım:
+    {% load fragment_cache %}
+
+    {% cachefragment "navigation" %}...{% endcachefragment %}
+
+    {% cachefragment "shift_table" "nobet_listesi.Shift" "nobet_listesi.Doctor" on shift_list.pk show_contact_info %}
+        ...
+    {% endcachefragment %}
+
+Adın ardından parçanın bağlı olduğu modeller ('uygulama.Model'), 'on'
+sözcüğünden sonra anahtara eklenecek değerler yazılır. Anahtar ayrıca
+kullanıcının yetki kümesini, etkin dili ve parçanın şablon kaynağını içerir;
+modellerden biri değişince, yetkisi farklı bir kullanıcı geldiğinde ya da şablon
+düzenlendiğinde parça yeniden işlenir.
+
+Parça içinde {% csrf_token %} kullanılamaz: belirteç oturuma özeldir.
+{% include %} ile eklenen şablonlardaki değişiklikler anahtara yansımaz.
+"""
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import caches
+from django.template.base import Node
+from django.template.defaulttags import CsrfTokenNode
+from django.utils import translation
+
+from core.cache import get_model_versions, permission_signature
+
+
+register = template.Library()
+
+
+def _request_model_versions(request, labels):
+    """Model sürümlerini istek boyunca bir kez okur; aynı sayfadaki parçalar paylaşır"""
+    if not labels:
+        return ()
+    known = getattr(request, '_fragment_model_versions', None) if request is not None else None
+    if known is None:
+        known = {}
+        if request is not None:
+            request._fragment_model_versions = known
+    missing = [label for label in labels if label not in known]
+    if missing:
+        known.update(zip(missing, get_model_versions(*missing)))
+    return tuple(known[label] for label in labels)
+
+
+def _request_user(context):
+    request = context.get('request')
+    user = getattr(request, 'user', None)
+    return user if user is not None else context.get('user')
+
+
+class CacheFragmentNode(Node):
+    def __init__(self, nodelist, name, models, vary_on, source_digest):
+        self.nodelist = nodelist
+        self.name = name
+        self.models = models
+        self.vary_on = vary_on
+        self.source_digest = source_digest
+
+    def cache_key(self, context):
+        name = self.name.resolve(context)
+        labels = [str(model.resolve(context)).lower() for model in self.models]
+        parts = [
+            self.source_digest,
+            translation.get_language() or '',
+            permission_signature(_request_user(context)),
+            *_request_model_versions(context.get('request'), labels),
+            *(value.resolve(context) for value in self.vary_on),
+        ]
+        raw = ':'.join(str(part) for part in parts)
+        return f"template_fragment:{name}:{hashlib.md5(raw.encode('utf-8')).hexdigest()}"
+
+    def render(self, context):
+        cache = caches['default']
+        key = self.cache_key(context)
+        content = cache.get(key)
+        if content is None:
+            content = self.nodelist.render(context)
+            timeout = getattr(settings, 'FRAGMENT_CACHE_TIMEOUT',
+                              getattr(settings, 'CACHE_MODEL_TIMEOUT', 60 * 60))
+            cache.set(key, content, timeout)
+        return content
+
+
+@register.tag('cachefragment')
+def do_cachefragment(parser, token):
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' en az bir parça adı almalıdır.")
+
+    nodelist = parser.parse(('endcachefragment',))
+    parser.delete_first_token()
+
+    if nodelist.get_nodes_by_type(CsrfTokenNode):
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' içinde {{% csrf_token %}} kullanılamaz; belirteç oturuma özeldir."
+        )
+
+    args = bits[2:]
+    if 'on' in args:
+        index = args.index('on')
+        model_bits, vary_bits = args[:index], args[index + 1:]
+    else:
+        model_bits, vary_bits = args, []
+
+    # Parçanın kaynağı anahtara katılır; şablon değişince eski kayıtlar kullanılmaz
+    source = hashlib.md5(str(getattr(parser.origin, 'name', '')).encode('utf-8'))
+    for node in nodelist.get_nodes_by_type(Node):
+        node_token = getattr(node, 'token', None)
+        if node_token is not None:
+            source.update(node_token.contents.encode('utf-8'))
+
+    return CacheFragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in model_bits],
+        [parser.compile_filter(bit) for bit in vary_bits],
+        source.hexdigest()[:12],
+    )
@@ -0,0 +1,145 @@
+"""
+Türkçe metin normalizasyonu, kök bulma ve arama vurgulama yardımcıları
+"""
+import functools
+import html
+import re
+
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+
+# Türkçe karakterlerin arama için ASCII karşılıkları.
+# "ı/İ/I" ve "i" aynı harf kabul edilir; böylece "ışık", "Işık" ve "isik" eşleşir.
+TURKISH_FOLD_MAP = str.maketrans({
+    'ı': 'i', 'İ': 'i', 'I': 'i',
+    'ş': 's', 'Ş': 's',
+    'ç': 'c', 'Ç': 'c',
+    'ğ': 'g', 'Ğ': 'g',
+    'ö': 'o', 'Ö': 'o',
+    'ü': 'u', 'Ü': 'u',
+    'â': 'a', 'Â': 'a',
+    'î': 'i', 'Î': 'i',
+    'û': 'u', 'Û': 'u',
+})
+
+# Normalize edilmiş (ASCII) metinde çekim ve iyelik ekleri, uzundan kısaya.
+# Kök bulma hafif tutulur: aynı kurallar indekse ve sorguya uygulandığından
+# tutarlı olması, dilbilgisel olarak doğru olmasından önemlidir.
+TURKISH_SUFFIXES = frozenset({
+    'lerinden', 'larindan', 'lerinde', 'larinda', 'lerine', 'larina', 'lerini', 'larini',
+    'lerin', 'larin', 'leri', 'lari', 'ler', 'lar',
+    'sinden', 'sindan', 'sunden', 'sundan', 'inden', 'indan', 'unden', 'undan',
+    'sinde', 'sinda', 'sunde', 'sunda', 'inde', 'inda', 'unde', 'unda',
+    'siyle', 'suyla', 'iyle', 'uyla', 'yle', 'yla',
+    'nden', 'ndan', 'den', 'dan', 'ten', 'tan', 'nde', 'nda', 'de', 'da', 'te', 'ta',
+    'nin', 'nun', 'in', 'un', 'yi', 'yu', 'ye', 'ya', 'si', 'su', 'ni', 'nu', 'ne', 'na',
+    'dir', 'dur', 'tir', 'tur', 'mis', 'mus', 'iyor', 'uyor',
+    'i', 'u', 'e', 'a',
+})
+_SUFFIX_LENGTHS = sorted({len(suffix) for suffix in TURKISH_SUFFIXES}, reverse=True)
+
+STEM_MIN_LENGTH = 4
+STEM_MAX_PASSES = 3
+
+
+def normalize_turkish(text):
+    """
+    Metni Türkçe kurallarına göre arama için normalize eder
+
+    Args:
+        text (str): Normalize edilecek metin
+
+    Returns:
+        str: Küçük harfli, aksansız ve noktalama işaretlerinden arındırılmış metin
+    """
+    if not text:
+        return ''
+
+    text = str(text).translate(TURKISH_FOLD_MAP).lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return ' '.join(text.split())
+
+
+@functools.lru_cache(maxsize=50000)
+def stem_turkish(word):
+    """
+    Normalize edilmiş kelimenin ekleri atılmış kökü
+
+    Örnek:
+        sunucularinda -> sunucu -> sunuc, bakimi -> bakim
+    """
+    for _ in range(STEM_MAX_PASSES):
+        for length in _SUFFIX_LENGTHS:
+            if len(word) - length >= STEM_MIN_LENGTH and word[-length:] in TURKISH_SUFFIXES:
+                word = word[:-length]
+                break
+        else:
+            break
+    return word
+
+
+def stem_text(text):
+    """Metni normalize eder ve her kelimeyi köküne indirger"""
+    return ' '.join(stem_turkish(word) for word in normalize_turkish(text).split())
+
+
+def html_to_text(value):
+    """Zengin metin (HTML) içeriğini düz metne çevirir"""
+    if not value:
+        return ''
+    return ' '.join(html.unescape(strip_tags(str(value))).split())
+
+
+def _fold_aligned(text):
+    """Her karakteri tek karaktere katlar; sonuç orijinal metinle aynı hizadadır"""
+    return ''.join(
+        (char.translate(TURKISH_FOLD_MAP).lower() or char)[0]
+        for char in text
+    )
+
+
+def highlight_snippet(text, query, length=200):
+    """
+    Düz metinden sorgu kelimelerini içeren bir bölüm seçer ve eşleşmeleri <mark> ile işaretler
+
+    Sorgu kelimeleri köklerine indirgenir; "sunucularda" araması "sunucu"
+    geçen yerleri de vurgular.
+
+    Returns:
+        SafeString: HTML olarak güvenli kısa metin
+    """
+    if not text:
+        return ''
+    stems = sorted({stem_turkish(token) for token in normalize_turkish(query).split()}, key=len, reverse=True)
+    folded = _fold_aligned(text)
+
+    spans = []
+    if stems:
+        pattern = re.compile(r'\b(?:%s)\w*' % '|'.join(re.escape(stem) for stem in stems))
+        spans = [match.span() for match in pattern.finditer(folded)]
+
+    start = 0
+    if spans:
+        start = max(0, spans[0][0] - length // 4)
+        # Kelimenin ortasından başlama
+        while start > 0 and not text[start - 1].isspace():
+            start -= 1
+    end = min(len(text), start + length)
+    while end < len(text) and not text[end].isspace():
+        end += 1
+
+    parts = ['…' if start > 0 else '']
+    position = start
+    for span_start, span_end in spans:
+        if span_end <= start or span_start >= end:
+            continue
+        span_start, span_end = max(span_start, start), min(span_end, end)
+        parts.append(escape(text[position:span_start]))
+        parts.append(f"<mark>{escape(text[span_start:span_end])}</mark>")
+        position = span_end
+    parts.append(escape(text[position:end]))
+    if end < len(text):
+        parts.append('…')
+    return mark_safe(''.join(parts))
+
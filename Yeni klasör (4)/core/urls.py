@@ -0,0 +1,13 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # Parçalı dosya yükleme
+    path('uploads/', views.upload_session_create, name='upload_session_create'),
+    path('uploads/<uuid:session_id>/', views.upload_session_status, name='upload_session_status'),
+    path('uploads/<uuid:session_id>/chunks/<int:index>/', views.upload_session_chunk, name='upload_session_chunk'),
+    path('uploads/<uuid:session_id>/complete/', views.upload_session_complete, name='upload_session_complete'),
+
+    # SQL profil raporu
+    path('sql-profile/', views.sql_profile_report, name='sql_profile_report'),
+]
@@ -0,0 +1,200 @@
+import hmac
+import json
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (FileResponse, Http404, HttpResponse, HttpResponseForbidden,
+                         HttpResponseNotModified, JsonResponse)
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.utils.translation import gettext_lazy as _
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_POST, require_GET
+from django.views.static import was_modified_since
+
+from . import metrics as app_metrics
+from .models import UploadSession
+from .storage import is_sha256
+from .profiling import get_config, get_report, clear_report
+
+
+# Parçalar tek istekte request.body ile okunur; DATA_UPLOAD_MAX_MEMORY_SIZE altında kalmalı
+UPLOAD_CHUNK_SIZE = getattr(settings, 'UPLOAD_CHUNK_SIZE', 2 * 1024 * 1024)
+UPLOAD_MAX_SIZE = getattr(settings, 'UPLOAD_MAX_SIZE', 200 * 1024 * 1024)
+
+
+@login_required
+@require_POST
+def upload_session_create(request):
+    """
+    Parçalı yükleme oturumu başlatır
+
+    İstemci dosyanın SHA-256 özetini gönderirse ve kullanıcı aynı içeriği daha
+    önce yüklediyse yükleme hiç yapılmadan oturum tamamlanmış olarak döner.
+    """
+    try:
+        data = json.loads(request.body or '{}')
+        file_name = str(data['file_name'])[:255]
+        size = int(data['size'])
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({'error': _('Geçersiz istek.')}, status=400)
+
+    if size <= 0 or size > UPLOAD_MAX_SIZE:
+        return JsonResponse({'error': _('Dosya boyutu izin verilen sınırların dışında.')}, status=400)
+
+    expected_sha256 = str(data.get('sha256') or '').lower()
+    if expected_sha256 and not is_sha256(expected_sha256):
+        return JsonResponse({'error': _('Geçersiz SHA-256 özeti.')}, status=400)
+
+    session = UploadSession.objects.create(
+        user=request.user,
+        file_name=file_name,
+        size=size,
+        chunk_size=UPLOAD_CHUNK_SIZE,
+        expected_sha256=expected_sha256,
+    )
+    session.skip_if_known()
+
+    return JsonResponse(session.as_dict(), status=201)
+
+
+@login_required
+@require_GET
+def upload_session_status(request, session_id):
+    """Oturumun durumunu ve eksik parçalarını döndürür (devam ettirme için)"""
+    session = get_object_or_404(UploadSession, pk=session_id, user=request.user)
+    return JsonResponse(session.as_dict())
+
+
+@login_required
+@require_POST
+def upload_session_chunk(request, session_id, index):
+    """Bir parçayı ham istek gövdesi olarak alır"""
+    session = get_object_or_404(UploadSession, pk=session_id, user=request.user)
+    if session.status != 'pending':
+        return JsonResponse({'error': _('Yükleme oturumu kapalı.')}, status=409)
+
+    try:
+        session.write_chunk(index, request.body)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({'index': index, 'received': True})
+
+
+@login_required
+@require_POST
+def upload_session_complete(request, session_id):
+    """Parçaları birleştirir ve dosyanın depolama anahtarını döndürür"""
+    session = get_object_or_404(UploadSession, pk=session_id, user=request.user)
+
+    if session.status == 'pending':
+        try:
+            session.assemble()
+        except ValueError as e:
+            return JsonResponse(dict(session.as_dict(), error=str(e)), status=400)
+
+    return JsonResponse(session.as_dict())
+
+
+@user_passes_test(lambda u: u.is_authenticated and u.is_superuser)
+def sql_profile_report(request):
+    """SQL bütçesini aşan en kötü istekleri listeler"""
+    if request.method == 'POST':
+        clear_report()
+        messages.success(request, _('SQL profil raporu temizlendi.'))
+        return redirect('sql_profile_report')
+
+    return render(request, 'core/sql_profile_report.html', {
+        'profiles': get_report(),
+        'config': get_config(),
+    })
+
+
+# Statik dosya sunumu (SERVE_STATIC açıkken; önde nginx gibi bir sunucu yoksa)
+
+STATIC_IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+STATIC_DEFAULT_CACHE = 'public, max-age=300'
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for item in header.split(','):
+        coding, _sep, params = item.partition(';')
+        params = params.replace(' ', '')
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+@require_GET
+def static_file(request, path):
+    """
+    STATIC_ROOT'taki dosyayı önceden sıkıştırılmış kopyasıyla sunar
+
+    Özetli adlar (collectstatic manifest'indeki) süresiz önbelleğe alınır ve
+    tarayıcı bunları bir daha doğrulamaz; diğerleri kısa süreli önbelleğe alınır
+    ve If-Modified-Since ile doğrulanır.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    immutable = getattr(staticfiles_storage, 'is_hashed', lambda name: False)(path)
+    stat = os.stat(full_path)
+    if not immutable and not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        response = HttpResponseNotModified()
+        response['Cache-Control'] = STATIC_DEFAULT_CACHE
+        return response
+
+    content_type, _encoding = mimetypes.guess_type(full_path)
+    serve_path, content_encoding = full_path, None
+    accepted = _accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for coding, suffix in STATIC_ENCODINGS:
+        if coding in accepted and os.path.isfile(full_path + suffix):
+            serve_path, content_encoding = full_path + suffix, coding
+            break
+
+    response = FileResponse(open(serve_path, 'rb'), content_type=content_type or 'application/octet-stream')
+    if content_encoding:
+        response['Content-Encoding'] = content_encoding
+    response['Vary'] = 'Accept-Encoding'
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = STATIC_IMMUTABLE_CACHE if immutable else STATIC_DEFAULT_CACHE
+    return response
+
+
+# Prometheus metrikleri
+
+def _metrics_allowed(request, config):
+    token = config['TOKEN']
+    if token:
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        return hmac.compare_digest(header.encode(), f"Bearer {token}".encode())
+    return request.META.get('REMOTE_ADDR') in config['ALLOWED_IPS']
+
+
+@never_cache
+@require_GET
+def metrics(request):
+    """Tüm web ve Celery süreçlerinin metriklerini Prometheus metin biçiminde döndürür"""
+    config = app_metrics.get_config()
+    if not _metrics_allowed(request, config):
+        return HttpResponseForbidden()
+    return HttpResponse(app_metrics.render_metrics(),
+                        content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,41 +1,59 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import Q, Count
+from core.async_views import alogin_required, arender, run_concurrently
+from core.cache import cache_for_models
+
 from .models import Category, Supplier, InventoryItem, InventoryMovement, Maintenance
 from .forms import (
     CategoryForm, SupplierForm, InventoryItemForm, InventoryMovementForm, 
     MaintenanceForm, InventoryItemFilterForm, MaintenanceFilterForm
 )
 
-@login_required
-def inventory_dashboard(request):
-    """Envanter dashboard görünümü"""
-    items = InventoryItem.objects.all()
-    
-    # Envanter durumu istatistikleri
-    status_counts = {
-        'available': items.filter(status='available').count(),
-        'in_use': items.filter(status='in_use').count(),
-        'maintenance': items.filter(status='maintenance').count(),
-        'reserved': items.filter(status='reserved').count(),
-        'retired': items.filter(status='retired').count(),
-    }
-    
-    # Son hareketler
-    recent_movements = InventoryMovement.objects.all().order_by('-movement_date')[:5]
-    
-    # Yaklaşan bakımlar
-    upcoming_maintenance = Maintenance.objects.filter(
+@cache_for_models(InventoryItem)
+def inventory_status_counts():
+    """Envanter sayılarını duruma göre tek sorguda hesaplar"""
+    return InventoryItem.objects.aggregate(
+        total=Count('id'),
+        available=Count('id', filter=Q(status='available')),
+        in_use=Count('id', filter=Q(status='in_use')),
+        maintenance=Count('id', filter=Q(status='maintenance')),
+        reserved=Count('id', filter=Q(status='reserved')),
+        retired=Count('id', filter=Q(status='retired')),
+    )
+
+
+@cache_for_models(InventoryMovement, InventoryItem)
+def recent_inventory_movements(limit=5):
+    return list(InventoryMovement.objects.select_related(
+        'item', 'assigned_to'
+    ).order_by('-movement_date')[:limit])
+
+
+@cache_for_models(Maintenance, InventoryItem)
+def upcoming_inventory_maintenance(limit=5):
+    return list(Maintenance.objects.filter(
         status__in=['scheduled', 'in_progress']
-    ).order_by('scheduled_date')[:5]
-    
-    return render(request, 'inventory_management/dashboard.html', {
-        'items': items,
+    ).select_related('item').order_by('scheduled_date')[:limit])
+
+
+@alogin_required
+async def inventory_dashboard(request):
+    """Envanter dashboard görünümü; bağımsız sorgular eşzamanlı çalışır"""
+    counts, recent_movements, upcoming_maintenance = await run_concurrently(
+        inventory_status_counts,
+        recent_inventory_movements,
+        upcoming_inventory_maintenance,
+    )
+    status_counts = {status: count for status, count in counts.items() if status != 'total'}
+    
+    return await arender(request, 'inventory_management/dashboard.html', {
+        'items': InventoryItem.objects.all(),
         'status_counts': status_counts,
         'recent_movements': recent_movements,
         'upcoming_maintenance': upcoming_maintenance,
-        'total_items': items.count(),
+        'total_items': counts['total'],
     })
 
 # Kategori görünümleri
@@ -21,13 +21,13 @@ class ShiftListAdmin(admin.ModelAdmin):
     search_fields = ('title',)
     date_hierarchy = 'created_at'
     inlines = [ShiftInline]
-    readonly_fields = ('created_at', 'updated_at', 'created_by', 'source_type', 'source_url', 'source_file')
+    readonly_fields = ('created_at', 'updated_at', 'created_by', 'source', 'fetch_log')
     fieldsets = (
         (None, {
             'fields': ('title', 'department', 'start_date', 'end_date', 'is_published')
         }),
         (_('Kaynak Bilgileri'), {
-            'fields': ('source_type', 'source_url', 'source_file'),
+            'fields': ('source', 'fetch_log'),
             'classes': ('collapse',)
         }),
         (_('Sistem Bilgileri'), {
@@ -60,13 +60,13 @@ class DoctorAdmin(admin.ModelAdmin):
     list_display = ('full_name', 'title', 'department', 'phone', 'email', 'active')
     list_filter = ('department', 'active', 'title')
     search_fields = ('name', 'surname', 'phone', 'email')
-    readonly_fields = ('created_at', 'updated_at', 'external_id')
+    readonly_fields = ('external_id',)
     fieldsets = (
         (None, {
-            'fields': ('name', 'surname', 'title', 'department', 'phone', 'email', 'active')
+            'fields': ('name', 'surname', 'title', 'department', 'phone', 'email', 'notes', 'active')
         }),
         (_('Sistem Bilgileri'), {
-            'fields': ('external_id', 'created_at', 'updated_at'),
+            'fields': ('external_id',),
             'classes': ('collapse',)
         }),
     )
@@ -81,7 +81,6 @@ class DepartmentAdmin(admin.ModelAdmin):
     list_display = ('name', 'code', 'active', 'doctor_count')
     list_filter = ('active',)
     search_fields = ('name', 'code')
-    readonly_fields = ('created_at', 'updated_at')
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
@@ -95,20 +94,21 @@ class DepartmentAdmin(admin.ModelAdmin):
 @admin.register(DataSource)
 class DataSourceAdmin(admin.ModelAdmin):
     list_display = ('name', 'source_type', 'department', 'active', 'fetch_interval', 
-                   'last_fetch', 'fetch_button')
+                   'last_fetched', 'fetch_button')
     list_filter = ('source_type', 'department', 'active')
     search_fields = ('name', 'url')
-    readonly_fields = ('created_at', 'updated_at', 'created_by', 'last_fetch')
+    readonly_fields = ('created_at', 'updated_at', 'created_by', 'last_fetched',
+                      'inferred_column_mapping', 'header_fingerprint')
     fieldsets = (
         (None, {
             'fields': ('name', 'url', 'source_type', 'department', 'active', 'fetch_interval')
         }),
         (_('Kolon Eşleştirme'), {
-            'fields': ('column_mapping',),
+            'fields': ('column_mapping', 'inferred_column_mapping', 'header_fingerprint'),
             'description': _('JSON formatında kolon eşleştirme bilgileri. Örnek: {"doctor_name": ["Doktor", "Hekim"], "date": ["Tarih", "Nöbet Tarihi"]}')
         }),
         (_('Sistem Bilgileri'), {
-            'fields': ('created_by', 'created_at', 'updated_at', 'last_fetch'),
+            'fields': ('created_by', 'created_at', 'updated_at', 'last_fetched'),
             'classes': ('collapse',)
         }),
     )
@@ -135,21 +135,27 @@ class ShiftAdmin(admin.ModelAdmin):
 
 @admin.register(FetchLog)
 class FetchLogAdmin(admin.ModelAdmin):
-    list_display = ('source', 'status', 'started_at', 'completed_at', 'duration', 'initiated_by')
+    list_display = ('source', 'status', 'started_at', 'completed_at', 'duration', 'records_processed')
     list_filter = ('status', 'started_at', 'source')
     search_fields = ('error_message',)
     readonly_fields = ('source', 'status', 'started_at', 'completed_at', 'duration', 
-                      'initiated_by', 'error_message', 'details')
+                      'records_processed', 'records_created', 'records_updated', 'records_failed',
+                      'error_message', 'raw_data', 'metrics')
     fieldsets = (
         (None, {
-            'fields': ('source', 'status', 'started_at', 'completed_at', 'initiated_by')
+            'fields': ('source', 'status', 'started_at', 'completed_at', 'records_processed',
+                       'records_created', 'records_updated', 'records_failed')
         }),
         (_('Hata Bilgileri'), {
             'fields': ('error_message',),
             'classes': ('collapse',)
         }),
         (_('Detaylar'), {
-            'fields': ('details',),
+            'fields': ('raw_data',),
+            'classes': ('collapse',)
+        }),
+        (_('Ölçümler'), {
+            'fields': ('metrics',),
             'classes': ('collapse',)
         }),
     )
@@ -166,9 +172,9 @@ class FetchLogAdmin(admin.ModelAdmin):
 class AuditLogAdmin(admin.ModelAdmin):
     list_display = ('timestamp', 'user', 'action', 'model_name', 'object_repr', 'ip_address')
     list_filter = ('action', 'model_name', 'timestamp', 'user')
-    search_fields = ('object_repr', 'details', 'ip_address')
+    search_fields = ('object_repr', 'ip_address')
     readonly_fields = ('timestamp', 'user', 'action', 'model_name', 'object_id', 
-                      'object_repr', 'changes', 'details', 'ip_address', 'user_agent')
+                      'object_repr', 'changes', 'ip_address', 'user_agent')
     fieldsets = (
         (None, {
             'fields': ('timestamp', 'user', 'action', 'model_name', 'object_id', 'object_repr')
@@ -178,7 +184,7 @@ class AuditLogAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         (_('Detaylar'), {
-            'fields': ('details', 'ip_address', 'user_agent'),
+            'fields': ('ip_address', 'user_agent'),
             'classes': ('collapse',)
         }),
     )
@@ -9,4 +9,9 @@ class NobetListesiConfig(AppConfig):
     
     def ready(self):
         # Sinyalleri yükle
-        import nobet_listesi.signals
\ No newline at end of file
+        import nobet_listesi.signals
+        
+        # Migrasyonlardan sonra doktor arama indeksini oluştur
+        from django.db.models.signals import post_migrate
+        from .search import ensure_doctor_search_index
+        post_migrate.connect(ensure_doctor_search_index, sender=self)
\ No newline at end of file
@@ -1,10 +1,50 @@
 from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from .models import DataSource, ShiftList, Department, Doctor, Shift
+from .mapping import normalize_column_mapping, TARGET_FIELDS
+import copy
 import datetime
 import json
 
 
+class AutocompleteSelectMixin:
+    """
+    Seçenekleri sayfaya gömmek yerine AJAX ile yükleyen select2 widget'ı.
+    Sadece seçili değerler HTML'e yazılır; doğrulama alanın queryset'i ile yapılır.
+    """
+    autocomplete_url = reverse_lazy('doctor_autocomplete')
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs.setdefault('data-autocomplete-url', str(self.autocomplete_url))
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        original_choices = self.choices
+        if hasattr(original_choices, 'queryset'):
+            selected = [v for v in value if v not in ('', None)]
+            limited_choices = copy.copy(original_choices)
+            try:
+                limited_choices.queryset = original_choices.queryset.filter(pk__in=selected)
+            except (ValueError, TypeError, ValidationError):
+                limited_choices.queryset = original_choices.queryset.none()
+            self.choices = limited_choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = original_choices
+
+
+class DoctorAutocompleteSelect(AutocompleteSelectMixin, forms.Select):
+    """Tekli doktor seçimi için AJAX destekli select2"""
+
+
+class DoctorAutocompleteSelectMultiple(AutocompleteSelectMixin, forms.SelectMultiple):
+    """Çoklu doktor seçimi için AJAX destekli select2"""
+
+
 class ShiftListForm(forms.ModelForm):
     """Nöbet listesi oluşturma ve düzenleme formu"""
     class Meta:
@@ -40,11 +80,11 @@ class DataSourceForm(forms.ModelForm):
     class Meta:
         model = DataSource
         fields = ['name', 'department', 'source_type', 'url', 'column_mapping', 
-                 'fetch_interval', 'last_fetch', 'active', 'notes']
+                 'fetch_interval', 'last_fetched', 'active', 'notes']
         widgets = {
             'notes': forms.Textarea(attrs={'rows': 3}),
             'column_mapping': forms.Textarea(attrs={'class': 'json-editor', 'rows': 10}),
-            'last_fetch': forms.DateTimeInput(attrs={'readonly': 'readonly'}),
+            'last_fetched': forms.DateTimeInput(attrs={'readonly': 'readonly'}),
         }
 
     def __init__(self, *args, **kwargs):
@@ -57,34 +97,25 @@ class DataSourceForm(forms.ModelForm):
         self.fields['active'].widget.attrs.update({'class': 'form-check-input'})
         
         # Son çekme zamanı salt okunur
-        self.fields['last_fetch'].widget.attrs['disabled'] = 'disabled'
-        self.fields['last_fetch'].required = False
+        self.fields['last_fetched'].widget.attrs['disabled'] = 'disabled'
+        self.fields['last_fetched'].required = False
     
     def clean_column_mapping(self):
         """JSON formatındaki kolon eşleştirmelerini doğrular"""
         column_mapping = self.cleaned_data.get('column_mapping')
         
-        # JSON formatı kontrolü
+        # Boş bırakılan eşleştirme ilk çekmede otomatik çıkarılır
         try:
-            if isinstance(column_mapping, str):
-                mapping = json.loads(column_mapping)
-            else:
-                mapping = column_mapping
-            
-            # Gerekli alanların kontrolü
-            required_fields = ['doctor', 'date']
-            for field in required_fields:
-                if field not in mapping:
-                    raise forms.ValidationError(_('Kolon eşleştirmesinde "{}" alanı eksik.').format(field))
-            
-            # Tekrar JSON formatına dönüştür (düzgün formatlama için)
-            if isinstance(column_mapping, str):
-                return json.dumps(mapping, indent=2)
-            return column_mapping
-        except ValueError:
-            raise forms.ValidationError(_('Geçerli bir JSON formatı değil.'))
-        except Exception as e:
-            raise forms.ValidationError(_('Kolon eşleştirmesi hatalı: {}').format(str(e)))
+            mapping = normalize_column_mapping(column_mapping)
+        except ValueError as e:
+            raise forms.ValidationError(str(e))
+        
+        unknown = [field for field in mapping if field not in TARGET_FIELDS]
+        if unknown:
+            raise forms.ValidationError(
+                _('Bilinmeyen alan: {}. Geçerli alanlar: {}').format(', '.join(unknown), ', '.join(TARGET_FIELDS))
+            )
+        return mapping
 
 
 class FileUploadForm(forms.Form):
@@ -101,8 +132,13 @@ class FileUploadForm(forms.Form):
     )
     file = forms.FileField(
         label=_('Dosya'),
+        required=False,
         widget=forms.FileInput(attrs={'class': 'form-control-file', 'accept': '.csv,.xls,.xlsx,.pdf'})
     )
+    # Parçalı yüklemeyle paylaşımlı depoya gönderilmiş dosyanın anahtarı
+    upload_key = forms.CharField(required=False, widget=forms.HiddenInput())
+    # Önizlemesi yapılmış ve depoda bekleyen dosya
+    preview_token = forms.CharField(required=False, widget=forms.HiddenInput())
     start_date = forms.DateField(
         label=_('Başlangıç Tarihi'),
         widget=forms.DateInput(attrs={'class': 'form-control datepicker', 'placeholder': 'GG.AA.YYYY'})
@@ -113,8 +149,10 @@ class FileUploadForm(forms.Form):
     )
     column_mapping = forms.CharField(
         label=_('Kolon Eşleştirmesi'),
+        required=False,
         widget=forms.Textarea(attrs={'class': 'json-editor', 'rows': 10}),
-        help_text=_('JSON formatında kolon eşleştirmesi. Örnek: {"doctor": "Doktor Adı", "date": "Tarih"}')
+        help_text=_('JSON formatında kolon eşleştirmesi. Örnek: {"doctor_name": "Doktor Adı", "date": "Tarih"}. '
+                    'Boş bırakılan alanlar otomatik eşleştirilir.')
     )
     is_published = forms.BooleanField(
         label=_('Yayınla'),
@@ -139,25 +177,26 @@ class FileUploadForm(forms.Form):
     def clean_column_mapping(self):
         column_mapping = self.cleaned_data.get('column_mapping')
         
-        # JSON formatı kontrolü
+        # Eksik alanlar dosyanın başlık ve değerlerinden otomatik eşleştirilir
         try:
-            mapping = json.loads(column_mapping)
-            
-            # Gerekli alanların kontrolü
-            required_fields = ['doctor', 'date']
-            for field in required_fields:
-                if field not in mapping:
-                    raise forms.ValidationError(_('Kolon eşleştirmesinde "{}" alanı eksik.').format(field))
-            
-            # Tekrar JSON formatına dönüştür (düzgün formatlama için)
-            return json.dumps(mapping, indent=2)
-        except ValueError:
-            raise forms.ValidationError(_('Geçerli bir JSON formatı değil.'))
-        except Exception as e:
-            raise forms.ValidationError(_('Kolon eşleştirmesi hatalı: {}').format(str(e)))
+            mapping = normalize_column_mapping(column_mapping)
+        except ValueError as e:
+            raise forms.ValidationError(str(e))
+        
+        unknown = [field for field in mapping if field not in TARGET_FIELDS]
+        if unknown:
+            raise forms.ValidationError(
+                _('Bilinmeyen alan: {}. Geçerli alanlar: {}').format(', '.join(unknown), ', '.join(TARGET_FIELDS))
+            )
+        
+        # Tekrar JSON formatına dönüştür (düzgün formatlama için)
+        return json.dumps(mapping, indent=2)
     
     def clean(self):
         cleaned_data = super().clean()
+        if not (cleaned_data.get('file') or cleaned_data.get('upload_key') or cleaned_data.get('preview_token')):
+            self.add_error('file', _('Lütfen bir dosya seçin.'))
+        
         start_date = cleaned_data.get('start_date')
         end_date = cleaned_data.get('end_date')
         
@@ -184,7 +223,7 @@ class FilterForm(forms.Form):
         queryset=Doctor.objects.filter(active=True),
         label=_('Doktor'),
         required=False,
-        widget=forms.Select(attrs={'class': 'form-control select2'})
+        widget=DoctorAutocompleteSelect(attrs={'class': 'form-control select2'})
     )
     status = forms.ChoiceField(
         label=_('Durum'),
@@ -221,6 +260,7 @@ class ShiftForm(forms.ModelForm):
         model = Shift
         fields = ['doctor', 'date', 'start_time', 'end_time', 'notes']
         widgets = {
+            'doctor': DoctorAutocompleteSelect(),
             'date': forms.DateInput(attrs={'class': 'form-control datepicker', 'placeholder': 'GG.AA.YYYY'}),
             'start_time': forms.TimeInput(attrs={'class': 'form-control', 'type': 'time'}),
             'end_time': forms.TimeInput(attrs={'class': 'form-control', 'type': 'time'}),
@@ -239,6 +279,7 @@ class ShiftForm(forms.ModelForm):
             self.fields['doctor'].queryset = Doctor.objects.filter(
                 department=shift_list.department, active=True
             ).order_by('surname', 'name')
+            self.fields['doctor'].widget.attrs['data-department'] = shift_list.department_id
         
         self.fields['doctor'].widget.attrs.update({'class': 'form-control select2'})
 
@@ -276,7 +317,7 @@ class BulkShiftForm(forms.Form):
     doctor = forms.ModelChoiceField(
         queryset=Doctor.objects.filter(active=True),
         label=_('Doktor'),
-        widget=forms.Select(attrs={'class': 'form-control select2'})
+        widget=DoctorAutocompleteSelect(attrs={'class': 'form-control select2'})
     )
     date_range = forms.CharField(
         label=_('Tarih Aralığı'),
@@ -319,6 +360,7 @@ class BulkShiftForm(forms.Form):
             self.fields['doctor'].queryset = Doctor.objects.filter(
                 department=shift_list.department, active=True
             ).order_by('surname', 'name')
+            self.fields['doctor'].widget.attrs['data-department'] = shift_list.department_id
 
     def clean(self):
         cleaned_data = super().clean()
@@ -469,7 +511,7 @@ class ExportForm(forms.Form):
         queryset=Doctor.objects.filter(active=True),
         label=_('Doktorlar'),
         required=False,
-        widget=forms.SelectMultiple(attrs={'class': 'form-control select2', 'multiple': 'multiple'})
+        widget=DoctorAutocompleteSelectMultiple(attrs={'class': 'form-control select2', 'multiple': 'multiple'})
     )
     include_contact_info = forms.BooleanField(
         label=_('İletişim Bilgilerini Dahil Et'),
@@ -530,6 +572,7 @@ class ExportForm(forms.Form):
                 self.fields['doctors'].queryset = Doctor.objects.filter(
                     department=department, active=True
                 ).order_by('surname', 'name')
+                self.fields['doctors'].widget.attrs['data-department'] = department.id
             except (Department.DoesNotExist, ValueError):
                 pass
 
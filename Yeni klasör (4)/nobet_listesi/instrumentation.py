@@ -0,0 +1,177 @@
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+# Raporlarda gösterilecek aşamalar ve sıraları
+INGEST_STAGES = ['download', 'parse', 'column_mapping', 'persist']
+
+STAGE_LABELS = {
+    'download': 'İndirme',
+    'read': 'Dosya Okuma',
+    'parse': 'Ayrıştırma',
+    'column_mapping': 'Kolon Eşleştirme',
+    'persist': 'Kaydetme',
+}
+
+
+def _current_rss_kb():
+    """
+    İşlemin şu anki yerleşik bellek kullanımı (KB)
+
+    ru_maxrss süreç ömrü boyunca en yüksek değeri verdiğinden büyük bir işten
+    sonraki çalıştırmalarda artış hep sıfır görünür; bu yüzden anlık değer okunur.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):  # Linux dışı sistemler
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+class StageTimer:
+    """Tek bir aşamanın ölçümleri"""
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.bytes = None
+        self.rows = None
+        self.peak_memory_kb = None
+
+    def as_dict(self):
+        data = {'seconds': round(self.seconds, 4)}
+        if self.bytes is not None:
+            data['bytes'] = self.bytes
+        if self.rows is not None:
+            data['rows'] = self.rows
+            if self.seconds > 0:
+                data['rows_per_second'] = round(self.rows / self.seconds, 1)
+        if self.peak_memory_kb is not None:
+            data['peak_memory_kb'] = self.peak_memory_kb
+        return data
+
+
+class IngestMetrics:
+    """
+    Veri alma hattının aşama bazlı süre, bayt, satır ve bellek ölçümleri
+
+    Aşamaların en yüksek bellek kullanımı tracemalloc ile her çalıştırmada ayrı
+    ölçülür; INGEST_METRICS_TRACE_MEMORY = False ile kapatılabilir. Ayrıca
+    çalıştırma başı ve sonundaki anlık RSS farkı kaydedilir.
+
+    Kullanım:
+        metrics = IngestMetrics()
+        with metrics.stage('download') as stage:
+            content = download_content(url)
+            stage.bytes = len(content)
+        fetch_log.metrics = metrics.as_dict()
+    """
+
+    def __init__(self, trace_memory=None):
+        if trace_memory is None:
+            trace_memory = getattr(settings, 'INGEST_METRICS_TRACE_MEMORY', True)
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.counts = {}
+        self._started = time.perf_counter()
+        self._finished = None
+        self._rss_before = _current_rss_kb()
+        self._started_tracing = False
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @contextmanager
+    def stage(self, name):
+        timer = StageTimer(name)
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            timer.seconds = time.perf_counter() - start
+            if self.trace_memory and tracemalloc.is_tracing():
+                timer.peak_memory_kb = tracemalloc.get_traced_memory()[1] // 1024
+            self.stages.append(timer)
+
+    def finish(self):
+        """Ölçümü sonlandırır ve bellek izlemeyi kapatır"""
+        if self._finished is None:
+            self._finished = time.perf_counter()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @property
+    def total_seconds(self):
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return end - self._started
+
+    def as_dict(self):
+        self.finish()
+
+        stages = {timer.name: timer.as_dict() for timer in self.stages}
+        total_bytes = sum(timer.bytes or 0 for timer in self.stages)
+        rows = max((timer.rows or 0 for timer in self.stages), default=0)
+        total_seconds = self.total_seconds
+
+        data = {
+            'stages': stages,
+            'total_seconds': round(total_seconds, 4),
+            'bytes': total_bytes,
+            'rows': rows,
+            'rows_per_second': round(rows / total_seconds, 1) if total_seconds > 0 else None,
+        }
+
+        stage_peaks = [timer.peak_memory_kb for timer in self.stages if timer.peak_memory_kb is not None]
+        if stage_peaks:
+            data['peak_memory_kb'] = max(stage_peaks)
+
+        rss_after = _current_rss_kb()
+        if rss_after is not None and self._rss_before is not None:
+            data['rss_kb'] = rss_after
+            data['rss_growth_kb'] = rss_after - self._rss_before
+
+        if self.counts:
+            data['records'] = dict(self.counts)
+
+        return data
+
+
+def summarize_metrics(metrics_list):
+    """
+    Birden fazla FetchLog ölçümünden aşama bazlı ortalama ve en kötü değerleri çıkarır
+
+    Args:
+        metrics_list (list): FetchLog.metrics sözlükleri
+
+    Returns:
+        dict: Aşama adı -> {'avg_seconds', 'max_seconds', 'avg_rows_per_second', 'runs'}
+    """
+    summary = {}
+    for metrics in metrics_list:
+        for name, stage in (metrics or {}).get('stages', {}).items():
+            item = summary.setdefault(name, {'seconds': [], 'rows_per_second': []})
+            item['seconds'].append(stage.get('seconds', 0))
+            if stage.get('rows_per_second') is not None:
+                item['rows_per_second'].append(stage['rows_per_second'])
+
+    result = {}
+    for name, item in summary.items():
+        seconds = item['seconds']
+        throughput = item['rows_per_second']
+        result[name] = {
+            'label': STAGE_LABELS.get(name, name),
+            'runs': len(seconds),
+            'avg_seconds': round(sum(seconds) / len(seconds), 4),
+            'max_seconds': round(max(seconds), 4),
+            'avg_rows_per_second': round(sum(throughput) / len(throughput), 1) if throughput else None,
+        }
+    return result
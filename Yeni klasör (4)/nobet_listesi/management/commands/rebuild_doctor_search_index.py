@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from nobet_listesi.search import ensure_doctor_search_index, rebuild_doctor_search_index
+
+
+class Command(BaseCommand):
+    help = 'Doktor arama indeksini (FTS5 / pg_trgm) oluşturur ve yeniden doldurur'
+
+    def handle(self, *args, **options):
+        ensure_doctor_search_index(rebuild_if_stale=False)
+        count = rebuild_doctor_search_index()
+        self.stdout.write(self.style.SUCCESS(f'{count} doktor arama indeksine eklendi.'))
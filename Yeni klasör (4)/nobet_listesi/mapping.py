@@ -0,0 +1,246 @@
+import hashlib
+import json
+import re
+import datetime
+
+from core.text import normalize_turkish
+
+
+# Sistem alanları ve başlıklarda karşılaşılan eş anlamlıları (Türkçe ve İngilizce)
+HEADER_SYNONYMS = {
+    'doctor_name': [
+        'doktor', 'doktor adi', 'doktor adi soyadi', 'hekim', 'hekim adi', 'ad soyad', 'adi soyadi',
+        'isim', 'personel', 'nobetci', 'nobetci doktor', 'nobetci hekim', 'doctor', 'doctor name',
+        'physician', 'name', 'full name', 'staff',
+    ],
+    'date': [
+        'tarih', 'nobet tarihi', 'gun', 'date', 'shift date', 'day',
+    ],
+    'shift_type': [
+        'nobet tipi', 'nobet turu', 'tip', 'tur', 'vardiya', 'shift type', 'type', 'shift',
+    ],
+    'start_time': [
+        'baslangic', 'baslangic saati', 'baslama', 'giris', 'start', 'start time', 'from',
+    ],
+    'end_time': [
+        'bitis', 'bitis saati', 'cikis', 'end', 'end time', 'to', 'until',
+    ],
+    'phone': [
+        'telefon', 'tel', 'cep', 'cep telefonu', 'gsm', 'phone', 'mobile', 'phone number',
+    ],
+    'email': [
+        'e posta', 'eposta', 'mail', 'e mail', 'email', 'email address',
+    ],
+    'notes': [
+        'not', 'notlar', 'aciklama', 'notes', 'note', 'remarks', 'comment',
+    ],
+}
+
+# Kolon eşleştirmelerinde eski anahtarların sistem alanı karşılıkları
+FIELD_ALIASES = {
+    'doctor': 'doctor_name',
+}
+
+TARGET_FIELDS = list(HEADER_SYNONYMS)
+REQUIRED_FIELDS = ['doctor_name', 'date']
+
+# Bir kolonun eşleştirilmesi için gereken en düşük puan
+MIN_SCORE = 0.5
+
+# Başlık tanınmasa da (A, B, Sütun1 ...) değerlerin en az %80'i alana uyuyorsa
+# kolon yalnızca değerlerle eşleşir: 0.8 * VALUE_ONLY_WEIGHT = MIN_SCORE
+VALUE_ONLY_WEIGHT = 0.625
+
+# Değerleri denetlenebilen alanlarda başlık tam eşleşse bile örnek değerlerin en
+# az bu oranı alana uymalı; "Gün" başlıklı hafta günü kolonu tarih sayılmamalı
+MIN_VALUE_SCORE = 0.5
+
+DATE_RE = re.compile(r'^\s*(\d{1,2}[./-]\d{1,2}[./-]\d{2,4}|\d{4}[./-]\d{1,2}[./-]\d{1,2})(\s+\d{1,2}:\d{2}(:\d{2})?)?\s*$')
+TIME_RE = re.compile(r'^\s*([01]?\d|2[0-3])[:.][0-5]\d(:[0-5]\d)?\s*$')
+PHONE_RE = re.compile(r'^\+?[\d\s()-]{10,17}$')
+EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+NAME_RE = re.compile(r'^(prof|doc|dr|uzm|op|asst|assoc)\b|^[^\W\d_]+(\s+[^\W\d_]+)+$')
+SHIFT_KEYWORDS = ('nobet', 'icap', 'gece', 'gunduz', 'normal', 'on call', 'night', 'day')
+
+
+def _is_date(value):
+    return isinstance(value, (datetime.date, datetime.datetime)) or bool(DATE_RE.match(str(value)))
+
+
+def _is_time(value):
+    return isinstance(value, datetime.time) or bool(TIME_RE.match(str(value)))
+
+
+def _is_phone(value):
+    text = str(value)
+    return bool(PHONE_RE.match(text)) and len(re.sub(r'\D', '', text)) >= 10
+
+
+def _is_email(value):
+    return bool(EMAIL_RE.match(str(value).strip()))
+
+
+def _is_name(value):
+    return bool(NAME_RE.match(normalize_turkish(value)))
+
+
+def _is_shift_keyword(value):
+    text = normalize_turkish(value)
+    return bool(text) and any(keyword in text for keyword in SHIFT_KEYWORDS)
+
+
+# Değer kokusu alma: örnek değerlerin ne kadarı alana uyuyor
+VALUE_SNIFFERS = {
+    'doctor_name': _is_name,
+    'date': _is_date,
+    'start_time': _is_time,
+    'end_time': _is_time,
+    'phone': _is_phone,
+    'email': _is_email,
+    'shift_type': _is_shift_keyword,
+}
+
+
+def normalize_column_mapping(column_mapping):
+    """
+    Kolon eşleştirmesini sözlüğe çevirir ve eski anahtarları sistem alanlarına dönüştürür
+
+    Örneğin {"doctor": "Doktor Adı"} -> {"doctor_name": "Doktor Adı"}
+    """
+    if not column_mapping:
+        return {}
+
+    if isinstance(column_mapping, str):
+        try:
+            column_mapping = json.loads(column_mapping)
+        except json.JSONDecodeError:
+            raise ValueError("Geçersiz kolon eşleştirme JSON formatı")
+
+    if not isinstance(column_mapping, dict):
+        raise ValueError("Kolon eşleştirmesi bir JSON nesnesi olmalıdır")
+
+    return {FIELD_ALIASES.get(target, target): source for target, source in column_mapping.items()}
+
+
+def header_fingerprint(columns):
+    """Başlık satırının parmak izi; kolon adları değişmedikçe aynı kalır"""
+    normalized = '\x1f'.join(normalize_turkish(column) for column in columns)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def _header_score(column, field):
+    header = normalize_turkish(column)
+    if not header:
+        return 0.0
+
+    best = 0.0
+    for synonym in HEADER_SYNONYMS[field]:
+        if header == synonym:
+            return 1.0
+        if re.search(r'\b{}\b'.format(re.escape(synonym)), header):
+            best = max(best, 0.6 if len(synonym) > 3 else 0.4)
+    return best
+
+
+def _value_score(values, field):
+    sniffer = VALUE_SNIFFERS.get(field)
+    if sniffer is None or not values:
+        return 0.0
+    return sum(1 for value in values if sniffer(value)) / len(values)
+
+
+def score_columns(df, sample_size=50):
+    """
+    Her kaynak kolon ve sistem alanı çifti için 0-1 arası puan hesaplar
+
+    Puan, başlık eş anlamlılarından ve örnek değerlerin biçiminden gelir;
+    değerleri açıkça bir alana uyan kolonlar başlıktan bağımsız da eşleşebilir.
+    Değerleri denetlenebilen alanlarda değerler uymuyorsa başlık tek başına
+    yetmez (MIN_VALUE_SCORE).
+
+    Returns:
+        dict: (alan, kolon) -> puan
+    """
+    sample = df.head(sample_size)
+    scores = {}
+    for column in df.columns:
+        values = [value for value in sample[column].tolist() if value is not None and str(value).strip() not in ('', 'nan', 'NaT')]
+        for field in TARGET_FIELDS:
+            header = _header_score(column, field)
+            if field in VALUE_SNIFFERS:
+                value = _value_score(values, field)
+                if values and value < MIN_VALUE_SCORE:
+                    continue
+                score = max(0.6 * header + 0.4 * value, VALUE_ONLY_WEIGHT * value)
+            else:
+                score = header
+            if score > 0:
+                scores[(field, column)] = round(score, 3)
+    return scores
+
+
+def infer_column_mapping(df, sample_size=50):
+    """
+    Kaynak kolonlarını sistem alanlarıyla otomatik eşleştirir
+
+    En yüksek puanlı çiftlerden başlanarak her kolon ve alan en fazla bir kez
+    kullanılır.
+
+    Returns:
+        dict: Sistem alanı -> kaynak kolon adı
+    """
+    scores = score_columns(df, sample_size)
+    mapping = {}
+    used_columns = set()
+    for (field, column), score in sorted(scores.items(), key=lambda item: item[1], reverse=True):
+        if score < MIN_SCORE:
+            break
+        if field in mapping or column in used_columns:
+            continue
+        mapping[field] = column
+        used_columns.add(column)
+    return mapping
+
+
+def complete_column_mapping(df, column_mapping=None):
+    """
+    Elle girilen eşleştirmedeki eksik alanları çıkarımla tamamlar
+
+    Elle girilen eşleştirme her zaman önceliklidir.
+    """
+    explicit = normalize_column_mapping(column_mapping)
+    inferred = infer_column_mapping(df)
+
+    explicit_columns = set()
+    for source in explicit.values():
+        explicit_columns.update(source if isinstance(source, list) else [source])
+
+    mapping = {
+        field: column for field, column in inferred.items()
+        if field not in explicit and column not in explicit_columns
+    }
+    mapping.update(explicit)
+    return mapping
+
+
+def resolve_source_mapping(source, df):
+    """
+    Veri kaynağı için kolon eşleştirmesini döndürür
+
+    Çıkarılan eşleştirme başlık parmak izi ile birlikte kaynakta saklanır ve
+    yalnızca başlık satırı değiştiğinde yeniden hesaplanır.
+    """
+    fingerprint = header_fingerprint(df.columns)
+    cached = source.inferred_column_mapping or {}
+    explicit = normalize_column_mapping(source.column_mapping)
+
+    # Elle girilen eşleştirme sonradan değiştiyse saklanan sonuç da geçersizdir
+    if (source.header_fingerprint == fingerprint and cached
+            and all(cached.get(field) == column for field, column in explicit.items())):
+        return cached
+
+    mapping = complete_column_mapping(df, source.column_mapping)
+    source.inferred_column_mapping = mapping
+    source.header_fingerprint = fingerprint
+    source.save(update_fields=['inferred_column_mapping', 'header_fingerprint'])
+    return mapping
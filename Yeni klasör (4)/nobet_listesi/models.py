@@ -1,9 +1,11 @@
 from django.db import models
-from django.contrib.auth.models import User
+from django.conf import settings
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 import uuid
 
+from .search import build_doctor_search_text
+
 
 class DataSource(models.Model):
     """Nöbet listelerinin çekileceği veri kaynakları"""
@@ -17,15 +19,25 @@ class DataSource(models.Model):
     name = models.CharField(_('Kaynak Adı'), max_length=100)
     url = models.URLField(_('URL'), help_text=_('Veri kaynağının URL adresi'))
     source_type = models.CharField(_('Kaynak Tipi'), max_length=10, choices=SOURCE_TYPE_CHOICES)
+    department = models.ForeignKey('Department', on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='data_sources',
+                                 verbose_name=_('Bölüm'))
     active = models.BooleanField(_('Aktif'), default=True)
     fetch_interval = models.IntegerField(_('Çekme Aralığı (saat)'), default=24)
     last_fetched = models.DateTimeField(_('Son Çekilme Zamanı'), null=True, blank=True)
     column_mapping = models.JSONField(_('Kolon Eşleştirme'), 
-                                    help_text=_('Kaynak kolonlarının sistem kolonlarıyla eşleştirilmesi'),
-                                    default=dict)
+                                    help_text=_('Kaynak kolonlarının sistem kolonlarıyla eşleştirilmesi. '
+                                                'Boş bırakılan alanlar otomatik eşleştirilir.'),
+                                    default=dict, blank=True)
+    inferred_column_mapping = models.JSONField(_('Çıkarılan Kolon Eşleştirme'), default=dict, blank=True,
+                                             editable=False)
+    header_fingerprint = models.CharField(_('Başlık Parmak İzi'), max_length=40, blank=True,
+                                        editable=False,
+                                        help_text=_('Çıkarılan eşleştirmenin ait olduğu başlık satırı'))
+    notes = models.TextField(_('Notlar'), blank=True, null=True)
     created_at = models.DateTimeField(_('Oluşturulma Zamanı'), auto_now_add=True)
     updated_at = models.DateTimeField(_('Güncellenme Zamanı'), auto_now=True)
-    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, 
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, 
                                  related_name='created_sources',
                                  verbose_name=_('Oluşturan'))
     
@@ -67,6 +79,8 @@ class FetchLog(models.Model):
     error_message = models.TextField(_('Hata Mesajı'), blank=True, null=True)
     raw_data = models.TextField(_('Ham Veri'), blank=True, null=True, 
                              help_text=_('Çekilen ham veri (debug için)'))
+    metrics = models.JSONField(_('Ölçümler'), default=dict, blank=True,
+                              help_text=_('Aşama bazlı süre, bayt, satır ve bellek ölçümleri'))
     
     class Meta:
         verbose_name = _('Çekme Logu')
@@ -87,6 +101,7 @@ class Department(models.Model):
     """Hastane/klinik bölümleri"""
     name = models.CharField(_('Bölüm Adı'), max_length=100)
     code = models.CharField(_('Bölüm Kodu'), max_length=20, blank=True, null=True)
+    description = models.TextField(_('Açıklama'), blank=True, null=True)
     active = models.BooleanField(_('Aktif'), default=True)
     
     class Meta:
@@ -109,9 +124,13 @@ class Doctor(models.Model):
                                  verbose_name=_('Bölüm'))
     phone = models.CharField(_('Telefon'), max_length=20, blank=True, null=True)
     email = models.EmailField(_('E-posta'), blank=True, null=True)
+    notes = models.TextField(_('Notlar'), blank=True, null=True)
     active = models.BooleanField(_('Aktif'), default=True)
     external_id = models.CharField(_('Harici ID'), max_length=100, blank=True, null=True,
                                 help_text=_('Harici sistemdeki ID'))
+    search_text = models.CharField(_('Arama Metni'), max_length=300, blank=True, editable=False,
+                                 db_index=True,
+                                 help_text=_('Türkçe karakterleri normalize edilmiş unvan, ad ve soyad'))
     
     class Meta:
         verbose_name = _('Doktor')
@@ -123,6 +142,13 @@ class Doctor(models.Model):
             return f"{self.title} {self.name} {self.surname}"
         return f"{self.name} {self.surname}"
     
+    def save(self, *args, **kwargs):
+        self.search_text = build_doctor_search_text(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'title', 'name', 'surname'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'search_text'}
+        super().save(*args, **kwargs)
+    
     def get_full_name(self):
         return f"{self.name} {self.surname}"
     
@@ -157,6 +183,7 @@ class ShiftList(models.Model):
                                  verbose_name=_('Bölüm'))
     start_date = models.DateField(_('Başlangıç Tarihi'))
     end_date = models.DateField(_('Bitiş Tarihi'))
+    description = models.TextField(_('Açıklama'), blank=True)
     source = models.ForeignKey(DataSource, on_delete=models.SET_NULL, 
                              null=True, blank=True,
                              related_name='shift_lists',
@@ -167,7 +194,7 @@ class ShiftList(models.Model):
                                 verbose_name=_('Çekme Logu'))
     created_at = models.DateTimeField(_('Oluşturulma Zamanı'), auto_now_add=True)
     updated_at = models.DateTimeField(_('Güncellenme Zamanı'), auto_now=True)
-    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, 
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, 
                                  null=True, blank=True,
                                  related_name='created_shift_lists',
                                  verbose_name=_('Oluşturan'))
@@ -237,7 +264,7 @@ class AuditLog(models.Model):
         ('unpublish', _('Yayından Kaldırma')),
     ]
     
-    user = models.ForeignKey(User, on_delete=models.SET_NULL, 
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, 
                            null=True, blank=True,
                            related_name='audit_logs',
                            verbose_name=_('Kullanıcı'))
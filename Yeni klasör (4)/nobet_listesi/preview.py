@@ -0,0 +1,247 @@
+import io
+import json
+import os
+import uuid
+import datetime
+
+import pandas as pd
+import requests
+import tabula
+from django.conf import settings
+from django.core.cache import cache
+
+from core.storage import local_blob_path
+
+from .tasks import map_columns, parse_doctor_name, normalize_phone_number, parse_content
+from .mapping import complete_column_mapping, resolve_source_mapping
+
+
+# Önizlemede okunacak varsayılan satır sayısı
+PREVIEW_ROWS = getattr(settings, 'INGEST_PREVIEW_ROWS', 50)
+
+# Uzak CSV kaynaklarından önizleme için indirilecek en fazla bayt
+PREVIEW_MAX_BYTES = getattr(settings, 'INGEST_PREVIEW_MAX_BYTES', 256 * 1024)
+
+# Önizleme sonucunun onay için saklanma süresi (saniye)
+PREVIEW_TIMEOUT = 60 * 60
+
+PREVIEW_CACHE_KEY = 'nobet_listesi:upload_preview:{}'
+
+DATE_FORMATS = ['%d.%m.%Y', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%y', '%m/%d/%Y']
+TIME_FORMATS = ['%H:%M', '%H.%M', '%H:%M:%S']
+
+FILE_EXTENSIONS = {
+    'csv': 'csv',
+    'xls': 'excel',
+    'xlsx': 'excel',
+    'pdf': 'pdf',
+    'html': 'html',
+    'htm': 'html',
+}
+
+
+def detect_file_type(file_name):
+    """Dosya uzantısından dosya tipini bulur"""
+    ext = os.path.splitext(file_name)[1].lstrip('.').lower()
+    return FILE_EXTENSIONS.get(ext)
+
+
+def read_file_sample(file_path, file_type, nrows=PREVIEW_ROWS):
+    """
+    Dosyanın yalnızca başlığını ve ilk satırlarını okur
+
+    Dosyanın tamamı belleğe alınmaz; CSV satır satır, xlsx salt okunur modda
+    okunur ve istenen satır sayısına ulaşınca durulur.
+    """
+    if file_type == 'csv':
+        return pd.read_csv(file_path, nrows=nrows)
+    elif file_type == 'excel':
+        # Depodaki dosyaların uzantısı yoktur; xlsx (zip) içeriğinden tanınır
+        with open(file_path, 'rb') as f:
+            is_xlsx = f.read(4) == b'PK\x03\x04'
+        if not is_xlsx:
+            return pd.read_excel(file_path, nrows=nrows)
+        return _read_xlsx_sample(file_path, nrows)
+    elif file_type == 'pdf':
+        df_list = tabula.read_pdf(file_path, pages='1')
+        if not df_list:
+            raise ValueError("PDF'den tablo okunamadı")
+        return pd.concat(df_list, ignore_index=True).head(nrows)
+    elif file_type == 'html':
+        with open(file_path, 'rb') as f:
+            return parse_content(f.read(), 'html').head(nrows)
+    raise ValueError(f"Desteklenmeyen dosya tipi: {file_type}")
+
+
+def _read_xlsx_sample(file_path, nrows):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(max_row=nrows + 1, values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        columns = [str(col) if col is not None else f'Unnamed: {i}' for i, col in enumerate(header)]
+        return pd.DataFrame(list(rows), columns=columns)
+    finally:
+        workbook.close()
+
+
+def read_remote_sample(url, source_type, nrows=PREVIEW_ROWS):
+    """
+    Uzak kaynağın ilk satırlarını okur
+
+    CSV kaynaklarında yalnızca ilk PREVIEW_MAX_BYTES bayt indirilir. Excel ve
+    PDF dosyaları sonundaki dizin olmadan açılamadığından tamamı indirilir.
+    """
+    with requests.get(url, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        if source_type != 'csv':
+            return parse_content(response.content, source_type).head(nrows)
+
+        buffer = bytearray()
+        for chunk in response.iter_content(chunk_size=16 * 1024):
+            buffer.extend(chunk)
+            if len(buffer) >= PREVIEW_MAX_BYTES or buffer.count(b'\n') > nrows:
+                break
+
+    # Yarım kalan son satırı at
+    if b'\n' in buffer:
+        buffer = buffer[:buffer.rindex(b'\n') + 1]
+    return pd.read_csv(io.BytesIO(bytes(buffer)), nrows=nrows)
+
+
+def detect_date_format(series):
+    """
+    Tarih kolonunun biçimini bulur
+
+    Returns:
+        tuple: (biçim, başarı oranı). Değerler zaten tarih tipindeyse biçim 'native' olur.
+    """
+    values = series.dropna()
+    if values.empty:
+        return None, 0.0
+
+    if all(isinstance(value, (datetime.date, pd.Timestamp)) for value in values):
+        return 'native', 1.0
+
+    values = values.astype(str).str.strip()
+    best_format, best_rate = None, 0.0
+    for fmt in DATE_FORMATS:
+        rate = pd.to_datetime(values, format=fmt, errors='coerce').notna().mean()
+        if rate > best_rate:
+            best_format, best_rate = fmt, float(rate)
+        if best_rate == 1.0:
+            break
+    return best_format, best_rate
+
+
+def _time_success(value):
+    if isinstance(value, (datetime.time, datetime.datetime)):
+        return True
+    for fmt in TIME_FORMATS:
+        try:
+            datetime.datetime.strptime(str(value).strip(), fmt)
+            return True
+        except ValueError:
+            continue
+    return False
+
+
+COLUMN_CHECKS = {
+    'doctor_name': lambda value: bool(parse_doctor_name(str(value))['surname']),
+    'phone': lambda value: str(normalize_phone_number(str(value)) or '').startswith('+90'),
+    'email': lambda value: '@' in str(value),
+    'start_time': _time_success,
+    'end_time': _time_success,
+    'shift_type': lambda value: bool(str(value).strip()),
+}
+
+
+def analyze_sample(df):
+    """
+    Eşleştirilmiş örnek verideki kolonların ayrıştırma başarı oranlarını hesaplar
+
+    Returns:
+        tuple: (kolon istatistikleri, bulunan tarih biçimleri)
+    """
+    stats = {}
+    date_formats = {}
+    for column in df.columns:
+        values = df[column].dropna()
+        total = len(values)
+        if column == 'date':
+            fmt, rate = detect_date_format(df[column])
+            date_formats[column] = fmt
+            parsed = round(rate * total)
+        elif column in COLUMN_CHECKS and total:
+            parsed = sum(1 for value in values if COLUMN_CHECKS[column](value))
+        else:
+            parsed = total
+        stats[column] = {
+            'total': total,
+            'parsed': parsed,
+            'empty': len(df) - total,
+            'success_rate': round(parsed / total, 3) if total else None,
+        }
+    return stats, date_formats
+
+
+def build_preview(df, column_mapping):
+    """
+    Örnek veriye kolon eşleştirmesi uygular ve önizleme sonucunu hazırlar
+
+    Veritabanına hiçbir kayıt yazılmaz.
+    """
+    original_columns = [str(col) for col in df.columns]
+    mapped = map_columns(df, column_mapping)
+    stats, date_formats = analyze_sample(mapped)
+
+    required = ['doctor_name', 'date']
+    return {
+        'columns': original_columns,
+        'column_mapping': column_mapping,
+        'mapped_columns': [str(col) for col in mapped.columns],
+        'missing_columns': [col for col in required if col not in mapped.columns],
+        'rows': json.loads(mapped.to_json(orient='records', date_format='iso', force_ascii=False)),
+        'sample_size': len(mapped),
+        'column_stats': stats,
+        'date_formats': date_formats,
+    }
+
+
+def preview_uploaded_file(storage_key, file_type, column_mapping, nrows=PREVIEW_ROWS):
+    """Yüklenen dosyanın önizlemesini hazırlar; eksik eşleştirmeler çıkarımla tamamlanır"""
+    with local_blob_path(storage_key) as file_path:
+        df = read_file_sample(file_path, file_type, nrows)
+    return build_preview(df, complete_column_mapping(df, column_mapping))
+
+
+def preview_data_source(source, nrows=PREVIEW_ROWS):
+    """Uzak veri kaynağının önizlemesini hazırlar"""
+    df = read_remote_sample(source.url, source.source_type, nrows)
+    return build_preview(df, resolve_source_mapping(source, df))
+
+
+def store_preview(preview, **extra):
+    """
+    Önizleme sonucunu onay adımında yeniden kullanmak üzere saklar
+
+    Returns:
+        str: Önizleme anahtarı
+    """
+    token = uuid.uuid4().hex
+    cache.set(PREVIEW_CACHE_KEY.format(token), dict(extra, preview=preview), PREVIEW_TIMEOUT)
+    return token
+
+
+def load_preview(token):
+    """Saklanan önizleme sonucunu döndürür; süresi dolduysa None"""
+    if not token:
+        return None
+    return cache.get(PREVIEW_CACHE_KEY.format(token))
+
+
+def discard_preview(token):
+    cache.delete(PREVIEW_CACHE_KEY.format(token))
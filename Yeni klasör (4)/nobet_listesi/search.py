@@ -0,0 +1,156 @@
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from core.text import normalize_turkish
+
+
+DOCTOR_FTS_TABLE = 'nobet_listesi_doctor_fts'
+DOCTOR_TRGM_INDEX = 'nobet_listesi_doctor_search_trgm'
+
+AUTOCOMPLETE_DEFAULT_LIMIT = 20
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+
+def build_doctor_search_text(doctor):
+    """Doktorun unvan, ad ve soyadından arama metnini oluşturur"""
+    parts = [doctor.title, doctor.name, doctor.surname]
+    return normalize_turkish(' '.join(part for part in parts if part))
+
+
+def _fts_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def _fts_match_expression(tokens):
+    """FTS5 için her kelimeye önek araması uygulayan MATCH ifadesi"""
+    return ' '.join('"{}"*'.format(token.replace('"', '')) for token in tokens)
+
+
+def ensure_doctor_search_index(rebuild_if_stale=True, **kwargs):
+    """
+    Doktor arama indeksini oluşturur (post_migrate sinyali ile çağrılır)
+
+    SQLite'ta FTS5 sanal tablosu, PostgreSQL'de pg_trgm GIN indeksi kullanılır.
+    """
+    from .models import Doctor
+
+    table = Doctor._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {DOCTOR_FTS_TABLE} USING fts5("
+                f"search_text, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+            if rebuild_if_stale:
+                cursor.execute(f"SELECT COUNT(*) FROM {DOCTOR_FTS_TABLE}")
+                indexed = cursor.fetchone()[0]
+                cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                if cursor.fetchone()[0] != indexed:
+                    rebuild_doctor_search_index()
+        elif connection.vendor == 'postgresql':
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {DOCTOR_TRGM_INDEX} "
+                f"ON {table} USING gin (search_text gin_trgm_ops)"
+            )
+
+
+def rebuild_doctor_search_index():
+    """
+    Tüm doktorların arama metnini yeniden hesaplar ve FTS indeksini doldurur
+
+    Returns:
+        int: İndekslenen doktor sayısı
+    """
+    from .models import Doctor
+
+    updated = []
+    for doctor in Doctor.objects.only('id', 'title', 'name', 'surname', 'search_text').iterator():
+        search_text = build_doctor_search_text(doctor)
+        if doctor.search_text != search_text:
+            doctor.search_text = search_text
+            updated.append(doctor)
+    Doctor.objects.bulk_update(updated, ['search_text'], batch_size=500)
+
+    if not _fts_enabled():
+        return Doctor.objects.count()
+
+    rows = list(Doctor.objects.values_list('id', 'search_text'))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {DOCTOR_FTS_TABLE}")
+        cursor.executemany(
+            f"INSERT INTO {DOCTOR_FTS_TABLE} (rowid, search_text) VALUES (%s, %s)",
+            rows
+        )
+    return len(rows)
+
+
+def index_doctor(doctor):
+    """Tek bir doktorun FTS kaydını günceller"""
+    if not _fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {DOCTOR_FTS_TABLE} WHERE rowid = %s", [doctor.pk])
+        cursor.execute(
+            f"INSERT INTO {DOCTOR_FTS_TABLE} (rowid, search_text) VALUES (%s, %s)",
+            [doctor.pk, doctor.search_text or '']
+        )
+
+
+def unindex_doctor(doctor_id):
+    """Silinen doktorun FTS kaydını kaldırır"""
+    if not _fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {DOCTOR_FTS_TABLE} WHERE rowid = %s", [doctor_id])
+
+
+def search_doctors(query, queryset=None):
+    """
+    Doktorları ad, soyad ve unvana göre önek araması ile filtreler
+
+    Sonuçlar eşleşme derecesine göre (SQLite'ta FTS5 bm25, PostgreSQL'de pg_trgm
+    benzerliği), eşitlikte soyad ve ada göre sıralanır.
+
+    Args:
+        query (str): Arama metni (her kelime bir önek olarak değerlendirilir)
+        queryset (QuerySet, optional): Filtrelenecek doktor sorgusu
+
+    Returns:
+        QuerySet: Eşleşen doktorlar
+    """
+    from .models import Doctor
+
+    if queryset is None:
+        queryset = Doctor.objects.all()
+
+    tokens = normalize_turkish(query).split()
+    if not tokens:
+        return queryset.order_by('surname', 'name')
+
+    table = Doctor._meta.db_table
+    if _fts_enabled():
+        match = _fts_match_expression(tokens)
+        # bm25 küçük değerlerde daha iyi eşleşmeyi gösterir
+        return queryset.filter(pk__in=RawSQL(
+            f"SELECT rowid FROM {DOCTOR_FTS_TABLE} WHERE {DOCTOR_FTS_TABLE} MATCH %s",
+            [match]
+        )).annotate(search_rank=RawSQL(
+            f"SELECT bm25({DOCTOR_FTS_TABLE}) FROM {DOCTOR_FTS_TABLE} "
+            f"WHERE {DOCTOR_FTS_TABLE} MATCH %s AND rowid = {table}.id",
+            [match]
+        )).order_by('search_rank', 'surname', 'name')
+
+    # PostgreSQL'de LIKE sorguları pg_trgm GIN indeksini kullanır
+    for token in tokens:
+        queryset = queryset.filter(
+            Q(search_text__startswith=token) | Q(search_text__contains=' ' + token)
+        )
+    if connection.vendor == 'postgresql':
+        queryset = queryset.annotate(
+            search_rank=RawSQL(f"similarity({table}.search_text, %s)", [' '.join(tokens)])
+        ).order_by('-search_rank', 'surname', 'name')
+    else:
+        queryset = queryset.order_by('surname', 'name')
+    return queryset
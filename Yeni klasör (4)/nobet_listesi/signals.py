@@ -3,6 +3,7 @@ from django.dispatch import receiver
 from django.utils import timezone
 
 from .models import ShiftList, Shift, Doctor, Department, FetchLog, AuditLog
+from .search import index_doctor, unindex_doctor
 
 
 @receiver(post_save, sender=ShiftList)
@@ -102,4 +103,20 @@ def normalize_doctor_phone(sender, instance, created, **kwargs):
             post_save.disconnect(normalize_doctor_phone, sender=Doctor)
             instance.phone = normalized_phone
             instance.save()
-            post_save.connect(normalize_doctor_phone, sender=Doctor)
\ No newline at end of file
+            post_save.connect(normalize_doctor_phone, sender=Doctor)
+
+
+@receiver(post_save, sender=Doctor)
+def update_doctor_search_index(sender, instance, **kwargs):
+    """
+    Doktor kaydedildiğinde arama indeksini günceller.
+    """
+    index_doctor(instance)
+
+
+@receiver(post_delete, sender=Doctor)
+def remove_doctor_from_search_index(sender, instance, **kwargs):
+    """
+    Doktor silindiğinde arama indeksinden kaldırır.
+    """
+    unindex_doctor(instance.pk)
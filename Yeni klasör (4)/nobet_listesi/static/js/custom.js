@@ -32,28 +32,59 @@ $(document).ready(function() {
 // Select2 başlatma fonksiyonu
 function initializeSelect2() {
     if ($.fn.select2) {
-        $('.select2').select2({
-            theme: 'bootstrap4',
-            width: '100%',
-            placeholder: function() {
-                return $(this).data('placeholder') || 'Seçiniz';
-            },
-            allowClear: true,
-            language: {
-                inputTooShort: function() {
-                    return "Lütfen en az 2 karakter girin...";
-                },
-                noResults: function() {
-                    return "Sonuç bulunamadı";
+        $('.select2').each(function() {
+            $(this).select2(select2AutocompleteOptions(this, {
+                theme: 'bootstrap4',
+                width: '100%',
+                placeholder: function() {
+                    return $(this).data('placeholder') || 'Seçiniz';
                 },
-                searching: function() {
-                    return "Aranıyor...";
+                allowClear: true,
+                language: {
+                    inputTooShort: function() {
+                        return "Lütfen en az 2 karakter girin...";
+                    },
+                    noResults: function() {
+                        return "Sonuç bulunamadı";
+                    },
+                    searching: function() {
+                        return "Aranıyor...";
+                    }
                 }
-            }
+            }));
         });
     }
 }
 
+// data-autocomplete-url özniteliği olan alanlar için seçenekleri AJAX ile yükler
+function select2AutocompleteOptions(element, options) {
+    var $element = $(element);
+    var url = $element.data('autocomplete-url');
+    
+    if (!url) {
+        return options;
+    }
+    
+    return $.extend({}, options, {
+        minimumInputLength: 2,
+        ajax: {
+            url: url,
+            dataType: 'json',
+            delay: 200,
+            cache: true,
+            data: function(params) {
+                return {
+                    q: params.term,
+                    department: $element.data('department') || ''
+                };
+            },
+            processResults: function(data) {
+                return data;
+            }
+        }
+    });
+}
+
 // Telefon numarası formatlaması
 function initializePhoneInputs() {
     $('.phone-input').on('input', function() {
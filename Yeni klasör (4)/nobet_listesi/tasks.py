@@ -2,7 +2,6 @@ import os
 import pandas as pd
 import numpy as np
 import requests
-import json
 import logging
 import datetime
 import tabula
@@ -12,13 +11,18 @@ from io import BytesIO
 from urllib.parse import urlparse
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.db import transaction, IntegrityError
 from django.conf import settings
 
 from celery import shared_task
 from celery.exceptions import MaxRetriesExceededError
 
+from core.metrics import record_ingest
+from core.storage import local_blob_path
+
 from .models import DataSource, ShiftList, Department, Doctor, Shift, FetchLog, AuditLog
+from .instrumentation import IngestMetrics
+from .mapping import normalize_column_mapping, complete_column_mapping, resolve_source_mapping
 
 # Logger yapılandırması
 logger = logging.getLogger(__name__)
@@ -37,6 +41,7 @@ def fetch_data_from_source(self, source_id, user_id=None):
     """
     source = None
     fetch_log = None
+    metrics = IngestMetrics()
     
     try:
         # Veri kaynağını al
@@ -56,29 +61,39 @@ def fetch_data_from_source(self, source_id, user_id=None):
         if not parsed_url.scheme or not parsed_url.netloc:
             raise ValueError(f"Geçersiz URL: {source.url}")
         
-        # Veri kaynağı tipine göre işlem yap
-        if source.source_type == 'csv':
-            df = fetch_csv_data(source.url)
-        elif source.source_type == 'excel':
-            df = fetch_excel_data(source.url)
-        elif source.source_type == 'html':
-            df = fetch_html_table_data(source.url)
-        elif source.source_type == 'pdf':
-            df = fetch_pdf_table_data(source.url)
-        else:
-            raise ValueError(f"Desteklenmeyen kaynak tipi: {source.source_type}")
+        # Veriyi indir
+        with metrics.stage('download') as stage:
+            content = download_content(source.url)
+            stage.bytes = len(content)
+        
+        # Veri kaynağı tipine göre ayrıştır
+        with metrics.stage('parse') as stage:
+            df = parse_content(content, source.source_type)
+            stage.rows = len(df)
+        del content
         
         # Kolon eşleştirmesi yap
-        df = map_columns(df, source.column_mapping)
+        with metrics.stage('column_mapping') as stage:
+            df = map_columns(df, resolve_source_mapping(source, df))
+            stage.rows = len(df)
         
         # Verileri işle ve kaydet
-        with transaction.atomic():
-            process_shift_data(df, source, user)
+        with metrics.stage('persist') as stage:
+            with transaction.atomic():
+                shift_list, counts = process_shift_data(df, source, user)
+            stage.rows = counts['processed']
+        metrics.counts = counts
         
         # Başarılı log kaydı
-        fetch_log.status = 'success'
+        fetch_log.status = 'partial' if counts['failed'] else 'success'
         fetch_log.completed_at = timezone.now()
+        fetch_log.records_processed = counts['processed']
+        fetch_log.records_created = counts['created']
+        fetch_log.records_updated = counts['updated']
+        fetch_log.records_failed = counts['failed']
+        fetch_log.metrics = metrics.as_dict()
         fetch_log.save()
+        record_ingest(source.name, fetch_log.metrics)
         
         # Denetim logu
         if user:
@@ -103,6 +118,7 @@ def fetch_data_from_source(self, source_id, user_id=None):
             fetch_log.status = 'failed'
             fetch_log.error_message = error_msg
             fetch_log.completed_at = timezone.now()
+            fetch_log.metrics = metrics.as_dict()
             fetch_log.save()
         return {'status': 'error', 'message': error_msg}
     
@@ -113,6 +129,7 @@ def fetch_data_from_source(self, source_id, user_id=None):
             fetch_log.status = 'failed'
             fetch_log.error_message = error_msg
             fetch_log.completed_at = timezone.now()
+            fetch_log.metrics = metrics.as_dict()
             fetch_log.save()
         return {'status': 'error', 'message': error_msg}
     
@@ -123,6 +140,7 @@ def fetch_data_from_source(self, source_id, user_id=None):
             fetch_log.status = 'failed'
             fetch_log.error_message = error_msg
             fetch_log.completed_at = timezone.now()
+            fetch_log.metrics = metrics.as_dict()
             fetch_log.save()
         
         # Yeniden deneme
@@ -138,17 +156,34 @@ def fetch_data_from_source(self, source_id, user_id=None):
             fetch_log.status = 'failed'
             fetch_log.error_message = error_msg
             fetch_log.completed_at = timezone.now()
+            fetch_log.metrics = metrics.as_dict()
             fetch_log.save()
         return {'status': 'error', 'message': error_msg}
 
 
+@shared_task
+def fetch_due_sources():
+    """
+    Çekme zamanı gelmiş aktif veri kaynakları için içe aktarma görevlerini kuyruğa ekler
+
+    Returns:
+        int: Kuyruğa eklenen kaynak sayısı
+    """
+    count = 0
+    for source in DataSource.objects.filter(active=True).only('id', 'last_fetched', 'fetch_interval'):
+        if source.is_due_for_fetch():
+            fetch_data_from_source.delay(source.id)
+            count += 1
+    return count
+
+
 @shared_task(bind=True, max_retries=2)
-def process_uploaded_file(self, file_path, file_type, department_id, start_date, end_date, title, column_mapping, user_id=None):
+def process_uploaded_file(self, storage_key, file_type, department_id, start_date, end_date, title, column_mapping, user_id=None, date_formats=None):
     """
     Yüklenen dosyayı işler ve nöbet listesi oluşturur
     
     Args:
-        file_path (str): Dosya yolu
+        storage_key (str): Dosyanın paylaşımlı depodaki anahtarı
         file_type (str): Dosya tipi (csv, excel, pdf, html)
         department_id (int): Bölüm ID'si
         start_date (str): Başlangıç tarihi (ISO format)
@@ -156,7 +191,11 @@ def process_uploaded_file(self, file_path, file_type, department_id, start_date,
         title (str): Nöbet listesi başlığı
         column_mapping (dict): Kolon eşleştirme bilgileri
         user_id (int, optional): İşlemi başlatan kullanıcı ID'si
+        date_formats (dict, optional): Önizlemede bulunan tarih biçimleri
     """
+    metrics = IngestMetrics()
+    date_formats = date_formats or {}
+    
     try:
         # Kullanıcı ve bölüm bilgilerini al
         user = User.objects.get(id=user_id) if user_id else None
@@ -167,29 +206,15 @@ def process_uploaded_file(self, file_path, file_type, department_id, start_date,
         end_date = datetime.date.fromisoformat(end_date)
         
         # Dosya tipine göre veriyi oku
-        if file_type == 'csv':
-            df = pd.read_csv(file_path)
-        elif file_type == 'excel':
-            df = pd.read_excel(file_path)
-        elif file_type == 'pdf':
-            df = tabula.read_pdf(file_path, pages='all')
-            if isinstance(df, list) and len(df) > 0:
-                df = pd.concat(df, ignore_index=True)
-            else:
-                raise ValueError("PDF'den tablo okunamadı")
-        elif file_type == 'html':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            soup = BeautifulSoup(html_content, 'html.parser')
-            tables = soup.find_all('table')
-            if not tables:
-                raise ValueError("HTML dosyasında tablo bulunamadı")
-            df = pd.read_html(str(tables[0]))[0]
-        else:
-            raise ValueError(f"Desteklenmeyen dosya tipi: {file_type}")
+        with metrics.stage('parse') as stage:
+            with local_blob_path(storage_key) as file_path:
+                stage.bytes = os.path.getsize(file_path)
+                df = read_uploaded_file(file_path, file_type)
+            stage.rows = len(df)
         
         # Kolon eşleştirmesi yap
-        df = map_columns(df, column_mapping)
+        with metrics.stage('column_mapping'):
+            df = map_columns(df, complete_column_mapping(df, column_mapping))
         
         # Nöbet listesi oluştur
         shift_list = ShiftList.objects.create(
@@ -200,15 +225,14 @@ def process_uploaded_file(self, file_path, file_type, department_id, start_date,
             created_by=user,
             is_published=False,  # Taslak olarak oluştur
             source_type=file_type,
-            source_file=os.path.basename(file_path)
+            source_file=storage_key
         )
         
         # Verileri işle
-        process_shift_data_from_df(df, shift_list, user)
-        
-        # Geçici dosyayı sil
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        with metrics.stage('persist') as stage:
+            counts = process_shift_data_from_df(df, shift_list, user, date_format=date_formats.get('date'))
+            stage.rows = counts['processed']
+        metrics.counts = counts
         
         # Denetim logu
         if user:
@@ -221,10 +245,14 @@ def process_uploaded_file(self, file_path, file_type, department_id, start_date,
                 details=f"Dosyadan nöbet listesi oluşturuldu: {title}"
             )
         
+        metrics_data = metrics.as_dict()
+        record_ingest('upload', metrics_data)
+
         return {
             'status': 'success',
             'message': f"Dosya başarıyla işlendi ve nöbet listesi oluşturuldu: {title}",
-            'shift_list_id': shift_list.id
+            'shift_list_id': shift_list.id,
+            'metrics': metrics_data
         }
     
     except (Department.DoesNotExist, User.DoesNotExist) as e:
@@ -236,13 +264,6 @@ def process_uploaded_file(self, file_path, file_type, department_id, start_date,
         error_msg = f"Dosya işleme hatası: {str(e)}"
         logger.error(error_msg, exc_info=True)
         
-        # Geçici dosyayı silmeye çalış
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-        except Exception:
-            pass
-        
         # Yeniden deneme
         try:
             self.retry(exc=e)
@@ -253,48 +274,75 @@ def process_uploaded_file(self, file_path, file_type, department_id, start_date,
 
 
 # Yardımcı fonksiyonlar
-def fetch_csv_data(url):
+def download_content(url):
     """
-    URL'den CSV verisi çeker
+    URL'deki veriyi ham bayt olarak indirir
     """
     response = requests.get(url, timeout=30)
     response.raise_for_status()
-    return pd.read_csv(BytesIO(response.content))
+    return response.content
 
 
-def fetch_excel_data(url):
+def parse_content(content, source_type):
     """
-    URL'den Excel verisi çeker
+    Ham veriyi kaynak tipine göre DataFrame'e dönüştürür
+    
+    Args:
+        content (bytes): İndirilen veri
+        source_type (str): Kaynak tipi (csv, excel, html, pdf)
+    
+    Returns:
+        DataFrame: Ayrıştırılmış veri
     """
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    return pd.read_excel(BytesIO(response.content))
+    if source_type == 'csv':
+        return pd.read_csv(BytesIO(content))
+    elif source_type == 'excel':
+        return pd.read_excel(BytesIO(content))
+    elif source_type == 'html':
+        return parse_html_table(content)
+    elif source_type == 'pdf':
+        return parse_pdf_tables(content)
+    raise ValueError(f"Desteklenmeyen kaynak tipi: {source_type}")
 
 
-def fetch_html_table_data(url):
+def read_uploaded_file(file_path, file_type):
     """
-    URL'den HTML tablosu çeker
+    Yüklenen dosyayı dosya tipine göre DataFrame'e dönüştürür
     """
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.content, 'html.parser')
+    if file_type == 'csv':
+        return pd.read_csv(file_path)
+    elif file_type == 'excel':
+        return pd.read_excel(file_path)
+    elif file_type == 'pdf':
+        df = tabula.read_pdf(file_path, pages='all')
+        if isinstance(df, list) and len(df) > 0:
+            return pd.concat(df, ignore_index=True)
+        raise ValueError("PDF'den tablo okunamadı")
+    elif file_type == 'html':
+        with open(file_path, 'rb') as f:
+            return parse_html_table(f.read())
+    raise ValueError(f"Desteklenmeyen dosya tipi: {file_type}")
+
+
+def parse_html_table(content):
+    """
+    HTML içeriğindeki ilk tabloyu okur
+    """
+    soup = BeautifulSoup(content, 'html.parser')
     tables = soup.find_all('table')
     if not tables:
         raise ValueError("HTML sayfasında tablo bulunamadı")
     return pd.read_html(str(tables[0]))[0]
 
 
-def fetch_pdf_table_data(url):
+def parse_pdf_tables(content):
     """
-    URL'den PDF tablosu çeker
+    PDF içeriğindeki tüm tabloları okuyup birleştirir
     """
-    response = requests.get(url, timeout=30)
-    response.raise_for_status()
-    
     # Geçici dosya oluştur
     temp_file = f"/tmp/temp_pdf_{timezone.now().timestamp()}.pdf"
     with open(temp_file, 'wb') as f:
-        f.write(response.content)
+        f.write(content)
     
     # PDF'den tabloları oku
     try:
@@ -303,19 +351,41 @@ def fetch_pdf_table_data(url):
             raise ValueError("PDF'den tablo okunamadı")
         
         # Tüm tabloları birleştir
-        df = pd.concat(df_list, ignore_index=True)
-        
+        return pd.concat(df_list, ignore_index=True)
+    finally:
         # Geçici dosyayı sil
-        os.remove(temp_file)
-        
-        return df
-    except Exception as e:
-        # Hata durumunda geçici dosyayı silmeye çalış
         try:
             os.remove(temp_file)
-        except:
+        except OSError:
             pass
-        raise e
+
+
+def fetch_csv_data(url):
+    """
+    URL'den CSV verisi çeker
+    """
+    return parse_content(download_content(url), 'csv')
+
+
+def fetch_excel_data(url):
+    """
+    URL'den Excel verisi çeker
+    """
+    return parse_content(download_content(url), 'excel')
+
+
+def fetch_html_table_data(url):
+    """
+    URL'den HTML tablosu çeker
+    """
+    return parse_content(download_content(url), 'html')
+
+
+def fetch_pdf_table_data(url):
+    """
+    URL'den PDF tablosu çeker
+    """
+    return parse_content(download_content(url), 'pdf')
 
 
 def map_columns(df, column_mapping):
@@ -329,16 +399,11 @@ def map_columns(df, column_mapping):
     Returns:
         DataFrame: Eşleştirilmiş kolonlarla veri çerçevesi
     """
+    # JSON string ise parse et, eski anahtarları (ör. 'doctor') sistem alanlarına çevir
+    column_mapping = normalize_column_mapping(column_mapping)
     if not column_mapping:
         return df
     
-    # JSON string ise parse et
-    if isinstance(column_mapping, str):
-        try:
-            column_mapping = json.loads(column_mapping)
-        except json.JSONDecodeError:
-            raise ValueError("Geçersiz kolon eşleştirme JSON formatı")
-    
     # Kolon eşleştirmesi yap
     renamed_columns = {}
     for target_col, source_cols in column_mapping.items():
@@ -382,12 +447,12 @@ def process_shift_data(df, source, user=None):
     )
     
     # Verileri işle
-    process_shift_data_from_df(df, shift_list, user)
+    counts = process_shift_data_from_df(df, shift_list, user)
     
-    return shift_list
+    return shift_list, counts
 
 
-def process_shift_data_from_df(df, shift_list, user=None):
+def process_shift_data_from_df(df, shift_list, user=None, date_format=None):
     """
     DataFrame'den nöbet verilerini işler ve kaydeder
     
@@ -395,7 +460,13 @@ def process_shift_data_from_df(df, shift_list, user=None):
         df (DataFrame): İşlenecek veri çerçevesi
         shift_list (ShiftList): Nöbet listesi
         user (User, optional): İşlemi başlatan kullanıcı
+        date_format (str, optional): Tarih kolonunun biçimi (ör. '%d.%m.%Y')
+    
+    Returns:
+        dict: İşlenen, oluşturulan, güncellenen ve başarısız kayıt sayıları
     """
+    counts = {'processed': 0, 'created': 0, 'updated': 0, 'failed': 0}
+    
     required_columns = ['doctor_name', 'date']
     for col in required_columns:
         if col not in df.columns:
@@ -404,7 +475,10 @@ def process_shift_data_from_df(df, shift_list, user=None):
     # Tarih kolonunu datetime formatına dönüştür
     if 'date' in df.columns:
         try:
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
+            if date_format and date_format != 'native':
+                df['date'] = pd.to_datetime(df['date'].astype(str).str.strip(), format=date_format, errors='coerce')
+            else:
+                df['date'] = pd.to_datetime(df['date'], errors='coerce')
             # NaT değerleri filtrele
             df = df.dropna(subset=['date'])
         except Exception as e:
@@ -418,83 +492,111 @@ def process_shift_data_from_df(df, shift_list, user=None):
         shift_list.end_date = max_date
         shift_list.save()
     
-    # Her satır için nöbet kaydı oluştur
+    # Her satır için nöbet kaydı oluştur; hatalı satırlar tüm işlemi durdurmaz
     for _, row in df.iterrows():
-        # Doktor adını parse et
-        doctor_name = row['doctor_name']
-        doctor_parts = parse_doctor_name(doctor_name)
-        
-        # Doktor kaydını bul veya oluştur
-        doctor, _ = Doctor.objects.get_or_create(
-            name=doctor_parts.get('name', ''),
-            surname=doctor_parts.get('surname', ''),
-            defaults={
-                'title': doctor_parts.get('title', ''),
-                'department': shift_list.department,
-                'active': True
-            }
-        )
-        
-        # Telefon numarası varsa normalize et ve kaydet
-        if 'phone' in row and pd.notna(row['phone']):
-            phone = normalize_phone_number(str(row['phone']))
-            if phone and doctor.phone != phone:
-                doctor.phone = phone
-                doctor.save()
-        
-        # E-posta varsa kaydet
-        if 'email' in row and pd.notna(row['email']):
-            email = str(row['email']).strip()
-            if email and doctor.email != email:
-                doctor.email = email
-                doctor.save()
-        
-        # Nöbet tipi
-        shift_type = 'normal'
-        if 'shift_type' in row and pd.notna(row['shift_type']):
-            shift_type_val = str(row['shift_type']).lower()
-            if 'icap' in shift_type_val or 'on-call' in shift_type_val:
-                shift_type = 'on_call'
-            elif 'gece' in shift_type_val or 'night' in shift_type_val:
-                shift_type = 'night'
-        
-        # Başlangıç ve bitiş saatleri
-        start_time = None
-        end_time = None
-        
-        if 'start_time' in row and pd.notna(row['start_time']):
-            try:
-                if isinstance(row['start_time'], str):
-                    start_time = datetime.datetime.strptime(row['start_time'], '%H:%M').time()
-                elif isinstance(row['start_time'], datetime.time):
-                    start_time = row['start_time']
-            except (ValueError, TypeError):
-                pass
-        
-        if 'end_time' in row and pd.notna(row['end_time']):
-            try:
-                if isinstance(row['end_time'], str):
-                    end_time = datetime.datetime.strptime(row['end_time'], '%H:%M').time()
-                elif isinstance(row['end_time'], datetime.time):
-                    end_time = row['end_time']
-            except (ValueError, TypeError):
-                pass
-        
-        # Notlar
-        notes = None
-        if 'notes' in row and pd.notna(row['notes']):
-            notes = str(row['notes']).strip()
-        
-        # Nöbet kaydı oluştur
-        Shift.objects.create(
-            shift_list=shift_list,
-            doctor=doctor,
-            date=row['date'].date(),
-            shift_type=shift_type,
-            start_time=start_time,
-            end_time=end_time,
-            notes=notes
-        )
+        counts['processed'] += 1
+        try:
+            with transaction.atomic():
+                created = _save_shift_row(row, shift_list)
+        except (ValueError, TypeError, IntegrityError) as e:
+            counts['failed'] += 1
+            logger.warning(f"Nöbet satırı işlenemedi: {str(e)}")
+            continue
+        
+        if created:
+            counts['created'] += 1
+        else:
+            counts['updated'] += 1
+    
+    return counts
+
+
+def _save_shift_row(row, shift_list):
+    """
+    Tek bir satırdan nöbet kaydı oluşturur veya aynı listedeki kaydı günceller
+    
+    Returns:
+        bool: Yeni kayıt oluşturulduysa True
+    """
+    # Doktor adını parse et
+    doctor_name = row['doctor_name']
+    doctor_parts = parse_doctor_name(doctor_name)
+    
+    # Doktor kaydını bul veya oluştur
+    doctor, _ = Doctor.objects.get_or_create(
+        name=doctor_parts.get('name', ''),
+        surname=doctor_parts.get('surname', ''),
+        defaults={
+            'title': doctor_parts.get('title', ''),
+            'department': shift_list.department,
+            'active': True
+        }
+    )
+    
+    # Telefon numarası varsa normalize et ve kaydet
+    if 'phone' in row and pd.notna(row['phone']):
+        phone = normalize_phone_number(str(row['phone']))
+        if phone and doctor.phone != phone:
+            doctor.phone = phone
+            doctor.save()
+    
+    # E-posta varsa kaydet
+    if 'email' in row and pd.notna(row['email']):
+        email = str(row['email']).strip()
+        if email and doctor.email != email:
+            doctor.email = email
+            doctor.save()
+    
+    # Nöbet tipi
+    shift_type = 'normal'
+    if 'shift_type' in row and pd.notna(row['shift_type']):
+        shift_type_val = str(row['shift_type']).lower()
+        if 'icap' in shift_type_val or 'on-call' in shift_type_val:
+            shift_type = 'on_call'
+        elif 'gece' in shift_type_val or 'night' in shift_type_val:
+            shift_type = 'night'
+    
+    # Başlangıç ve bitiş saatleri
+    start_time = None
+    end_time = None
+    
+    if 'start_time' in row and pd.notna(row['start_time']):
+        try:
+            if isinstance(row['start_time'], str):
+                start_time = datetime.datetime.strptime(row['start_time'], '%H:%M').time()
+            elif isinstance(row['start_time'], datetime.time):
+                start_time = row['start_time']
+        except (ValueError, TypeError):
+            pass
+    
+    if 'end_time' in row and pd.notna(row['end_time']):
+        try:
+            if isinstance(row['end_time'], str):
+                end_time = datetime.datetime.strptime(row['end_time'], '%H:%M').time()
+            elif isinstance(row['end_time'], datetime.time):
+                end_time = row['end_time']
+        except (ValueError, TypeError):
+            pass
+    
+    # Notlar
+    notes = None
+    if 'notes' in row and pd.notna(row['notes']):
+        notes = str(row['notes']).strip()
+    
+    # Nöbet kaydını oluştur veya yalnızca bu listedeki kaydı güncelle; başka bir
+    # listedeki aynı nöbet taşınmaz, IntegrityError ile satır başarısız sayılır
+    _, created = Shift.objects.update_or_create(
+        doctor=doctor,
+        date=row['date'].date(),
+        shift_type=shift_type,
+        shift_list=shift_list,
+        defaults={
+            'start_time': start_time,
+            'end_time': end_time,
+            'notes': notes,
+        }
+    )
+    return created
 
 
 def parse_doctor_name(full_name):
@@ -5,6 +5,10 @@ urlpatterns = [
     # Dashboard
     path('', views.dashboard, name='nobet_dashboard'),
     
+    # Takvim ve nöbetçi sorguları (JSON)
+    path('calendar/', views.shift_calendar, name='shift_calendar'),
+    path('on-call/', views.on_call, name='on_call'),
+    
     # Nöbet Listeleri
     path('shift-lists/', views.shift_list_view, name='shift_list_view'),
     path('shift-lists/<int:pk>/', views.shift_list_detail, name='shift_list_detail'),
@@ -24,24 +28,29 @@ urlpatterns = [
     path('data-sources/<int:pk>/update/', views.data_source_update, name='data_source_update'),
     path('data-sources/<int:pk>/delete/', views.data_source_delete, name='data_source_delete'),
     path('data-sources/<int:source_id>/fetch/', views.fetch_data, name='fetch_data'),
+    path('data-sources/<int:source_id>/preview/', views.data_source_preview, name='data_source_preview'),
+    path('data-sources/<int:source_id>/fetch-trend/', views.fetch_log_trend, name='fetch_log_trend'),
     
     # Dosya Yükleme
     path('upload/', views.file_upload, name='file_upload'),
+    path('upload/preview/', views.file_upload_preview, name='file_upload_preview'),
     
     # Dışa Aktarma
     path('export/', views.export_shift_list, name='export_shift_list'),
+    path('export/shift-list-info/', views.shift_list_info, name='api_shift_list_info'),
     
     # Doktorlar
     path('doctors/', views.doctor_list, name='doctor_list'),
     path('doctors/create/', views.doctor_create, name='doctor_create'),
+    path('doctors/autocomplete/', views.doctor_autocomplete, name='doctor_autocomplete'),
     path('doctors/<int:pk>/update/', views.doctor_update, name='doctor_update'),
     path('doctors/<int:pk>/delete/', views.doctor_delete, name='doctor_delete'),
     
     # Bölümler
-    path('departments/', views.department_list, name='department_list'),
-    path('departments/create/', views.department_create, name='department_create'),
-    path('departments/<int:pk>/update/', views.department_update, name='department_update'),
-    path('departments/<int:pk>/delete/', views.department_delete, name='department_delete'),
+    path('departments/', views.department_list, name='nobet_department_list'),
+    path('departments/create/', views.department_create, name='nobet_department_create'),
+    path('departments/<int:pk>/update/', views.department_update, name='nobet_department_update'),
+    path('departments/<int:pk>/delete/', views.department_delete, name='nobet_department_delete'),
     
     # Loglar
     path('audit-logs/', views.audit_log_list, name='audit_log_list'),
@@ -1,4 +1,5 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib import messages
 from django.http import JsonResponse, HttpResponse
@@ -8,11 +9,23 @@ from django.utils.translation import gettext_lazy as _
 from django.db.models import Q, Count
 from django.views.decorators.http import require_POST
 from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
+
+from core.async_views import alogin_required, aget_user, arender, run_concurrently
+from core.cache import cache_for_models
+from core.models import UploadSession
+from core.storage import put_blob
 
 from .models import DataSource, ShiftList, Department, Doctor, Shift, FetchLog, AuditLog
 from .forms import (
-    DataSourceForm, FileUploadForm, ShiftListFilterForm, 
-    ShiftForm, DoctorForm, DepartmentForm, ExportForm
+    DataSourceForm, FileUploadForm, FilterForm, ShiftListForm,
+    ShiftForm, BulkShiftForm, DoctorForm, DepartmentForm, ExportForm
+)
+from .search import search_doctors, AUTOCOMPLETE_DEFAULT_LIMIT, AUTOCOMPLETE_MAX_LIMIT
+from .instrumentation import INGEST_STAGES, STAGE_LABELS, summarize_metrics
+from .preview import (
+    detect_file_type, preview_uploaded_file, preview_data_source,
+    store_preview, load_preview, discard_preview
 )
 
 import pandas as pd
@@ -20,56 +33,257 @@ import json
 import csv
 import io
 import datetime
-import uuid
 
 # Celery tasks
 from .tasks import fetch_data_from_source, process_uploaded_file
 
 
-@login_required
-def dashboard(request):
-    """Ana dashboard görünümü"""
-    # Son eklenen nöbet listeleri
-    recent_shift_lists = ShiftList.objects.filter(is_published=True).order_by('-created_at')[:5]
-    
-    # Bölümlere göre nöbet sayıları
-    departments = Department.objects.filter(active=True)
-    department_stats = []
-    for dept in departments:
-        shift_count = Shift.objects.filter(shift_list__department=dept).count()
-        department_stats.append({
-            'department': dept,
-            'shift_count': shift_count
-        })
-    
-    # Son veri çekme işlemleri
-    recent_fetch_logs = FetchLog.objects.order_by('-started_at')[:5]
-    
-    # Aktif veri kaynakları
-    active_sources = DataSource.objects.filter(active=True).count()
-    
-    # Toplam nöbet sayısı
-    total_shifts = Shift.objects.count()
-    
-    # Toplam doktor sayısı
-    total_doctors = Doctor.objects.filter(active=True).count()
+@cache_for_models(ShiftList, Department)
+def recent_published_shift_lists(limit=5):
+    return list(ShiftList.objects.filter(is_published=True).select_related(
+        'department'
+    ).order_by('-created_at')[:limit])
+
+
+@cache_for_models(Department, ShiftList, Shift)
+def department_shift_counts():
+    """Bölümlere göre nöbet sayıları; tek sorgu"""
+    return [
+        {'department': dept, 'shift_count': dept.shift_count}
+        for dept in Department.objects.filter(active=True).annotate(
+            shift_count=Count('shift_lists__shifts')
+        )
+    ]
+
+
+@cache_for_models(FetchLog, DataSource)
+def recent_fetch_log_list(limit=5):
+    return list(FetchLog.objects.select_related('source').order_by('-started_at')[:limit])
+
+
+@cache_for_models(DataSource, Shift, Doctor)
+def dashboard_totals():
+    """Aktif kaynak, nöbet ve doktor sayıları; her model için tek sorgu"""
+    return {
+        'active_sources': DataSource.objects.filter(active=True).count(),
+        'total_shifts': Shift.objects.count(),
+        'total_doctors': Doctor.objects.filter(active=True).count(),
+    }
+
+
+@alogin_required
+async def dashboard(request):
+    """Ana dashboard görünümü; bağımsız sorgular eşzamanlı çalışır"""
+    recent_shift_lists, department_stats, recent_fetch_logs, totals = await run_concurrently(
+        recent_published_shift_lists,
+        department_shift_counts,
+        recent_fetch_log_list,
+        dashboard_totals,
+    )
     
     context = {
         'recent_shift_lists': recent_shift_lists,
         'department_stats': department_stats,
         'recent_fetch_logs': recent_fetch_logs,
-        'active_sources': active_sources,
-        'total_shifts': total_shifts,
-        'total_doctors': total_doctors,
+        'active_sources': totals['active_sources'],
+        'total_shifts': totals['total_shifts'],
+        'total_doctors': totals['total_doctors'],
     }
     
-    return render(request, 'nobet_listesi/dashboard.html', context)
+    return await arender(request, 'nobet_listesi/dashboard.html', context)
+
+
+# Takvim ve nöbetçi sorguları
+
+CALENDAR_MAX_DAYS = 62
+
+
+def _parse_date(value, default=None):
+    if not value:
+        return default
+    try:
+        return datetime.date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def _parse_time(value):
+    try:
+        return datetime.time.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _department_id(request):
+    value = request.GET.get('department', '')
+    return int(value) if value.isdigit() else None
+
+
+def _published_shifts(department_id=None):
+    shifts = Shift.objects.filter(shift_list__is_published=True).select_related(
+        'doctor', 'shift_list__department'
+    )
+    if department_id:
+        shifts = shifts.filter(shift_list__department_id=department_id)
+    return shifts
+
+
+@cache_for_models(Shift, ShiftList, Doctor, Department)
+def calendar_events(start, end, department_id=None):
+    """Tarih aralığındaki yayınlanmış nöbetler (takvim olayları)"""
+    shifts = _published_shifts(department_id).filter(
+        date__gte=start, date__lte=end
+    ).order_by('date', 'start_time')
+    return [
+        {
+            'id': shift.id,
+            'title': str(shift.doctor),
+            'start': _shift_datetime(shift.date, shift.start_time),
+            'end': _shift_datetime(shift.date, shift.end_time, shift.start_time),
+            'allDay': shift.start_time is None,
+            'shift_type': shift.shift_type,
+            'shift_type_display': str(shift.get_shift_type_display()),
+            'department': shift.shift_list.department.name,
+            'shift_list_id': shift.shift_list_id,
+        }
+        for shift in shifts
+    ]
+
+
+@cache_for_models(ShiftList, Department)
+def calendar_shift_lists(start, end, department_id=None):
+    """Tarih aralığıyla kesişen yayınlanmış nöbet listeleri"""
+    shift_lists = ShiftList.objects.filter(
+        is_published=True, start_date__lte=end, end_date__gte=start
+    ).select_related('department')
+    if department_id:
+        shift_lists = shift_lists.filter(department_id=department_id)
+    return [
+        {
+            'id': shift_list.id,
+            'title': shift_list.title,
+            'department': shift_list.department.name,
+            'url': reverse('shift_list_detail', args=[shift_list.id]),
+        }
+        for shift_list in shift_lists.order_by('start_date')
+    ]
+
+
+def _shift_datetime(date, time, start_time=None):
+    if time is None:
+        return date.isoformat()
+    # Gece yarısını geçen nöbetler ertesi gün biter
+    if start_time is not None and time <= start_time:
+        date = date + datetime.timedelta(days=1)
+    return datetime.datetime.combine(date, time).isoformat()
+
+
+@cache_for_models(Shift, ShiftList, Doctor, Department)
+def on_call_shifts(date, department_id=None):
+    """Verilen gündeki nöbetler"""
+    return list(_published_shifts(department_id).filter(date=date).order_by('start_time'))
+
+
+def _covers_time(shift, time):
+    """Verilen gündeki nöbet o saatte sürüyor mu; saatsiz nöbetler tüm günü kapsar"""
+    if shift.start_time is None:
+        return True
+    if shift.end_time is None or shift.end_time <= shift.start_time:
+        # Bitişi belirsiz ya da gece yarısını geçen nöbet günün sonuna kadar sürer
+        return shift.start_time <= time
+    return shift.start_time <= time < shift.end_time
+
+
+@cache_for_models(Shift, ShiftList, Doctor, Department)
+def overnight_shifts(date, department_id=None):
+    """Önceki günden başlayıp verilen güne sarkan nöbetler"""
+    return [
+        shift for shift in _published_shifts(department_id).filter(
+            date=date - datetime.timedelta(days=1), start_time__isnull=False, end_time__isnull=False
+        )
+        if shift.end_time <= shift.start_time
+    ]
+
+
+@alogin_required
+async def shift_calendar(request):
+    """Takvim için nöbetler (JSON); ?start=YYYY-MM-DD&end=YYYY-MM-DD&department=ID"""
+    today = timezone.localdate()
+    start = _parse_date(request.GET.get('start'), today.replace(day=1))
+    end = _parse_date(request.GET.get('end'), start + datetime.timedelta(days=31) if start else None)
+    if start is None or end is None or end < start:
+        return JsonResponse({'error': _('Geçersiz tarih aralığı.')}, status=400)
+    if (end - start).days > CALENDAR_MAX_DAYS:
+        return JsonResponse({'error': _('Tarih aralığı en fazla %(days)s gün olabilir.') % {'days': CALENDAR_MAX_DAYS}}, status=400)
+    
+    department_id = _department_id(request)
+    events, shift_lists = await run_concurrently(
+        lambda: calendar_events(start, end, department_id),
+        lambda: calendar_shift_lists(start, end, department_id),
+    )
+    return JsonResponse({'events': events, 'shift_lists': shift_lists})
+
+
+@alogin_required
+async def on_call(request):
+    """
+    Verilen gün ve saatte nöbetçi doktorlar (JSON); ?date=YYYY-MM-DD&time=HH:MM&department=ID
+
+    Tarih ve saat verilmezse şu an kullanılır. Yalnızca tarih verilirse o günün
+    tüm nöbetleri döner. Önceki günden gece yarısını geçen nöbetler bitişlerine
+    kadar dahildir.
+    """
+    now = timezone.localtime()
+    date = _parse_date(request.GET.get('date'), now.date())
+    if date is None:
+        return JsonResponse({'error': _('Geçersiz tarih.')}, status=400)
+    time = request.GET.get('time')
+    if time:
+        time = _parse_time(time)
+        if time is None:
+            return JsonResponse({'error': _('Geçersiz saat.')}, status=400)
+    elif not request.GET.get('date'):
+        time = now.time().replace(microsecond=0)
+    else:
+        time = None
+    department_id = _department_id(request)
+    
+    user = await aget_user(request)
+    show_contact, todays, overnight = await run_concurrently(
+        lambda: user.has_perm('nobet_listesi.view_doctor'),
+        lambda: on_call_shifts(date, department_id),
+        lambda: overnight_shifts(date, department_id),
+    )
+    
+    def as_dict(shift):
+        doctor = shift.doctor
+        return {
+            'id': shift.id,
+            'doctor': str(doctor),
+            'department': shift.shift_list.department.name,
+            'shift_type': shift.shift_type,
+            'shift_type_display': str(shift.get_shift_type_display()),
+            'date': shift.date.isoformat(),
+            'start_time': shift.start_time.strftime('%H:%M') if shift.start_time else None,
+            'end_time': shift.end_time.strftime('%H:%M') if shift.end_time else None,
+            'phone': doctor.phone if show_contact else doctor.get_masked_phone(),
+        }
+    
+    if time is not None:
+        overnight = [shift for shift in overnight if time < shift.end_time]
+        todays = [shift for shift in todays if _covers_time(shift, time)]
+    
+    return JsonResponse({
+        'date': date.isoformat(),
+        'time': time.strftime('%H:%M') if time is not None else None,
+        'results': [as_dict(shift) for shift in overnight + todays],
+    })
 
 
 @login_required
 def shift_list_view(request):
     """Nöbet listelerini görüntüleme ve filtreleme"""
-    filter_form = ShiftListFilterForm(request.GET)
+    filter_form = FilterForm(request.GET)
     shift_lists = ShiftList.objects.all()
     
     # Filtreleme işlemleri
@@ -109,30 +323,34 @@ def shift_list_view(request):
     context = {
         'filter_form': filter_form,
         'page_obj': page_obj,
+        'shift_lists': page_obj,
     }
     
-    return render(request, 'nobet_listesi/shift_list.html', context)
+    return render(request, 'nobet_listesi/shift_list_view.html', context)
 
 
 @login_required
 def shift_list_detail(request, pk):
     """Nöbet listesi detayı"""
     shift_list = get_object_or_404(ShiftList, pk=pk)
-    shifts = shift_list.shifts.all().order_by('date', 'start_time')
+    shifts = shift_list.shifts.select_related('doctor').order_by('date', 'start_time')
     
     # Doktorlara göre gruplandırma
-    doctors = {}
-    for shift in shifts:
-        if shift.doctor_id not in doctors:
-            doctors[shift.doctor_id] = {
-                'doctor': shift.doctor,
-                'shifts': []
-            }
-        doctors[shift.doctor_id]['shifts'].append(shift)
+    def group_by_doctor():
+        doctors = {}
+        for shift in shifts:
+            if shift.doctor_id not in doctors:
+                doctors[shift.doctor_id] = {
+                    'doctor': shift.doctor,
+                    'shifts': []
+                }
+            doctors[shift.doctor_id]['shifts'].append(shift)
+        return list(doctors.values())
     
+    # Tablolar önbellekteki şablon parçalarından gelirse sorgu hiç çalışmaz
     context = {
         'shift_list': shift_list,
-        'doctors': doctors.values(),
+        'doctors': SimpleLazyObject(group_by_doctor),
         'shifts': shifts,
     }
     
@@ -206,6 +424,8 @@ def shift_list_update(request, pk):
     }
     
     return render(request, 'nobet_listesi/shift_list_form.html', context)
+
+
 @login_required
 @permission_required('nobet_listesi.add_shift', raise_exception=True)
 def bulk_shift_create(request, shift_list_id):
@@ -282,64 +502,6 @@ def bulk_shift_create(request, shift_list_id):
     }
     
     return render(request, 'nobet_listesi/bulk_shift_form.html', context)
-        end_date = request.POST.get('end_date')
-        is_published = request.POST.get('is_published') == 'on'
-        
-        try:
-            department = Department.objects.get(id=department_id)
-            start_date = datetime.datetime.strptime(start_date, '%Y-%m-%d').date()
-            end_date = datetime.datetime.strptime(end_date, '%Y-%m-%d').date()
-            
-            # Değişiklikleri kaydet
-            old_data = {
-                'title': shift_list.title,
-                'department': shift_list.department.id,
-                'start_date': shift_list.start_date.isoformat(),
-                'end_date': shift_list.end_date.isoformat(),
-                'is_published': shift_list.is_published
-            }
-            
-            shift_list.title = title
-            shift_list.department = department
-            shift_list.start_date = start_date
-            shift_list.end_date = end_date
-            shift_list.is_published = is_published
-            shift_list.save()
-            
-            # Denetim logu
-            new_data = {
-                'title': shift_list.title,
-                'department': shift_list.department.id,
-                'start_date': shift_list.start_date.isoformat(),
-                'end_date': shift_list.end_date.isoformat(),
-                'is_published': shift_list.is_published
-            }
-            
-            AuditLog.objects.create(
-                user=request.user,
-                action='update',
-                model_name='ShiftList',
-                object_id=shift_list.id,
-                object_repr=str(shift_list),
-                changes={'old': old_data, 'new': new_data},
-                ip_address=request.META.get('REMOTE_ADDR'),
-                user_agent=request.META.get('HTTP_USER_AGENT')
-            )
-            
-            messages.success(request, _('Nöbet listesi başarıyla güncellendi.'))
-            return redirect('shift_list_detail', pk=shift_list.pk)
-        
-        except (Department.DoesNotExist, ValueError) as e:
-            messages.error(request, _('Nöbet listesi güncellenirken hata oluştu: {}').format(str(e)))
-    
-    # GET isteği veya form hatası durumunda
-    departments = Department.objects.filter(active=True)
-    context = {
-        'shift_list': shift_list,
-        'departments': departments,
-    }
-    
-    return render(request, 'nobet_listesi/shift_list_form.html', context)
 
 
 @login_required
@@ -660,31 +822,37 @@ def file_upload(request):
     if request.method == 'POST':
         form = FileUploadForm(request.POST, request.FILES)
         if form.is_valid():
-            file = request.FILES['file']
-            file_type = form.cleaned_data['file_type']
             department = form.cleaned_data['department']
             start_date = form.cleaned_data['start_date']
             end_date = form.cleaned_data['end_date']
             title = form.cleaned_data['title']
             column_mapping = form.cleaned_data['column_mapping']
-            
-            # Dosyayı geçici olarak kaydet
-            temp_file_path = f"/tmp/{uuid.uuid4()}_{file.name}"
-            with open(temp_file_path, 'wb+') as destination:
-                for chunk in file.chunks():
-                    destination.write(chunk)
+            date_formats = None
             
             try:
-                # Celery task'ı başlat
+                # Önizlemesi yapılmış dosya tekrar yüklenmez
+                pending = load_preview(form.cleaned_data['preview_token'])
+                if pending:
+                    storage_key = pending['storage_key']
+                    file_type = pending['file_type']
+                    column_mapping = pending['preview']['column_mapping']
+                    date_formats = pending['preview']['date_formats']
+                    discard_preview(form.cleaned_data['preview_token'])
+                else:
+                    storage_key, file_name = _stored_upload(request, form.cleaned_data['upload_key'])
+                    file_type = detect_file_type(file_name)
+                
+                # Celery task'ı başlat; worker dosyayı paylaşımlı depodan okur
                 task = process_uploaded_file.delay(
-                    temp_file_path,
+                    storage_key,
                     file_type,
                     department.id,
                     start_date.isoformat(),
                     end_date.isoformat(),
                     title,
                     column_mapping,
-                    request.user.id
+                    request.user.id,
+                    date_formats=date_formats
                 )
                 
                 messages.success(
@@ -708,6 +876,88 @@ def file_upload(request):
     return render(request, 'nobet_listesi/file_upload.html', context)
 
 
+def _stored_upload(request, upload_key=None):
+    """
+    Yüklenen dosyanın paylaşımlı depodaki anahtarını ve adını döndürür
+    
+    Parçalı yüklemede yalnızca kullanıcının kendi tamamladığı oturumun anahtarı
+    kabul edilir; doğrudan yüklenen dosya içerik adresli olarak depoya yazılır.
+    """
+    if upload_key:
+        file_name = UploadSession.objects.filter(
+            user=request.user, blob_key=upload_key, status='complete'
+        ).values_list('file_name', flat=True).first()
+        if not file_name:
+            raise ValueError(_('Yüklenen dosya bulunamadı.'))
+        return upload_key, file_name
+    
+    file = request.FILES['file']
+    storage_key, _created = put_blob(file)
+    return storage_key, file.name
+
+
+@login_required
+@permission_required('nobet_listesi.add_shiftlist', raise_exception=True)
+@require_POST
+def file_upload_preview(request):
+    """
+    Yüklenen dosyanın ilk satırlarını veritabanına yazmadan önizler
+    
+    Dönen önizleme anahtarı, içe aktarma onaylandığında dosyanın ve bulunan
+    tarih biçimlerinin yeniden kullanılması için formla birlikte gönderilir.
+    """
+    if not request.FILES.get('file') and not request.POST.get('upload_key'):
+        return JsonResponse({'error': _('Dosya seçilmedi.')}, status=400)
+    
+    try:
+        column_mapping = json.loads(request.POST.get('column_mapping') or '{}')
+    except json.JSONDecodeError:
+        return JsonResponse({'error': _('Geçersiz JSON formatı.')}, status=400)
+    
+    try:
+        storage_key, file_name = _stored_upload(request, request.POST.get('upload_key'))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    
+    file_type = request.POST.get('file_type') or detect_file_type(file_name)
+    if not file_type:
+        return JsonResponse({'error': _('Desteklenmeyen dosya formatı.')}, status=400)
+    
+    try:
+        preview = preview_uploaded_file(storage_key, file_type, column_mapping)
+    except Exception as e:
+        return JsonResponse({'error': _('Önizleme oluşturulamadı: {}').format(str(e))}, status=400)
+    
+    token = store_preview(preview, storage_key=storage_key, file_type=file_type)
+    
+    return JsonResponse(dict(preview, preview_token=token))
+
+
+@login_required
+@permission_required('nobet_listesi.view_datasource', raise_exception=True)
+def data_source_preview(request, source_id):
+    """Veri kaynağının ilk satırlarını veritabanına yazmadan önizler"""
+    data_source = get_object_or_404(DataSource, pk=source_id)
+    
+    try:
+        preview = preview_data_source(data_source)
+    except Exception as e:
+        return JsonResponse({'error': _('Önizleme oluşturulamadı: {}').format(str(e))}, status=400)
+    
+    return JsonResponse(preview)
+
+
+@login_required
+def shift_list_info(request):
+    """Dışa aktarma formu için nöbet listesinin bölüm ve tarih aralığı"""
+    shift_list = get_object_or_404(ShiftList, pk=request.GET.get('shift_list_id') or 0)
+    return JsonResponse({
+        'department_id': shift_list.department_id,
+        'start_date': shift_list.start_date.strftime('%d.%m.%Y'),
+        'end_date': shift_list.end_date.strftime('%d.%m.%Y'),
+    })
+
+
 @login_required
 def export_shift_list(request):
     """Nöbet listesini dışa aktarma"""
@@ -720,7 +970,7 @@ def export_shift_list(request):
             mask_contact_info = form.cleaned_data['mask_contact_info']
             
             # Nöbetleri al
-            shifts = shift_list.shifts.all().order_by('date', 'start_time')
+            shifts = shift_list.shifts.select_related('doctor').order_by('date', 'start_time')
             
             # Dışa aktarılacak verileri hazırla
             data = []
@@ -795,13 +1045,13 @@ def export_shift_list(request):
                 return render(request, 'nobet_listesi/shift_list_pdf.html', context)
     
     else:
-        form = ExportForm()
+        form = ExportForm(initial={'shift_list': request.GET.get('shift_list')})
     
     context = {
         'form': form,
     }
     
-    return render(request, 'nobet_listesi/export_form.html', context)
+    return render(request, 'nobet_listesi/export.html', context)
 
 
 @login_required
@@ -848,7 +1098,7 @@ def audit_log_list(request):
     # Filtre seçenekleri
     action_choices = AuditLog.ACTION_CHOICES
     model_names = AuditLog.objects.values_list('model_name', flat=True).distinct()
-    users = User.objects.filter(audit_logs__isnull=False).distinct()
+    users = get_user_model().objects.filter(audit_logs__isnull=False).distinct()
     
     context = {
         'page_obj': page_obj,
@@ -925,13 +1175,42 @@ def fetch_log_detail(request, pk):
     """Veri çekme logu detayı"""
     log = get_object_or_404(FetchLog, pk=pk)
     
+    # Aşama ölçümlerini hat sırasına göre diz
+    stage_metrics = (log.metrics or {}).get('stages', {})
+    ordered = INGEST_STAGES + [name for name in stage_metrics if name not in INGEST_STAGES]
+    stages = [
+        dict(stage_metrics[name], name=name, label=STAGE_LABELS.get(name, name))
+        for name in ordered if name in stage_metrics
+    ]
+    
     context = {
         'log': log,
+        'stages': stages,
     }
     
     return render(request, 'nobet_listesi/fetch_log_detail.html', context)
 
 
+@login_required
+@permission_required('nobet_listesi.view_fetchlog', raise_exception=True)
+def fetch_log_trend(request, source_id):
+    """Veri kaynağının son çekme işlemlerindeki aşama sürelerinin eğilimi"""
+    source = get_object_or_404(DataSource, pk=source_id)
+    logs = list(source.fetch_logs.order_by('-started_at')[:30])
+    
+    summary = summarize_metrics([log.metrics for log in logs])
+    ordered = INGEST_STAGES + [name for name in summary if name not in INGEST_STAGES]
+    stages = [dict(summary[name], name=name) for name in ordered if name in summary]
+    
+    context = {
+        'source': source,
+        'logs': logs,
+        'stages': stages,
+    }
+    
+    return render(request, 'nobet_listesi/fetch_log_trend.html', context)
+
+
 @login_required
 @permission_required('nobet_listesi.add_doctor', raise_exception=True)
 def doctor_list(request):
@@ -951,11 +1230,7 @@ def doctor_list(request):
         doctors = doctors.filter(active=active)
     
     if search:
-        doctors = doctors.filter(
-            Q(name__icontains=search) | 
-            Q(surname__icontains=search) | 
-            Q(title__icontains=search)
-        )
+        doctors = search_doctors(search, doctors)
     
     # Sayfalama
     paginator = Paginator(doctors, 20)  # Her sayfada 20 doktor
@@ -976,6 +1251,30 @@ def doctor_list(request):
     return render(request, 'nobet_listesi/doctor_list.html', context)
 
 
+@login_required
+def doctor_autocomplete(request):
+    """Select2 alanları için önek araması ile doktor önerileri (JSON)"""
+    query = request.GET.get('q', '')
+    department_id = request.GET.get('department')
+    
+    try:
+        limit = max(1, min(int(request.GET.get('limit', AUTOCOMPLETE_DEFAULT_LIMIT)), AUTOCOMPLETE_MAX_LIMIT))
+    except ValueError:
+        limit = AUTOCOMPLETE_DEFAULT_LIMIT
+    
+    doctors = Doctor.objects.filter(active=True).only('id', 'title', 'name', 'surname')
+    
+    if department_id and department_id.isdigit():
+        doctors = doctors.filter(department_id=department_id)
+    
+    doctors = search_doctors(query, doctors)[:limit]
+    
+    return JsonResponse({
+        'results': [{'id': doctor.id, 'text': str(doctor)} for doctor in doctors],
+        'pagination': {'more': False},
+    })
+
+
 @login_required
 @permission_required('nobet_listesi.add_doctor', raise_exception=True)
 def doctor_create(request):
@@ -1152,7 +1451,7 @@ def department_create(request):
             )
             
             messages.success(request, _('Bölüm başarıyla eklendi.'))
-            return redirect('department_list')
+            return redirect('nobet_department_list')
     else:
         form = DepartmentForm()
     
@@ -1200,7 +1499,7 @@ def department_update(request, pk):
             )
             
             messages.success(request, _('Bölüm başarıyla güncellendi.'))
-            return redirect('department_list')
+            return redirect('nobet_department_list')
     else:
         form = DepartmentForm(instance=department)
     
@@ -1239,4 +1538,4 @@ def department_delete(request, pk):
     except Exception as e:
         messages.error(request, _('Bölüm silinirken hata oluştu: {}').format(str(e)))
     
-    return redirect('department_list')
\ No newline at end of file
+    return redirect('nobet_department_list')
\ No newline at end of file
@@ -1,55 +1,79 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import Q, Count
 from django.utils import timezone
+from core.async_views import alogin_required, arender, run_concurrently
+from core.cache import cache_for_models
+
 from .models import ServerType, Server, ServerMaintenanceRecord, ServerMonitoringLog, ServerDocument
 from .forms import (
     ServerTypeForm, ServerForm, ServerMaintenanceRecordForm, ServerMonitoringLogForm,
     ServerDocumentForm, ServerFilterForm, ServerMaintenanceFilterForm, ServerMonitoringLogFilterForm
 )
 
-@login_required
-def server_dashboard(request):
-    """Sunucu yönetimi dashboard görünümü"""
-    # Sunucu istatistikleri
-    total_servers = Server.objects.count()
-    active_servers = Server.objects.filter(status='active').count()
-    maintenance_servers = Server.objects.filter(status='maintenance').count()
-    inactive_servers = Server.objects.filter(status='inactive').count()
-    retired_servers = Server.objects.filter(status='retired').count()
-    
-    # İşletim sistemine göre dağılım
-    os_distribution = {}
+@cache_for_models(Server)
+def server_counts():
+    """Durum ve işletim sistemi dağılımını tek sorguda hesaplar"""
+    aggregates = {
+        'total': Count('id'),
+        'active': Count('id', filter=Q(status='active')),
+        'maintenance': Count('id', filter=Q(status='maintenance')),
+        'inactive': Count('id', filter=Q(status='inactive')),
+        'retired': Count('id', filter=Q(status='retired')),
+    }
     for os_choice, os_name in Server.OS_CHOICES:
-        os_distribution[os_name] = Server.objects.filter(operating_system=os_choice).count()
+        aggregates[f'os_{os_choice}'] = Count('id', filter=Q(operating_system=os_choice))
+    counts = Server.objects.aggregate(**aggregates)
     
-    # Yakında garantisi dolacak sunucular
-    today = timezone.now().date()
-    ninety_days_later = today + timezone.timedelta(days=90)
-    warranty_expiring_soon = Server.objects.filter(
+    counts['os_distribution'] = {
+        str(os_name): counts.pop(f'os_{os_choice}') for os_choice, os_name in Server.OS_CHOICES
+    }
+    return counts
+
+
+@cache_for_models(Server, ServerType)
+def warranty_expiring_servers(today, days=90):
+    """Yakında garantisi dolacak sunucular; tarih anahtara girdiğinden gün değişince yenilenir"""
+    return list(Server.objects.filter(
         warranty_expiry__gt=today,
-        warranty_expiry__lte=ninety_days_later
-    ).order_by('warranty_expiry')
-    
-    # Yaklaşan bakımlar
-    upcoming_maintenance = ServerMaintenanceRecord.objects.filter(
+        warranty_expiry__lte=today + timezone.timedelta(days=days)
+    ).select_related('server_type').order_by('warranty_expiry'))
+
+
+@cache_for_models(ServerMaintenanceRecord, Server)
+def upcoming_server_maintenance(today, limit=5):
+    return list(ServerMaintenanceRecord.objects.filter(
         status__in=['scheduled', 'in_progress'],
         scheduled_date__gte=today
-    ).order_by('scheduled_date')[:5]
-    
-    # Son izleme günlükleri
-    recent_logs = ServerMonitoringLog.objects.filter(
+    ).select_related('server').order_by('scheduled_date')[:limit])
+
+
+@cache_for_models(ServerMonitoringLog, Server)
+def unresolved_monitoring_logs(limit=5):
+    return list(ServerMonitoringLog.objects.filter(
         resolved=False
-    ).order_by('-timestamp')[:5]
-    
-    return render(request, 'server_management/dashboard.html', {
-        'total_servers': total_servers,
-        'active_servers': active_servers,
-        'maintenance_servers': maintenance_servers,
-        'inactive_servers': inactive_servers,
-        'retired_servers': retired_servers,
-        'os_distribution': os_distribution,
+    ).select_related('server').order_by('-timestamp')[:limit])
+
+
+@alogin_required
+async def server_dashboard(request):
+    """Sunucu yönetimi dashboard görünümü; bağımsız sorgular eşzamanlı çalışır"""
+    today = timezone.now().date()
+    counts, warranty_expiring_soon, upcoming_maintenance, recent_logs = await run_concurrently(
+        server_counts,
+        lambda: warranty_expiring_servers(today),
+        lambda: upcoming_server_maintenance(today),
+        unresolved_monitoring_logs,
+    )
+    
+    return await arender(request, 'server_management/dashboard.html', {
+        'total_servers': counts['total'],
+        'active_servers': counts['active'],
+        'maintenance_servers': counts['maintenance'],
+        'inactive_servers': counts['inactive'],
+        'retired_servers': counts['retired'],
+        'os_distribution': counts['os_distribution'],
         'warranty_expiring_soon': warranty_expiring_soon,
         'upcoming_maintenance': upcoming_maintenance,
         'recent_logs': recent_logs,
@@ -1,9 +1,11 @@
 from django.db import models
-#from django.contrib.auth.models import AbstractUser, Group, Permission
+from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.conf import settings
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from core.cache import VersionedManager
+
 class Department(models.Model):
     """Departman modeli"""
     name = models.CharField(_('Departman Adı'), max_length=100)
@@ -210,6 +212,9 @@ class UserNotification(models.Model):
     read_at = models.DateTimeField(_('Okunma Tarihi'), null=True, blank=True)
     related_url = models.CharField(_('İlgili URL'), max_length=255, blank=True)
     
+    # Toplu okundu işaretleme (update) önbellek sürümünü de artırır
+    objects = VersionedManager()
+    
     class Meta:
         verbose_name = _('Bildirim')
         verbose_name_plural = _('Bildirimler')
@@ -34,6 +34,7 @@ urlpatterns = [
     
     # Bildirim URL'leri
     path('notifications/', views.notification_list, name='notification_list'),
+    path('notifications/counts/', views.notification_counts, name='notification_counts'),
     path('notifications/<int:notification_id>/mark-read/', views.notification_mark_read, name='notification_mark_read'),
     path('notifications/mark-all-read/', views.notification_mark_all_read, name='notification_mark_all_read'),
     path('notifications/create/', views.notification_create, name='notification_create'),
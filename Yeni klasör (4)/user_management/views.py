@@ -6,6 +6,8 @@ from django.db.models import Q, Count
 from django.utils import timezone
 from django.http import JsonResponse
 from django.urls import reverse
+from core.async_views import alogin_required, aget_user, arender, run_concurrently
+from core.cache import cache_for_models
 
 from .models import CustomUser, Department, UserActivity, UserPermissionRequest, UserNotification
 from .forms import (
@@ -103,35 +105,82 @@ def password_change(request):
     return render(request, 'user_management/password_change.html', {'form': form})
 
 # Kullanıcı profil görünümleri
-@login_required
-def user_dashboard(request):
-    """Kullanıcı dashboard görünümü"""
+@cache_for_models(UserNotification)
+def unread_notification_list(user_id, limit=5):
+    return list(UserNotification.objects.filter(
+        user_id=user_id, is_read=False
+    ).order_by('-created_at')[:limit])
+
+
+@cache_for_models(UserNotification)
+def notification_count_summary(user_id):
+    """Kullanıcının bildirim sayıları; öncelik dağılımı dahil tek sorgu"""
+    unread = Q(is_read=False)
+    counts = {'total': Count('id'), 'unread': Count('id', filter=unread)}
+    for priority, _ in UserNotification.PRIORITY_CHOICES:
+        counts[f'unread_{priority}'] = Count('id', filter=unread & Q(priority=priority))
+    return UserNotification.objects.filter(user_id=user_id).aggregate(**counts)
+
+
+@cache_for_models(UserActivity)
+def recent_activity_list(user_id, limit=10):
+    return list(UserActivity.objects.filter(
+        user_id=user_id
+    ).order_by('-timestamp')[:limit])
+
+
+@cache_for_models(UserPermissionRequest)
+def user_permission_request_list(user_id, limit=5):
+    return list(UserPermissionRequest.objects.filter(
+        user_id=user_id
+    ).order_by('-requested_at')[:limit])
+
+
+@cache_for_models(UserPermissionRequest, CustomUser)
+def pending_permission_request_list():
+    """Bekleyen izin talepleri"""
+    return list(UserPermissionRequest.objects.filter(
+        status='pending'
+    ).select_related('user').order_by('-requested_at')[:5])
+
+
+@cache_for_models(Department, CustomUser)
+def department_member_counts(department_id=None):
+    """Departmanları üye sayılarıyla birlikte tek sorguda döndürür"""
+    departments = Department.objects.annotate(member_count=Count('members'))
+    if department_id is not None:
+        departments = departments.filter(id=department_id)
+    return list(departments)
+
+
+@alogin_required
+async def user_dashboard(request):
+    """Kullanıcı dashboard görünümü; bağımsız sorgular eşzamanlı çalışır"""
     # Kullanıcı bilgileri
-    user = request.user
-    
-    # Okunmamış bildirimler
-    unread_notifications = UserNotification.objects.filter(user=user, is_read=False).order_by('-created_at')[:5]
-    
-    # Son aktiviteler
-    recent_activities = UserActivity.objects.filter(user=user).order_by('-timestamp')[:10]
-    
-    # İzin talepleri
-    permission_requests = UserPermissionRequest.objects.filter(user=user).order_by('-requested_at')[:5]
-    
-    # Yöneticiler için ek bilgiler
-    pending_permission_requests = None
-    department_stats = None
-    if is_admin_or_manager(user):
-        # Bekleyen izin talepleri
-        pending_permission_requests = UserPermissionRequest.objects.filter(status='pending').order_by('-requested_at')[:5]
-        
-        # Departman istatistikleri
+    user = await aget_user(request)
+    
+    # Okunmamış bildirimler, son aktiviteler ve izin talepleri
+    queries = [
+        lambda: unread_notification_list(user.pk),
+        lambda: recent_activity_list(user.pk),
+        lambda: user_permission_request_list(user.pk),
+    ]
+    
+    # Yöneticiler için bekleyen izin talepleri ve departman istatistikleri
+    is_manager = is_admin_or_manager(user)
+    if is_manager:
+        queries.append(pending_permission_request_list)
         if user.user_type == 'admin':
-            department_stats = Department.objects.annotate(member_count=Count('members'))
-        elif user.department:
-            department_stats = Department.objects.filter(id=user.department.id).annotate(member_count=Count('members'))
+            queries.append(department_member_counts)
+        elif user.department_id:
+            queries.append(lambda: department_member_counts(user.department_id))
+    
+    results = await run_concurrently(*queries)
+    unread_notifications, recent_activities, permission_requests = results[:3]
+    pending_permission_requests = results[3] if is_manager else None
+    department_stats = results[4] if len(results) > 4 else None
     
-    return render(request, 'user_management/dashboard.html', {
+    return await arender(request, 'user_management/dashboard.html', {
         'user': user,
         'unread_notifications': unread_notifications,
         'recent_activities': recent_activities,
@@ -588,6 +637,28 @@ def notification_list(request):
         'notifications': notifications
     })
 
+@alogin_required
+async def notification_counts(request):
+    """Menüdeki bildirim rozeti için sayılar (JSON)"""
+    user = await aget_user(request)
+    counts, latest = await run_concurrently(
+        lambda: notification_count_summary(user.pk),
+        lambda: unread_notification_list(user.pk),
+    )
+    return JsonResponse({
+        'counts': counts,
+        'latest': [
+            {
+                'id': notification.id,
+                'title': notification.title,
+                'priority': notification.priority,
+                'created_at': notification.created_at.isoformat(),
+                'url': notification.related_url,
+            }
+            for notification in latest
+        ],
+    })
+
 @login_required
 def notification_mark_read(request, notification_id):
     """Bildirimi okundu olarak işaretleme görünümü"""